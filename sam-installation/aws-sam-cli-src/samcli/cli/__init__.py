@@ -1,3 +1,11 @@
 """
 CLI Framework
 """
+
+import os
+
+# Set to 1 to print the modules which took the longest to import when the command exits
+if os.environ.get("SAM_CLI_IMPORT_PROFILE", "0") == "1":  # pragma: no cover
+    from samcli.cli.import_profiler import install_import_profiler
+
+    install_import_profiler()
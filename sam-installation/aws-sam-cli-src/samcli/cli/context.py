@@ -7,7 +7,6 @@ import uuid
 from typing import List, Optional, cast
 
 import click
-from rich.console import Console
 
 from samcli.cli.formatters import RootCommandHelpTextFormatter
 from samcli.commands.exceptions import AWSServiceClientError
@@ -45,10 +44,14 @@ class Context:
         self._session_id = str(uuid.uuid4())
         self._experimental = False
         self._exception = None
-        self._console = Console()
+        self._console = None
 
     @property
     def console(self):
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
         return self._console
 
     @property
@@ -32,6 +32,7 @@ class DefaultEntry:
 
     INSTALLATION_ID = ConfigEntry("installationId", None)
     LAST_VERSION_CHECK = ConfigEntry("lastVersionCheck", None)
+    LATEST_VERSION = ConfigEntry("latestVersion", None)
     TELEMETRY = ConfigEntry("telemetryEnabled", "SAM_CLI_TELEMETRY")
     ACCELERATE_OPT_IN_STACKS = ConfigEntry("accelerateOptInStacks", None)
 
@@ -414,6 +415,17 @@ class GlobalConfig(metaclass=Singleton):
     def last_version_check(self, value: float):
         self.set_value(DefaultEntry.LAST_VERSION_CHECK, value)
 
+    @property
+    def latest_version(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the latest SAM CLI version fetched from PyPI, with the ETag of the response and the fetch time
+        """
+        return self.get_value(DefaultEntry.LATEST_VERSION, value_type=dict)
+
+    @latest_version.setter
+    def latest_version(self, value: Dict[str, Any]):
+        self.set_value(DefaultEntry.LATEST_VERSION, value)
+
     def is_accelerate_opt_in_stack(self, template_file: str, stack_name: str) -> bool:
         """
         Returns True, if current folder with stack name is been accepted to use sam sync before.
@@ -0,0 +1,120 @@
+"""
+Profiler of the modules imported by a command, enabled with SAM_CLI_IMPORT_PROFILE=1
+
+It reports the modules which take the most time to import, to find what slows down the startup of the CLI.
+Unlike ``python -X importtime``, the report is sorted and also shows which module first imported each module.
+"""
+
+import atexit
+import builtins
+import importlib
+import importlib.util
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Number of modules listed in the report
+IMPORT_PROFILE_TOP = int(os.environ.get("SAM_CLI_IMPORT_PROFILE_TOP", "30"))
+
+
+class ImportProfiler:
+    """
+    Measures the time spent executing each module the first time it is imported. The cumulative time of a module
+    includes the modules it imports, its self time does not.
+    """
+
+    def __init__(self) -> None:
+        # module name -> (cumulative seconds, self seconds, importer)
+        self._timings: Dict[str, Tuple[float, float, str]] = {}
+        # time spent in the nested imports of each import in progress
+        self._children_time: List[float] = []
+        # time spent in the outermost imports
+        self._total = 0.0
+        self._original_import: Optional[Callable[..., Any]] = None
+        self._original_import_module: Optional[Callable[..., Any]] = None
+        self._start = time.perf_counter()
+
+    def install(self) -> None:
+        """
+        Starts measuring the imports, and reports them when the interpreter exits
+        """
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        self._original_import_module = importlib.import_module
+        builtins.__import__ = self._import
+        importlib.import_module = self._import_module  # type: ignore[assignment]
+        atexit.register(self.report)
+
+    def uninstall(self) -> None:
+        if self._original_import is None:
+            return
+        builtins.__import__ = self._original_import
+        importlib.import_module = self._original_import_module  # type: ignore[assignment]
+        self._original_import = None
+        self._original_import_module = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):  # pylint: disable=redefined-builtin
+        module_name = name
+        importer = (globals or {}).get("__name__", "")
+        if level:
+            try:
+                module_name = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+            except (ImportError, ValueError):
+                module_name = name
+        return self._measure(module_name, importer, self._original_import, name, globals, locals, fromlist, level)
+
+    def _import_module(self, name, package=None):
+        module_name = importlib.util.resolve_name(name, package) if name.startswith(".") else name
+        caller = sys._getframe(1).f_globals.get("__name__", "")  # pylint: disable=protected-access
+        return self._measure(module_name, caller, self._original_import_module, name, package)
+
+    def _measure(self, module_name: str, importer: str, original: Any, *args):
+        if module_name in sys.modules or module_name in self._timings:
+            return original(*args)
+
+        self._children_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            children_time = self._children_time.pop()
+            if self._children_time:
+                self._children_time[-1] += elapsed
+            else:
+                self._total += elapsed
+            if module_name in sys.modules:
+                self._timings[module_name] = (elapsed, elapsed - children_time, importer)
+
+    def report(self, top: int = IMPORT_PROFILE_TOP, file=None) -> None:
+        """
+        Prints the slowest imports, sorted by cumulative time
+
+        Parameters
+        ----------
+        top: int
+            Number of modules to print
+        file
+            Stream the report is written to, stderr by default
+        """
+        file = file or sys.stderr
+        print(
+            f"\nImported {len(self._timings)} modules in {self._total * 1000:.0f} ms "
+            f"({(time.perf_counter() - self._start) * 1000:.0f} ms since the profiler started)",
+            file=file,
+        )
+        print(f"{'cumulative':>12} {'self':>9}  module (imported by)", file=file)
+        slowest = sorted(self._timings.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        for module_name, (cumulative, self_time, importer) in slowest:
+            print(f"{cumulative * 1000:9.1f} ms {self_time * 1000:6.1f} ms  {module_name} ({importer})", file=file)
+
+
+def install_import_profiler() -> ImportProfiler:
+    """
+    Installs an import profiler which reports the slowest imports when the interpreter exits
+    """
+    profiler = ImportProfiler()
+    profiler.install()
+    return profiler
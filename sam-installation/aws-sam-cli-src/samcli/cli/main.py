@@ -134,6 +134,7 @@ def cli(ctx):
     import atexit
 
     from samcli.lib.telemetry.metric import emit_all_metrics, send_installed_metric
+    from samcli.lib.telemetry.sender import flush_telemetry
 
     # if development version of SAM CLI is used, attach module proxy
     # to catch missing configuration for dynamic/hidden imports
@@ -166,6 +167,8 @@ def cli(ctx):
     lambda_builders_logger = logging.getLogger(LAMBDA_BULDERS_LOGGER_NAME)
     botocore_logger = logging.getLogger("botocore")
 
+    # exit handlers run in the reverse order, the metrics emitted on exit are flushed with the others
+    atexit.register(flush_telemetry)
     atexit.register(emit_all_metrics)
 
     SamCliLogger.configure_logger(sam_cli_logger, SAM_CLI_FORMATTER, logging.INFO)
@@ -0,0 +1,103 @@
+"""
+Benchmark of the startup time of the CLI
+
+    python -m samcli.cli.startup_benchmark [--runs 10] [--budget-ms 200] [command ...]
+
+Runs ``sam --version`` and ``sam <command> --help`` in new interpreters, and reports the median and the 95th
+percentile of their wall time. Exits with 1 if a command fails or if a median is over the budget.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Sequence, Tuple
+
+DEFAULT_RUNS = 10
+DEFAULT_BUDGET_MS = 200
+DEFAULT_COMMANDS = ["local invoke", "deploy", "logs", "validate", "init"]
+
+
+def measure(args: Sequence[str], runs: int) -> Tuple[List[float], bool]:
+    """
+    Returns the wall times, in milliseconds, of running the CLI with the given arguments
+
+    Parameters
+    ----------
+    args: Sequence[str]
+        Arguments of the CLI, e.g. ["logs", "--help"]
+    runs: int
+        Number of times the CLI is run
+
+    Returns
+    -------
+    Tuple[List[float], bool]
+        The wall time of each run, and whether all the runs succeeded
+    """
+    env = dict(os.environ)
+    # sending the telemetry should not be part of the startup time
+    env.setdefault("SAM_CLI_TELEMETRY", "0")
+    env.pop("SAM_CLI_IMPORT_PROFILE", None)
+
+    timings = []
+    succeeded = True
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-m", "samcli", *args],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        succeeded = succeeded and process.returncode == 0
+    return timings, succeeded
+
+
+def measure_interpreter(runs: int) -> List[float]:
+    """
+    Returns the wall times, in milliseconds, of starting an interpreter which does nothing
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=False)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentile(timings: List[float], fraction: float) -> float:
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    parser = argparse.ArgumentParser(description="Measure the startup time of the SAM CLI")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Number of runs of each command")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Budget of the median time")
+    parser.add_argument("commands", nargs="*", default=DEFAULT_COMMANDS, help="Commands whose --help is measured")
+    options = parser.parse_args(list(argv) or None)
+
+    # the time to start an interpreter is not spent in the CLI, it is reported separately
+    baseline = statistics.median(measure_interpreter(options.runs))
+    print(f"{'python -c pass':30} median {baseline:7.1f} ms")
+
+    failed = False
+    for args in [["--version"]] + [command.split() + ["--help"] for command in options.commands]:
+        timings, succeeded = measure(args, options.runs)
+        median = statistics.median(timings)
+        status = "" if succeeded else "  FAILED"
+        if median > options.budget_ms:
+            status += "  OVER BUDGET"
+        failed = failed or bool(status)
+        print(
+            f"{'sam ' + ' '.join(args):30} median {median:7.1f} ms  p95 {percentile(timings, 0.95):7.1f} ms{status}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main(sys.argv[1:]))
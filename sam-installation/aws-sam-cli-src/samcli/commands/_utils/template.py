@@ -8,7 +8,6 @@ import pathlib
 
 import jmespath
 import yaml
-from botocore.utils import set_value_from_jmespath
 
 from samcli.commands.exceptions import UserException
 from samcli.lib.samlib.resource_metadata_normalizer import ASSET_PATH_METADATA_KEY, ResourceMetadataNormalizer
@@ -52,7 +51,7 @@ def get_template_data(template_file):
 
     with open(template_file, "r", encoding="utf-8") as fp:
         try:
-            return yaml_parse(fp.read())
+            return yaml_parse(fp.read(), template_file)
         except (ValueError, yaml.YAMLError) as ex:
             raise TemplateFailedParsingException("Failed to parse template: {}".format(str(ex))) from ex
 
@@ -132,6 +131,8 @@ def _update_relative_paths(template_dict, original_root, new_root):
     Updated dictionary
 
     """
+    # botocore.utils is slow to import, and this module is imported by most of the commands
+    from botocore.utils import set_value_from_jmespath
 
     for resource_type, properties in template_dict.get("Metadata", {}).items():
         if resource_type not in METADATA_WITH_LOCAL_PATHS:
@@ -36,8 +36,6 @@ from samcli.commands._utils.options import (
 )
 from samcli.commands.deploy.core.command import DeployCommand
 from samcli.commands.deploy.utils import sanitize_parameter_overrides
-from samcli.lib.bootstrap.bootstrap import manage_stack
-from samcli.lib.bootstrap.companion_stack.companion_stack_manager import sync_ecr_stack
 from samcli.lib.cli_validation.image_repository_validation import image_repository_validation
 from samcli.lib.telemetry.metric import track_command
 from samcli.lib.utils import osutils
@@ -278,6 +276,8 @@ def do_cli(
     from samcli.commands.deploy.exceptions import DeployResolveS3AndS3SetError
     from samcli.commands.deploy.guided_context import GuidedContext
     from samcli.commands.package.package_context import PackageContext
+    from samcli.lib.bootstrap.bootstrap import manage_stack
+    from samcli.lib.bootstrap.companion_stack.companion_stack_manager import sync_ecr_stack
 
     if guided:
         # Allow for a guided deploy to prompt and save those details.
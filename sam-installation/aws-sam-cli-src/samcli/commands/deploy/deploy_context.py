@@ -19,7 +19,6 @@ import logging
 import os
 from typing import Dict, List, Optional
 
-import boto3
 import click
 
 from samcli.commands.deploy import exceptions as deploy_exceptions
@@ -34,7 +33,7 @@ from samcli.lib.deploy.utils import FailureMode
 from samcli.lib.intrinsic_resolver.intrinsics_symbol_table import IntrinsicsSymbolTable
 from samcli.lib.package.s3_uploader import S3Uploader
 from samcli.lib.providers.sam_stack_provider import SamLocalStackProvider
-from samcli.lib.utils.boto_utils import get_boto_config_with_user_agent
+from samcli.lib.utils.boto_utils import get_boto_client_with_config
 from samcli.yamlhelper import yaml_parse
 
 LOG = logging.getLogger(__name__)
@@ -136,14 +135,13 @@ class DeployContext:
         template_size = os.path.getsize(self.template_file)
         if template_size > self._max_template_size and not self.s3_bucket:
             raise deploy_exceptions.DeployBucketRequiredError()
-        boto_config = get_boto_config_with_user_agent()
-        cloudformation_client = boto3.client(
-            "cloudformation", region_name=self.region if self.region else None, config=boto_config
+        cloudformation_client = get_boto_client_with_config(
+            "cloudformation", region_name=self.region if self.region else None
         )
 
         s3_client = None
         if self.s3_bucket:
-            s3_client = boto3.client("s3", region_name=self.region if self.region else None, config=boto_config)
+            s3_client = get_boto_client_with_config("s3", region_name=self.region if self.region else None)
 
             self.s3_uploader = S3Uploader(
                 s3_client, self.s3_bucket, self.s3_prefix, self.kms_key_id, self.force_upload, self.no_progressbar
@@ -0,0 +1,16 @@
+"""
+Modes of the containers of the local commands, kept apart from the invoke context so the command options can be
+defined without importing it
+"""
+
+from enum import Enum
+
+
+class ContainersInitializationMode(Enum):
+    EAGER = "EAGER"
+    LAZY = "LAZY"
+
+
+class ContainersMode(Enum):
+    WARM = "WARM"
+    COLD = "COLD"
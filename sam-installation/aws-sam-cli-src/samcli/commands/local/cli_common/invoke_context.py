@@ -6,12 +6,12 @@ import errno
 import json
 import logging
 import os
-from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, TextIO, Tuple, Type, cast
 
 from samcli.commands._utils.template import TemplateFailedParsingException, TemplateNotFoundException
 from samcli.commands.exceptions import ContainersInitializationException
+from samcli.commands.local.cli_common.container_modes import ContainersInitializationMode, ContainersMode
 from samcli.commands.local.cli_common.user_exceptions import DebugContextException, InvokeContextException
 from samcli.commands.local.lib.debug_context import DebugContext
 from samcli.commands.local.lib.local_lambda import LocalLambdaRunner
@@ -50,16 +50,6 @@ class NoFunctionIdentifierProvidedException(InvokeContextException):
     """
 
 
-class ContainersInitializationMode(Enum):
-    EAGER = "EAGER"
-    LAZY = "LAZY"
-
-
-class ContainersMode(Enum):
-    WARM = "WARM"
-    COLD = "COLD"
-
-
 class InvokeContext:
     """
     Sets up a context to invoke Lambda functions locally by parsing all command line arguments necessary for the
@@ -320,8 +310,7 @@ class InvokeContext:
 
         def initialize_function_container(function: Function) -> None:
             function_config = self.local_lambda_runner.get_invoke_config(function)
-            self.lambda_runtime.run(
-                container=None,
+            cast(WarmLambdaRuntime, self.lambda_runtime).prewarm(
                 function_config=function_config,
                 debug_context=self._debug_context,
                 container_host=self._container_host,
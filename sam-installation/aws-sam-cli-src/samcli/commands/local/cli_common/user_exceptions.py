@@ -47,6 +47,12 @@ class ResourceNotFound(UserException):
     """
 
 
+class LayerChecksumMismatch(UserException):
+    """
+    The downloaded Layer doesn't match the CodeSha256 of the LayerVersion
+    """
+
+
 class InvalidLayerVersionArn(UserException):
     """
     The LayerVersion Arn given in the template is Invalid
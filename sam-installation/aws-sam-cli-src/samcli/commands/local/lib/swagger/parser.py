@@ -6,6 +6,7 @@ from typing import Dict, List, Union
 from samcli.commands.local.lib.swagger.integration_uri import IntegrationType, LambdaUri
 from samcli.commands.local.lib.validators.identity_source_validator import IdentitySourceValidator
 from samcli.local.apigw.authorizers.authorizer import Authorizer
+from samcli.local.apigw.authorizers.authorizer_cache import parse_result_ttl
 from samcli.local.apigw.authorizers.lambda_authorizer import LambdaAuthorizer
 from samcli.local.apigw.exceptions import (
     IncorrectOasWithDefaultAuthorizerException,
@@ -41,6 +42,7 @@ class SwaggerParser:
     _AUTHORIZER_IN = "in"
     _AUTHORIZER_IDENTITY_SOURCE = "identitySource"
     _AUTHORIZER_SIMPLE_RESPONSES = "enableSimpleResponses"
+    _AUTHORIZER_RESULT_TTL = "authorizerResultTtlInSeconds"
 
     def __init__(self, stack_path: str, swagger):
         """
@@ -171,6 +173,7 @@ class SwaggerParser:
                 identity_sources=identity_sources,
                 validation_string=validation_expression,
                 use_simple_response=enable_simple_response,
+                result_ttl=parse_result_ttl(authorizer_object.get(SwaggerParser._AUTHORIZER_RESULT_TTL), auth_name),
             )
 
             authorizers[auth_name] = lambda_authorizer
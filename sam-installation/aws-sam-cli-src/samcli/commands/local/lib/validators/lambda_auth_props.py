@@ -21,6 +21,7 @@ class BaseLambdaAuthorizerValidator(ABC):
     AUTHORIZER_IDENTITY_SOURCE = "IdentitySource"
     AUTHORIZER_VALIDATION = "IdentityValidationExpression"
     AUTHORIZER_AUTHORIZER_URI = "AuthorizerUri"
+    AUTHORIZER_RESULT_TTL = "AuthorizerResultTtlInSeconds"
 
     @staticmethod
     @abstractmethod
@@ -22,11 +22,11 @@ from samcli.lib.observability.cw_logs.cw_log_formatters import (
 from samcli.lib.observability.cw_logs.cw_log_group_provider import LogGroupProvider
 from samcli.lib.observability.cw_logs.cw_log_puller import CWLogPuller
 from samcli.lib.observability.observability_info_puller import (
-    ObservabilityCombinedPuller,
     ObservabilityEventConsumer,
     ObservabilityEventConsumerDecorator,
     ObservabilityPuller,
 )
+from samcli.lib.observability.observability_tail_scheduler import ObservabilityTailScheduler
 from samcli.lib.observability.util import OutputOption
 from samcli.lib.utils.boto_utils import BotoProviderType, get_client_error_code
 from samcli.lib.utils.cloudformation import CloudFormationResourceSummary
@@ -34,6 +34,9 @@ from samcli.lib.utils.colors import Colored
 
 LOG = logging.getLogger(__name__)
 
+# Poll interval of CloudWatch log groups which have new events, when tailing
+CW_LOG_POLL_INTERVAL = 0.5
+
 
 class NoPullerGeneratedException(UserException):
     """
@@ -98,6 +101,7 @@ def generate_puller(
                 consumer,
                 cw_log_group_name,
                 resource_information.logical_resource_id,
+                poll_interval=CW_LOG_POLL_INTERVAL,
             )
         )
 
@@ -111,6 +115,7 @@ def generate_puller(
                 logs_client,
                 consumer,
                 cw_log_group,
+                poll_interval=CW_LOG_POLL_INTERVAL,
             )
         )
 
@@ -123,8 +128,9 @@ def generate_puller(
     if not pullers:
         raise NoPullerGeneratedException("No valid resources find to pull information")
 
-    # return the combined puller instance, which will pull from all pullers collected
-    return ObservabilityCombinedPuller(pullers)
+    # return the combined puller instance, which will pull from all pullers collected. When tailing, all of them are
+    # scheduled together, the log groups share the CloudWatch Logs API rate budget and the events are merged in order
+    return ObservabilityTailScheduler(pullers)
 
 
 def _validate_cw_log_group_name(cw_log_group, logs_client):
@@ -19,7 +19,6 @@ import logging
 import os
 from typing import List, Optional
 
-import boto3
 import click
 import docker
 
@@ -33,7 +32,7 @@ from samcli.lib.package.s3_uploader import S3Uploader
 from samcli.lib.package.uploaders import Uploaders
 from samcli.lib.providers.provider import ResourceIdentifier, Stack, get_resource_full_path_by_id
 from samcli.lib.providers.sam_stack_provider import SamLocalStackProvider
-from samcli.lib.utils.boto_utils import get_boto_config_with_user_agent
+from samcli.lib.utils.boto_utils import get_boto_client_with_config
 from samcli.lib.utils.preview_runtimes import PREVIEW_RUNTIMES
 from samcli.lib.utils.resources import AWS_LAMBDA_FUNCTION, AWS_SERVERLESS_FUNCTION
 from samcli.yamlhelper import yaml_dump
@@ -118,11 +117,8 @@ class PackageContext:
         self.image_repositories = updated_repo
         region_name = self.region if self.region else None
 
-        s3_client = boto3.client(
-            "s3",
-            config=get_boto_config_with_user_agent(signature_version="s3v4", region_name=region_name),
-        )
-        ecr_client = boto3.client("ecr", config=get_boto_config_with_user_agent(region_name=region_name))
+        s3_client = get_boto_client_with_config("s3", signature_version="s3v4", region_name=region_name)
+        ecr_client = get_boto_client_with_config("ecr", region_name=region_name)
 
         docker_client = docker.from_env(version=DOCKER_MIN_API_VERSION)
 
@@ -137,7 +133,7 @@ class PackageContext:
 
         self.uploaders = Uploaders(s3_uploader, ecr_uploader)
 
-        code_signer_client = boto3.client("signer", config=get_boto_config_with_user_agent(region_name=region_name))
+        code_signer_client = get_boto_client_with_config("signer", region_name=region_name)
         self.code_signer = CodeSigner(code_signer_client, self.signing_profiles)
 
         try:
@@ -3,7 +3,6 @@
 import json
 import logging
 
-import boto3
 import click
 
 from samcli.cli.cli_config_file import ConfigProvider, configuration_option, save_params_option
@@ -153,6 +152,8 @@ def _print_console_link(region, application_id):
 
     """
     if not region:
+        import boto3
+
         region = boto3.Session().region_name
 
     console_link = SERVERLESSREPO_CONSOLE_URL.format(region, application_id.replace("/", "~"))
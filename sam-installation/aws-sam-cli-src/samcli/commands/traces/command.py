@@ -75,17 +75,14 @@ def do_cli(trace_ids, tailing, start_time, end_time, output, region):
     """
     from datetime import datetime
 
-    import boto3
-
     from samcli.commands.logs.logs_context import parse_time
     from samcli.commands.traces.traces_puller_factory import generate_trace_puller
-    from samcli.lib.utils.boto_utils import get_boto_config_with_user_agent
+    from samcli.lib.utils.boto_utils import get_boto_client_with_config
 
     sanitized_start_time = parse_time(start_time, "start-time")
     sanitized_end_time = parse_time(end_time, "end-time") or datetime.utcnow()
 
-    boto_config = get_boto_config_with_user_agent(region_name=region)
-    xray_client = boto3.client("xray", config=boto_config)
+    xray_client = get_boto_client_with_config("xray", region_name=region)
 
     # generate puller depending on the parameters
     puller = generate_trace_puller(xray_client, OutputOption(output) if output else OutputOption.text)
@@ -6,11 +6,11 @@ from typing import Any, List
 
 from samcli.commands.traces.trace_console_consumers import XRayTraceConsoleConsumer
 from samcli.lib.observability.observability_info_puller import (
-    ObservabilityCombinedPuller,
     ObservabilityEventConsumer,
     ObservabilityEventConsumerDecorator,
     ObservabilityPuller,
 )
+from samcli.lib.observability.observability_tail_scheduler import ObservabilityTailScheduler
 from samcli.lib.observability.util import OutputOption
 from samcli.lib.observability.xray_traces.xray_event_mappers import (
     XRayServiceGraphConsoleMapper,
@@ -45,7 +45,7 @@ def generate_trace_puller(
     pullers.append(XRayTracePuller(xray_client, generate_xray_event_consumer(output)))
     pullers.append(XRayServiceGraphPuller(xray_client, generate_xray_service_graph_consumer(output)))
 
-    return ObservabilityCombinedPuller(pullers)
+    return ObservabilityTailScheduler(pullers)
 
 
 def generate_json_xray_event_consumer() -> ObservabilityEventConsumer:
@@ -12,6 +12,13 @@ from subprocess import CalledProcessError, run
 from typing import Any, Dict
 
 from samcli.hook_packages.terraform.hooks.prepare.constants import CFN_CODE_PROPERTIES
+from samcli.hook_packages.terraform.hooks.prepare.prepare_cache import (
+    PREPARE_CACHE_ENABLED,
+    PrepareCache,
+    compute_inputs_digest,
+    compute_plan_digest,
+    get_plan_time_sources,
+)
 from samcli.hook_packages.terraform.hooks.prepare.translate import translate_to_cfn
 from samcli.lib.hook.exceptions import (
     PrepareHookException,
@@ -98,8 +105,23 @@ def prepare(params: dict) -> dict:
 
     plan_file = params.get("PlanFile")
 
+    prepare_cache = PrepareCache(output_dir_path, metadata_file_path) if PREPARE_CACHE_ENABLED else None
+    inputs_digest = (
+        compute_inputs_digest(
+            terraform_application_dir, project_root_dir, output_dir_path, plan_file, prepare_cache.plan_time_sources
+        )
+        if prepare_cache
+        else None
+    )
+
     if skip_prepare_infra and os.path.exists(metadata_file_path):
         LOG.info("Skipping preparation stage, the metadata file already exists at %s", metadata_file_path)
+    elif prepare_cache and inputs_digest and prepare_cache.matches_inputs(inputs_digest):
+        LOG.info(
+            "Skipping preparation stage, the Terraform project did not change since the metadata file %s "
+            "was generated",
+            metadata_file_path,
+        )
     else:
         try:
             # initialize terraform application
@@ -110,6 +132,24 @@ def prepare(params: dict) -> dict:
                 with open(plan_file, "r") as f:
                     tf_json = json.load(f)
 
+            plan_digest = compute_plan_digest(tf_json) if prepare_cache else None
+            # the artifacts built by the plan, like the zip files of archive_file, are only built again if their
+            # sources are part of the inputs
+            plan_time_sources = (
+                get_plan_time_sources(tf_json, terraform_application_dir) if prepare_cache and not plan_file else []
+            )
+            if prepare_cache and plan_time_sources != prepare_cache.plan_time_sources:
+                inputs_digest = compute_inputs_digest(
+                    terraform_application_dir, project_root_dir, output_dir_path, plan_file, plan_time_sources
+                )
+            if prepare_cache and inputs_digest and plan_digest and prepare_cache.matches_plan(plan_digest):
+                LOG.info("The Terraform plan did not change, reusing the metadata file %s", metadata_file_path)
+                prepare_cache.save(inputs_digest, plan_digest, plan_time_sources)
+                return {"iac_applications": {"MainApplication": {"metadata_file": metadata_file_path}}}
+
+            if prepare_cache:
+                prepare_cache.invalidate()
+
             # convert terraform to cloudformation
             LOG.info("Generating metadata file")
             cfn_dict = translate_to_cfn(tf_json, output_dir_path, terraform_application_dir, project_root_dir)
@@ -130,6 +170,9 @@ def prepare(params: dict) -> dict:
             with open(metadata_file_path, "w+") as metadata_file:
                 json.dump(cfn_dict, metadata_file)
 
+            if prepare_cache and inputs_digest and plan_digest:
+                prepare_cache.save(inputs_digest, plan_digest, plan_time_sources)
+
         except OSError as e:
             raise PrepareHookException(f"OSError: {e}") from e
 
@@ -0,0 +1,322 @@
+"""
+Cache of the Terraform prepare hook results, so an unchanged Terraform project is not planned and translated again
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from samcli import __version__ as samcli_version
+from samcli.lib.utils.file_lock import atomic_write_text
+
+LOG = logging.getLogger(__name__)
+
+# Set to 0 to always run the Terraform commands and translate the plan
+PREPARE_CACHE_ENABLED = os.environ.get("SAM_CLI_TERRAFORM_PREPARE_CACHE", "1") != "0"
+
+PREPARE_CACHE_FILE = "prepare_cache.json"
+PREPARE_CACHE_VERSION = 2
+
+# files that change the Terraform plan without changing the configuration
+TERRAFORM_INPUT_FILE_NAMES = {".terraform.lock.hcl", "terraform.tfstate"}
+TERRAFORM_INPUT_FILE_SUFFIXES = (".tf", ".tf.json", ".tfvars", ".tfvars.json")
+# the modules manifest lists the directory of each module used by the project, local or downloaded
+TERRAFORM_MODULES_MANIFEST = os.path.join("modules", "modules.json")
+# the selected workspace and the backend configuration of an initialized project
+TERRAFORM_DATA_DIR_INPUT_FILES = ["environment", "terraform.tfstate", TERRAFORM_MODULES_MANIFEST]
+TERRAFORM_ENVIRONMENT_VARIABLE_PREFIXES = ("TF_VAR_", "TF_CLI_ARGS", "TF_WORKSPACE", "TF_DATA_DIR")
+# the AWS variables select the account and region the providers and data sources read from
+TERRAFORM_ENVIRONMENT_VARIABLES = ("AWS_REGION", "AWS_DEFAULT_REGION", "AWS_PROFILE")
+
+# keys of the plan JSON that change on every plan without changing the translated template
+VOLATILE_PLAN_KEYS = ["timestamp"]
+# attributes of the data sources which build a file from local files while planning, like the zip file of a Lambda
+# function built by an archive_file data source
+PLAN_TIME_SOURCE_ATTRIBUTES = {"archive_file": ["source_dir", "source_file"]}
+
+
+def _iter_input_files(directory: str) -> Iterator[str]:
+    """
+    Yields the Terraform configuration, variable and state files of a module directory, in a deterministic order.
+    Terraform only loads the files of the module directory itself, sub directories are not walked.
+    """
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return
+    for name in names:
+        if name not in TERRAFORM_INPUT_FILE_NAMES and not name.endswith(TERRAFORM_INPUT_FILE_SUFFIXES):
+            continue
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            yield path
+
+
+def _get_module_directories(terraform_application_dir: str, data_dir: str) -> List[str]:
+    """
+    Returns the root module directory and the directories of the modules listed in the modules manifest written by
+    terraform init, the directories are relative to the root module directory
+    """
+    directories = [terraform_application_dir]
+    try:
+        with open(os.path.join(data_dir, TERRAFORM_MODULES_MANIFEST), "r") as manifest_file:
+            modules = json.load(manifest_file).get("Modules") or []
+    except (OSError, ValueError, AttributeError):
+        return directories
+
+    for module in modules:
+        module_dir = module.get("Dir") if isinstance(module, dict) else None
+        if not isinstance(module_dir, str):
+            continue
+        directory = os.path.normpath(os.path.join(terraform_application_dir, module_dir))
+        if directory not in directories:
+            directories.append(directory)
+    return directories
+
+
+def _update_with_file(digest: Any, path: str) -> None:
+    digest.update(path.encode("utf-8"))
+    try:
+        with open(path, "rb") as input_file:
+            for chunk in iter(lambda: input_file.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        digest.update(b"<missing>")
+
+
+def _update_with_source(digest: Any, path: str) -> None:
+    if not os.path.isdir(path):
+        _update_with_file(digest, path)
+        return
+    for directory, directory_names, file_names in os.walk(path):
+        directory_names.sort()
+        for name in sorted(file_names):
+            _update_with_file(digest, os.path.join(directory, name))
+
+
+def get_plan_time_sources(tf_json: Dict, terraform_application_dir: str) -> List[str]:
+    """
+    Returns the local files and directories the plan built artifacts from, like the source_dir of an archive_file
+    data source. The artifacts are only built again by terraform plan, so the prepare hook result also depends on
+    them.
+
+    Parameters
+    ----------
+    tf_json: Dict
+        The Terraform plan in JSON format
+    terraform_application_dir: str
+        The absolute path of the Terraform application root module, relative sources are relative to it
+
+    Returns
+    -------
+    List[str]
+        The absolute paths of the sources, sorted
+    """
+    sources = set()
+    root_modules = [
+        (tf_json.get("prior_state") or {}).get("values", {}).get("root_module"),
+        (tf_json.get("planned_values") or {}).get("root_module"),
+    ]
+    modules = [module for module in root_modules if isinstance(module, dict)]
+    while modules:
+        module = modules.pop()
+        modules.extend(child for child in module.get("child_modules") or [] if isinstance(child, dict))
+        for resource in module.get("resources") or []:
+            values = resource.get("values") or {}
+            for attribute in PLAN_TIME_SOURCE_ATTRIBUTES.get(resource.get("type"), []):
+                source = values.get(attribute)
+                if isinstance(source, str) and source:
+                    sources.add(os.path.normpath(os.path.join(terraform_application_dir, source)))
+    return sorted(sources)
+
+
+def compute_inputs_digest(
+    terraform_application_dir: str,
+    project_root_dir: str,
+    output_dir_path: str,
+    plan_file: Optional[str] = None,
+    plan_time_sources: Sequence[str] = (),
+) -> str:
+    """
+    Computes the digest of everything the prepare hook result depends on: the Terraform configuration files of the
+    root module and of the modules it uses, the lock and state files, the Terraform and AWS environment variables,
+    the sources of the artifacts built while planning and the hook parameters. If a plan file is provided, the plan
+    file replaces the Terraform project files.
+
+    Changes done to a remote state by another machine are not detected, SAM_CLI_TERRAFORM_PREPARE_CACHE=0 can be used
+    to force planning the project again.
+
+    Parameters
+    ----------
+    terraform_application_dir: str
+        The absolute path of the Terraform application root module
+    project_root_dir: str
+        The absolute path of the project root directory
+    output_dir_path: str
+        The absolute path of the directory the metadata files are written to
+    plan_file: Optional[str]
+        The Terraform plan file provided by the customer
+    plan_time_sources: Sequence[str]
+        The sources of the artifacts built by the plan, see get_plan_time_sources
+
+    Returns
+    -------
+    str
+        The hex digest of the inputs
+    """
+    digest = hashlib.sha256()
+    for value in [
+        str(PREPARE_CACHE_VERSION),
+        samcli_version,
+        terraform_application_dir,
+        project_root_dir,
+        output_dir_path,
+    ]:
+        digest.update(f"{value}\0".encode("utf-8"))
+
+    if plan_file:
+        _update_with_file(digest, os.path.abspath(plan_file))
+        return digest.hexdigest()
+
+    for name, value in sorted(os.environ.items()):
+        if name.startswith(TERRAFORM_ENVIRONMENT_VARIABLE_PREFIXES) or name in TERRAFORM_ENVIRONMENT_VARIABLES:
+            digest.update(f"{name}={value}\0".encode("utf-8"))
+
+    data_dir = os.path.join(terraform_application_dir, os.environ.get("TF_DATA_DIR", ".terraform"))
+    for directory in _get_module_directories(terraform_application_dir, data_dir):
+        for path in _iter_input_files(directory):
+            _update_with_file(digest, path)
+
+    for name in TERRAFORM_DATA_DIR_INPUT_FILES:
+        path = os.path.join(data_dir, name)
+        if os.path.isfile(path):
+            _update_with_file(digest, path)
+
+    for source in plan_time_sources:
+        _update_with_source(digest, source)
+
+    return digest.hexdigest()
+
+
+def compute_plan_digest(tf_json: Dict) -> str:
+    """
+    Computes the digest of a Terraform plan JSON, ignoring the keys that change on every plan
+
+    Parameters
+    ----------
+    tf_json: Dict
+        The Terraform plan in JSON format
+
+    Returns
+    -------
+    str
+        The hex digest of the plan
+    """
+    plan = {key: value for key, value in tf_json.items() if key not in VOLATILE_PLAN_KEYS}
+    serialized = json.dumps(plan, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class PrepareCache:
+    """
+    Record of the inputs and of the plan the metadata files of an output directory were generated from.
+
+    When the inputs did not change, the metadata files are reused without running any Terraform command. When the
+    inputs changed but Terraform produced the same plan (e.g. only comments or formatting changed), the metadata
+    files are reused without translating the plan again.
+    """
+
+    def __init__(self, output_dir_path: str, metadata_file_path: str):
+        """
+        Parameters
+        ----------
+        output_dir_path: str
+            The directory the metadata files are written to
+        metadata_file_path: str
+            The path of the generated metadata file
+        """
+        self._output_dir_path = output_dir_path
+        self._metadata_file_path = metadata_file_path
+        self._cache_file_path = os.path.join(output_dir_path, PREPARE_CACHE_FILE)
+        self._record = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self._cache_file_path, "r") as cache_file:
+                record = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(record, dict) or record.get("version") != PREPARE_CACHE_VERSION:
+            return {}
+        return record
+
+    def _outputs_exist(self) -> bool:
+        return all(
+            os.path.isfile(os.path.join(self._output_dir_path, name)) for name in self._record.get("outputs", [])
+        ) and os.path.isfile(self._metadata_file_path)
+
+    @property
+    def plan_time_sources(self) -> List[str]:
+        """
+        The sources of the artifacts built by the plan the metadata files were generated from
+        """
+        sources = self._record.get("sources")
+        return [source for source in sources if isinstance(source, str)] if isinstance(sources, list) else []
+
+    def matches_inputs(self, inputs_digest: str) -> bool:
+        """
+        Returns True if the metadata files were generated from the same inputs, and they still exist
+        """
+        return bool(self._record) and self._record.get("inputs") == inputs_digest and self._outputs_exist()
+
+    def matches_plan(self, plan_digest: str) -> bool:
+        """
+        Returns True if the metadata files were generated from the same plan, and they still exist
+        """
+        return bool(self._record) and self._record.get("plan") == plan_digest and self._outputs_exist()
+
+    def save(self, inputs_digest: str, plan_digest: str, plan_time_sources: Sequence[str] = ()) -> None:
+        """
+        Record the inputs and the plan the current metadata files were generated from
+
+        Parameters
+        ----------
+        inputs_digest: str
+            The digest returned by compute_inputs_digest
+        plan_digest: str
+            The digest returned by compute_plan_digest
+        plan_time_sources: Sequence[str]
+            The sources of the artifacts built by the plan, included in inputs_digest
+        """
+        outputs = sorted(
+            name
+            for name in os.listdir(self._output_dir_path)
+            if name != PREPARE_CACHE_FILE
+            and not name.startswith(".")
+            and os.path.isfile(os.path.join(self._output_dir_path, name))
+        )
+        self._record = {
+            "version": PREPARE_CACHE_VERSION,
+            "inputs": inputs_digest,
+            "plan": plan_digest,
+            "sources": list(plan_time_sources),
+            "outputs": outputs,
+        }
+        try:
+            atomic_write_text(self._cache_file_path, json.dumps(self._record))
+        except OSError as ex:
+            LOG.debug("Failed to write the prepare cache file %s: %s", self._cache_file_path, ex)
+
+    def invalidate(self) -> None:
+        """
+        Forget the recorded inputs, e.g. before the metadata files are generated again
+        """
+        self._record = {}
+        try:
+            os.remove(self._cache_file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as ex:
+            LOG.debug("Failed to remove the prepare cache file %s: %s", self._cache_file_path, ex)
@@ -5,8 +5,10 @@ e.g. linking layers to functions
 
 import logging
 import re
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Type, Union
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 from samcli.hook_packages.terraform.hooks.prepare.constants import TF_AWS_API_GATEWAY_REST_API
 from samcli.hook_packages.terraform.hooks.prepare.exceptions import (
@@ -86,6 +88,113 @@ DATA_RESOURCE_ADDRESS_PREFIX = "data."
 
 LOG = logging.getLogger(__name__)
 
+# destination linking attribute value -> (destination logical id, destination resource type)
+DestinationLinkingMap = Dict[str, Tuple[str, str]]
+
+
+class LinkingIndex:
+    """
+    Lookups shared by all the link rules of a prepare run. The destination resources of a rule are indexed by the
+    value of their linking attribute (e.g. the ARN of a function) once, instead of once per source resource, and the
+    resolved values of module outputs and variables are memoized, as the same module expressions are resolved again
+    and again by the different rules.
+
+    The indexed resources and modules must not change while the index is in use.
+    """
+
+    def __init__(self):
+        # the indexed objects are kept in the entries, so their ids are not reused while the index is alive
+        self._destination_maps: Dict[Tuple, Tuple[Dict, DestinationLinkingMap]] = {}
+        self._module_values: Dict[
+            Tuple[int, str, str], Tuple[TFModule, List[Union[ConstantValue, ResolvedReference]]]
+        ] = {}
+
+    def get_destination_map(
+        self, destination_resource_tf: Dict[str, Dict], expected_destinations: List["ResourcePairExceptedDestination"]
+    ) -> DestinationLinkingMap:
+        key = (
+            id(destination_resource_tf),
+            tuple(
+                (destination.terraform_resource_type_prefix, destination.terraform_attribute_name)
+                for destination in expected_destinations
+            ),
+        )
+        cached = self._destination_maps.get(key)
+        if cached is None:
+            cached = (
+                destination_resource_tf,
+                _build_destination_linking_map(destination_resource_tf, expected_destinations),
+            )
+            self._destination_maps[key] = cached
+        return cached[1]
+
+    def get_module_values(
+        self,
+        module: TFModule,
+        kind: str,
+        name: str,
+        resolve: Callable[[], List[Union[ConstantValue, ResolvedReference]]],
+    ) -> List[Union[ConstantValue, ResolvedReference]]:
+        key = (id(module), kind, name)
+        cached = self._module_values.get(key)
+        if cached is None:
+            cached = (module, resolve())
+            self._module_values[key] = cached
+        else:
+            LOG.debug("Using the resolved values of %s %s in module %s", kind, name, module.module_name)
+        # callers extend the returned list
+        return list(cached[1])
+
+
+_LINKING_INDEX: ContextVar[Optional[LinkingIndex]] = ContextVar("linking_index", default=None)
+
+
+@contextmanager
+def linking_index() -> Iterator[LinkingIndex]:
+    """
+    Share a LinkingIndex between all the resource linking done inside the block
+    """
+    index = LinkingIndex()
+    token = _LINKING_INDEX.set(index)
+    try:
+        yield index
+    finally:
+        _LINKING_INDEX.reset(token)
+
+
+def _build_destination_linking_map(
+    destination_resource_tf: Dict[str, Dict], expected_destinations: List["ResourcePairExceptedDestination"]
+) -> DestinationLinkingMap:
+    """
+    Build the map between the destination linking field property values, and resources' logical ids
+
+    Parameters
+    ----------
+    destination_resource_tf: Dict[str, Dict]
+        The destination resources keyed by their logical ids
+    expected_destinations: List[ResourcePairExceptedDestination]
+        The destination resource types, and the attribute used to link to each of them
+
+    Returns
+    -------
+    DestinationLinkingMap
+        The logical id and the type of the destination resources keyed by their linking attribute value
+    """
+    expected_destinations_map = {
+        expected_destination.terraform_resource_type_prefix: expected_destination.terraform_attribute_name
+        for expected_destination in expected_destinations
+    }
+    child_resources_linking_attributes_logical_id_mapping = {}
+    for logical_id, destination_resource in destination_resource_tf.items():
+        destination_attribute = expected_destinations_map.get(f"{destination_resource.get('type', '')}.", "")
+        linking_attribute_value = destination_resource.get("values", {}).get(destination_attribute)
+        if linking_attribute_value:
+            child_resources_linking_attributes_logical_id_mapping[linking_attribute_value] = (
+                logical_id,
+                destination_resource.get("type", {}),
+            )
+    return child_resources_linking_attributes_logical_id_mapping
+
 
 def _default_tf_destination_value_id_extractor(value: str) -> str:
     """
@@ -168,6 +277,7 @@ class ResourceLinker:
 
     def __init__(self, resource_pair):
         self._resource_pair = resource_pair
+        self._destination_linking_map: Optional[DestinationLinkingMap] = None
 
     def link_resources(self) -> None:
         """
@@ -331,20 +441,7 @@ class ResourceLinker:
             self._resource_pair.tf_destination_value_extractor_from_link_field_value_function(value) for value in values
         ]
 
-        # build map between the destination linking field property values, and resources' logical ids
-        expected_destinations_map = {
-            expected_destination.terraform_resource_type_prefix: expected_destination.terraform_attribute_name
-            for expected_destination in self._resource_pair.expected_destinations
-        }
-        child_resources_linking_attributes_logical_id_mapping = {}
-        for logical_id, destination_resource in self._resource_pair.destination_resource_tf.items():
-            destination_attribute = expected_destinations_map.get(f"{destination_resource.get('type', '')}.", "")
-            linking_attribute_value = destination_resource.get("values", {}).get(destination_attribute)
-            if linking_attribute_value:
-                child_resources_linking_attributes_logical_id_mapping[linking_attribute_value] = (
-                    logical_id,
-                    destination_resource.get("type", {}),
-                )
+        child_resources_linking_attributes_logical_id_mapping = self._get_destination_linking_map()
 
         LOG.debug(
             "The map between destination resources linking fields %s, and resources logical ids is %s",
@@ -376,6 +473,23 @@ class ResourceLinker:
         LOG.debug("The value of the source resource linking field after mapping %s", dest_resources)
         self._resource_pair.cfn_resource_update_call_back_function(cfn_resource, dest_resources)
 
+    def _get_destination_linking_map(self) -> DestinationLinkingMap:
+        """
+        Returns the map between the destination linking field property values, and resources' logical ids. It is
+        built once per linker, or once per prepare run if a LinkingIndex is in use.
+        """
+        if self._destination_linking_map is None:
+            index = _LINKING_INDEX.get()
+            if index is not None:
+                self._destination_linking_map = index.get_destination_map(
+                    self._resource_pair.destination_resource_tf, self._resource_pair.expected_destinations
+                )
+            else:
+                self._destination_linking_map = _build_destination_linking_map(
+                    self._resource_pair.destination_resource_tf, self._resource_pair.expected_destinations
+                )
+        return self._destination_linking_map
+
     def _process_resolved_resources(
         self,
         source_tf_resource: TFResource,
@@ -807,6 +921,31 @@ def _clean_references_list(references: List[str]) -> List[str]:
 
 
 def _resolve_module_output(module: TFModule, output_name: str) -> List[Union[ConstantValue, ResolvedReference]]:
+    """
+    Resolves any references in the output section of the module, the resolved values are memoized if a LinkingIndex
+    is in use
+
+    Parameters
+    ----------
+    module : Module
+        The module with outputs to search
+    output_name : str
+        The value to resolve
+
+    Returns
+    -------
+    List[Union[ConstantValue, ResolvedReference]]
+        A list of resolved values
+    """
+    index = _LINKING_INDEX.get()
+    if index is None:
+        return _do_resolve_module_output(module, output_name)
+    return index.get_module_values(
+        module, "output", output_name, lambda: _do_resolve_module_output(module, output_name)
+    )
+
+
+def _do_resolve_module_output(module: TFModule, output_name: str) -> List[Union[ConstantValue, ResolvedReference]]:
     """
     Resolves any references in the output section of the module
 
@@ -906,6 +1045,16 @@ def _resolve_module_output(module: TFModule, output_name: str) -> List[Union[Con
 
 
 def _resolve_module_variable(module: TFModule, variable_name: str) -> List[Union[ConstantValue, ResolvedReference]]:
+    # the resolved values are memoized if a LinkingIndex is in use
+    index = _LINKING_INDEX.get()
+    if index is None:
+        return _do_resolve_module_variable(module, variable_name)
+    return index.get_module_values(
+        module, "variable", variable_name, lambda: _do_resolve_module_variable(module, variable_name)
+    )
+
+
+def _do_resolve_module_variable(module: TFModule, variable_name: str) -> List[Union[ConstantValue, ResolvedReference]]:
     # return a list of the values that resolve the passed variable
     # name in the input module.
     results: List[Union[ConstantValue, ResolvedReference]] = []
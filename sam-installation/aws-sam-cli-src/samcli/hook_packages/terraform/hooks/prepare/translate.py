@@ -6,6 +6,7 @@ This method contains the logic required to translate the `terraform show` JSON o
 
 import hashlib
 import logging
+import time
 from typing import Any, Dict, Iterator, List, Tuple, Type, Union
 
 from samcli.hook_packages.terraform.hooks.prepare.constants import (
@@ -26,6 +27,7 @@ from samcli.hook_packages.terraform.hooks.prepare.property_builder import (
 from samcli.hook_packages.terraform.hooks.prepare.resource_linking import (
     _build_module,
     _resolve_resource_attribute,
+    linking_index,
 )
 from samcli.hook_packages.terraform.hooks.prepare.resources.apigw import (
     RESTAPITranslationValidator,
@@ -350,26 +352,37 @@ def translate_to_cfn(
 
 
 def _handle_linking(resource_property_mapping: Dict[str, ResourceProperties]) -> None:
-    for link in RESOURCE_LINKS:
-        link.linking_func(
-            resource_property_mapping[link.source].terraform_config,
-            resource_property_mapping[link.source].cfn_resources,
-            resource_property_mapping[link.dest].terraform_resources,
-        )
-
-    for multiple_destinations_link in MULTIPLE_DESTINATIONS_RESOURCE_LINKS:
-        destinations: Dict[str, Dict] = {}
-        for dest_resource_type in multiple_destinations_link.destinations:
-            destinations = {
-                **destinations,
-                **resource_property_mapping[dest_resource_type].terraform_resources,
-            }
-
-        multiple_destinations_link.linking_func(
-            resource_property_mapping[multiple_destinations_link.source].terraform_config,
-            resource_property_mapping[multiple_destinations_link.source].cfn_resources,
-            destinations,
-        )
+    # all the link rules share one index of the destination resources and of the resolved module values
+    with linking_index():
+        for link in RESOURCE_LINKS:
+            start = time.perf_counter()
+            link.linking_func(
+                resource_property_mapping[link.source].terraform_config,
+                resource_property_mapping[link.source].cfn_resources,
+                resource_property_mapping[link.dest].terraform_resources,
+            )
+            LOG.debug("Linked %s to %s in %.1f ms", link.source, link.dest, (time.perf_counter() - start) * 1000)
+
+        for multiple_destinations_link in MULTIPLE_DESTINATIONS_RESOURCE_LINKS:
+            start = time.perf_counter()
+            destinations: Dict[str, Dict] = {}
+            for dest_resource_type in multiple_destinations_link.destinations:
+                destinations = {
+                    **destinations,
+                    **resource_property_mapping[dest_resource_type].terraform_resources,
+                }
+
+            multiple_destinations_link.linking_func(
+                resource_property_mapping[multiple_destinations_link.source].terraform_config,
+                resource_property_mapping[multiple_destinations_link.source].cfn_resources,
+                destinations,
+            )
+            LOG.debug(
+                "Linked %s to %s in %.1f ms",
+                multiple_destinations_link.source,
+                ", ".join(multiple_destinations_link.destinations),
+                (time.perf_counter() - start) * 1000,
+            )
 
 
 def _add_child_modules_to_queue(curr_module: Dict, curr_module_configuration: TFModule, modules_queue: List) -> None:
@@ -6,18 +6,20 @@ import json
 import logging
 from typing import Optional
 
-import boto3
 from botocore.exceptions import ClientError
 
 from samcli import __version__
 from samcli.cli.global_config import GlobalConfig
 from samcli.commands.exceptions import AWSServiceClientError, UserException
+from samcli.lib.utils.lazy_import import lazy_import
 from samcli.lib.utils.managed_cloudformation_stack import StackOutput
 from samcli.lib.utils.managed_cloudformation_stack import manage_stack as manage_cloudformation_stack
 
 SAM_CLI_STACK_NAME = "aws-sam-cli-managed-default"
 LOG = logging.getLogger(__name__)
 
+boto3 = lazy_import("boto3")
+
 
 def manage_stack(profile, region):
     outputs: StackOutput = manage_cloudformation_stack(
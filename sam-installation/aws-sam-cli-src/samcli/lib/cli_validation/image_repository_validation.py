@@ -6,13 +6,6 @@ This is to be run last after all CLI options have been processed.
 import click
 
 from samcli.commands._utils.option_validator import Validator
-from samcli.commands._utils.template import get_template_artifacts_format
-from samcli.lib.providers.provider import (
-    ResourceIdentifier,
-    get_resource_full_path_by_id,
-)
-from samcli.lib.providers.sam_function_provider import SamFunctionProvider
-from samcli.lib.providers.sam_stack_provider import SamLocalStackProvider
 from samcli.lib.utils.packagetype import IMAGE
 
 
@@ -38,6 +31,8 @@ def image_repository_validation(support_resolve_image_repos=True):
         """
 
         def wrapped(*args, **kwargs):
+            from samcli.commands._utils.template import get_template_artifacts_format
+
             ctx = click.get_current_context()
             guided = ctx.params.get("guided", False) or ctx.params.get("g", False)
             image_repository = ctx.params.get("image_repository", False)
@@ -119,6 +114,11 @@ def _is_all_image_funcs_provided(template_file, image_repositories, parameters_o
     """
     Validate that the customer provides ECR repository for every available Lambda function with image package type
     """
+    # the providers are slow to import, they are only needed once the command runs
+    from samcli.lib.providers.provider import ResourceIdentifier, get_resource_full_path_by_id
+    from samcli.lib.providers.sam_function_provider import SamFunctionProvider
+    from samcli.lib.providers.sam_stack_provider import SamLocalStackProvider
+
     image_repositories = image_repositories if image_repositories else {}
     global_parameter_overrides = {}
     stacks, _ = SamLocalStackProvider.get_stacks(
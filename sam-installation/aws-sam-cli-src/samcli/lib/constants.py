@@ -1 +1,2 @@
 DOCKER_MIN_API_VERSION = "1.35"
+DEFAULT_CONTAINER_HOST_INTERFACE = "127.0.0.1"
@@ -4,8 +4,6 @@ import json
 from pathlib import Path
 from typing import Dict, NamedTuple, Optional, cast
 
-import jsonschema
-
 from .exceptions import InvalidHookPackageConfigException
 
 
@@ -51,6 +49,8 @@ class HookPackageConfig:
         with config_loc.open("r", encoding="utf-8") as f:
             config_dict = json.load(f)
 
+        import jsonschema
+
         try:
             jsonschema.validate(config_dict, self.jsonschema)
         except jsonschema.ValidationError as e:
@@ -7,6 +7,7 @@ import copy
 import logging
 import re
 from collections import OrderedDict
+from typing import Any, Dict, Tuple
 
 from samcli.commands._utils.template import get_template_data
 from samcli.lib.intrinsic_resolver.invalid_intrinsic_exception import InvalidIntrinsicException, InvalidSymbolException
@@ -95,6 +96,11 @@ class IntrinsicResolver:
         self._conditions = self._template.get("Conditions", {})
         self._outputs = self._template.get("Outputs", {})
 
+        # Each Ref/Fn::GetAtt symbol and each condition is only resolved once per template. A changed template is
+        # resolved again from scratch: the memoized values of the previous template are dropped here
+        self._symbol_cache: Dict[Tuple[str, str, bool], Any] = {}
+        self._condition_cache: Dict[Tuple[str, bool], Any] = {}
+
     def default_intrinsic_function_map(self):
         """
         Returns a dictionary containing the mapping from
@@ -286,6 +292,38 @@ class IntrinsicResolver:
                     ) from e
         return processed_dict
 
+    def _resolve_symbol(self, logical_id, resource_attribute, ignore_errors=False):
+        """
+        Memoized symbol_resolver.resolve_symbols, a copy is returned for values that are not immutable
+        """
+        key = (logical_id, resource_attribute, ignore_errors)
+        if key in self._symbol_cache:
+            resolved = self._symbol_cache[key]
+            if resolved is None or isinstance(resolved, (str, int, float, bool)):
+                return resolved
+            return copy.deepcopy(resolved)
+
+        if ignore_errors:
+            resolved = self._symbol_resolver.resolve_symbols(logical_id, resource_attribute, ignore_errors=True)
+        else:
+            resolved = self._symbol_resolver.resolve_symbols(logical_id, resource_attribute)
+        self._symbol_cache[key] = copy.deepcopy(resolved) if isinstance(resolved, (dict, list)) else resolved
+        return resolved
+
+    def _resolve_condition(self, condition_name, condition, ignore_errors, parent_function):
+        """
+        Memoized evaluation of a condition of the Conditions dictionary
+        """
+        key = (condition_name, ignore_errors)
+        if key in self._condition_cache:
+            return self._condition_cache[key]
+
+        condition_evaluated = self.intrinsic_property_resolver(
+            condition, ignore_errors, parent_function=parent_function
+        )
+        self._condition_cache[key] = condition_evaluated
+        return condition_evaluated
+
     def handle_fn_join(self, intrinsic_value, ignore_errors):
         """
         { "Fn::Join" : [ "delimiter", [ comma-delimited list of values ] ] }
@@ -615,7 +653,7 @@ class IntrinsicResolver:
         verify_intrinsic_type_str(logical_id, IntrinsicResolver.FN_GET_ATT)
         verify_intrinsic_type_str(resource_type, IntrinsicResolver.FN_GET_ATT)
 
-        return self._symbol_resolver.resolve_symbols(logical_id, resource_type)
+        return self._resolve_symbol(logical_id, resource_type)
 
     def handle_fn_ref(self, intrinsic_value, ignore_errors):
         """
@@ -639,7 +677,7 @@ class IntrinsicResolver:
         )
         verify_intrinsic_type_str(arguments, IntrinsicResolver.REF)
 
-        return self._symbol_resolver.resolve_symbols(arguments, IntrinsicResolver.REF)
+        return self._resolve_symbol(arguments, IntrinsicResolver.REF)
 
     def handle_fn_sub(self, intrinsic_value, ignore_errors):
         """
@@ -658,12 +696,12 @@ class IntrinsicResolver:
         A string with the resolved attributes
         """
 
-        def resolve_sub_attribute(intrinsic_item, symbol_resolver):
+        def resolve_sub_attribute(intrinsic_item):
             if "." in intrinsic_item:
-                (logical_id, attribute_type) = intrinsic_item.rsplit(".", 1)
+                logical_id, attribute_type = intrinsic_item.rsplit(".", 1)
             else:
-                (logical_id, attribute_type) = intrinsic_item, IntrinsicResolver.REF
-            return symbol_resolver.resolve_symbols(logical_id, attribute_type, ignore_errors=True)
+                logical_id, attribute_type = intrinsic_item, IntrinsicResolver.REF
+            return self._resolve_symbol(logical_id, attribute_type, ignore_errors=True)
 
         if isinstance(intrinsic_value, str):
             intrinsic_value = [intrinsic_value, {}]
@@ -689,7 +727,7 @@ class IntrinsicResolver:
         subable_props = re.findall(string=sub_str, pattern=IntrinsicResolver._REGEX_SUB_FUNCTION)
         for sub_item in subable_props:
             sanitized_item = sanitized_variables[sub_item] if sub_item in sanitized_variables else sub_item
-            result = resolve_sub_attribute(sanitized_item, self._symbol_resolver)
+            result = resolve_sub_attribute(sanitized_item)
             sub_str = re.sub(pattern=r"\$\{" + sub_item + r"\}", string=sub_str, repl=str(result))
         return sub_str
 
@@ -741,9 +779,7 @@ class IntrinsicResolver:
             message="The condition is missing in the Conditions dictionary for {}".format(IntrinsicResolver.FN_IF),
         )
 
-        condition_evaluated = self.intrinsic_property_resolver(
-            condition, ignore_errors, parent_function=IntrinsicResolver.FN_IF
-        )
+        condition_evaluated = self._resolve_condition(condition_name, condition, ignore_errors, IntrinsicResolver.FN_IF)
         verify_intrinsic_type_bool(
             condition_evaluated,
             IntrinsicResolver.FN_IF,
@@ -811,8 +847,8 @@ class IntrinsicResolver:
             condition = self._conditions.get(condition_name)
             verify_non_null(condition, IntrinsicResolver.FN_NOT, position_in_list="first")
 
-            argument_sanitised = self.intrinsic_property_resolver(
-                condition, ignore_errors, parent_function=IntrinsicResolver.FN_NOT
+            argument_sanitised = self._resolve_condition(
+                condition_name, condition, ignore_errors, IntrinsicResolver.FN_NOT
             )
 
         verify_intrinsic_type_bool(
@@ -878,8 +914,8 @@ class IntrinsicResolver:
                     condition, IntrinsicResolver.FN_AND, position_in_list=self.get_prefix_position_in_list(i)
                 )
 
-                condition_evaluated = self.intrinsic_property_resolver(
-                    condition, ignore_errors, parent_function=IntrinsicResolver.FN_AND
+                condition_evaluated = self._resolve_condition(
+                    condition_name, condition, ignore_errors, IntrinsicResolver.FN_AND
                 )
                 verify_intrinsic_type_bool(condition_evaluated, IntrinsicResolver.FN_AND)
 
@@ -934,8 +970,8 @@ class IntrinsicResolver:
                     condition, IntrinsicResolver.FN_OR, position_in_list=self.get_prefix_position_in_list(i)
                 )
 
-                condition_evaluated = self.intrinsic_property_resolver(
-                    condition, ignore_errors, parent_function=IntrinsicResolver.FN_OR
+                condition_evaluated = self._resolve_condition(
+                    condition_name, condition, ignore_errors, IntrinsicResolver.FN_OR
                 )
                 verify_intrinsic_type_bool(condition_evaluated, IntrinsicResolver.FN_OR)
                 if condition_evaluated:
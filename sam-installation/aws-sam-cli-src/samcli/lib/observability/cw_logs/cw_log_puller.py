@@ -3,24 +3,34 @@ CloudWatch log event puller implementation
 """
 
 import logging
-import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
 
 from botocore.exceptions import ClientError
 
 from samcli.lib.observability.cw_logs.cw_log_event import CWLogEvent
-from samcli.lib.observability.observability_info_puller import ObservabilityEventConsumer, ObservabilityPuller
+from samcli.lib.observability.observability_info_puller import (
+    ObservabilityEventConsumer,
+    ObservabilityPollingPuller,
+)
 from samcli.lib.utils.time import to_datetime, to_timestamp
 
 LOG = logging.getLogger(__name__)
 
+# Poll interval ceiling when backing off because of throttling
+MAX_POLL_INTERVAL = 30
+# FilterLogEvents requests per second shared by all log groups tailed together
+MAX_REQUESTS_PER_SECOND = 5
 
-class CWLogPuller(ObservabilityPuller):
+
+class CWLogPuller(ObservabilityPollingPuller):
     """
     Puller implementation that can pull events from CloudWatch log group
     """
 
+    api_name = "logs:FilterLogEvents"
+    api_rate_limit = MAX_REQUESTS_PER_SECOND
+
     def __init__(
         self,
         logs_client: Any,
@@ -28,7 +38,8 @@ class CWLogPuller(ObservabilityPuller):
         cw_log_group: str,
         resource_name: Optional[str] = None,
         max_retries: int = 1000,
-        poll_interval: int = 1,
+        poll_interval: float = 1,
+        max_poll_interval: float = MAX_POLL_INTERVAL,
     ):
         """
         Parameters
@@ -43,8 +54,10 @@ class CWLogPuller(ObservabilityPuller):
             Optional parameter to assign a resource name for each event.
         max_retries: int
             Optional parameter to set maximum retries when tailing. Default value is 1000
-        poll_interval: int
+        poll_interval: float
             Optional parameter to define sleep interval between pulling new log events when tailing. Default value is 1
+        max_poll_interval: float
+            Optional parameter to define the maximum sleep interval when backing off because of throttling
         """
         self.logs_client = logs_client
         self.consumer = consumer
@@ -52,49 +65,64 @@ class CWLogPuller(ObservabilityPuller):
         self.resource_name = resource_name
         self._max_retries = max_retries
         self._poll_interval = poll_interval
+        self._min_poll_interval = poll_interval
+        self._max_poll_interval = max(max_poll_interval, poll_interval)
         self.latest_event_time = 0
         self.had_data = False
         self._invalid_log_group = False
+        # ids of the consumed events at or after latest_event_time, since the next poll will return them again
+        self._seen_event_ids: Dict[str, int] = {}
 
-    def tail(self, start_time: Optional[datetime] = None, filter_pattern: Optional[str] = None):
-        if start_time:
-            self.latest_event_time = to_timestamp(start_time)
+    @property
+    def poll_interval(self) -> float:
+        return self._poll_interval
 
-        counter = self._max_retries
-        while counter > 0 and not self.cancelled:
-            LOG.debug("Tailing logs from %s starting at %s", self.cw_log_group, str(self.latest_event_time))
+    @property
+    def max_retries(self) -> int:
+        return self._max_retries
 
-            counter -= 1
-            try:
-                self.load_time_period(to_datetime(self.latest_event_time), filter_pattern=filter_pattern)
-            except ClientError as err:
-                error_code = err.response.get("Error", {}).get("Code")
-                if error_code == "ThrottlingException":
-                    # if throttled, increase poll interval by 1 second each time
-                    if self._poll_interval == 1:
-                        self._poll_interval += 1
-                    else:
-                        self._poll_interval **= 2
-                    LOG.warning(
-                        "Throttled by CloudWatch Logs API, consider pulling logs for certain resources. "
-                        "Increasing the poll interval time for resource %s to %s seconds",
-                        self.cw_log_group,
-                        self._poll_interval,
-                    )
-                else:
-                    # if error is other than throttling, re-raise it
-                    LOG.error("Failed while fetching new log events", exc_info=err)
-                    raise err
+    def poll(self, filter_pattern: Optional[str] = None) -> bool:
+        """
+        Fetches the events published since the previous poll, and adapts the poll interval. The interval is doubled
+        (up to max_poll_interval) when throttled, and halved back towards the initial interval after each
+        successful poll.
 
-            # This poll fetched logs. Reset the retry counter and set the timestamp for next poll
-            if self.had_data:
-                counter = self._max_retries
-                self.latest_event_time += 1  # one extra millisecond to fetch next log event
-                self.had_data = False
+        Parameters
+        ----------
+        filter_pattern : Optional[str]
+            Optional parameter to filter events with given string
 
-            # We already fetched logs once. Sleep for some time before querying again.
-            # This also helps us scoot under the TPS limit for CloudWatch API call.
-            time.sleep(self._poll_interval)
+        Returns
+        -------
+        bool
+            True if new events were consumed
+        """
+        LOG.debug("Tailing logs from %s starting at %s", self.cw_log_group, str(self.latest_event_time))
+
+        try:
+            self.load_time_period(to_datetime(self.latest_event_time), filter_pattern=filter_pattern)
+        except ClientError as err:
+            error_code = err.response.get("Error", {}).get("Code")
+            if error_code == "ThrottlingException":
+                # if throttled, back off exponentially up to the ceiling
+                self._poll_interval = min(self._poll_interval * 2, self._max_poll_interval)
+                LOG.warning(
+                    "Throttled by CloudWatch Logs API, consider pulling logs for certain resources. "
+                    "Increasing the poll interval time for resource %s to %s seconds",
+                    self.cw_log_group,
+                    self._poll_interval,
+                )
+                return False
+
+            # if error is other than throttling, re-raise it
+            LOG.error("Failed while fetching new log events", exc_info=err)
+            raise err
+
+        self._poll_interval = max(self._min_poll_interval, self._poll_interval / 2)
+
+        had_data = self.had_data
+        self.had_data = False
+        return had_data
 
     def load_time_period(
         self,
@@ -130,13 +158,27 @@ class CWLogPuller(ObservabilityPuller):
 
             # Several events will be returned. Consume one at a time
             for event in result.get("events", []):
+                event_id = event.get("eventId")
+                # events at latest_event_time are returned again by the next poll, skip the ones already consumed
+                if event_id and event_id in self._seen_event_ids:
+                    continue
+
                 self.had_data = True
                 cw_event = CWLogEvent(self.cw_log_group, dict(event), self.resource_name)
 
                 self.latest_event_time = max(cw_event.timestamp, self.latest_event_time)
+                if event_id:
+                    self._seen_event_ids[event_id] = cw_event.timestamp
 
                 self.consumer.consume(cw_event)
 
+            # older events can't be returned anymore, forget about them
+            self._seen_event_ids = {
+                event_id: timestamp
+                for event_id, timestamp in self._seen_event_ids.items()
+                if timestamp >= self.latest_event_time
+            }
+
             # Keep iterating until there are no more logs left to query.
             next_token = result.get("nextToken", None)
             kwargs["nextToken"] = next_token
@@ -2,12 +2,16 @@
 Interfaces and generic implementations for observability events (like CW logs)
 """
 
+import asyncio
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, Sequence, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, TypeVar, Union
 
 from samcli.lib.utils.async_utils import AsyncContext
+from samcli.lib.utils.time import to_timestamp
 
 LOG = logging.getLogger(__name__)
 
@@ -93,6 +97,114 @@ class ObservabilityPuller(ABC):
         self.cancelled = True
 
 
+class ApiRateBudget:
+    """
+    Spaces the requests to an API so that they don't exceed its rate limit, whichever puller or thread sends them
+    """
+
+    def __init__(self, requests_per_second: float):
+        self._request_interval = 1 / requests_per_second
+        self._next_request_time = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Reserves the next request slot, returns the seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            request_time = max(now, self._next_request_time)
+            self._next_request_time = request_time + self._request_interval
+            return request_time - now
+
+    async def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def wait(self) -> None:
+        """
+        Blocking version of acquire, for the requests sent from worker threads
+        """
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ObservabilityPollingPuller(ObservabilityPuller):
+    """
+    Puller which tails by polling for the events published since its previous poll. The polls of many pullers can
+    be scheduled together on one event loop, see ObservabilityTailScheduler
+    """
+
+    # Name of the API called by poll, the pullers calling the same API share its request budget when tailed together
+    api_name: str = ""
+    # Maximum number of requests per second to api_name
+    api_rate_limit: float = 5
+    # Time of the latest pulled event in milliseconds, the next poll starts from there
+    latest_event_time: int = 0
+    # Consumer of the pulled events
+    consumer: "ObservabilityEventConsumer"
+
+    @property
+    @abstractmethod
+    def poll_interval(self) -> float:
+        """
+        Seconds to wait between two polls
+        """
+
+    @property
+    @abstractmethod
+    def max_retries(self) -> int:
+        """
+        Number of consecutive polls without new events after which tailing stops
+        """
+
+    @abstractmethod
+    def poll(self, filter_pattern: Optional[str] = None) -> bool:
+        """
+        Pulls the events published since the previous poll and passes them to the consumer
+
+        Parameters
+        ----------
+        filter_pattern : Optional[str]
+            Optional parameter to filter events with given string
+
+        Returns
+        -------
+        bool
+            True if new events were consumed
+        """
+
+    def use_rate_budgets(self, get_rate_budget: Callable[[str, float], ApiRateBudget]) -> None:
+        """
+        Called before tailing with a function that returns the rate budget of an API, given its name and its default
+        rate limit, shared with the other pullers tailed together. The polls themselves are already spaced by the
+        budget of api_name, pullers which send more requests to an API in a poll take their budget for each of them.
+        """
+
+    def event_time(self, event: ObservabilityEvent) -> float:
+        """
+        Returns the time of an event pulled by this puller in milliseconds, used to order the events of many pullers
+        """
+        return event.timestamp
+
+    def tail(self, start_time: Optional[datetime] = None, filter_pattern: Optional[str] = None):
+        if start_time:
+            self.latest_event_time = to_timestamp(start_time)
+
+        counter = self.max_retries
+        while counter > 0 and not self.cancelled:
+            counter -= 1
+
+            # This poll fetched events. Reset the retry counter
+            if self.poll(filter_pattern):
+                counter = self.max_retries
+
+            # Sleep for some time before querying again, this also helps us scoot under the TPS limit of the API
+            time.sleep(self.poll_interval)
+
+
 # pylint: disable=fixme
 # fixme add ABC parent class back once we bump the pylint to a version 2.8.2 or higher
 class ObservabilityEventMapper(Generic[ObservabilityEventType]):
@@ -177,6 +289,10 @@ class ObservabilityCombinedPuller(ObservabilityPuller):
         """
         self._pullers = pullers
 
+    @property
+    def pullers(self) -> Sequence[ObservabilityPuller]:
+        return self._pullers
+
     def tail(self, start_time: Optional[datetime] = None, filter_pattern: Optional[str] = None):
         """
         Implementation of ObservabilityPuller.tail method with AsyncContext.
@@ -0,0 +1,270 @@
+"""
+Scheduler which tails many observability pullers from a single event loop
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from samcli.lib.observability.observability_info_puller import (
+    ApiRateBudget,
+    ObservabilityCombinedPuller,
+    ObservabilityEvent,
+    ObservabilityEventConsumer,
+    ObservabilityPollingPuller,
+    ObservabilityPuller,
+)
+from samcli.lib.utils.time import to_timestamp
+
+LOG = logging.getLogger(__name__)
+
+# Poll interval ceiling for pullers which didn't have new events lately
+IDLE_POLL_INTERVAL = 5
+# Maximum number of requests in flight, the blocking boto3 calls are run on this many threads
+MAX_CONCURRENT_REQUESTS = 4
+# Seconds the events are held back, so that the events pulled by different pullers are printed in timestamp order
+EVENT_ORDERING_DELAY = 1.0
+# Maximum number of events held back, the oldest events are printed right away beyond that
+MAX_BUFFERED_EVENTS = 1000
+
+
+class _BufferedEventConsumer(ObservabilityEventConsumer):
+    """
+    Consumer which keeps the events pulled by one poll, the scheduler passes them to the wrapped consumer in order
+    """
+
+    def __init__(self, consumer: ObservabilityEventConsumer):
+        self.consumer = consumer
+        self.events: List[ObservabilityEvent] = []
+
+    def consume(self, event: ObservabilityEvent):
+        self.events.append(event)
+
+
+class ObservabilityTailScheduler(ObservabilityCombinedPuller):
+    """
+    Tails many pullers (CloudWatch log groups, XRay traces...) as cooperative tasks of a single event loop, instead of
+    one thread and one poll schedule per puller.
+
+    - The polls of the pullers which call the same API share the rate budget of that API.
+    - Pullers with new events are polled at their poll interval, idle pullers are polled less and less often, up to
+      IDLE_POLL_INTERVAL.
+    - The boto3 calls are blocking, they run on a pool of MAX_CONCURRENT_REQUESTS threads.
+    - The events of all the pullers are merged in a heap, and passed to their consumers in timestamp order once they
+      were held back for EVENT_ORDERING_DELAY.
+
+    Pullers which can't poll (see ObservabilityPollingPuller) are tailed on their own thread. Nested combined pullers
+    are flattened, so that all their pullers are scheduled together.
+    """
+
+    def __init__(
+        self,
+        pullers: Sequence[ObservabilityPuller],
+        idle_poll_interval: float = IDLE_POLL_INTERVAL,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        event_ordering_delay: float = EVENT_ORDERING_DELAY,
+        max_buffered_events: int = MAX_BUFFERED_EVENTS,
+        api_rate_limits: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Parameters
+        ----------
+        pullers : Sequence[ObservabilityPuller]
+            Pullers to tail
+        idle_poll_interval : float
+            Maximum poll interval for pullers which didn't have new events lately
+        max_concurrent_requests : int
+            Maximum number of polls running at the same time
+        event_ordering_delay : float
+            Seconds the events are held back to be ordered, 0 passes them to their consumers right after each poll
+        max_buffered_events : int
+            Maximum number of events held back
+        api_rate_limits : Optional[Dict[str, float]]
+            Requests per second of each API, overriding the api_rate_limit of the pullers
+        """
+        super().__init__(self._flatten(pullers))
+        self._idle_poll_interval = idle_poll_interval
+        self._max_concurrent_requests = max_concurrent_requests
+        self._event_ordering_delay = event_ordering_delay
+        self._max_buffered_events = max_buffered_events
+        self._api_rate_limits = api_rate_limits or {}
+
+        self._rate_budgets: Dict[str, ApiRateBudget] = {}
+        # (event time, sequence number, time the event was pulled, consumer, event), the oldest event first
+        self._buffered_events: List[Tuple[float, int, float, ObservabilityEventConsumer, ObservabilityEvent]] = []
+        self._sequence = itertools.count()
+        self._events_buffered: Optional[asyncio.Event] = None
+
+    @staticmethod
+    def _flatten(pullers: Sequence[ObservabilityPuller]) -> List[ObservabilityPuller]:
+        flattened: List[ObservabilityPuller] = []
+        for puller in pullers:
+            if isinstance(puller, ObservabilityCombinedPuller):
+                flattened.extend(ObservabilityTailScheduler._flatten(puller.pullers))
+            else:
+                flattened.append(puller)
+        return flattened
+
+    def tail(self, start_time: Optional[datetime] = None, filter_pattern: Optional[str] = None):
+        polling_pullers = [puller for puller in self._pullers if isinstance(puller, ObservabilityPollingPuller)]
+        buffered_consumers = [_BufferedEventConsumer(puller.consumer) for puller in polling_pullers]
+        for puller, buffered_consumer in zip(polling_pullers, buffered_consumers):
+            puller.consumer = buffered_consumer
+            puller.use_rate_budgets(self._get_api_rate_budget)
+
+        other_pullers = [puller for puller in self._pullers if not isinstance(puller, ObservabilityPollingPuller)]
+        executor = ThreadPoolExecutor(
+            max_workers=self._max_concurrent_requests + len(other_pullers), thread_name_prefix="ObservabilityTail"
+        )
+        event_loop = asyncio.new_event_loop()
+        main_task = event_loop.create_task(
+            self._tail_async(polling_pullers, buffered_consumers, other_pullers, executor, start_time, filter_pattern)
+        )
+        try:
+            event_loop.run_until_complete(main_task)
+        except KeyboardInterrupt:
+            LOG.info(" CTRL+C received, cancelling...")
+            self.stop_tailing()
+            main_task.cancel()
+            event_loop.run_until_complete(asyncio.gather(main_task, return_exceptions=True))
+        finally:
+            self._consume_buffered_events(flush=True)
+            for puller, buffered_consumer in zip(polling_pullers, buffered_consumers):
+                puller.consumer = buffered_consumer.consumer
+            # a poll in progress can't be interrupted, it is left to finish in the background
+            executor.shutdown(wait=False)
+            event_loop.close()
+            self._rate_budgets = {}
+
+    async def _tail_async(
+        self,
+        polling_pullers: List[ObservabilityPollingPuller],
+        buffered_consumers: List[_BufferedEventConsumer],
+        other_pullers: List[ObservabilityPuller],
+        executor: ThreadPoolExecutor,
+        start_time: Optional[datetime],
+        filter_pattern: Optional[str],
+    ) -> None:
+        event_loop = asyncio.get_running_loop()
+        self._events_buffered = asyncio.Event()
+
+        tasks: List[asyncio.Future] = []
+        for puller, buffered_consumer in zip(polling_pullers, buffered_consumers):
+            if start_time:
+                puller.latest_event_time = to_timestamp(start_time)
+            tasks.append(event_loop.create_task(self._tail_puller(puller, buffered_consumer, executor, filter_pattern)))
+        for puller in other_pullers:
+            LOG.debug("Tailing puller (%s) on its own thread", puller)
+            tasks.append(event_loop.run_in_executor(executor, puller.tail, start_time, filter_pattern))
+        if not tasks:
+            return
+        consume_task = event_loop.create_task(self._consume_events())
+
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                # re-raise the error of a failed puller, the other pullers are stopped below
+                task.result()
+        finally:
+            self.stop_tailing()
+            for task in tasks + [consume_task]:
+                task.cancel()
+            await asyncio.gather(*tasks, consume_task, return_exceptions=True)
+
+    async def _tail_puller(
+        self,
+        puller: ObservabilityPollingPuller,
+        buffered_consumer: _BufferedEventConsumer,
+        executor: ThreadPoolExecutor,
+        filter_pattern: Optional[str],
+    ) -> None:
+        event_loop = asyncio.get_running_loop()
+        rate_budget = self._get_rate_budget(puller)
+        retries = puller.max_retries
+        idle_polls = 0
+        while retries > 0 and not self.cancelled:
+            await rate_budget.acquire()
+            if self.cancelled:
+                break
+
+            retries -= 1
+            had_data = await event_loop.run_in_executor(executor, puller.poll, filter_pattern)
+            self._buffer_events(puller, buffered_consumer)
+            if had_data:
+                retries = puller.max_retries
+                idle_polls = 0
+            else:
+                idle_polls += 1
+
+            # idle pullers are polled less often, so that active ones get more of the request budget
+            poll_interval = puller.poll_interval
+            if idle_polls:
+                poll_interval = max(poll_interval, min(poll_interval * 1.5**idle_polls, self._idle_poll_interval))
+            await asyncio.sleep(poll_interval)
+        LOG.debug("Stopped tailing puller (%s)", puller)
+
+    def _get_rate_budget(self, puller: ObservabilityPollingPuller) -> ApiRateBudget:
+        # pullers which don't name their API get a budget of their own
+        return self._get_api_rate_budget(puller.api_name or str(id(puller)), puller.api_rate_limit)
+
+    def _get_api_rate_budget(self, api_name: str, api_rate_limit: float) -> ApiRateBudget:
+        if api_name not in self._rate_budgets:
+            requests_per_second = self._api_rate_limits.get(api_name, api_rate_limit)
+            self._rate_budgets[api_name] = ApiRateBudget(requests_per_second)
+        return self._rate_budgets[api_name]
+
+    def _buffer_events(self, puller: ObservabilityPollingPuller, buffered_consumer: _BufferedEventConsumer) -> None:
+        events, buffered_consumer.events = buffered_consumer.events, []
+        if not events:
+            return
+        pulled_time = time.monotonic()
+        for event in events:
+            heapq.heappush(
+                self._buffered_events,
+                (puller.event_time(event), next(self._sequence), pulled_time, buffered_consumer.consumer, event),
+            )
+        if self._events_buffered:
+            self._events_buffered.set()
+
+    async def _consume_events(self) -> None:
+        """
+        Passes the buffered events to their consumers in timestamp order, once they were held back long enough
+        """
+        while True:
+            delay = self._consume_buffered_events()
+            if delay is None:
+                await self._events_buffered.wait()  # type: ignore[union-attr]
+                self._events_buffered.clear()  # type: ignore[union-attr]
+            else:
+                await asyncio.sleep(delay)
+
+    def _consume_buffered_events(self, flush: bool = False) -> Optional[float]:
+        """
+        Consumes the buffered events which are ready, all of them if flush is set
+
+        Returns
+        -------
+        Optional[float]
+            Seconds until the oldest remaining event is ready, None if there are no events left
+        """
+        while self._buffered_events:
+            _, _, pulled_time, consumer, event = self._buffered_events[0]
+            delay = pulled_time + self._event_ordering_delay - time.monotonic()
+            if delay > 0 and not flush and len(self._buffered_events) <= self._max_buffered_events:
+                return delay
+
+            heapq.heappop(self._buffered_events)
+            try:
+                consumer.consume(event)
+            except Exception:  # pylint: disable=broad-except
+                LOG.error("Failed while consuming event", exc_info=True)
+        return None
+
+    def stop_tailing(self):
+        self.cancelled = True
+        super().stop_tailing()
@@ -3,73 +3,96 @@ This file contains puller implementations for XRay
 """
 
 import logging
-import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from itertools import zip_longest
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Union
 
 from botocore.exceptions import ClientError
 
-from samcli.lib.observability.observability_info_puller import ObservabilityEventConsumer, ObservabilityPuller
+from samcli.lib.observability.observability_info_puller import (
+    ApiRateBudget,
+    ObservabilityEvent,
+    ObservabilityEventConsumer,
+    ObservabilityPollingPuller,
+)
 from samcli.lib.observability.xray_traces.xray_events import XRayTraceEvent
-from samcli.lib.utils.time import to_datetime, to_timestamp
+from samcli.lib.observability.xray_traces.xray_trace_cache import XRayTraceCache
+from samcli.lib.utils.time import to_datetime
 
 LOG = logging.getLogger(__name__)
 
+# Requests per second to each of the XRay APIs, shared by all the XRay pullers tailed together
+MAX_REQUESTS_PER_SECOND = 5
+BATCH_GET_TRACES_API_NAME = "xray:BatchGetTraces"
+# Poll interval ceiling when backing off because of throttling
+MAX_POLL_INTERVAL = 30
+# Maximum number of trace ids accepted by 'batch_get_traces'
+BATCH_GET_TRACES_MAX_IDS = 5
+# Maximum number of 'batch_get_traces' requests running at the same time
+MAX_CONCURRENT_BATCH_REQUESTS = 4
+# Maximum number of trace revisions remembered to skip the traces which were already consumed
+MAX_TRACKED_TRACE_IDS = 10000
 
-class AbstractXRayPuller(ObservabilityPuller):
+
+class AbstractXRayPuller(ObservabilityPollingPuller):
     def __init__(
         self,
         max_retries: int = 1000,
-        poll_interval: int = 1,
+        poll_interval: float = 1,
+        max_poll_interval: float = MAX_POLL_INTERVAL,
     ):
         """
         Parameters
         ----------
         max_retries : int
             Optional maximum number of retries which can be used to pull information. Default value is 1000
-        poll_interval : int
+        poll_interval : float
             Optional interval value that will be used to wait between calls in tail operation. Default value is 1
+        max_poll_interval : float
+            Optional maximum interval when backing off because of throttling. Default value is 30
         """
         self._max_retries = max_retries
         self._poll_interval = poll_interval
+        self._min_poll_interval = poll_interval
+        self._max_poll_interval = max(max_poll_interval, poll_interval)
         self._had_data = False
         self.latest_event_time = 0
 
-    def tail(self, start_time: Optional[datetime] = None, filter_pattern: Optional[str] = None):
-        if start_time:
-            self.latest_event_time = to_timestamp(start_time)
+    @property
+    def poll_interval(self) -> float:
+        return self._poll_interval
 
-        counter = self._max_retries
-        while counter > 0 and not self.cancelled:
-            LOG.debug("Tailing XRay traces starting at %s", self.latest_event_time)
+    @property
+    def max_retries(self) -> int:
+        return self._max_retries
 
-            counter -= 1
-            try:
-                self.load_time_period(to_datetime(self.latest_event_time), datetime.utcnow())
-            except ClientError as err:
-                error_code = err.response.get("Error", {}).get("Code")
-                if error_code == "ThrottlingException":
-                    # if throttled, increase poll interval by 1 second each time
-                    if self._poll_interval == 1:
-                        self._poll_interval += 1
-                    else:
-                        self._poll_interval **= 2
-                    LOG.warning(
-                        "Throttled by XRay API, increasing the poll interval time to %s seconds",
-                        self._poll_interval,
-                    )
-                else:
-                    # if exception is other than throttling re-raise
-                    LOG.error("Failed while fetching new AWS X-Ray events", exc_info=err)
-                    raise err
+    def poll(self, filter_pattern: Optional[str] = None) -> bool:
+        LOG.debug("Tailing XRay traces starting at %s", self.latest_event_time)
 
-            if self._had_data:
-                counter = self._max_retries
-                self.latest_event_time += 1
-                self._had_data = False
+        try:
+            self.load_time_period(to_datetime(self.latest_event_time), datetime.utcnow())
+        except ClientError as err:
+            error_code = err.response.get("Error", {}).get("Code")
+            if error_code == "ThrottlingException":
+                # if throttled, back off exponentially up to the ceiling
+                self._poll_interval = min(self._poll_interval * 2, self._max_poll_interval)
+                LOG.warning(
+                    "Throttled by XRay API, increasing the poll interval time to %s seconds",
+                    self._poll_interval,
+                )
+            else:
+                # if exception is other than throttling re-raise
+                LOG.error("Failed while fetching new AWS X-Ray events", exc_info=err)
+                raise err
+        else:
+            self._poll_interval = max(self._min_poll_interval, self._poll_interval / 2)
 
-            time.sleep(self._poll_interval)
+        had_data = self._had_data
+        if had_data:
+            self.latest_event_time += 1
+            self._had_data = False
+        return had_data
 
 
 class XRayTracePuller(AbstractXRayPuller):
@@ -78,8 +101,17 @@ class XRayTracePuller(AbstractXRayPuller):
     and then getting them as a batch later.
     """
 
+    api_name = "xray:GetTraceSummaries"
+    api_rate_limit = MAX_REQUESTS_PER_SECOND
+
     def __init__(
-        self, xray_client: Any, consumer: ObservabilityEventConsumer, max_retries: int = 1000, poll_interval: int = 1
+        self,
+        xray_client: Any,
+        consumer: ObservabilityEventConsumer,
+        max_retries: int = 1000,
+        poll_interval: int = 1,
+        trace_cache: Optional[XRayTraceCache] = None,
+        max_concurrent_requests: int = MAX_CONCURRENT_BATCH_REQUESTS,
     ):
         """
         Parameters
@@ -92,12 +124,32 @@ class XRayTracePuller(AbstractXRayPuller):
             Optional maximum number of retries which can be used to pull information. Default value is 1000
         poll_interval : int
             Optional interval value that will be used to wait between calls in tail operation. Default value is 1
+        trace_cache : Optional[XRayTraceCache]
+            Optional on-disk cache of the downloaded traces. Default value is the cache of the SAM CLI configuration
+            directory
+        max_concurrent_requests : int
+            Optional maximum number of 'batch_get_traces' requests running at the same time. Default value is 4
         """
         super().__init__(max_retries, poll_interval)
         self.xray_client = xray_client
         self.consumer = consumer
+        self._trace_cache = trace_cache or XRayTraceCache()
+        self._max_concurrent_requests = max(max_concurrent_requests, 1)
         # Previous trace ID is a dictionary that contains the following information: {trace_id: trace_revision,}
-        self._previous_trace_ids: Dict = {}
+        # Only the most recently seen MAX_TRACKED_TRACE_IDS are kept, so that it doesn't grow during long tails
+        self._previous_trace_ids: "OrderedDict[str, int]" = OrderedDict()
+        # the budgets are replaced by the ones shared with the other pullers when tailed by a scheduler. The first
+        # 'get_trace_summaries' request of a poll is spaced by the scheduler, it has no budget otherwise
+        self._batch_rate_budget = ApiRateBudget(MAX_REQUESTS_PER_SECOND)
+        self._summaries_rate_budget: Optional[ApiRateBudget] = None
+
+    def use_rate_budgets(self, get_rate_budget: Callable[[str, float], ApiRateBudget]) -> None:
+        self._summaries_rate_budget = get_rate_budget(self.api_name, self.api_rate_limit)
+        self._batch_rate_budget = get_rate_budget(BATCH_GET_TRACES_API_NAME, MAX_REQUESTS_PER_SECOND)
+
+    def event_time(self, event: ObservabilityEvent) -> float:
+        # the start time of the first segment of the trace, in seconds
+        return event.timestamp * 1000
 
     def load_time_period(
         self,
@@ -110,20 +162,21 @@ class XRayTracePuller(AbstractXRayPuller):
         # first, collect all trace ids in given period
         trace_ids = {}
         LOG.debug("Fetching XRay trace summaries %s", kwargs)
-        result_paginator = self.xray_client.get_paginator("get_trace_summaries")
-        result_iterator = result_paginator.paginate(**kwargs)
-        for result in result_iterator:
+        for result in self._paginate("get_trace_summaries", self._summaries_rate_budget, False, **kwargs):
             trace_summaries = result.get("TraceSummaries", [])
             for trace_summary in trace_summaries:
                 trace_id = trace_summary.get("Id", None)
                 trace_revision = int(trace_summary.get("Revision", 0))
                 is_partial = trace_summary.get("IsPartial", False)
-                if not is_partial:
-                    if trace_id not in self._previous_trace_ids or trace_revision > self._previous_trace_ids.get(
-                        trace_id, 0
-                    ):
-                        trace_ids[trace_id] = trace_revision
-                        self._previous_trace_ids[trace_id] = trace_revision
+                if is_partial:
+                    continue
+                # the revision is only remembered once the trace is consumed, so that the traces which failed to be
+                # fetched or consumed are loaded again by the next poll
+                if trace_id not in self._previous_trace_ids or trace_revision > self._previous_trace_ids[trace_id]:
+                    trace_ids[trace_id] = trace_revision
+                else:
+                    # least recently seen traces are forgotten first
+                    self._previous_trace_ids.move_to_end(trace_id)
 
         # now load collected events
         self.load_events(trace_ids)
@@ -134,32 +187,120 @@ class XRayTracePuller(AbstractXRayPuller):
             LOG.debug("Nothing to fetch, empty event_id dict given (%s)", event_ids)
             return
 
-        if isinstance(event_ids, dict):
-            # xray client only accepts 5 items at max, so create batches of 5 element arrays
-            event_batches = zip_longest(*([iter(event_ids.keys())] * 5))
-        else:
-            event_batches = zip_longest(*([iter(event_ids)] * 5))
-
-        for event_batch in event_batches:
-            kwargs: Dict[str, Any] = {"TraceIds": list(filter(None, event_batch))}
-            result_paginator = self.xray_client.get_paginator("batch_get_traces")
-            result_iterator = result_paginator.paginate(**kwargs)
-            for result in result_iterator:
-                traces = result.get("Traces", [])
-
-                if not traces:
-                    LOG.debug("No event found with given trace ids %s", str(event_ids))
-
-                for trace in traces:
-                    self._had_data = True
-                    trace_id = trace.get("Id", None)
-                    if isinstance(event_ids, dict):
-                        xray_trace_event = XRayTraceEvent(trace, event_ids.get(trace_id, None))
-                    else:
-                        xray_trace_event = XRayTraceEvent(trace)
-
-                    # update latest fetched event
-                    latest_event_time = xray_trace_event.get_latest_event_time()
-                    self.latest_event_time = max(self.latest_event_time, latest_event_time)
-
-                    self.consumer.consume(xray_trace_event)
+        # the revisions are only known when the trace ids come from the trace summaries, a cached trace is only used
+        # if it is as recent as its summary
+        revisions: Dict[str, int] = event_ids if isinstance(event_ids, dict) else {}
+        cached_traces: Dict[str, Dict] = {}
+        trace_ids_to_fetch = []
+        for trace_id in event_ids:
+            cached_trace = self._trace_cache.get(trace_id, revisions[trace_id]) if trace_id in revisions else None
+            if cached_trace is None:
+                trace_ids_to_fetch.append(trace_id)
+            else:
+                LOG.debug("Using the cached trace %s", trace_id)
+                cached_traces[trace_id] = cached_trace
+
+        # xray client only accepts 5 items at max, so create batches of 5 element arrays
+        event_batches = [
+            trace_ids_to_fetch[index : index + BATCH_GET_TRACES_MAX_IDS]
+            for index in range(0, len(trace_ids_to_fetch), BATCH_GET_TRACES_MAX_IDS)
+        ]
+
+        # the traces are consumed in the order of their summaries. The batches are fetched concurrently, only a few
+        # batches ahead of the one being consumed, so that the memory used doesn't depend on the number of traces.
+        # The threads of the executor are only started by the first batch
+        executor = ThreadPoolExecutor(
+            max_workers=max(min(self._max_concurrent_requests, len(event_batches)), 1),
+            thread_name_prefix="XRayBatchGetTraces",
+        )
+        pending_batches: Deque[Future] = deque()
+        submitted_batches = 0
+        fetched_trace_ids = 0
+        fetched_traces: Dict[str, Dict] = {}
+        try:
+            for trace_id in event_ids:
+                if trace_id in cached_traces:
+                    self._consume_traces([cached_traces.pop(trace_id)], event_ids)
+                    continue
+
+                if fetched_trace_ids % BATCH_GET_TRACES_MAX_IDS == 0:
+                    # first trace id of its batch, wait for the batch and fetch the following ones meanwhile
+                    batch_index = fetched_trace_ids // BATCH_GET_TRACES_MAX_IDS
+                    while submitted_batches < min(len(event_batches), batch_index + self._max_concurrent_requests):
+                        pending_batches.append(executor.submit(self._get_traces, event_batches[submitted_batches]))
+                        submitted_batches += 1
+                    traces = pending_batches.popleft().result()
+                    self._trace_cache.put_all(traces, revisions)
+                    fetched_traces = {trace.get("Id", None): trace for trace in traces}
+                fetched_trace_ids += 1
+
+                trace = fetched_traces.pop(trace_id, None)
+                if trace is not None:
+                    self._consume_traces([trace], event_ids)
+        finally:
+            for pending_batch in pending_batches:
+                pending_batch.cancel()
+            executor.shutdown()
+            if event_batches:
+                self._trace_cache.evict()
+
+    def _get_traces(self, trace_ids: List[str]) -> List[Dict]:
+        kwargs: Dict[str, Any] = {"TraceIds": trace_ids}
+        traces: List[Dict] = []
+        for result in self._paginate("batch_get_traces", self._batch_rate_budget, True, **kwargs):
+            traces.extend(result.get("Traces", []))
+        if not traces:
+            LOG.debug("No event found with given trace ids %s", str(trace_ids))
+        return traces
+
+    def _paginate(
+        self, operation_name: str, rate_budget: Optional[ApiRateBudget], budget_first_page: bool, **kwargs
+    ) -> Iterator[Dict]:
+        """
+        Iterates the pages of an XRay API, taking the rate budget of the API before each request
+
+        Parameters
+        ----------
+        operation_name : str
+            Name of the paginated operation
+        rate_budget : Optional[ApiRateBudget]
+            Rate budget of the API, None to send the requests right away
+        budget_first_page : bool
+            Whether the budget is also taken for the first request, which is already spaced by the caller otherwise
+        """
+        pages = iter(self.xray_client.get_paginator(operation_name).paginate(**kwargs))
+        # the request of a page is sent when iterating to it, there is no request after the last page
+        take_budget = budget_first_page
+        while True:
+            if take_budget and rate_budget:
+                rate_budget.wait()
+            try:
+                page = next(pages)
+            except StopIteration:
+                return
+            yield page
+            take_budget = bool(page.get("NextToken"))
+
+    def _consume_traces(self, traces: List[Dict], event_ids: Union[List[Any], Dict]) -> None:
+        for trace in traces:
+            self._had_data = True
+            trace_id = trace.get("Id", None)
+            if isinstance(event_ids, dict):
+                xray_trace_event = XRayTraceEvent(trace, event_ids.get(trace_id, None))
+            else:
+                xray_trace_event = XRayTraceEvent(trace)
+
+            # update latest fetched event
+            latest_event_time = xray_trace_event.get_latest_event_time()
+            self.latest_event_time = max(self.latest_event_time, latest_event_time)
+
+            self.consumer.consume(xray_trace_event)
+            if isinstance(event_ids, dict) and trace_id in event_ids:
+                self._remember_trace(trace_id, event_ids[trace_id])
+
+    def _remember_trace(self, trace_id: str, revision: int) -> None:
+        self._previous_trace_ids[trace_id] = revision
+        # least recently seen traces are forgotten first
+        self._previous_trace_ids.move_to_end(trace_id)
+        if len(self._previous_trace_ids) > MAX_TRACKED_TRACE_IDS:
+            self._previous_trace_ids.popitem(last=False)
@@ -6,8 +6,8 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Set, Union
 
-from samcli.lib.observability.observability_info_puller import ObservabilityEventConsumer
-from samcli.lib.observability.xray_traces.xray_event_puller import AbstractXRayPuller
+from samcli.lib.observability.observability_info_puller import ObservabilityEvent, ObservabilityEventConsumer
+from samcli.lib.observability.xray_traces.xray_event_puller import MAX_REQUESTS_PER_SECOND, AbstractXRayPuller
 from samcli.lib.observability.xray_traces.xray_events import XRayServiceGraphEvent
 from samcli.lib.utils.time import to_utc, utc_to_timestamp
 
@@ -19,6 +19,9 @@ class XRayServiceGraphPuller(AbstractXRayPuller):
     ObservabilityPuller implementation which pulls XRay Service Graph
     """
 
+    api_name = "xray:GetServiceGraph"
+    api_rate_limit = MAX_REQUESTS_PER_SECOND
+
     def __init__(
         self, xray_client: Any, consumer: ObservabilityEventConsumer, max_retries: int = 1000, poll_interval: int = 1
     ):
@@ -39,6 +42,11 @@ class XRayServiceGraphPuller(AbstractXRayPuller):
         self.consumer = consumer
         self._previous_xray_service_graphs: Set[str] = set()
 
+    def event_time(self, event: ObservabilityEvent) -> float:
+        # service graphs don't have a timestamp, they are ordered by the end of the period they cover
+        end_time = getattr(event, "end_time", None)
+        return utc_to_timestamp(to_utc(end_time)) if end_time else self.latest_event_time
+
     def load_time_period(
         self,
         start_time: Optional[datetime] = None,
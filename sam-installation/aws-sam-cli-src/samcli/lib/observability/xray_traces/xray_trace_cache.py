@@ -0,0 +1,112 @@
+"""
+On-disk cache of the XRay traces, so that loading the same time window again doesn't download the same traces again
+"""
+
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from samcli.cli.global_config import GlobalConfig
+from samcli.lib.utils.file_lock import atomic_write_text
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of traces kept on disk, the least recently written ones are removed first. 0 disables the cache
+XRAY_TRACE_CACHE_MAX_ENTRIES = int(os.environ.get("SAM_CLI_XRAY_TRACE_CACHE_MAX_ENTRIES", "5000"))
+
+XRAY_TRACE_CACHE_DIR_NAME = "xray-traces"
+# Trace ids look like 1-5f84c7a2-4b1a2d3c4e5f6a7b8c9d0e1f, anything else is not cached
+_TRACE_ID_PATTERN = re.compile(r"^[0-9A-Za-z-]{1,64}$")
+
+
+class XRayTraceCache:
+    """
+    Keeps the complete traces returned by 'batch_get_traces', one file per trace id. A cached trace is only used if
+    its revision is at least the revision of the trace summary, since a trace is updated as new segments arrive.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = XRAY_TRACE_CACHE_MAX_ENTRIES):
+        """
+        Parameters
+        ----------
+        cache_dir : Optional[Path]
+            Directory of the cached traces, defaults to the xray-traces directory of the SAM CLI configuration
+            directory
+        max_entries : int
+            Maximum number of traces kept on disk
+        """
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+
+    @property
+    def cache_dir(self) -> Path:
+        if not self._cache_dir:
+            self._cache_dir = GlobalConfig().config_dir / XRAY_TRACE_CACHE_DIR_NAME
+        return self._cache_dir
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def get(self, trace_id: str, revision: int) -> Optional[Dict]:
+        """
+        Returns the cached trace if its revision is at least the given revision, None otherwise
+        """
+        if not self.enabled or not _TRACE_ID_PATTERN.match(trace_id):
+            return None
+        try:
+            content = json.loads((self.cache_dir / f"{trace_id}.json").read_text())
+            if int(content.get("revision", -1)) >= revision:
+                return content["trace"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as ex:
+            LOG.debug("Ignoring the invalid cached trace %s", trace_id, exc_info=ex)
+        return None
+
+    def put_all(self, traces: List[Dict], revisions: Dict[str, int]) -> None:
+        """
+        Caches the given traces with their revision, see evict to remove the oldest traces
+
+        Parameters
+        ----------
+        traces : List[Dict]
+            Traces returned by 'batch_get_traces'
+        revisions : Dict[str, int]
+            Revision of each trace id, the traces without a known revision are not cached
+        """
+        if not self.enabled:
+            return
+        for trace in traces:
+            trace_id = trace.get("Id", "")
+            if trace_id not in revisions or not _TRACE_ID_PATTERN.match(trace_id):
+                continue
+            try:
+                self._write(trace_id, json.dumps({"revision": revisions[trace_id], "trace": trace}))
+            except (OSError, TypeError, ValueError) as ex:
+                LOG.debug("Failed to cache the trace %s", trace_id, exc_info=ex)
+
+    def _write(self, trace_id: str, content: str) -> None:
+        # the cache can always be downloaded again, the file is replaced atomically but isn't synced to disk.
+        # Traces may contain request details, the directory is only readable by the user
+        self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        atomic_write_text(self.cache_dir / f"{trace_id}.json", content, fsync=False)
+
+    def evict(self) -> None:
+        """
+        Removes the least recently written traces beyond the maximum number of entries
+        """
+        if not self.enabled or not self.cache_dir.is_dir():
+            return
+        try:
+            cached_files = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+            if len(cached_files) <= self._max_entries:
+                return
+            cached_files.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in cached_files[: len(cached_files) - self._max_entries]:
+                os.remove(entry.path)
+        except OSError as ex:
+            LOG.debug("Failed to remove the oldest cached traces", exc_info=ex)
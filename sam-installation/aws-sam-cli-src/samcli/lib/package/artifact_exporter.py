@@ -17,8 +17,6 @@ Exporting resources defined in the cloudformation template to the cloud.
 import os
 from typing import Dict, List, Optional
 
-from botocore.utils import set_value_from_jmespath
-
 from samcli.commands.package import exceptions
 from samcli.lib.package.code_signer import CodeSigner
 from samcli.lib.package.local_files_utils import get_uploaded_s3_object_name, mktempfile
@@ -38,6 +36,7 @@ from samcli.lib.package.utils import (
 )
 from samcli.lib.providers.provider import get_full_path
 from samcli.lib.samlib.resource_metadata_normalizer import ResourceMetadataNormalizer
+from samcli.lib.utils.lazy_import import lazy_import
 from samcli.lib.utils.packagetype import ZIP
 from samcli.lib.utils.resources import (
     AWS_CLOUDFORMATION_STACK,
@@ -49,6 +48,8 @@ from samcli.lib.utils.resources import (
 from samcli.lib.utils.s3 import parse_s3_url
 from samcli.yamlhelper import yaml_dump, yaml_parse
 
+botocore_utils = lazy_import("botocore.utils")
+
 # NOTE: sriram-mv, A cyclic dependency on `Template` needs to be broken.
 
 
@@ -101,7 +102,7 @@ class CloudFormationStackResource(ResourceZip):
             # TemplateUrl property requires S3 URL to be in path-style format
             parts = parse_s3_url(url, version_property="Version")
             s3_path_url = self.uploader.to_path_style_s3_url(parts["Key"], parts.get("Version", None))
-            set_value_from_jmespath(resource_dict, self.PROPERTY_NAME, s3_path_url)
+            botocore_utils.set_value_from_jmespath(resource_dict, self.PROPERTY_NAME, s3_path_url)
 
 
 class ServerlessApplicationResource(CloudFormationStackResource):
@@ -148,7 +149,7 @@ class CloudFormationStackSetResource(ResourceZip):
         # TemplateUrl property requires S3 URL to be in path-style format
         parts = parse_s3_url(url, version_property="Version")
         s3_path_url = self.uploader.to_path_style_s3_url(parts["Key"], parts.get("Version", None))
-        set_value_from_jmespath(resource_dict, self.PROPERTY_NAME, s3_path_url)
+        botocore_utils.set_value_from_jmespath(resource_dict, self.PROPERTY_NAME, s3_path_url)
 
 
 class Template:
@@ -25,6 +25,7 @@ from samcli.lib.utils.resources import (
     AWS_APIGATEWAY_V2_ROUTE,
     AWS_APIGATEWAY_V2_STAGE,
 )
+from samcli.local.apigw.authorizers.authorizer_cache import parse_result_ttl
 from samcli.local.apigw.authorizers.lambda_authorizer import LambdaAuthorizer
 from samcli.local.apigw.route import Route
 
@@ -166,6 +167,7 @@ class CfnApiProvider(CfnBaseApiProvider):
                 identity_source_list.append(trimmed_id_source)
 
         validation_expression = properties.get(LambdaAuthorizerV1Validator.AUTHORIZER_VALIDATION)
+        result_ttl = parse_result_ttl(properties.get(LambdaAuthorizerV1Validator.AUTHORIZER_RESULT_TTL), logical_id)
 
         lambda_authorizer = LambdaAuthorizer(
             payload_version="1.0",
@@ -174,6 +176,7 @@ class CfnApiProvider(CfnBaseApiProvider):
             lambda_name=function_name,
             identity_sources=identity_source_list,
             validation_string=validation_expression,
+            result_ttl=result_ttl,
         )
 
         collector.add_authorizers(rest_api_id, {logical_id: lambda_authorizer})
@@ -203,6 +206,7 @@ class CfnApiProvider(CfnBaseApiProvider):
         identity_sources = properties.get(LambdaAuthorizerV2Validator.AUTHORIZER_IDENTITY_SOURCE, [])
         payload_version = properties.get(LambdaAuthorizerV2Validator.AUTHORIZER_V2_PAYLOAD, LambdaAuthorizer.PAYLOAD_V2)
         simple_responses = properties.get(LambdaAuthorizerV2Validator.AUTHORIZER_V2_SIMPLE_RESPONSE, False)
+        result_ttl = parse_result_ttl(properties.get(LambdaAuthorizerV2Validator.AUTHORIZER_RESULT_TTL), logical_id)
 
         # this will always return a string since we have already validated above
         function_name = cast(str, LambdaUri.get_function_name(authorizer_uri))
@@ -214,6 +218,7 @@ class CfnApiProvider(CfnBaseApiProvider):
             lambda_name=function_name,
             identity_sources=identity_sources,
             use_simple_response=simple_responses,
+            result_ttl=result_ttl,
         )
 
         collector.add_authorizers(api_id, {logical_id: lambda_authorizer})
@@ -743,6 +743,48 @@ class Stack:
         return child_stacks
 
 
+class StackIndex:
+    """
+    Index of a list of stacks by stack path and by parent stack path, for the same lookups as the Stack helpers
+    without scanning the list. The index doesn't follow changes of the list, the owner of the stacks builds a new
+    index whenever it loads them again.
+    """
+
+    def __init__(self, stacks: List[Stack]):
+        self._stacks = stacks
+        self._stacks_by_path: Dict[str, Stack] = {}
+        self._child_stacks: Dict[str, List[Stack]] = {}
+        for stack in stacks:
+            # keep the first stack of a path, like Stack.get_stack_by_full_path
+            self._stacks_by_path.setdefault(stack.stack_path, stack)
+            if not stack.is_root_stack:
+                self._child_stacks.setdefault(stack.parent_stack_path, []).append(stack)
+
+    @property
+    def stacks(self) -> List[Stack]:
+        return self._stacks
+
+    def get_stack_by_full_path(self, full_path: str) -> Optional[Stack]:
+        """
+        See Stack.get_stack_by_full_path
+        """
+        return self._stacks_by_path.get(full_path)
+
+    def get_parent_stack(self, child_stack: Stack) -> Optional[Stack]:
+        """
+        See Stack.get_parent_stack
+        """
+        if child_stack.is_root_stack:
+            return None
+        return self._stacks_by_path.get(child_stack.parent_stack_path)
+
+    def get_child_stacks(self, stack: Stack) -> List[Stack]:
+        """
+        See Stack.get_child_stacks
+        """
+        return list(self._child_stacks.get(stack.stack_path, []))
+
+
 class ResourceIdentifier:
     """Resource identifier for representing a resource with nested stack support"""
 
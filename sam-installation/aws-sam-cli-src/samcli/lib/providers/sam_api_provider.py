@@ -11,6 +11,7 @@ from samcli.lib.providers.provider import Stack
 from samcli.lib.utils.colors import Colored
 from samcli.lib.utils.resources import AWS_SERVERLESS_API, AWS_SERVERLESS_FUNCTION, AWS_SERVERLESS_HTTPAPI
 from samcli.local.apigw.authorizers.authorizer import Authorizer
+from samcli.local.apigw.authorizers.authorizer_cache import parse_result_ttl
 from samcli.local.apigw.authorizers.lambda_authorizer import LambdaAuthorizer
 from samcli.local.apigw.route import Route
 
@@ -43,6 +44,7 @@ class SamApiProvider(CfnBaseApiProvider):
     _IDENTITY_HEADERS = "Headers"
     _IDENTITY_CONTEXT = "Context"
     _IDENTITY_STAGE = "StageVariables"
+    _IDENTITY_REAUTHORIZE_EVERY = "ReauthorizeEvery"
     _API_IDENTITY_SOURCE_PREFIX = "method."
     _HTTP_IDENTITY_SOURCE_PREFIX = "$"
 
@@ -235,6 +237,7 @@ class SamApiProvider(CfnBaseApiProvider):
             lambda_name=function_name,
             identity_sources=identity_sources,
             use_simple_response=simple_responses,
+            result_ttl=parse_result_ttl(identity_object.get(SamApiProvider._IDENTITY_REAUTHORIZE_EVERY), auth_name),
         )
 
     @staticmethod
@@ -272,6 +275,7 @@ class SamApiProvider(CfnBaseApiProvider):
             lambda_name=function_name,
             identity_sources=[header],
             validation_string=validation_expression,
+            result_ttl=parse_result_ttl(identity_object.get(SamApiProvider._IDENTITY_REAUTHORIZE_EVERY), auth_name),
         )
 
     @staticmethod
@@ -10,7 +10,6 @@ from samcli.lib.intrinsic_resolver.intrinsic_property_resolver import IntrinsicR
 from samcli.lib.intrinsic_resolver.intrinsics_symbol_table import IntrinsicsSymbolTable
 from samcli.lib.package.ecr_utils import is_ecr_url
 from samcli.lib.samlib.resource_metadata_normalizer import ResourceMetadataNormalizer
-from samcli.lib.samlib.wrapper import SamTranslatorWrapper
 from samcli.lib.utils.resources import (
     AWS_LAMBDA_FUNCTION,
     AWS_LAMBDA_LAYERVERSION,
@@ -190,6 +189,9 @@ class SamBaseProvider:
         template_dict = template_dict or {}
         parameters_values = SamBaseProvider._get_parameter_values(template_dict, parameter_overrides)
         if template_dict and use_sam_transform:
+            # samtranslator is slow to import, only load it when there is a template to transform
+            from samcli.lib.samlib.wrapper import SamTranslatorWrapper
+
             template_dict = SamTranslatorWrapper(template_dict, parameter_values=parameters_values).run_plugins()
         ResourceMetadataNormalizer.normalize(template_dict)
 
@@ -229,6 +231,8 @@ class SamBaseProvider:
         template_dict = template_dict or Stack()
         parameters_values = SamBaseProvider._get_parameter_values(template_dict, parameter_overrides)
         if template_dict:
+            from samcli.lib.samlib.wrapper import SamTranslatorWrapper
+
             template_dict = SamTranslatorWrapper(template_dict, parameter_values=parameters_values).run_plugins()
         if normalize_resource_metadata:
             ResourceMetadataNormalizer.normalize(template_dict)
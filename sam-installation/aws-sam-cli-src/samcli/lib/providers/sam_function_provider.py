@@ -24,7 +24,7 @@ from samcli.lib.utils.resources import (
 )
 
 from ..build.constants import DEPRECATED_RUNTIMES
-from .provider import Function, LayerVersion, Stack, get_full_path, get_function_build_info
+from .provider import Function, LayerVersion, Stack, StackIndex, get_full_path, get_function_build_info
 from .sam_base_provider import SamBaseProvider
 from .sam_stack_provider import SamLocalStackProvider
 
@@ -64,14 +64,18 @@ class SamFunctionProvider(SamBaseProvider):
         """
 
         self._stacks = stacks
+        self._index_stacks()
 
         for stack in stacks:
             LOG.debug("%d resources found in the stack %s", len(stack.resources), stack.stack_path)
 
         # Store a map of function full_path to function information for quick reference
         self.functions = SamFunctionProvider._extract_functions(
-            self._stacks, use_raw_codeuri, ignore_code_extraction_warnings, locate_layer_nested
+            self._stacks, use_raw_codeuri, ignore_code_extraction_warnings, locate_layer_nested, self._stack_index
         )
+        # Functions by logical ID, name and function name, built from self.functions when it is first needed
+        self._indexed_functions: Optional[Dict[str, Function]] = None
+        self._functions_by_name: Dict[str, List[Function]] = {}
 
         self._colored = Colored()
 
@@ -100,8 +104,9 @@ class SamFunctionProvider(SamBaseProvider):
         :param bool locate_layer_nested: resolved nested layer reference to their actual location in the nested stack
         """
         self._stacks = stacks
+        self._index_stacks()
         self.functions = SamFunctionProvider._extract_functions(
-            self._stacks, use_raw_codeuri, ignore_code_extraction_warnings, locate_layer_nested
+            self._stacks, use_raw_codeuri, ignore_code_extraction_warnings, locate_layer_nested, self._stack_index
         )
 
     def get(self, name: str) -> Optional[Function]:
@@ -129,13 +134,8 @@ class SamFunctionProvider(SamBaseProvider):
             resolved_function = self.functions.get(name)
 
         if not resolved_function:
-            # If function is not found by full path, search through all functions
-
-            found_fs = []
-
-            for f in self.get_all():
-                if name in (f.function_id, f.name, f.functionname):
-                    found_fs.append(f)
+            # If function is not found by full path, search by logical ID, name and function name
+            found_fs = list(self._get_functions_by_name().get(name, []))
 
             # If multiple functions are found, only return one of them
             if len(found_fs) > 1:
@@ -180,12 +180,33 @@ class SamFunctionProvider(SamBaseProvider):
         for _, function in self.functions.items():
             yield function
 
+    def _index_stacks(self) -> None:
+        """
+        Indexes the stacks, it must be called again whenever the stacks are replaced
+        """
+        self._stack_index = StackIndex(self._stacks)
+
+    def _get_functions_by_name(self) -> Dict[str, List[Function]]:
+        """
+        Returns the functions by logical ID, name and function name, in the order of self.functions. The index is
+        built again once the functions are extracted again, e.g. after the templates are reloaded.
+        """
+        if self._indexed_functions is not self.functions:
+            functions_by_name: Dict[str, List[Function]] = {}
+            for function in self.functions.values():
+                for name in {function.function_id, function.name, function.functionname}:
+                    functions_by_name.setdefault(name, []).append(function)
+            self._functions_by_name = functions_by_name
+            self._indexed_functions = self.functions
+        return self._functions_by_name
+
     @staticmethod
     def _extract_functions(
         stacks: List[Stack],
         use_raw_codeuri: bool = False,
         ignore_code_extraction_warnings: bool = False,
         locate_layer_nested: bool = False,
+        stack_index: Optional[StackIndex] = None,
     ) -> Dict[str, Function]:
         """
         Extracts and returns function information from the given dictionary of SAM/CloudFormation resources. This
@@ -195,10 +216,13 @@ class SamFunctionProvider(SamBaseProvider):
         :param bool use_raw_codeuri: Do not resolve adjust core_uri based on the template path, use the raw uri.
         :param bool ignore_code_extraction_warnings: suppress log statements on code extraction from resources.
         :param bool locate_layer_nested: resolved nested layer reference to their actual location in the nested stack
+        :param StackIndex stack_index: Index of the stacks, built from stacks if not given
         :return dict(string : samcli.commands.local.lib.provider.Function): Dictionary of function full_path to the
             Function configuration object
         """
 
+        if locate_layer_nested and not stack_index:
+            stack_index = StackIndex(stacks)
         result: Dict[str, Function] = {}  # a dict with full_path as key and extracted function as value
         for stack in stacks:
             for name, resource in stack.resources.items():
@@ -242,7 +266,7 @@ class SamFunctionProvider(SamBaseProvider):
                         use_raw_codeuri,
                         ignore_code_extraction_warnings=ignore_code_extraction_warnings,
                         locate_layer_nested=locate_layer_nested,
-                        stacks=stacks if locate_layer_nested else None,
+                        stack_index=stack_index if locate_layer_nested else None,
                         function_id=resource_metadata.get("SamResourceId", "") if locate_layer_nested else None,
                     )
                     function = SamFunctionProvider._convert_sam_function_resource(
@@ -261,7 +285,7 @@ class SamFunctionProvider(SamBaseProvider):
                         use_raw_codeuri,
                         ignore_code_extraction_warnings=ignore_code_extraction_warnings,
                         locate_layer_nested=locate_layer_nested,
-                        stacks=stacks if locate_layer_nested else None,
+                        stack_index=stack_index if locate_layer_nested else None,
                         function_id=resource_metadata.get("SamResourceId", "") if locate_layer_nested else None,
                     )
                     function = SamFunctionProvider._convert_lambda_function_resource(
@@ -497,7 +521,7 @@ class SamFunctionProvider(SamBaseProvider):
         use_raw_codeuri: bool = False,
         ignore_code_extraction_warnings: bool = False,
         locate_layer_nested: bool = False,
-        stacks: Optional[List[Stack]] = None,
+        stack_index: Optional[StackIndex] = None,
         function_id: Optional[str] = None,
     ) -> List[LayerVersion]:
         """
@@ -516,8 +540,8 @@ class SamFunctionProvider(SamBaseProvider):
             Whether to print warning when codeuri is not a local pth
         locate_layer_nested: bool
             Resolved nested layer reference to their actual location in the nested stack
-        stacks: List[Stack]
-            List of stacks generates from templates
+        stack_index: StackIndex
+            Index of the stacks generated from templates
         function_id: str
             Logical id for the function resources
 
@@ -531,14 +555,14 @@ class SamFunctionProvider(SamBaseProvider):
         """
         layers = []
 
-        if locate_layer_nested and stacks and function_id:
+        if locate_layer_nested and stack_index and function_id:
             # The layer can be a parameter pass from parent stack, we need to locate to where the
             # layer is actually defined
             func_template = stack.template_dict.get("Resources", {}).get(function_id, {})
             a_list_of_layers = func_template.get("Properties", {}).get("Layers", [])
             for layer in a_list_of_layers:
                 found_layer = SamFunctionProvider._locate_layer_from_nested(
-                    stack, stacks, layer, use_raw_codeuri, ignore_code_extraction_warnings
+                    stack, stack_index, layer, use_raw_codeuri, ignore_code_extraction_warnings
                 )
                 if found_layer:
                     layers.append(found_layer)
@@ -594,7 +618,7 @@ class SamFunctionProvider(SamBaseProvider):
     @staticmethod
     def _locate_layer_from_nested(  # pylint: disable=too-many-return-statements
         stack: Stack,
-        stacks: List[Stack],
+        stack_index: StackIndex,
         layer: Any,
         use_raw_codeuri: bool = False,
         ignore_code_extraction_warnings: bool = False,
@@ -613,8 +637,8 @@ class SamFunctionProvider(SamBaseProvider):
         ----------
         stack : Stack
             The stack the layer is defined in
-        stacks: List[Stack]
-            List of stacks generates from templates
+        stack_index: StackIndex
+            Index of the stacks generated from templates
         layer : Any
             layer that are defined within the Layers Property on a function,
             layer can be defined as string or Dict, in case customers define it in other types, use "Any" here.
@@ -655,17 +679,16 @@ class SamFunctionProvider(SamBaseProvider):
             layer_reference = layer_attribute[1].split(".")[1]
             LOG.debug("Search layer %s in child stack", layer_reference)
 
-            child_stacks = Stack.get_child_stacks(stack, stacks)
             stack_prefix = stack.stack_path + "/" if stack.stack_path else ""
             stack_path = stack_prefix + layer_stack_reference
-            child_stack = Stack.get_stack_by_full_path(stack_path, child_stacks)
+            child_stack = stack_index.get_stack_by_full_path(stack_path)
             if not child_stack:
                 LOG.debug("Child stack not found, layer can not be located in templates")
                 return None
             # search in child stack
             LOG.debug("Child stack %s found", child_stack.stack_path)
             return SamFunctionProvider._locate_layer_from_nested(
-                child_stack, stacks, layer_reference, use_raw_codeuri, ignore_code_extraction_warnings
+                child_stack, stack_index, layer_reference, use_raw_codeuri, ignore_code_extraction_warnings
             )
 
         # If the layer reference is not in the stack's parameters section, it must be a layer reference in current stack
@@ -683,7 +706,7 @@ class SamFunctionProvider(SamBaseProvider):
             return resolve_layer
 
         # search in parent stack
-        parent_stack = Stack.get_parent_stack(stack, stacks)
+        parent_stack = stack_index.get_parent_stack(stack)
         LOG.debug("Search layer: %s in parent stack", layer_reference)
         # If it can't find the parent stack, it mean's the current stack is root stack and the layer reference may be a
         # layer arn passing from root stack's parameters, which means the actual layer can't be located in templates
@@ -700,7 +723,7 @@ class SamFunctionProvider(SamBaseProvider):
         )
 
         return SamFunctionProvider._locate_layer_from_nested(
-            parent_stack, stacks, layer, use_raw_codeuri, ignore_code_extraction_warnings
+            parent_stack, stack_index, layer, use_raw_codeuri, ignore_code_extraction_warnings
         )
 
     @staticmethod
@@ -762,10 +785,10 @@ class SamFunctionProvider(SamBaseProvider):
         )
 
     def get_resources_by_stack_path(self, stack_path: str) -> Dict:
-        candidates = [stack.resources for stack in self._stacks if stack.stack_path == stack_path]
-        if not candidates:
+        stack = self._stack_index.get_stack_by_full_path(stack_path)
+        if not stack:
             raise RuntimeError(f"Cannot find resources with stack_path = {stack_path}")
-        return candidates[0]
+        return stack.resources
 
     @staticmethod
     def _metadata_has_necessary_entries_for_image_function_to_be_built(metadata: Optional[Dict[str, Any]]) -> bool:
@@ -924,9 +947,10 @@ class RefreshableSamFunctionProvider(SamFunctionProvider):
             except (TemplateNotFoundException, TemplateFailedParsingException) as ex:
                 raise ex
 
+        self._index_stacks()
         self.is_changed = False
         self.functions = self._extract_functions(
-            self._stacks, self._use_raw_codeuri, self._ignore_code_extraction_warnings
+            self._stacks, self._use_raw_codeuri, self._ignore_code_extraction_warnings, stack_index=self._stack_index
         )
         self._watch_stack_templates(self._stacks)
 
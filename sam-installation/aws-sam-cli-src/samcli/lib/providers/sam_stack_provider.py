@@ -4,17 +4,50 @@ Class that provides all nested stacks from a given SAM template
 
 import logging
 import os
-from typing import Dict, Iterator, List, Optional, Tuple, Union, cast
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union, cast
 from urllib.parse import unquote, urlparse
 
 from samcli.commands._utils.template import TemplateNotFoundException, get_template_data
 from samcli.lib.providers.exceptions import RemoteStackLocationNotSupported
 from samcli.lib.providers.provider import Stack, get_full_path
 from samcli.lib.providers.sam_base_provider import SamBaseProvider
+from samcli.lib.providers.stack_template_cache import STACK_TEMPLATE_CACHE
 from samcli.lib.utils.resources import AWS_CLOUDFORMATION_STACK, AWS_SERVERLESS_APPLICATION
 
 LOG = logging.getLogger(__name__)
 
+# Number of sibling nested stacks that are loaded at the same time, 1 loads them one after the other
+NESTED_STACK_MAX_WORKERS = int(os.environ.get("SAM_CLI_NESTED_STACK_MAX_WORKERS", "8"))
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Set in the worker threads of _map_concurrently
+_worker_state = threading.local()
+
+
+def _map_concurrently(func: Callable[[T], R], items: Sequence[T]) -> List[R]:
+    """
+    Apply func to the items using up to NESTED_STACK_MAX_WORKERS threads, the results keep the order of the items.
+    Only the top level is run concurrently, func is applied sequentially when called from one of the workers, so
+    the number of threads doesn't grow with the depth of the nested stacks.
+    """
+    if NESTED_STACK_MAX_WORKERS <= 1 or len(items) <= 1 or getattr(_worker_state, "active", False):
+        return [func(item) for item in items]
+
+    def run_in_worker(item: T) -> R:
+        _worker_state.active = True
+        try:
+            return func(item)
+        finally:
+            _worker_state.active = False
+
+    with ThreadPoolExecutor(max_workers=min(NESTED_STACK_MAX_WORKERS, len(items))) as executor:
+        return list(executor.map(run_in_worker, items))
+
 
 class SamLocalStackProvider(SamBaseProvider):
     """
@@ -59,11 +92,20 @@ class SamLocalStackProvider(SamBaseProvider):
 
         self._template_file = template_file
         self._stack_path = stack_path
-        self._template_dict = self.get_template(
-            template_dict,
-            SamLocalStackProvider.merge_parameter_overrides(parameter_overrides, global_parameter_overrides),
-            use_sam_transform=use_sam_transform,
+        merged_parameter_overrides = SamLocalStackProvider.merge_parameter_overrides(
+            parameter_overrides, global_parameter_overrides
         )
+        if use_sam_transform:
+            self._template_dict = STACK_TEMPLATE_CACHE.get_resolved_template(
+                template_dict,
+                merged_parameter_overrides,
+                lambda: self.get_template(template_dict, merged_parameter_overrides, use_sam_transform=True),
+            )
+        else:
+            # without the transform, the template is normalized in place, so it is always resolved
+            self._template_dict = self.get_template(
+                template_dict, merged_parameter_overrides, use_sam_transform=use_sam_transform
+            )
         self._resources = self._template_dict.get("Resources", {})
         self._global_parameter_overrides = global_parameter_overrides
 
@@ -107,8 +149,10 @@ class SamLocalStackProvider(SamBaseProvider):
         This method supports applications defined with AWS::Serverless::Application
         The dictionary of application LogicalId to the Application object will be assigned to self._stacks.
         If child stacks with remote URL are detected, their full paths are recorded in self._remote_stack_full_paths.
+        The child templates are read concurrently.
         """
 
+        stack_resources = []
         for name, resource in self._resources.items():
             resource_type = resource.get("Type")
             resource_properties = resource.get("Properties", {})
@@ -117,24 +161,28 @@ class SamLocalStackProvider(SamBaseProvider):
             if resource_metadata:
                 resource_properties["Metadata"] = resource_metadata
 
-            stack: Optional[Stack] = None
+            if resource_type == AWS_SERVERLESS_APPLICATION:
+                stack_resources.append(
+                    (name, SamLocalStackProvider._convert_sam_application_resource, resource_properties)
+                )
+            if resource_type == AWS_CLOUDFORMATION_STACK:
+                stack_resources.append((name, SamLocalStackProvider._convert_cfn_stack_resource, resource_properties))
+
+            # We don't care about other resource types. Just ignore them
+
+        def convert(stack_resource: Tuple[str, Callable, Dict]) -> Tuple[str, Optional[Stack], bool]:
+            name, converter, resource_properties = stack_resource
             try:
-                if resource_type == AWS_SERVERLESS_APPLICATION:
-                    stack = SamLocalStackProvider._convert_sam_application_resource(
-                        self._template_file, self._stack_path, name, resource_properties
-                    )
-                if resource_type == AWS_CLOUDFORMATION_STACK:
-                    stack = SamLocalStackProvider._convert_cfn_stack_resource(
-                        self._template_file, self._stack_path, name, resource_properties
-                    )
+                return name, converter(self._template_file, self._stack_path, name, resource_properties), False
             except RemoteStackLocationNotSupported:
-                self.remote_stack_full_paths.append(get_full_path(self._stack_path, name))
+                return name, None, True
 
+        for name, stack, is_remote in _map_concurrently(convert, stack_resources):
+            if is_remote:
+                self.remote_stack_full_paths.append(get_full_path(self._stack_path, name))
             if stack:
                 self._stacks[name] = stack
 
-            # We don't care about other resource types. Just ignore them
-
     @staticmethod
     def _convert_sam_application_resource(
         template_file: str,
@@ -163,7 +211,7 @@ class SamLocalStackProvider(SamBaseProvider):
             parameters=SamLocalStackProvider.merge_parameter_overrides(
                 resource_properties.get("Parameters", {}), global_parameter_overrides
             ),
-            template_dict=get_template_data(location),
+            template_dict=STACK_TEMPLATE_CACHE.get_template_data(location, get_template_data),
             metadata=resource_properties.get("Metadata", {}),
         )
 
@@ -197,7 +245,7 @@ class SamLocalStackProvider(SamBaseProvider):
             parameters=SamLocalStackProvider.merge_parameter_overrides(
                 resource_properties.get("Parameters", {}), global_parameter_overrides
             ),
-            template_dict=get_template_data(template_url),
+            template_dict=STACK_TEMPLATE_CACHE.get_template_data(template_url, get_template_data),
             metadata=resource_properties.get("Metadata", {}),
         )
 
@@ -213,7 +261,8 @@ class SamLocalStackProvider(SamBaseProvider):
         use_sam_transform: bool = True,
     ) -> Tuple[List[Stack], List[str]]:
         """
-        Recursively extract stacks from a template file.
+        Recursively extract stacks from a template file. Sibling nested stacks are loaded concurrently, and the
+        parsed and resolved templates are cached, so a template referenced several times is only loaded once.
 
         Parameters
         ----------
@@ -245,8 +294,9 @@ class SamLocalStackProvider(SamBaseProvider):
             The list of full paths of detected remote stacks
         """
         template_dict: dict
+        start_time = time.perf_counter()
         if template_file:
-            template_dict = get_template_data(template_file)
+            template_dict = STACK_TEMPLATE_CACHE.get_template_data(template_file, get_template_data)
         elif template_dictionary:
             template_file = ""
             template_dict = template_dictionary
@@ -266,6 +316,7 @@ class SamLocalStackProvider(SamBaseProvider):
             )
         ]
         remote_stack_full_paths: List[str] = []
+        parsed_time = time.perf_counter()
 
         current = SamLocalStackProvider(
             template_file,
@@ -276,9 +327,16 @@ class SamLocalStackProvider(SamBaseProvider):
             use_sam_transform=use_sam_transform,
         )
         remote_stack_full_paths.extend(current.remote_stack_full_paths)
+        LOG.debug(
+            "Loaded stack '%s' from %s, parsed in %.1f ms, resolved in %.1f ms",
+            stacks[0].stack_path or "root",
+            template_file or "template dictionary",
+            (parsed_time - start_time) * 1000,
+            (time.perf_counter() - parsed_time) * 1000,
+        )
 
-        for child_stack in current.get_all():
-            stacks_in_child, remote_stack_full_paths_in_child = SamLocalStackProvider.get_stacks(
+        def get_child_stacks(child_stack: Stack) -> Tuple[List[Stack], List[str]]:
+            return SamLocalStackProvider.get_stacks(
                 child_stack.location,
                 os.path.join(stack_path, stacks[0].stack_id),
                 child_stack.name,
@@ -287,6 +345,10 @@ class SamLocalStackProvider(SamBaseProvider):
                 child_stack.metadata,
                 use_sam_transform=use_sam_transform,
             )
+
+        for stacks_in_child, remote_stack_full_paths_in_child in _map_concurrently(
+            get_child_stacks, list(current.get_all())
+        ):
             stacks.extend(stacks_in_child)
             remote_stack_full_paths.extend(remote_stack_full_paths_in_child)
 
@@ -0,0 +1,128 @@
+"""
+In-memory cache of the parsed and resolved stack templates, shared by all the nested stacks of a project
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of parsed and of resolved templates kept in memory, least recently used ones are evicted first
+STACK_TEMPLATE_CACHE_MAX_SIZE = int(os.environ.get("SAM_CLI_STACK_TEMPLATE_CACHE_MAX_SIZE", "256"))
+
+
+def _fingerprint(value: Any) -> Optional[str]:
+    """
+    Returns a hash of a JSON-like value, None if it can not be serialized deterministically
+    """
+    try:
+        serialized = json.dumps(value, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class StackTemplateCache:
+    """
+    Caches the template files by (absolute path, modification time, size), so a template referenced by several
+    nested stacks is only parsed once and is parsed again once it changes. Resolved templates are cached by the
+    content of the template and the parameter overrides, so the same child template with the same parameters is
+    only transformed and resolved once.
+
+    Copies of the cached templates are returned, callers are free to modify them.
+    """
+
+    def __init__(self, max_size: int = STACK_TEMPLATE_CACHE_MAX_SIZE):
+        self._max_size = max_size
+        self._parsed: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._resolved: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_template_data(self, template_file: str, parse: Callable[[str], Dict]) -> Dict:
+        """
+        Parameters
+        ----------
+        template_file: str
+            Path of the template file
+        parse: Callable[[str], Dict]
+            Function that reads and parses the template file, called if the file is not cached
+
+        Returns
+        -------
+        Dict
+            Copy of the parsed template
+        """
+        try:
+            stat = os.stat(template_file)
+        except OSError:
+            # let the parse function report the missing file
+            return parse(template_file)
+
+        key = (os.path.abspath(template_file), stat.st_mtime_ns, stat.st_size)
+        template_dict = self._get(self._parsed, key)
+        if template_dict is None:
+            template_dict = parse(template_file)
+            self._put(self._parsed, key, template_dict)
+        else:
+            LOG.debug("Using the cached template of %s", template_file)
+        return copy.deepcopy(template_dict)
+
+    def get_resolved_template(
+        self, template_dict: Dict, parameter_overrides: Optional[Dict], resolve: Callable[[], Dict]
+    ) -> Dict:
+        """
+        Parameters
+        ----------
+        template_dict: Dict
+            The unresolved template
+        parameter_overrides: Optional[Dict]
+            Parameter overrides the template is resolved with
+        resolve: Callable[[], Dict]
+            Function that resolves the template, called if it is not cached
+
+        Returns
+        -------
+        Dict
+            Copy of the resolved template
+        """
+        template_fingerprint = _fingerprint(template_dict)
+        parameters_fingerprint = _fingerprint(parameter_overrides)
+        if template_fingerprint is None or parameters_fingerprint is None:
+            return resolve()
+
+        key = (template_fingerprint, parameters_fingerprint)
+        resolved = self._get(self._resolved, key)
+        if resolved is None:
+            resolved = resolve()
+            self._put(self._resolved, key, resolved)
+        return copy.deepcopy(resolved)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._parsed.clear()
+            self._resolved.clear()
+
+    def _get(self, entries: "OrderedDict[Hashable, Dict]", key: Hashable) -> Optional[Dict]:
+        with self._lock:
+            value = entries.get(key)
+            if value is not None:
+                entries.move_to_end(key)
+            return value
+
+    def _put(self, entries: "OrderedDict[Hashable, Dict]", key: Hashable, value: Dict) -> None:
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self._max_size:
+                entries.popitem(last=False)
+
+
+STACK_TEMPLATE_CACHE = StackTemplateCache()
@@ -8,7 +8,13 @@ from typing import Callable, Optional
 
 from samcli.lib.sync.exceptions import SyncFlowException
 from samcli.lib.sync.sync_flow import SyncFlow
-from samcli.lib.sync.sync_flow_executor import SyncFlowExecutor, SyncFlowFuture, SyncFlowTask, default_exception_handler
+from samcli.lib.sync.sync_flow_executor import (
+    SYNC_FLOW_MAX_WORKERS,
+    SyncFlowExecutor,
+    SyncFlowFuture,
+    SyncFlowTask,
+    default_exception_handler,
+)
 
 LOG = logging.getLogger(__name__)
 
@@ -31,8 +37,8 @@ class ContinuousSyncFlowExecutor(SyncFlowExecutor):
     # Flag for whether the executor should be stopped at the next available time
     _stop_flag: bool
 
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, max_workers: Optional[int] = SYNC_FLOW_MAX_WORKERS) -> None:
+        super().__init__(max_workers)
         self._stop_flag = False
 
     def stop(self, should_stop=True) -> None:
@@ -40,7 +46,7 @@ class ContinuousSyncFlowExecutor(SyncFlowExecutor):
         with self._flow_queue_lock:
             self._stop_flag = should_stop
             if should_stop:
-                self._flow_queue.queue.clear()
+                self._clear_queue()
 
     def should_stop(self) -> bool:
         """
@@ -82,6 +88,25 @@ class ContinuousSyncFlowExecutor(SyncFlowExecutor):
 
         return super()._submit_sync_flow_task(executor, sync_flow_task)
 
+    def _get_wakeup_timeout(self) -> Optional[float]:
+        """
+        Returns
+        -------
+        Optional[float]
+            Number of seconds until the earliest delayed task can be executed, None if there is no delayed task
+        """
+        # a task whose sync flow is running waits for it to finish, which wakes up the execution loop anyway.
+        # Counting it would make the loop spin while the sync flow runs, once the delay of the task expired
+        with self._flow_queue_lock:
+            ready_times = [
+                task.queue_time + task.wait_time
+                for task in self._flow_queue.queue
+                if isinstance(task, DelayedSyncFlowTask) and task.sync_flow not in self._running_futures
+            ]
+        if not ready_times:
+            return None
+        return max(0.0, min(ready_times) - time.time())
+
     def _add_sync_flow_task(self, task: SyncFlowTask) -> None:
         """Add SyncFlowTask to the queue
         Skips if the executor is in the state of being shut down.
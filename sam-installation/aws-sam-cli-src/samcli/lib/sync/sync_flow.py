@@ -8,12 +8,10 @@ from pathlib import Path
 from threading import Lock
 from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Set, cast
 
-from boto3.session import Session
-
 from samcli.lib.build.app_builder import ApplicationBuildResult
 from samcli.lib.providers.provider import ResourceIdentifier, Stack, get_resource_by_id
 from samcli.lib.sync.exceptions import MissingLockException, MissingPhysicalResourceError
-from samcli.lib.utils.boto_utils import get_boto_client_provider_from_session_with_config
+from samcli.lib.utils.boto_utils import get_boto_client_provider_with_config
 from samcli.lib.utils.lock_distributor import LockChain, LockDistributor
 from samcli.lib.utils.resources import RESOURCES_WITH_LOCAL_PATHS
 
@@ -59,7 +57,6 @@ class SyncFlow(ABC):
     _deploy_context: "DeployContext"
     _sync_context: "SyncContext"
     _stacks: Optional[List[Stack]]
-    _session: Optional[Session]
     _physical_id_mapping: Dict[str, str]
     _locks: Optional[Dict[str, Lock]]
     # Local hash represents the state of a particular sync flow
@@ -100,7 +97,6 @@ class SyncFlow(ABC):
         self._sync_context = sync_context
         self._log_name = log_name
         self._stacks = stacks
-        self._session = None
         self._physical_id_mapping = physical_id_mapping
         self._locks = None
         self._local_sha = None
@@ -110,19 +106,16 @@ class SyncFlow(ABC):
         """Clients and other expensives setups should be handled here instead of constructor"""
         pass
 
-    def _get_session(self) -> Session:
-        if not self._session:
-            self._session = Session(profile_name=self._deploy_context.profile, region_name=self._deploy_context.region)
-        return self._session
-
     def _boto_client(self, client_name: str):
+        # the clients are shared by all the flows of the same region and profile
+        region, profile = self._deploy_context.region, self._deploy_context.profile
         default_retry_config = get_default_retry_config()
         if not default_retry_config:
-            LOG.debug("Creating boto client (%s) with user's retry config", client_name)
-            return get_boto_client_provider_from_session_with_config(self._get_session())(client_name)
+            LOG.debug("Getting boto client (%s) with user's retry config", client_name)
+            return get_boto_client_provider_with_config(region=region, profile=profile)(client_name)
 
-        LOG.debug("Creating boto client (%s) with default retry config", client_name)
-        return get_boto_client_provider_from_session_with_config(self._get_session(), retries=default_retry_config)(
+        LOG.debug("Getting boto client (%s) with default retry config", client_name)
+        return get_boto_client_provider_with_config(region=region, profile=profile, retries=default_retry_config)(
             client_name
         )
 
@@ -1,13 +1,14 @@
 """Executor for SyncFlows"""
 
 import logging
+import os
 import time
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from queue import Queue
-from threading import RLock
-from typing import Callable, List, Optional, Set
+from threading import Condition, RLock
+from typing import Callable, Dict, List, Optional
 from uuid import uuid4
 
 from botocore.exceptions import ClientError
@@ -23,6 +24,7 @@ from samcli.lib.sync.exceptions import (
 )
 from samcli.lib.sync.sync_flow import SyncFlow
 from samcli.lib.telemetry.event import EventName, EventTracker, EventType
+from samcli.lib.utils.boto_utils import BOTO_CLIENT_REGISTRY
 from samcli.lib.utils.colors import Colored
 from samcli.lib.utils.lock_distributor import LockDistributor, LockDistributorType
 
@@ -30,6 +32,9 @@ LOG = logging.getLogger(__name__)
 
 HELP_TEXT_FOR_SYNC_INFRA = " Try sam sync without --code or sam deploy."
 
+# Number of SyncFlows that can be executed at the same time, defaults to the ThreadPoolExecutor default
+SYNC_FLOW_MAX_WORKERS = int(os.environ.get("SAM_CLI_SYNC_MAX_WORKERS", "0")) or None
+
 
 @dataclass(frozen=True, eq=True)
 class SyncFlowTask:
@@ -57,6 +62,12 @@ class SyncFlowFuture:
     sync_flow: SyncFlow
     future: Future
 
+    # Seconds the SyncFlow waited in the queue before being submitted
+    queue_wait_time: float = 0
+
+    # Monotonic time of when the SyncFlow was submitted
+    submit_time: float = 0
+
 
 def default_exception_handler(sync_flow_exception: SyncFlowException) -> None:
     """Default exception handler for SyncFlowExecutor
@@ -110,24 +121,44 @@ def default_exception_handler(sync_flow_exception: SyncFlowException) -> None:
 class SyncFlowExecutor:
     """Executor for SyncFlows
     Can be used with ThreadPoolExecutor or ProcessPoolExecutor with/without manager
+
+    The execution loop sleeps until a SyncFlow is queued or a running SyncFlow finishes, instead of polling.
     """
 
     _flow_queue: Queue
     _flow_queue_lock: RLock
+    _wakeup_condition: Condition
+    _wakeup_pending: bool
     _lock_distributor: LockDistributor
     _running_flag: bool
     _color: Colored
-    _running_futures: Set[SyncFlowFuture]
+    _running_futures: Dict[SyncFlow, SyncFlowFuture]
+    _queued_flows: Dict[SyncFlow, int]
+    _queue_times: Dict[SyncFlow, float]
+    _max_workers: Optional[int]
 
-    def __init__(
-        self,
-    ) -> None:
+    def __init__(self, max_workers: Optional[int] = SYNC_FLOW_MAX_WORKERS) -> None:
+        """
+        Parameters
+        ----------
+        max_workers : Optional[int]
+            Number of SyncFlows that can be executed at the same time, by default the ThreadPoolExecutor default
+        """
         self._flow_queue = Queue()
         self._lock_distributor = LockDistributor(LockDistributorType.THREAD)
         self._running_flag = False
         self._flow_queue_lock = RLock()
+        self._wakeup_condition = Condition(self._flow_queue_lock)
+        self._wakeup_pending = False
         self._color = Colored()
-        self._running_futures = set()
+        self._running_futures = dict()
+        self._queued_flows = dict()
+        self._queue_times = dict()
+        self._max_workers = max_workers
+
+    @property
+    def max_workers(self) -> Optional[int]:
+        return self._max_workers
 
     def _add_sync_flow_task(self, task: SyncFlowTask) -> None:
         """Add SyncFlowTask to the queue
@@ -139,12 +170,51 @@ class SyncFlowExecutor:
         """
         # Lock flow_queue as check dedup and add is not atomic
         with self._flow_queue_lock:
-            if task.dedup and task.sync_flow in [task.sync_flow for task in self._flow_queue.queue]:
+            if task.dedup and task.sync_flow in self._queued_flows:
                 LOG.debug("Found the same SyncFlow in queue. Skip adding.")
                 return
 
             task.sync_flow.set_locks_with_distributor(self._lock_distributor)
-            self._flow_queue.put(task)
+            self._queue_times.setdefault(task.sync_flow, time.monotonic())
+            self._put_task(task)
+            self._wakeup()
+
+    def _put_task(self, task: SyncFlowTask) -> None:
+        """Put a task into the queue, must be called while holding _flow_queue_lock"""
+        self._queued_flows[task.sync_flow] = self._queued_flows.get(task.sync_flow, 0) + 1
+        self._flow_queue.put(task)
+
+    def _get_task(self) -> SyncFlowTask:
+        """Take the next task from the queue, must be called while holding _flow_queue_lock"""
+        task: SyncFlowTask = self._flow_queue.get()
+        remaining = self._queued_flows.pop(task.sync_flow, 1) - 1
+        if remaining:
+            self._queued_flows[task.sync_flow] = remaining
+        return task
+
+    def _clear_queue(self) -> None:
+        """Remove all the tasks from the queue"""
+        with self._flow_queue_lock:
+            self._flow_queue.queue.clear()
+            self._queued_flows.clear()
+            self._queue_times.clear()
+            self._wakeup()
+
+    def _wakeup(self) -> None:
+        """Wake up the execution loop"""
+        with self._wakeup_condition:
+            self._wakeup_pending = True
+            self._wakeup_condition.notify_all()
+
+    def _get_wakeup_timeout(self) -> Optional[float]:
+        """
+        Returns
+        -------
+        Optional[float]
+            Maximum number of seconds the execution loop can sleep while waiting for an event, None to wait
+            until the next event
+        """
+        return None
 
     def add_sync_flow(self, sync_flow: SyncFlow, dedup: bool = True) -> None:
         """Add a SyncFlow to queue to be executed
@@ -189,18 +259,26 @@ class SyncFlowExecutor:
             by default default_exception_handler.__func__
         """
         self._running_flag = True
-        with ThreadPoolExecutor() as executor:
+        # the flows share their boto clients, their connection pools should not be smaller than the number of flows
+        # running at the same time (the ThreadPoolExecutor default when max_workers is not set)
+        BOTO_CLIENT_REGISTRY.scale_max_pool_connections(self._max_workers or min(32, (os.cpu_count() or 1) + 4))
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
             self._running_futures.clear()
             while True:
+                with self._wakeup_condition:
+                    self._wakeup_pending = False
+
                 self._execute_step(executor, exception_handler)
 
-                # Exit execution if there are no running and pending sync flows
-                if self._can_exit():
-                    LOG.debug("No more SyncFlows in executor. Stopping.")
-                    break
+                with self._wakeup_condition:
+                    # Exit execution if there are no running and pending sync flows
+                    if self._can_exit():
+                        LOG.debug("No more SyncFlows in executor. Stopping.")
+                        break
 
-                # Sleep for a bit to cut down CPU utilization of this busy wait loop
-                time.sleep(0.1)
+                    # Sleep until a sync flow is queued or finishes, unless that happened during this step
+                    if not self._wakeup_pending:
+                        self._wakeup_condition.wait(timeout=self._get_wakeup_timeout())
         self._running_flag = False
 
     def _execute_step(
@@ -217,6 +295,12 @@ class SyncFlowExecutor:
         exception_handler : Optional[Callable[[SyncFlowException], None]]
             Exception handler
         """
+        # Check for finished sync flows first. A queued task for a sync flow that is still in _running_futures is
+        # deferred, and the completion of that sync flow won't wake up the execution loop again if it already did
+        for sync_flow, sync_flow_future in list(self._running_futures.items()):
+            if self._handle_result(sync_flow_future, exception_handler):
+                del self._running_futures[sync_flow]
+
         # Execute all pending sync flows
         with self._flow_queue_lock:
             # Putting nonsubmitted tasks into this deferred tasks list
@@ -225,14 +309,14 @@ class SyncFlowExecutor:
 
             # Go through all queued tasks and try to execute them
             while not self._flow_queue.empty():
-                sync_flow_task: SyncFlowTask = self._flow_queue.get()
+                sync_flow_task = self._get_task()
 
                 sync_flow_future = self._submit_sync_flow_task(executor, sync_flow_task)
 
                 # sync_flow_future can be None if the task cannot be submitted currently
                 # Put it into deferred_tasks and add all of them at the end to avoid endless loop
                 if sync_flow_future:
-                    self._running_futures.add(sync_flow_future)
+                    self._running_futures[sync_flow_future.sync_flow] = sync_flow_future
                     LOG.info(
                         self._color.color_log(msg=f"Syncing {sync_flow_future.sync_flow.log_name}...", color="cyan"),
                         extra=dict(markup=True),
@@ -240,14 +324,9 @@ class SyncFlowExecutor:
                 else:
                     deferred_tasks.append(sync_flow_task)
 
-            # Add tasks that cannot be executed yet
+            # Put back tasks that cannot be executed yet, they will be checked again on the next wake up
             for task in deferred_tasks:
-                self._add_sync_flow_task(task)
-
-        # Check for finished sync flows
-        for sync_flow_future in set(self._running_futures):
-            if self._handle_result(sync_flow_future, exception_handler):
-                self._running_futures.remove(sync_flow_future)
+                self._put_task(task)
 
     def _submit_sync_flow_task(
         self, executor: ThreadPoolExecutor, sync_flow_task: SyncFlowTask
@@ -271,14 +350,26 @@ class SyncFlowExecutor:
         sync_flow = sync_flow_task.sync_flow
 
         # Check whether the same sync flow is already running or not
-        if sync_flow in [future.sync_flow for future in self._running_futures]:
+        if sync_flow in self._running_futures:
             return None
 
-        sync_flow_future = SyncFlowFuture(
-            sync_flow=sync_flow, future=executor.submit(SyncFlowExecutor._sync_flow_execute_wrapper, sync_flow)
-        )
+        submit_time = time.monotonic()
+        future = executor.submit(SyncFlowExecutor._sync_flow_execute_wrapper, sync_flow)
+        # wake up the execution loop as soon as the sync flow is done
+        future.add_done_callback(lambda _: self._wakeup())
 
-        return sync_flow_future
+        with self._flow_queue_lock:
+            queue_time = self._queue_times.get(sync_flow, submit_time)
+            # keep the queue time if another task for the same sync flow is still queued
+            if sync_flow not in self._queued_flows:
+                self._queue_times.pop(sync_flow, None)
+
+        return SyncFlowFuture(
+            sync_flow=sync_flow,
+            future=future,
+            queue_wait_time=submit_time - queue_time,
+            submit_time=submit_time,
+        )
 
     def _handle_result(
         self, sync_flow_future: SyncFlowFuture, exception_handler: Optional[Callable[[SyncFlowException], None]]
@@ -320,6 +411,13 @@ class SyncFlowExecutor:
                 self._color.color_log(msg=message, color="green"),
                 extra=dict(markup=True),
             )
+
+        LOG.debug(
+            "%s waited %.3f seconds in queue and ran for %.3f seconds",
+            sync_flow_future.sync_flow.log_name,
+            sync_flow_future.queue_wait_time,
+            time.monotonic() - sync_flow_future.submit_time,
+        )
         return True
 
     @staticmethod
@@ -0,0 +1,266 @@
+"""
+Background sender of the telemetry metrics
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from samcli.cli.global_config import GlobalConfig
+from samcli.lib.utils.file_lock import atomic_write_text
+
+LOG = logging.getLogger(__name__)
+
+# Seconds the CLI waits on exit for the buffered metrics to be sent,
+# the metrics which are not sent by then are saved and sent by a later command
+TELEMETRY_EXIT_TIMEOUT = float(os.environ.get("SAM_CLI_TELEMETRY_EXIT_TIMEOUT", "0.1"))
+# Maximum number of metrics sent in one request
+TELEMETRY_BATCH_SIZE = 20
+# Connect and read timeouts of a request, they only delay the background thread
+TELEMETRY_REQUEST_TIMEOUT = (2, 2)
+
+PENDING_METRICS_DIR_NAME = "telemetry"
+PENDING_METRICS_SUFFIX = ".json"
+# The oldest files are dropped once there are this many files of pending metrics
+PENDING_METRICS_MAX_FILES = 50
+# Pending metrics older than this many seconds are dropped
+PENDING_METRICS_MAX_AGE = 7 * 24 * 60 * 60
+
+
+class TelemetrySender:
+    """
+    Sends the metrics to a telemetry endpoint from a daemon thread, in batches, so the commands never wait for
+    the telemetry backend.
+
+    The metrics which could not be sent, because the backend is unreachable or because the CLI exited before they
+    were sent, are saved in the pending metrics directory. They are sent by the next command which sends metrics.
+    """
+
+    def __init__(self, url: str, pending_metrics_dir: Optional[Path] = None):
+        """
+        Parameters
+        ----------
+        url: str
+            URL of the telemetry endpoint
+        pending_metrics_dir: Optional[Path]
+            Directory the unsent metrics are saved to, defaults to the telemetry directory of the SAM CLI
+            configuration directory
+        """
+        self._url = url
+        self._pending_metrics_dir = pending_metrics_dir
+        self._queue: List[Dict] = []
+        # batch whose request is running, and the file it was saved to if the CLI started exiting meanwhile
+        self._in_flight: List[Dict] = []
+        self._in_flight_file: Optional[Path] = None
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        # set once flush saved the queued metrics, the metrics queued after that would be lost on exit
+        self._flushed = False
+        # set once a request failed, the next metrics are saved instead of being sent
+        self._unreachable = False
+
+    @property
+    def pending_metrics_dir(self) -> Path:
+        if not self._pending_metrics_dir:
+            self._pending_metrics_dir = GlobalConfig().config_dir / PENDING_METRICS_DIR_NAME
+        return self._pending_metrics_dir
+
+    def send(self, metric: Dict) -> None:
+        """
+        Queues the metric, it is sent by the background thread
+
+        Parameters
+        ----------
+        metric: Dict
+            The metric name and its data
+        """
+        with self._condition:
+            if not self._closed and not self._unreachable:
+                self._queue.append(metric)
+                self._start()
+                self._condition.notify()
+                return
+        self._save_pending_metrics([metric])
+
+    def flush(self, timeout: float = TELEMETRY_EXIT_TIMEOUT) -> None:
+        """
+        Waits at most ``timeout`` seconds for the queued metrics to be sent, the remaining ones are saved to be
+        sent by a later command. Metrics sent after the flush are saved directly.
+
+        Parameters
+        ----------
+        timeout: float
+            Seconds to wait for the background thread
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+
+        if thread:
+            thread.join(max(timeout, 0))
+
+        with self._condition:
+            remaining, self._queue = self._queue, []
+            self._flushed = True
+            # the request is still running and may not complete before the CLI exits, the batch is saved as well.
+            # The background thread removes the file if the request completes after all
+            if self._in_flight and not self._in_flight_file:
+                self._in_flight_file = self._save_pending_metrics(self._in_flight)
+        self._save_pending_metrics(remaining)
+
+    def _start(self) -> None:
+        # called with the condition acquired
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="TelemetrySender", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        self._load_pending_metrics()
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                batch = self._queue[:TELEMETRY_BATCH_SIZE]
+                del self._queue[:TELEMETRY_BATCH_SIZE]
+                self._in_flight = batch
+
+            sent = self._post(batch)
+            with self._condition:
+                self._in_flight = []
+                in_flight_file, self._in_flight_file = self._in_flight_file, None
+                unsent: List[Dict] = []
+                if not sent:
+                    self._unreachable = True
+                    # the batch was already saved by flush if the CLI started exiting
+                    unsent = ([] if in_flight_file else batch) + self._queue
+                    self._queue = []
+
+            if not sent:
+                self._save_pending_metrics(unsent)
+                return
+            if in_flight_file:
+                in_flight_file.unlink(missing_ok=True)
+
+    def _post(self, batch: List[Dict]) -> bool:
+        """
+        Returns False if the metrics should be sent again later
+        """
+        # requests is only imported by the background thread, to keep it out of the CLI startup time
+        import requests
+
+        payload = {"metrics": batch}
+        LOG.debug("Sending Telemetry: %s", payload)
+        try:
+            response = requests.post(self._url, json=payload, timeout=TELEMETRY_REQUEST_TIMEOUT)
+        except requests.exceptions.ReadTimeout as ex:
+            # the backend may have received the metrics already, sending them again could count them twice
+            LOG.debug("Timed out waiting for the telemetry response, not sending the metrics again: %s", ex)
+            return True
+        except requests.exceptions.RequestException as ex:
+            # Expected if request times out OR cannot connect to the backend (offline).
+            LOG.debug("Failed to send telemetry: %s", ex)
+            return False
+        LOG.debug("Telemetry response: %d", response.status_code)
+        # the backend rejected the metrics if it returned a client error, sending them again would not help
+        return response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR
+
+    def _save_pending_metrics(self, metrics: List[Dict]) -> Optional[Path]:
+        """
+        Returns the file the metrics were saved to, None if there were no metrics or they could not be saved
+        """
+        if not metrics:
+            return None
+        try:
+            self.pending_metrics_dir.mkdir(parents=True, exist_ok=True)
+            pending_files = sorted(self.pending_metrics_dir.glob(f"*{PENDING_METRICS_SUFFIX}"))
+            for pending_file in pending_files[: max(len(pending_files) - PENDING_METRICS_MAX_FILES + 1, 0)]:
+                pending_file.unlink(missing_ok=True)
+            # the names start with the time, so the oldest files are sorted first
+            pending_file = self.pending_metrics_dir / f"{time.time_ns()}-{uuid.uuid4().hex}{PENDING_METRICS_SUFFIX}"
+            atomic_write_text(pending_file, json.dumps({"url": self._url, "metrics": metrics}))
+            LOG.debug("Saved %d telemetry metrics to send later", len(metrics))
+            return pending_file
+        except (OSError, ValueError) as ex:
+            LOG.debug("Failed to save the telemetry metrics which were not sent", exc_info=ex)
+            return None
+
+    def _load_pending_metrics(self) -> None:
+        """
+        Queues the metrics saved by the previous commands. Each file is renamed before it is read, so the metrics
+        are only sent by one of the commands running at the same time. A file is only removed once its metrics are
+        queued, the files which were not queued yet when the queue was flushed are left for a later command.
+        """
+        try:
+            pending_files = sorted(self.pending_metrics_dir.glob(f"*{PENDING_METRICS_SUFFIX}"))
+        except OSError:
+            return
+
+        queued_metrics = 0
+        for pending_file in pending_files:
+            claimed_file = pending_file.with_name(f"{pending_file.name}.{os.getpid()}")
+            try:
+                expired = time.time() - pending_file.stat().st_mtime > PENDING_METRICS_MAX_AGE
+                pending_file.rename(claimed_file)
+            except OSError:
+                # sent by another command
+                continue
+
+            metrics: List[Dict] = []
+            try:
+                content = json.loads(claimed_file.read_text())
+                if not expired and content.get("url") == self._url:
+                    metrics = content.get("metrics", [])
+            except (OSError, ValueError, AttributeError) as ex:
+                LOG.debug("Ignoring the invalid pending telemetry file %s", pending_file, exc_info=ex)
+
+            with self._condition:
+                try:
+                    if self._flushed:
+                        claimed_file.rename(pending_file)
+                        return
+                    # the metrics saved by the previous commands are sent first, in the order they were saved
+                    self._queue[queued_metrics:queued_metrics] = metrics
+                    queued_metrics += len(metrics)
+                    claimed_file.unlink(missing_ok=True)
+                except OSError as ex:
+                    LOG.debug("Failed to release the pending telemetry file %s", pending_file, exc_info=ex)
+                    return
+
+        if queued_metrics:
+            LOG.debug("Sending %d telemetry metrics saved by previous commands", queued_metrics)
+
+
+_SENDERS: Dict[str, TelemetrySender] = {}
+_SENDERS_LOCK = threading.Lock()
+
+
+def get_telemetry_sender(url: str) -> TelemetrySender:
+    """
+    Returns the sender of the telemetry endpoint, the same sender is shared by all the metrics of a command
+    """
+    with _SENDERS_LOCK:
+        if url not in _SENDERS:
+            _SENDERS[url] = TelemetrySender(url)
+        return _SENDERS[url]
+
+
+def flush_telemetry(timeout: float = TELEMETRY_EXIT_TIMEOUT) -> None:
+    """
+    Waits at most ``timeout`` seconds in total for the queued metrics to be sent, the remaining ones are saved to be
+    sent by a later command. Registered to run when the CLI exits.
+    """
+    deadline = time.monotonic() + timeout
+    with _SENDERS_LOCK:
+        senders = list(_SENDERS.values())
+    for sender in senders:
+        sender.flush(deadline - time.monotonic())
@@ -4,10 +4,9 @@ Class to publish metrics
 
 import logging
 
-import requests
-
 # Get the preconfigured endpoint URL
 from samcli.cli.global_config import GlobalConfig
+from samcli.lib.telemetry.sender import get_telemetry_sender
 from samcli.settings import telemetry_endpoint_url as DEFAULT_ENDPOINT_URL
 
 LOG = logging.getLogger(__name__)
@@ -28,9 +27,8 @@ class Telemetry:
 
     def emit(self, metric, force_emit=False):
         """
-        Emits the metric with given name and the attributes and send it immediately to the HTTP backend. This method
-        will return immediately without waiting for response from the backend. Before sending, this method will
-        also update ``attrs`` with some common attributes used by all metrics.
+        Emits the metric with given name and the attributes and queues it to be sent to the HTTP backend by a
+        background thread. This method will return immediately without waiting for the backend.
 
         Parameters
         ----------
@@ -43,19 +41,15 @@ class Telemetry:
         if bool(GlobalConfig().telemetry_enabled) or force_emit:
             self._send({metric.get_metric_name(): metric.get_data()})
 
-    def _send(self, metric, wait_for_response=False):
+    def _send(self, metric):
         """
-        Serializes the metric data to JSON and sends to the backend.
+        Queues the metric to be serialized to JSON and sent to the backend, batched with the other metrics.
 
         Parameters
         ----------
 
         metric : dict
             Dictionary of metric data to send to backend.
-
-        wait_for_response : bool
-            If set to True, this method will wait until the HTTP server returns a response. If not, it will return
-            immediately after the request is sent.
         """
 
         if not self._url:
@@ -63,19 +57,4 @@ class Telemetry:
             LOG.debug("Not sending telemetry. Endpoint URL not configured")
             return
 
-        payload = {"metrics": [metric]}
-        LOG.debug("Sending Telemetry: %s", payload)
-
-        timeout_ms = 2000 if wait_for_response else 100  # 2 seconds to wait for response or 100ms
-
-        timeout = (
-            2,  # connection timeout. Always set to 2 seconds
-            timeout_ms / 1000.0,  # Read timeout. Tweaked based on input.
-        )
-        try:
-            r = requests.post(self._url, json=payload, timeout=timeout)
-            LOG.debug("Telemetry response: %d", r.status_code)
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as ex:
-            # Expected if request times out OR cannot connect to the backend (offline).
-            # Just print debug log and ignore the exception.
-            LOG.debug(str(ex))
+        get_telemetry_sender(self._url).send(metric)
@@ -2,18 +2,38 @@
 This module contains utility functions for boto3 library
 """
 
-from typing import Any, Optional
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
-from boto3 import Session
-from botocore.config import Config
 from botocore.exceptions import ClientError
 from typing_extensions import Protocol
 
 from samcli import __version__
 from samcli.cli.global_config import GlobalConfig
+from samcli.lib.utils.lazy_import import lazy_import
 
+if TYPE_CHECKING:  # pragma: no cover
+    from boto3 import Session
+    from botocore.config import Config
 
-def get_boto_config_with_user_agent(**kwargs) -> Config:
+LOG = logging.getLogger(__name__)
+
+# loaded on first use, they are slow to import and not every command talks to AWS
+boto3 = lazy_import("boto3")
+botocore_config = lazy_import("botocore.config")
+
+# botocore default size of the connection pool of a client
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+# Size of the connection pool of the shared clients, 0 scales it with the number of threads using them
+BOTO_MAX_POOL_CONNECTIONS = int(os.environ.get("SAM_CLI_BOTO_MAX_POOL_CONNECTIONS", "0"))
+
+
+def get_boto_config_with_user_agent(**kwargs) -> "Config":
     """
     Automatically add user agent string to boto configs.
 
@@ -28,7 +48,7 @@ def get_boto_config_with_user_agent(**kwargs) -> Config:
         Returns config instance which contains given parameters in it
     """
     gc = GlobalConfig()
-    return Config(
+    return botocore_config.Config(
         user_agent_extra=(
             f"aws-sam-cli/{__version__}/{gc.installation_id}" if gc.telemetry_enabled else f"aws-sam-cli/{__version__}"
         ),
@@ -41,7 +61,122 @@ class BotoProviderType(Protocol):
     def __call__(self, service_name: str) -> Any: ...  # pragma: no cover
 
 
-def get_boto_client_provider_from_session_with_config(session: Session, **kwargs) -> BotoProviderType:
+@dataclass
+class ClientCreationStats:
+    """Number of clients created for a service, and the time spent creating them"""
+
+    count: int = 0
+    total_seconds: float = 0.0
+
+
+class BotoClientRegistry:
+    """
+    Process-wide registry of boto clients, keyed by service, region, profile (or session) and client config.
+
+    boto3 clients are thread-safe, so a single client is shared by all the threads which need the same one, instead
+    of each flow or invocation creating its own client and connection pool. Sessions are not thread-safe, clients
+    are created under a lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._sessions: Dict[Tuple[Optional[str], Optional[str]], "Session"] = {}
+        # the session of a client is kept with it, so the id of the session is not reused while the client is cached
+        self._clients: Dict[Tuple, Tuple[Any, "Session"]] = {}
+        self._max_pool_connections = BOTO_MAX_POOL_CONNECTIONS or DEFAULT_MAX_POOL_CONNECTIONS
+        self._stats: Dict[str, ClientCreationStats] = {}
+
+    @property
+    def max_pool_connections(self) -> int:
+        return self._max_pool_connections
+
+    def scale_max_pool_connections(self, workers: int) -> None:
+        """
+        Makes the connection pools of the clients created from now on large enough for the given number of threads,
+        so they do not wait for a connection. Pools are never shrunk.
+
+        Parameters
+        ----------
+        workers: int
+            Number of threads which use the clients at the same time
+        """
+        if BOTO_MAX_POOL_CONNECTIONS:
+            return
+        with self._lock:
+            if workers > self._max_pool_connections:
+                LOG.debug("Scaling the connection pools of the boto clients to %d connections", workers)
+                self._max_pool_connections = workers
+
+    def get_session(self, region: Optional[str] = None, profile: Optional[str] = None) -> "Session":
+        """
+        Returns the session shared by the clients of the region and profile
+        """
+        with self._lock:
+            key = (region, profile)
+            if key not in self._sessions:
+                self._sessions[key] = boto3.Session(region_name=region, profile_name=profile)
+            return self._sessions[key]
+
+    def get_client(self, service_name: str, session: Optional["Session"] = None, **kwargs) -> Any:
+        """
+        Returns the shared client of the service, created with the given session and configuration
+
+        Parameters
+        ----------
+        service_name: str
+            Name of the service, e.g. "lambda"
+        session: Optional[Session]
+            Session the client is created with, defaults to the default boto3 session which is configured with the
+            region and profile of the command
+        kwargs :
+            Key-value params that will be passed to get_boto_config_with_user_agent
+
+        Returns
+        -------
+            The boto client
+        """
+        kwargs.setdefault("max_pool_connections", self._max_pool_connections)
+        config_key = json.dumps(kwargs, sort_keys=True, default=repr)
+        with self._lock:
+            if session is None:
+                if boto3.DEFAULT_SESSION is None:
+                    boto3.setup_default_session()
+                session = boto3.DEFAULT_SESSION
+            key = (service_name, id(session), config_key)
+            cached = self._clients.get(key)
+            if cached:
+                return cached[0]
+
+            start = time.perf_counter()
+            client = session.client(service_name, config=get_boto_config_with_user_agent(**kwargs))
+            elapsed = time.perf_counter() - start
+
+            stats = self._stats.setdefault(service_name, ClientCreationStats())
+            stats.count += 1
+            stats.total_seconds += elapsed
+            LOG.debug("Created boto client (%s) in %.1f ms", service_name, elapsed * 1000)
+
+            self._clients[key] = (client, session)
+            return client
+
+    def get_stats(self) -> Dict[str, ClientCreationStats]:
+        """
+        Returns the number of clients created for each service and the time spent creating them
+        """
+        with self._lock:
+            return {name: ClientCreationStats(stats.count, stats.total_seconds) for name, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._clients.clear()
+            self._stats.clear()
+
+
+BOTO_CLIENT_REGISTRY = BotoClientRegistry()
+
+
+def get_boto_client_provider_from_session_with_config(session: "Session", **kwargs) -> BotoProviderType:
     """
     Returns a wrapper function for boto client with given configuration. It can be used like;
 
@@ -59,7 +194,7 @@ def get_boto_client_provider_from_session_with_config(session: Session, **kwargs
     -------
         A callable function which will return a boto client
     """
-    return lambda client_name: session.client(client_name, config=get_boto_config_with_user_agent(**kwargs))
+    return lambda client_name: BOTO_CLIENT_REGISTRY.get_client(client_name, session=session, **kwargs)
 
 
 def get_boto_client_provider_with_config(
@@ -85,11 +220,30 @@ def get_boto_client_provider_with_config(
         A callable function which will return a boto client
     """
     return get_boto_client_provider_from_session_with_config(
-        Session(region_name=region, profile_name=profile), **kwargs
+        BOTO_CLIENT_REGISTRY.get_session(region, profile), **kwargs
     )
 
 
-def get_boto_resource_provider_from_session_with_config(session: Session, **kwargs) -> BotoProviderType:
+def get_boto_client_with_config(service_name: str, **kwargs) -> Any:
+    """
+    Returns the shared client of the service created with the default boto3 session, which is configured with the
+    region and profile of the command
+
+    Parameters
+    ----------
+    service_name: str
+        Name of the service, e.g. "cloudformation"
+    kwargs :
+        Key-value params that will be passed to get_boto_config_with_user_agent
+
+    Returns
+    -------
+        The boto client
+    """
+    return BOTO_CLIENT_REGISTRY.get_client(service_name, **kwargs)
+
+
+def get_boto_resource_provider_from_session_with_config(session: "Session", **kwargs) -> BotoProviderType:
     """
     Returns a wrapper function for boto resource with given configuration. It can be used like;
 
@@ -133,7 +287,7 @@ def get_boto_resource_provider_with_config(
         A callable function which will return a boto resource
     """
     return get_boto_resource_provider_from_session_with_config(
-        Session(region_name=region, profile_name=profile), **kwargs
+        boto3.Session(region_name=region, profile_name=profile), **kwargs
     )
 
 
@@ -5,12 +5,10 @@ Wrapper to generated colored messages for printing in Terminal
 import logging
 import os
 import platform
+import sys
 from enum import Enum
 
 import click
-from rich.logging import RichHandler
-from rich.style import Style
-from rich.text import Text
 
 from samcli.lib.utils.sam_logging import SAM_CLI_LOGGER_NAME
 
@@ -22,6 +20,15 @@ if platform.system().lower() == "windows":
         pass
 
 
+def _has_rich_handler(logger: logging.Logger) -> bool:
+    # no handler can be a RichHandler if rich.logging was never imported, avoid importing it just for the check
+    if "rich.logging" not in sys.modules:
+        return False
+    from rich.logging import RichHandler
+
+    return any(isinstance(handler, RichHandler) for handler in logger.handlers)
+
+
 # Python 3.11 has StrEnum
 class Colors(str, Enum):
     SUCCESS = "green"
@@ -57,9 +64,7 @@ class Colored:
         colorize : bool
             Optional. Set this to True to turn on coloring. False will turn off coloring
         """
-        self.rich_logging = any(
-            isinstance(handler, RichHandler) for handler in logging.getLogger(SAM_CLI_LOGGER_NAME).handlers
-        )
+        self.rich_logging = _has_rich_handler(logging.getLogger(SAM_CLI_LOGGER_NAME))
         self.colorize = colorize
 
     def red(self, msg):
@@ -89,6 +94,9 @@ class Colored:
     def underline_log(self, msg):
         """Underline the input such that underlying Rich Logger understands it (if configured)."""
         if self.rich_logging:
+            from rich.style import Style
+            from rich.text import Text
+
             _color_msg = Text(msg, style=Style(underline=True))
             return _color_msg.markup if self.colorize else msg
         else:
@@ -105,6 +113,9 @@ class Colored:
 
     def _color_log(self, msg, color):
         """Marked up text with color used for logging with a logger"""
+        from rich.style import Style
+        from rich.text import Text
+
         _color_msg = Text(msg, style=Style(color=color))
         return _color_msg.markup if self.colorize else msg
 
@@ -0,0 +1,181 @@
+"""
+Cross-process advisory file locks
+"""
+
+import logging
+import os
+import platform
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Optional, Union
+
+LOG = logging.getLogger(__name__)
+
+if platform.system().lower() == "windows":  # pragma: no cover
+    import msvcrt
+
+    def _lock_file(file_handle: IO, blocking: bool) -> None:
+        file_handle.seek(0)
+        mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK  # type: ignore[attr-defined]
+        while True:
+            try:
+                msvcrt.locking(file_handle.fileno(), mode, 1)  # type: ignore[attr-defined]
+                return
+            except OSError:
+                # LK_LOCK only retries for ~10 seconds before giving up, keep waiting if blocking was requested
+                if not blocking:
+                    raise
+                time.sleep(0.1)
+
+    def _unlock_file(file_handle: IO) -> None:
+        file_handle.seek(0)
+        msvcrt.locking(file_handle.fileno(), msvcrt.LK_UNLCK, 1)  # type: ignore[attr-defined]
+
+else:
+    import fcntl
+
+    def _lock_file(file_handle: IO, blocking: bool) -> None:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        fcntl.flock(file_handle.fileno(), flags)
+
+    def _unlock_file(file_handle: IO) -> None:
+        fcntl.flock(file_handle.fileno(), fcntl.LOCK_UN)
+
+
+class FileLockTimeout(Exception):
+    """Raised when a FileLock could not be acquired"""
+
+
+class FileLock:
+    """
+    Exclusive advisory lock backed by a lock file on disk. The lock is shared between processes,
+    so it can be used to guard a resource (e.g. a cache directory) that several SAM CLI
+    invocations may be touching at the same time.
+    Can be used with `with` statement
+    """
+
+    def __init__(self, lock_path: Union[str, Path]):
+        """
+        Parameters
+        ----------
+        lock_path : Union[str, Path]
+            Path of the lock file, it will be created if it doesn't exist
+        """
+        self._lock_path = Path(lock_path)
+        self._file_handle: Optional[IO] = None
+
+    @property
+    def lock_path(self) -> Path:
+        return self._lock_path
+
+    @property
+    def is_locked(self) -> bool:
+        return self._file_handle is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Acquire the lock
+
+        Parameters
+        ----------
+        blocking : bool
+            Wait until the lock is available if True, otherwise return immediately
+
+        Returns
+        -------
+        bool
+            True if the lock was acquired, False if blocking is False and the lock is held by someone else
+        """
+        if self._file_handle:
+            return True
+
+        while True:
+            self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+            file_handle = open(self._lock_path, "a+")
+            try:
+                _lock_file(file_handle, blocking)
+            except OSError:
+                file_handle.close()
+                if blocking:
+                    raise FileLockTimeout(f"Unable to acquire lock {self._lock_path}")
+                return False
+
+            # the previous owner may have removed the lock file while we were waiting for it (see release),
+            # in which case the lock is taken on the new lock file instead
+            if self._is_current_lock_file(file_handle):
+                break
+            _unlock_file(file_handle)
+            file_handle.close()
+
+        LOG.debug("Acquired file lock %s", self._lock_path)
+        self._file_handle = file_handle
+        return True
+
+    def release(self, remove: bool = False) -> None:
+        """
+        Release the lock if it is held
+
+        Parameters
+        ----------
+        remove : bool
+            Remove the lock file before releasing the lock, when the guarded resource is gone
+        """
+        if not self._file_handle:
+            return
+
+        if remove:
+            try:
+                self._lock_path.unlink(missing_ok=True)
+            except OSError as ex:
+                # Windows doesn't remove files which are open
+                LOG.debug("Failed to remove lock file %s", self._lock_path, exc_info=ex)
+
+        try:
+            _unlock_file(self._file_handle)
+        finally:
+            self._file_handle.close()
+            self._file_handle = None
+            LOG.debug("Released file lock %s", self._lock_path)
+
+    def _is_current_lock_file(self, file_handle: IO) -> bool:
+        try:
+            return os.path.samestat(os.fstat(file_handle.fileno()), os.stat(self._lock_path))
+        except FileNotFoundError:
+            return False
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        self.release()
+
+
+def atomic_write_text(path: Union[str, Path], content: str, fsync: bool = True) -> None:
+    """
+    Write text to a file atomically, readers will either see the old content or the new content but never
+    a partially written file.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        Path of the file to write
+    content : str
+        Content to write
+    fsync : bool
+        Sync the content to disk before replacing the file. Caches which can be rebuilt may skip it, the file
+        is still replaced atomically but may be lost on a power failure
+    """
+    path = Path(path)
+    file_descriptor, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(file_descriptor, "w") as tmp_file:
+            tmp_file.write(content)
+            if fsync:
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
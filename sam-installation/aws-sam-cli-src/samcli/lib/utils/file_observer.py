@@ -3,20 +3,21 @@ Wraps watchdog to observe file system for any change.
 """
 
 import logging
+import os
 import platform
 import threading
+import time
 import uuid
 from abc import ABC, abstractmethod
 from pathlib import Path
 from threading import Lock, Thread
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 import docker
 from docker import DockerClient
 from docker.errors import ImageNotFound
 from docker.types import CancellableStream
 from watchdog.events import (
-    EVENT_TYPE_DELETED,
     EVENT_TYPE_OPENED,
     FileSystemEvent,
     FileSystemEventHandler,
@@ -27,13 +28,18 @@ from watchdog.observers.api import BaseObserver, ObservedWatch
 
 from samcli.cli.global_config import Singleton
 from samcli.lib.constants import DOCKER_MIN_API_VERSION
-from samcli.lib.utils.hash import dir_checksum, file_checksum
+from samcli.lib.utils.hash import file_checksum
 from samcli.lib.utils.packagetype import IMAGE, ZIP
 from samcli.local.lambdafn.config import FunctionConfig
 
 LOG = logging.getLogger(__name__)
 # Windows API error returned when attempting to perform I/O on closed pipe
 BROKEN_PIPE_ERROR = 109
+# Number of seconds to wait for a burst of file system events to settle before processing them,
+# 0 processes every event as soon as it is received
+FILE_OBSERVER_DEBOUNCE_WINDOW = float(os.environ.get("SAM_CLI_FILE_OBSERVER_DEBOUNCE_WINDOW", "0.1"))
+# Upper bound of the delay added by the debounce window while events keep arriving
+FILE_OBSERVER_DEBOUNCE_MAX_WAIT = 1.0
 
 
 class ResourceObserver(ABC):
@@ -410,6 +416,189 @@ class FileObserver(ResourceObserver):
         self._single_file_observer.stop()
 
 
+class _PathTrieNode:
+    __slots__ = ("children", "path", "groups")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_PathTrieNode"] = {}
+        self.path: Optional[str] = None
+        self.groups: Set[str] = set()
+
+
+class _PathTrie:
+    """
+    Trie of the observed paths keyed by path components, used to find the observed paths affected by an event
+    without comparing the event path against every observed path.
+    """
+
+    def __init__(self) -> None:
+        self._root = _PathTrieNode()
+
+    @staticmethod
+    def _split(path: str) -> List[str]:
+        return [part for part in os.path.normpath(path).split(os.sep) if part]
+
+    def _find_node(self, path: str) -> Optional[_PathTrieNode]:
+        node: Optional[_PathTrieNode] = self._root
+        for part in self._split(path):
+            node = node.children.get(part) if node else None
+        return node
+
+    def add(self, path: str, group: str) -> None:
+        node = self._root
+        for part in self._split(path):
+            node = node.children.setdefault(part, _PathTrieNode())
+        node.path = path
+        node.groups.add(group)
+
+    def remove(self, path: str, group: str) -> None:
+        nodes = [self._root]
+        parts = self._split(path)
+        for part in parts:
+            node = nodes[-1].children.get(part)
+            if not node:
+                return
+            nodes.append(node)
+        nodes[-1].groups.discard(group)
+        # prune the nodes that do not lead to any observed path anymore
+        for part, parent in zip(reversed(parts), reversed(nodes[:-1])):
+            child = parent.children[part]
+            if child.groups or child.children:
+                break
+            parent.children.pop(part)
+
+    def find_ancestors(self, path: str) -> List[Tuple[str, Set[str]]]:
+        """
+        Returns the observed paths that are the input path itself or one of its parents, with their groups
+        """
+        found = []
+        node: Optional[_PathTrieNode] = self._root
+        for part in self._split(path):
+            node = node.children.get(part) if node else None
+            if not node:
+                break
+            if node.groups and node.path:
+                found.append((node.path, node.groups))
+        return found
+
+    def find_descendants(self, path: str) -> List[Tuple[str, Set[str]]]:
+        """
+        Returns the observed paths that are children of the input path, with their groups
+        """
+        node = self._find_node(path)
+        found = []
+        stack = list(node.children.values()) if node else []
+        while stack:
+            node = stack.pop()
+            if node.groups and node.path:
+                found.append((node.path, node.groups))
+            stack.extend(node.children.values())
+        return found
+
+
+class _PathDigest:
+    """
+    Keeps the digest of every file under an observed path, so that a file system event only re-hashes the files
+    it names instead of the whole observed directory. The stat of each file is kept along with its digest, and
+    a file is only re-hashed if its size or modification time changed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        # file path -> (size, modification time, md5 digest)
+        self._files: Dict[str, Tuple[int, int, str]] = {}
+        # directory path -> names of its known direct children
+        self._children: Dict[str, Set[str]] = {}
+        if os.path.isdir(path):
+            self._scan_directory(path)
+        else:
+            self._update_file(path)
+
+    def contains(self, path: str) -> bool:
+        return path == self._path or path.startswith(self._path.rstrip(os.sep) + os.sep)
+
+    def update(self, paths: Set[str]) -> bool:
+        """
+        Update the digests of the input paths, directories are synced with their direct children
+
+        Parameters
+        ----------
+        paths: Set[str]
+            The changed files/directories paths, the paths outside of the observed path are ignored
+
+        Returns
+        -------
+        bool
+            True if the content of the observed path has changed
+        """
+        changed = False
+        for path in sorted(paths):
+            if not self.contains(path):
+                continue
+            try:
+                if os.path.isdir(path):
+                    changed |= self._sync_directory(path)
+                elif os.path.isfile(path):
+                    changed |= self._update_file(path)
+                else:
+                    changed |= self._remove(path)
+            except OSError as ex:
+                # the path got changed while reading it, the following events will bring the digests up to date
+                LOG.debug("Failed to update the digest of path %s", path, exc_info=ex)
+        return changed
+
+    def _add_child(self, path: str) -> None:
+        if path != self._path:
+            parent, name = os.path.split(path)
+            self._children.setdefault(parent, set()).add(name)
+
+    def _update_file(self, path: str) -> bool:
+        stat = os.stat(path)
+        previous = self._files.get(path)
+        if previous and previous[:2] == (stat.st_size, stat.st_mtime_ns):
+            return False
+        digest = file_checksum(path)
+        self._files[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        self._add_child(path)
+        return not previous or previous[2] != digest
+
+    def _scan_directory(self, path: str) -> bool:
+        changed = False
+        self._add_child(path)
+        for dirpath, dirnames, filenames in os.walk(path, followlinks=True):
+            self._children.setdefault(dirpath, set()).update(dirnames)
+            for filename in filenames:
+                changed |= self._update_file(os.path.join(dirpath, filename))
+        return changed
+
+    def _sync_directory(self, path: str) -> bool:
+        if path not in self._children:
+            return self._scan_directory(path)
+
+        changed = False
+        names = set()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                names.add(entry.name)
+                if entry.is_dir():
+                    # content changes of the known sub directories are reported by their own events
+                    if entry.path not in self._children:
+                        changed |= self._scan_directory(entry.path)
+                elif entry.is_file():
+                    changed |= self._update_file(entry.path)
+        for name in self._children[path] - names:
+            changed |= self._remove(os.path.join(path, name))
+        return changed
+
+    def _remove(self, path: str) -> bool:
+        changed = self._files.pop(path, None) is not None
+        for name in self._children.pop(path, set()):
+            changed |= self._remove(os.path.join(path, name))
+        parent, name = os.path.split(path)
+        self._children.get(parent, set()).discard(name)
+        return changed
+
+
 class SingletonFileObserver(metaclass=Singleton):
     """
     A Singleton class that will observe some file system paths for any change for multiple purposes.
@@ -419,7 +608,10 @@ class SingletonFileObserver(metaclass=Singleton):
         """
         Initialize the file observer
         """
-        self._observed_paths_per_group: Dict[str, Dict[str, str]] = {}
+        self._observed_paths_per_group: Dict[str, Set[str]] = {}
+        # digests of the observed paths, shared between the groups observing the same path
+        self._path_digests: Dict[str, _PathDigest] = {}
+        self._observed_paths_trie = _PathTrie()
         self._observed_groups_handlers: Dict[str, Callable] = {}
         self._observed_watches: Dict[str, ObservedWatch] = {}
         self._watch_dog_observed_paths: Dict[str, List[str]] = {}
@@ -437,56 +629,115 @@ class SingletonFileObserver(metaclass=Singleton):
         self._watch_lock = threading.Lock()
         self._lock: Lock = threading.Lock()
 
+        self._debounce_window = FILE_OBSERVER_DEBOUNCE_WINDOW
+        self._pending_lock = threading.Lock()
+        self._pending_paths: Set[str] = set()
+        self._first_pending_time: Optional[float] = None
+        self._flush_timer: Optional[threading.Timer] = None
+
     def on_change(self, event: FileSystemEvent) -> None:
         """
         It got executed once there is a change in one of the paths that watchdog is observing.
-        This method will check if any of the input paths is really changed, and based on that it will
-        invoke the input on_change function with the changed paths
+        The changed paths are collected, and processed together once no new event arrives during the debounce window,
+        so that a burst of events (e.g. an editor saving a file, or a git checkout) is handled only once.
 
         Parameters
         ----------
         event: watchdog.events.FileSystemEvent
             Determines that there is a change happened to some file/dir in the observed paths
         """
-        with self._watch_lock:
-            if event.event_type == EVENT_TYPE_OPENED:
-                LOG.debug("Ignoring file system OPENED event")
+        if event.event_type == EVENT_TYPE_OPENED:
+            LOG.debug("Ignoring file system OPENED event")
+            return
+
+        LOG.debug("a %s change got detected in path %s", event.event_type, event.src_path)
+        paths = [os.fsdecode(event.src_path)]
+        if getattr(event, "dest_path", None):
+            paths.append(os.fsdecode(event.dest_path))
+
+        with self._pending_lock:
+            self._pending_paths.update(paths)
+            if self._debounce_window > 0:
+                self._schedule_flush()
                 return
 
-            LOG.debug("a %s change got detected in path %s", event.event_type, event.src_path)
-            for group, _observed_paths in self._observed_paths_per_group.items():
-                observed_paths = None
-                if event.event_type == EVENT_TYPE_DELETED:
-                    observed_paths = [
-                        path
-                        for path in _observed_paths
-                        if path == event.src_path
-                        or path in self._watch_dog_observed_paths.get(f"{event.src_path!r}_False", [])
-                    ]
-                elif isinstance(event.src_path, str):
-                    observed_paths = [path for path in _observed_paths if event.src_path.startswith(path)]
-
-                if not observed_paths:
-                    continue
-
-                LOG.debug("affected paths of this change %s", observed_paths)
-                changed_paths = []
-                for path in observed_paths:
-                    path_obj = Path(path)
-                    # The path got deleted
-                    if not path_obj.exists():
-                        _observed_paths.pop(path, None)
-                        changed_paths += [path]
-                    else:
-                        new_checksum = calculate_checksum(path)
-                        if new_checksum and new_checksum != _observed_paths.get(path, None):
-                            changed_paths += [path]
-                            _observed_paths[path] = new_checksum
-                        else:
-                            LOG.debug("the path %s content does not change", path)
-
-                if changed_paths:
-                    self._observed_groups_handlers[group](changed_paths)
+        self._flush_pending_changes()
+
+    def _schedule_flush(self) -> None:
+        """
+        (Re)start the timer that processes the pending changes, the processing is delayed until there are no new
+        events for the debounce window, but not longer than FILE_OBSERVER_DEBOUNCE_MAX_WAIT after the first event.
+        Must be called while holding the pending lock.
+        """
+        now = time.monotonic()
+        if self._first_pending_time is None:
+            self._first_pending_time = now
+        if self._flush_timer:
+            self._flush_timer.cancel()
+        delay = min(self._debounce_window, max(0.0, self._first_pending_time + FILE_OBSERVER_DEBOUNCE_MAX_WAIT - now))
+        self._flush_timer = threading.Timer(delay, self._flush_pending_changes)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_pending_changes(self) -> None:
+        with self._pending_lock:
+            paths = self._pending_paths
+            self._pending_paths = set()
+            self._first_pending_time = None
+            self._flush_timer = None
+
+        if paths:
+            with self._watch_lock:
+                self._process_changes(paths)
+
+    def _process_changes(self, paths: Set[str]) -> None:
+        """
+        Check if any of the observed paths is really changed, and based on that invoke the groups' on_change
+        functions with their changed paths. Only the files named in the events are re-hashed.
+
+        Parameters
+        ----------
+        paths: Set[str]
+            The files/dirs paths reported by the file system events
+        """
+        # observed path -> the event paths under it
+        affected_paths: Dict[str, Set[str]] = {}
+        for path in paths:
+            observed_paths = self._observed_paths_trie.find_ancestors(path)
+            if not os.path.exists(path):
+                # a deleted directory takes all the observed paths under it
+                observed_paths += self._observed_paths_trie.find_descendants(path)
+            for observed_path, _ in observed_paths:
+                affected_paths.setdefault(observed_path, set()).add(path)
+
+        if not affected_paths:
+            return
+
+        LOG.debug("affected paths of this change %s", list(affected_paths))
+        changed_paths_per_group: Dict[str, List[str]] = {}
+        for observed_path, event_paths in affected_paths.items():
+            groups = [group for group, paths in self._observed_paths_per_group.items() if observed_path in paths]
+            # The path got deleted
+            if not Path(observed_path).exists():
+                for group in groups:
+                    self._forget_path(observed_path, group)
+            elif not self._path_digests[observed_path].update(event_paths):
+                LOG.debug("the path %s content does not change", observed_path)
+                continue
+            for group in groups:
+                changed_paths_per_group.setdefault(group, []).append(observed_path)
+
+        for group, changed_paths in changed_paths_per_group.items():
+            self._observed_groups_handlers[group](changed_paths)
+
+    def _forget_path(self, path: str, group: str) -> None:
+        """
+        Remove the input path from the group observed paths, and drop its digest once no group observes it
+        """
+        self._observed_paths_per_group[group].discard(path)
+        self._observed_paths_trie.remove(path, group)
+        if not any(path in paths for paths in self._observed_paths_per_group.values()):
+            self._path_digests.pop(path, None)
 
     def add_group(self, group: str, on_change: Callable) -> None:
         """
@@ -503,7 +754,7 @@ class SingletonFileObserver(metaclass=Singleton):
         """
         if group in self._observed_paths_per_group:
             raise Exception(f"The group {group} of paths is already watched")
-        self._observed_paths_per_group[group] = {}
+        self._observed_paths_per_group[group] = set()
         self._observed_groups_handlers[group] = on_change
 
     def watch(self, resource: str, group: str) -> None:
@@ -531,11 +782,13 @@ class SingletonFileObserver(metaclass=Singleton):
             if not path_obj.exists():
                 raise FileObserverException("Can not observe non exist path")
 
-            _observed_paths = self._observed_paths_per_group[group]
-            _check_sum = calculate_checksum(resource)
-            if not _check_sum:
-                raise Exception(f"Failed to calculate the hash of resource {resource}")
-            _observed_paths[resource] = _check_sum
+            if resource not in self._path_digests:
+                try:
+                    self._path_digests[resource] = _PathDigest(resource)
+                except OSError as ex:
+                    raise Exception(f"Failed to calculate the hash of resource {resource}") from ex
+            self._observed_paths_per_group[group].add(resource)
+            self._observed_paths_trie.add(resource, group)
 
             LOG.debug("watch resource %s", resource)
             # recursively watch the input path, and all child path for any modification
@@ -625,11 +878,10 @@ class SingletonFileObserver(metaclass=Singleton):
         # here, we need to only stop watching the input path in a specific recursive mode
         original_watch_dog_path = watch_dog_path
         watch_dog_path = f"{watch_dog_path}_{recursive}"
-        _observed_paths = self._observed_paths_per_group[group]
         child_paths = self._watch_dog_observed_paths.get(watch_dog_path, [])
         if original_path in child_paths:
             child_paths.remove(original_path)
-            _observed_paths.pop(original_path, None)
+            self._forget_path(original_path, group)
         if not child_paths:
             self._watch_dog_observed_paths.pop(watch_dog_path, None)
             if self._observed_watches.get(watch_dog_path, None):
@@ -649,18 +901,12 @@ class SingletonFileObserver(metaclass=Singleton):
         """
         Stop Observing.
         """
+        with self._pending_lock:
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._pending_paths = set()
+            self._first_pending_time = None
         with self._lock:
             if self._observer.is_alive():
                 self._observer.stop()
-
-
-def calculate_checksum(path: str) -> Optional[str]:
-    try:
-        path_obj = Path(path)
-        if path_obj.is_file():
-            checksum = file_checksum(path)
-        else:
-            checksum = dir_checksum(path)
-        return checksum
-    except Exception:
-        return None
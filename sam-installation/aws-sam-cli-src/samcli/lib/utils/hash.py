@@ -102,6 +102,49 @@ def dir_checksum(
     return cast(str, hash_generator.hexdigest())
 
 
+def dir_stat_checksum(directory: str, followlinks: bool = True, hash_generator: Any = None) -> str:
+    """
+    Cheap checksum of a directory which only looks at the file metadata (relative path, size and modification
+    time) instead of the file contents. It changes whenever a file is added, removed or modified, so it can be used
+    as a cache key without reading the whole directory.
+
+    Parameters
+    ----------
+    directory : str
+        A directory or file with an absolute path
+    followlinks : bool
+        Follow symbolic links through the given directory
+    hash_generator : hashlib._Hash
+        The hashing method (hashlib _Hash object) that generates checksum. Defaults to hashlib.md5.
+
+    Returns
+    -------
+    checksum hash of the directory metadata.
+    """
+    if not hash_generator:
+        hash_generator = _get_md5()
+
+    if os.path.isfile(directory):
+        files = [directory]
+    else:
+        files = []
+        for dirpath, _, filenames in os.walk(directory, followlinks=followlinks):
+            files.extend(os.path.join(dirpath, filename) for filename in filenames)
+        files.sort()
+
+    for file in files:
+        try:
+            file_stat = os.stat(file)
+        except OSError:
+            # broken symlink
+            continue
+        hash_generator.update(
+            f"{os.path.relpath(file, directory)}:{file_stat.st_size}:{file_stat.st_mtime_ns}".encode("utf-8")
+        )
+
+    return cast(str, hash_generator.hexdigest())
+
+
 def str_checksum(content: str, hash_generator: Any = None) -> str:
     """
     return a md5 checksum of a given string
@@ -0,0 +1,48 @@
+"""
+Lazy loading of the heavy dependencies, so they do not add to the startup time of commands that do not use them
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+from types import ModuleType
+
+# Set to 1 to import the lazily loaded modules right away, e.g. to find import errors early
+EAGER_IMPORTS = os.environ.get("SAM_CLI_EAGER_IMPORTS", "0") == "1"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns a module which is only executed the first time one of its attributes is used. It is a drop-in
+    replacement for ``import name`` at the top of a module, e.g. ``docker = lazy_import("docker")``.
+
+    Parameters
+    ----------
+    name: str
+        Absolute name of the module
+
+    Returns
+    -------
+    ModuleType
+        The module, loaded or not
+    """
+    module = sys.modules.get(name)
+    if module is not None or EAGER_IMPORTS:
+        return module or importlib.import_module(name)
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+    # like the import statement, make the submodule available as an attribute of its package
+    parent_name, _, child_name = name.rpartition(".")
+    if parent_name:
+        setattr(sys.modules[parent_name], child_name, module)
+    return module
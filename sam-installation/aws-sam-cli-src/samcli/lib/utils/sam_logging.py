@@ -6,9 +6,6 @@ import logging
 import os
 import sys
 
-from rich.console import Console
-from rich.logging import RichHandler
-
 SAM_CLI_FORMATTER = logging.Formatter("%(message)s")
 SAM_CLI_FORMATTER_WITH_TIMESTAMP = logging.Formatter("%(asctime)s | %(message)s")
 
@@ -38,20 +35,24 @@ class SamCliLogger:
         handlers = logger.handlers
         if handlers:
             log_stream_handler = handlers[0]
-        else:
-            log_stream_handler = (
-                RichHandler(console=Console(stderr=True), show_time=False, show_path=False, show_level=False)
-                if sys.stderr.isatty()
-                and not any(
-                    [
-                        os.getenv(NO_LOGGING_COLOR_ENV_VAR),
-                        os.getenv(SAM_NO_LOGGING_COLOR_ENV_VAR),
-                        os.getenv(TERMINAL_ENV_VAR) == DUMB_TERMINAL,
-                    ]
-                )
-                else logging.StreamHandler()
+        elif sys.stderr.isatty() and not any(
+            [
+                os.getenv(NO_LOGGING_COLOR_ENV_VAR),
+                os.getenv(SAM_NO_LOGGING_COLOR_ENV_VAR),
+                os.getenv(TERMINAL_ENV_VAR) == DUMB_TERMINAL,
+            ]
+        ):
+            # rich is only imported when it is used, it takes a noticeable part of the CLI startup time
+            from rich.console import Console
+            from rich.logging import RichHandler
+
+            log_stream_handler = RichHandler(
+                console=Console(stderr=True), show_time=False, show_path=False, show_level=False
             )
             logger.addHandler(log_stream_handler)
+        else:
+            log_stream_handler = logging.StreamHandler()
+            logger.addHandler(log_stream_handler)
         log_stream_handler.setLevel(logging.DEBUG)
         log_stream_handler.setFormatter(formatter)
 
@@ -2,23 +2,64 @@
 Tarball Archive utility
 """
 
+import io
 import logging
 import os
 import tarfile
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from tempfile import TemporaryFile
-from typing import IO, Callable, Dict, List, Literal, Optional, Union
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Union
 
 LOG = logging.getLogger(__name__)
 
 
+# Size of the chunks read from the pipe of a streamed tarball
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Paths validated by _validate_destinations_exists, with the modification times of the directories that were
+# scanned and the symlinks found in them. Adding, removing or replacing a symlink changes the modification time of
+# its directory, but removing the destination of a symlink doesn't, so the symlinks are checked again on every use
+_VALIDATED_DESTINATIONS: Dict[str, Tuple[Dict[str, int], List[str]]] = {}
+_VALIDATED_DESTINATIONS_LOCK = threading.Lock()
+
+
+class _TarballStream(io.RawIOBase):
+    """
+    Read end of the pipe a tarball is being written to. Iterating it yields fixed size chunks,
+    so that it can be sent as a chunked request body while the tarball is still being produced.
+    """
+
+    def __init__(self, read_fd: int):
+        super().__init__()
+        self._file = os.fdopen(read_fd, "rb")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self._file.readinto(buffer)  # type: ignore[no-any-return]
+
+    def __iter__(self) -> Iterator[bytes]:  # type: ignore[override]
+        while True:
+            chunk = self._file.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
 @contextmanager
 def create_tarball(
     tar_paths: Dict[Union[str, Path], str],
     tar_filter: Optional[Callable[[tarfile.TarInfo], Union[None, tarfile.TarInfo]]] = None,
     mode: Literal["x", "x:", "a", "a:", "w", "w:", "w:tar"] = "w",
     dereference: bool = False,
+    stream: bool = False,
 ):
     """
     Context Manger that creates the tarball of the Docker Context to use for building the image
@@ -30,17 +71,19 @@ def create_tarball(
     tar_filter: Optional[Callable[[tarfile.TarInfo], Union[None, tarfile.TarInfo]]]
         A method that modifies the tar file entry before adding it to the archive. Default to `None`
     mode: str
-        The mode in which the tarfile is opened. Defaults to "w".
+        The mode in which the tarfile is opened. Defaults to "w". Ignored when streaming
     dereference: bool
         Pass `True` to resolve symlinks before adding to archive. Otherwise, adds the symlink itself to the archive
+    stream: bool
+        Pass `True` to get a pipe the tarball is written to by a background thread, instead of a temporary file
+        holding the whole tarball. The pipe can only be read sequentially, and reading it must not stop
+        before the end is reached, unless the context is exited.
 
     Yields
     ------
     IO
         The tarball file
     """
-    tarballfile = TemporaryFile()
-
     do_dereferece = dereference
 
     # validate that the destinations for the symlink targets exist
@@ -48,6 +91,13 @@ def create_tarball(
         LOG.warning("Falling back to not resolving symlinks to create a tarball.")
         do_dereferece = False
 
+    if stream:
+        with _stream_tarball(tar_paths, tar_filter, do_dereferece) as tarball_stream:
+            yield tarball_stream
+        return
+
+    tarballfile = TemporaryFile()
+
     with tarfile.open(fileobj=tarballfile, mode=mode, dereference=do_dereferece) as archive:
         for path_on_system, path_in_tarball in tar_paths.items():
             archive.add(path_on_system, arcname=path_in_tarball, filter=tar_filter)
@@ -62,11 +112,58 @@ def create_tarball(
         tarballfile.close()
 
 
+@contextmanager
+def _stream_tarball(
+    tar_paths: Dict[Union[str, Path], str],
+    tar_filter: Optional[Callable[[tarfile.TarInfo], Union[None, tarfile.TarInfo]]],
+    dereference: bool,
+):
+    """
+    Writes the tarball to a pipe from a background thread, and yields the read end of the pipe
+
+    Raises
+    ------
+    Exception
+        Any error raised while writing the tarball, once the tarball has been fully read
+    """
+    read_fd, write_fd = os.pipe()
+    errors: List[BaseException] = []
+
+    def write_tarball():
+        try:
+            with os.fdopen(write_fd, "wb") as pipe_writer:
+                # "w|" writes the archive as a stream of blocks, without seeking
+                with tarfile.open(fileobj=pipe_writer, mode="w|", dereference=dereference) as archive:
+                    for path_on_system, path_in_tarball in tar_paths.items():
+                        archive.add(path_on_system, arcname=path_in_tarball, filter=tar_filter)
+        except BrokenPipeError:
+            LOG.debug("Tarball stream was closed before the tarball was fully written")
+        except BaseException as ex:  # pylint: disable=broad-except
+            errors.append(ex)
+
+    writer_thread = threading.Thread(target=write_tarball, daemon=True)
+    tarball_stream = _TarballStream(read_fd)
+    writer_thread.start()
+
+    try:
+        yield tarball_stream
+    finally:
+        # closing the read end unblocks the writer if the tarball wasn't fully read
+        tarball_stream.close()
+        writer_thread.join()
+
+    if errors:
+        raise errors[0]
+
+
 def _validate_destinations_exists(tar_paths: Union[List[Union[str, Path]], List[Path]]) -> bool:
     """
     Validates whether the destination of a symlink exists by resolving the link
     and checking the resolved path.
 
+    Every tree is scanned once, only symlinks are resolved. Valid trees are cached until one of
+    their directories is modified, the symlinks of a cached tree are checked again on every call.
+
     Parameters
     ----------
     tar_paths: List[Union[str, Path]]
@@ -78,29 +175,109 @@ def _validate_destinations_exists(tar_paths: Union[List[Union[str, Path]], List[
         True all the checked paths exist, otherwise returns false
     """
     for file in tar_paths:
-        file_path_obj = Path(file)
+        file_path = os.path.abspath(str(file))
+
+        with _VALIDATED_DESTINATIONS_LOCK:
+            cached_result = _VALIDATED_DESTINATIONS.get(file_path)
+
+        if cached_result and _get_modification_times(cached_result[0].keys()) == cached_result[0]:
+            is_valid = _symlink_destinations_exist(cached_result[1])
+        else:
+            is_valid, modification_times, symlinks = _scan_symlink_destinations(file_path)
+            # a missing destination may be created later without touching the symlink, only cache valid trees
+            if is_valid:
+                with _VALIDATED_DESTINATIONS_LOCK:
+                    _VALIDATED_DESTINATIONS[file_path] = (modification_times, symlinks)
+
+        if not is_valid:
+            # exits early
+            return False
+
+    return True
 
+
+def _get_modification_times(paths: Iterable[str]) -> Dict[str, int]:
+    modification_times = {}
+    for path in paths:
         try:
-            resolved_path = file_path_obj.resolve()
+            modification_times[path] = os.lstat(path).st_mtime_ns
         except OSError:
-            # this exception will occur on Windows and will return
-            # a WinError 123
-            LOG.warning(f"Failed to resolve file {file_path_obj} on the host machine")
-            return False
+            modification_times[path] = -1
+    return modification_times
 
-        if file_path_obj.is_dir():
-            # recursively call this method to validate the children are not symlinks to empty locations
-            children = list(file_path_obj.iterdir())
-            if not _validate_destinations_exists(children):
-                # exits early
-                return False
-        elif file_path_obj.is_symlink() and not resolved_path.exists():
-            LOG.warning(f"Symlinked file {file_path_obj} -> {resolved_path} does not exist!")
-            return False
 
+def _symlink_destinations_exist(symlinks: List[str]) -> bool:
+    for symlink in symlinks:
+        if not os.path.exists(symlink):
+            LOG.warning(f"Symlinked file {symlink} -> {os.path.realpath(symlink)} does not exist!")
+            return False
     return True
 
 
+def _scan_symlink_destinations(path: str) -> Tuple[bool, Dict[str, int], List[str]]:
+    """
+    Walks the given file or directory once and checks that every symlink found in it points to an existing path
+
+    Parameters
+    ----------
+    path: str
+        Absolute path of the file or directory to check
+
+    Return
+    ------
+    bool:
+        True if all the symlinks point to existing paths, otherwise returns false
+    Dict[str, int]:
+        Modification times of the path and the directories that were scanned
+    List[str]:
+        Symlinks found in the path, including the path itself
+    """
+    modification_times = _get_modification_times([path])
+    symlinks = []
+
+    try:
+        os.path.realpath(path)
+    except OSError:
+        # this exception will occur on Windows and will return
+        # a WinError 123
+        LOG.warning(f"Failed to resolve file {path} on the host machine")
+        return False, modification_times, symlinks
+
+    if os.path.islink(path):
+        if not os.path.exists(path):
+            LOG.warning(f"Symlinked file {path} -> {os.path.realpath(path)} does not exist!")
+            return False, modification_times, symlinks
+        symlinks.append(path)
+
+    directories = [path] if os.path.isdir(path) else []
+    visited = set()
+    while directories:
+        directory = directories.pop()
+        real_directory = os.path.realpath(directory)
+        # symlinked directories are followed, make sure cycles don't loop forever
+        if real_directory in visited:
+            continue
+        visited.add(real_directory)
+        modification_times.update(_get_modification_times([directory, real_directory]))
+
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            LOG.warning(f"Failed to resolve file {directory} on the host machine")
+            return False, modification_times, symlinks
+
+        for entry in entries:
+            if entry.is_symlink():
+                if not os.path.exists(entry.path):
+                    LOG.warning(f"Symlinked file {entry.path} -> {os.path.realpath(entry.path)} does not exist!")
+                    return False, modification_times, symlinks
+                symlinks.append(entry.path)
+            if entry.is_dir(follow_symlinks=True):
+                directories.append(entry.path)
+
+    return True, modification_times, symlinks
+
+
 def _is_within_directory(directory: Union[str, os.PathLike], target: Union[str, os.PathLike]) -> bool:
     """Checks if target is located under directory"""
     abs_directory = os.path.abspath(directory)
@@ -4,7 +4,10 @@ Date & Time related utilities
 
 import datetime
 
-import dateparser
+from samcli.lib.utils.lazy_import import lazy_import
+
+# slow to import, and only needed by the commands which accept relative times
+dateparser = lazy_import("dateparser")
 
 
 def timestamp_to_iso(timestamp):
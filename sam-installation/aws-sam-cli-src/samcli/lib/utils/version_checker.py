@@ -2,15 +2,21 @@
 Contains information about newer version checker for SAM CLI
 """
 
+import atexit
 import logging
+import threading
 from datetime import datetime, timedelta
 from functools import wraps
+from typing import Any, Dict, Optional
 
 import click
-from requests import get
 
 from samcli import __version__ as installed_version
 from samcli.cli.global_config import GlobalConfig
+from samcli.lib.utils.lazy_import import lazy_import
+
+# loaded on first use, the version is only checked once a week, from a background thread
+requests = lazy_import("requests")
 
 LOG = logging.getLogger(__name__)
 
@@ -39,17 +45,102 @@ def check_newer_version(func):
 
     @wraps(func)
     def wrapped(*args, **kwargs):
+        # fetch the latest version while the command runs, the command never waits for it
+        version_check = _start_version_check()
         # execute actual command first
         actual_result = func(*args, **kwargs)
         # check and inform newer version if it is available
-        _inform_newer_version()
+        _inform_newer_version(version_check)
 
         return actual_result
 
     return wrapped
 
 
-def _inform_newer_version(force_check=False) -> None:
+class VersionCheck:
+    """
+    Fetches the latest SAM CLI version from PyPI in a daemon thread. The response is cached in the GlobalConfig,
+    with its ETag, so the next checks are revalidated with If-None-Match instead of downloading it again.
+
+    The GlobalConfig is only written from the main thread: a fetch which did not finish by the end of the command
+    is saved on exit if it finished by then, so it is used by the next command instead of being fetched again.
+    """
+
+    def __init__(self, cached_version: Optional[Dict[str, Any]] = None):
+        """
+        Parameters
+        ----------
+        cached_version: Optional[Dict[str, Any]]
+            The previously fetched version, with the "version" and "etag" keys
+        """
+        self._cached_version = cached_version or {}
+        self._fetched_version: Optional[Dict[str, Any]] = None
+        self._done = threading.Event()
+        self._saved = False
+
+    def start(self) -> "VersionCheck":
+        threading.Thread(target=self._run, name="VersionCheck", daemon=True).start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def latest_version(self) -> Optional[str]:
+        """
+        Returns the latest version if it was fetched, None otherwise
+        """
+        return self._fetched_version.get("version") if self._fetched_version else None
+
+    def _run(self) -> None:
+        try:
+            self._fetched_version = fetch_latest_version(self._cached_version)
+        except Exception as e:
+            LOG.debug("New version check failed", exc_info=e)
+        finally:
+            self._done.set()
+
+    def save(self) -> None:
+        """
+        Saves the fetched version in the GlobalConfig, if it was fetched
+        """
+        if self._saved or not self._fetched_version:
+            return
+        self._saved = True
+        try:
+            GlobalConfig().latest_version = self._fetched_version
+        except Exception as e:
+            LOG.debug("Saving the latest version failed", exc_info=e)
+
+
+def _start_version_check() -> Optional[VersionCheck]:
+    """
+    Starts fetching the latest version if the weekly check is overdue and it was not fetched by a previous command
+    since the last check. Returns None if the version check is not needed or if the fetched version is cached.
+    """
+    try:
+        global_config = GlobalConfig()
+        last_version_check = global_config.last_version_check
+        if not is_version_check_overdue(last_version_check):
+            return None
+        cached_version = global_config.latest_version
+        if _is_fetched_since(cached_version, last_version_check):
+            return None
+        return VersionCheck(cached_version).start()
+    except Exception as e:
+        LOG.debug("Starting the new version check failed", exc_info=e)
+        return None
+
+
+def _is_fetched_since(cached_version: Optional[Dict[str, Any]], last_version_check: Optional[float]) -> bool:
+    fetched_at = (cached_version or {}).get("fetchedAt")
+    if type(fetched_at) not in [int, float] or is_version_check_overdue(fetched_at):
+        return False
+    return last_version_check is None or fetched_at > last_version_check
+
+
+def _inform_newer_version(version_check: Optional[VersionCheck] = None) -> None:
     """
     Compares installed SAM CLI version with the up to date version from PyPi,
     and print information if up to date version is different then what is installed now
@@ -59,35 +150,77 @@ def _inform_newer_version(force_check=False) -> None:
 
     Parameters
     ----------
-    force_check: bool
-        When it is True, it will trigger checking new version of SAM CLI. Default value is False
+    version_check: Optional[VersionCheck]
+        The version check started with the command, if the latest version was not fetched by a previous command
 
     """
     # run everything else in try-except block
-    global_config = None
-    need_to_update_last_check_time = True
     try:
         global_config = GlobalConfig()
         last_version_check = global_config.last_version_check
+        if not is_version_check_overdue(last_version_check):
+            return
 
-        if force_check or is_version_check_overdue(last_version_check):
-            fetch_and_compare_versions()
+        if version_check is None:
+            cached_version = global_config.latest_version
+            if not _is_fetched_since(cached_version, last_version_check):
+                return
+            latest_version = (cached_version or {}).get("version")
+        elif version_check.done:
+            version_check.save()
+            latest_version = version_check.latest_version
         else:
-            need_to_update_last_check_time = False
+            # never wait for PyPI, the version is saved on exit if it was fetched by then
+            LOG.debug("New version check did not finish before the end of the command")
+            atexit.register(version_check.save)
+            return
     except Exception as e:
         LOG.debug("New version check failed", exc_info=e)
+        return
+
+    try:
+        compare_versions(latest_version)
     finally:
-        if need_to_update_last_check_time:
-            update_last_check_time()
+        update_last_check_time()
+
+
+def fetch_latest_version(cached_version: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Fetches the latest SAM CLI version from PyPI, the cached version is revalidated with its ETag
+
+    Parameters
+    ----------
+    cached_version: Optional[Dict[str, Any]]
+        The previously fetched version, with the "version" and "etag" keys
+
+    Returns
+    -------
+    Dict[str, Any]
+        The latest version, the ETag of the response and the time it was fetched at
+    """
+    cached_version = cached_version or {}
+    headers = {}
+    if cached_version.get("etag") and cached_version.get("version"):
+        headers["If-None-Match"] = cached_version["etag"]
+
+    response = requests.get(AWS_SAM_CLI_PYPI_ENDPOINT, headers=headers, timeout=PYPI_CALL_TIMEOUT_IN_SECONDS)
+    if response.status_code == requests.codes.not_modified and headers:
+        latest_version = cached_version["version"]
+    else:
+        response.raise_for_status()
+        latest_version = response.json().get("info", {}).get("version", None)
+
+    return {
+        "version": latest_version,
+        "etag": response.headers.get("ETag"),
+        "fetchedAt": datetime.utcnow().timestamp(),
+    }
 
 
-def fetch_and_compare_versions() -> None:
+def compare_versions(latest_version: Optional[str]) -> None:
     """
-    Compare current up to date version with the installed one, and inform if a newer version available
+    Inform if the latest version is different than the installed one
     """
-    response = get(AWS_SAM_CLI_PYPI_ENDPOINT, timeout=PYPI_CALL_TIMEOUT_IN_SECONDS)
-    result = response.json()
-    latest_version = result.get("info", {}).get("version", None)
     LOG.debug("Installed version %s, current version %s", installed_version, latest_version)
     if latest_version and installed_version != latest_version:
         click.secho(
@@ -0,0 +1,126 @@
+"""
+Cache of the Lambda authorizer results, keyed by the identity source values of the request
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple, Union
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of authorizer results kept in the cache, the least recently used results are evicted first
+AUTHORIZER_CACHE_MAX_SIZE = int(os.environ.get("SAM_CLI_AUTHORIZER_CACHE_MAX_SIZE", "1000"))
+# API Gateway does not allow caching authorizer results longer than one hour
+MAX_RESULT_TTL = 3600
+
+
+def parse_result_ttl(value: Any, authorizer_name: str) -> Optional[int]:
+    """
+    Parses the authorizer result TTL (ReauthorizeEvery/AuthorizerResultTtlInSeconds) of a template
+
+    Parameters
+    ----------
+    value: Any
+        The TTL in seconds as defined in the template
+    authorizer_name: str
+        The name of the authorizer, used for logging
+
+    Returns
+    -------
+    Optional[int]
+        The TTL in seconds, None if it is not defined or invalid
+    """
+    if value is None:
+        return None
+
+    try:
+        ttl = int(value)
+    except (TypeError, ValueError):
+        LOG.warning("Ignoring the invalid result TTL '%s' of Lambda authorizer '%s'", value, authorizer_name)
+        return None
+
+    if not 0 <= ttl <= MAX_RESULT_TTL:
+        LOG.warning(
+            "Ignoring the result TTL '%s' of Lambda authorizer '%s', it must be between 0 and %s seconds",
+            value,
+            authorizer_name,
+            MAX_RESULT_TTL,
+        )
+        return None
+
+    return ttl
+
+
+class AuthorizerResultCache:
+    """
+    Size bounded LRU cache of the Lambda authorizer responses. The raw response is cached rather than the
+    authorization decision, so the policy is still evaluated against the method ARN of each request,
+    like API Gateway does.
+    """
+
+    def __init__(self, max_size: int = AUTHORIZER_CACHE_MAX_SIZE):
+        """
+        Parameters
+        ----------
+        max_size: int
+            Maximum number of cached authorizer responses
+        """
+        self._max_size = max_size
+        # cache key -> (expiry time, authorizer response)
+        self._results: "OrderedDict[Hashable, Tuple[float, Union[str, bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get(self, key: Hashable, now: Optional[float] = None) -> Optional[Union[str, bytes]]:
+        """
+        Returns the cached authorizer response of the key, None if it is not cached or it is expired
+        """
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            cached = self._results.get(key)
+            if cached and cached[0] > now:
+                self._results.move_to_end(key)
+                self._hits += 1
+                response: Optional[Union[str, bytes]] = cached[1]
+            else:
+                if cached:
+                    del self._results[key]
+                self._misses += 1
+                response = None
+            LOG.debug(
+                "Lambda authorizer cache %s (hits: %s, misses: %s)",
+                "hit" if response is not None else "miss",
+                self._hits,
+                self._misses,
+            )
+            return response
+
+    def put(self, key: Hashable, response: Union[str, bytes], ttl: int, now: Optional[float] = None) -> None:
+        """
+        Caches the authorizer response of the key for ttl seconds
+        """
+        if ttl <= 0 or self._max_size <= 0:
+            return
+
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            self._results[key] = (now + ttl, response)
+            self._results.move_to_end(key)
+            while len(self._results) > self._max_size:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
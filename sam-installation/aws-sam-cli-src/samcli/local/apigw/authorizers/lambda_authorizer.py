@@ -202,6 +202,7 @@ class LambdaAuthorizer(Authorizer):
         payload_version: str,
         validation_string: Optional[str] = None,
         use_simple_response: bool = False,
+        result_ttl: Optional[int] = None,
     ):
         """
         Creates a Lambda Authorizer class
@@ -222,6 +223,8 @@ class LambdaAuthorizer(Authorizer):
             The regular expression that can be used to validate headers
         use_simple_responses: bool = False
             Boolean representing whether to return a simple response or not
+        result_ttl: Optional[int] = None
+            Number of seconds the authorizer response is cached for, not cached if not set or 0
         """
         self.authorizer_name = authorizer_name
         self.lambda_name = lambda_name
@@ -229,6 +232,7 @@ class LambdaAuthorizer(Authorizer):
         self.validation_string = validation_string
         self.payload_version = payload_version
         self.use_simple_response = use_simple_response
+        self.result_ttl = result_ttl
 
         self._parse_identity_sources(identity_sources)
 
@@ -242,6 +246,7 @@ class LambdaAuthorizer(Authorizer):
             and self.payload_version == other.payload_version
             and self.authorizer_name == other.authorizer_name
             and self.type == other.type
+            and self.result_ttl == other.result_ttl
         )
 
     @property
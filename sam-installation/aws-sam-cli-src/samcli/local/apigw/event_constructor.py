@@ -23,7 +23,14 @@ LOG = logging.getLogger(__name__)
 
 
 def construct_v1_event(
-    flask_request, port, binary_types, stage_name=None, stage_variables=None, operation_name=None, api_type=Route.API
+    flask_request,
+    port,
+    binary_types,
+    stage_name=None,
+    stage_variables=None,
+    operation_name=None,
+    api_type=Route.API,
+    resource_path=None,
 ) -> Dict[str, Any]:
     """
     Helper method that constructs the Event to be passed to Lambda.
@@ -35,12 +42,13 @@ def construct_v1_event(
     :param stage_name: Optional, the stage name string
     :param stage_variables: Optional, API Gateway Stage Variables
     :param api_type: Optional, the type of api payload being constructed
+    :param resource_path: Optional, the API Gateway path of the route, converted from the request endpoint if not given
     :return: JSON object
     """
 
     identity = ContextIdentity(source_ip=flask_request.remote_addr)
 
-    endpoint = PathConverter.convert_path_to_api_gateway(flask_request.endpoint)
+    endpoint = resource_path or PathConverter.convert_path_to_api_gateway(flask_request.endpoint)
     method = flask_request.method
     protocol = flask_request.environ.get("SERVER_PROTOCOL", "HTTP/1.1")
     host = flask_request.host
@@ -3,9 +3,9 @@
 import base64
 import json
 import logging
-from datetime import datetime
-from io import StringIO
-from time import time
+import os
+from io import BytesIO, TextIOWrapper
+from time import perf_counter
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from flask import Flask, Request, request
@@ -19,6 +19,7 @@ from samcli.lib.providers.exceptions import MissingFunctionNameException
 from samcli.lib.providers.provider import Api, Cors
 from samcli.lib.telemetry.event import EventName, EventTracker, UsedFeature
 from samcli.lib.utils.stream_writer import StreamWriter
+from samcli.local.apigw.authorizers.authorizer_cache import AuthorizerResultCache
 from samcli.local.apigw.authorizers.lambda_authorizer import LambdaAuthorizer
 from samcli.local.apigw.event_constructor import construct_v1_event, construct_v2_event_http
 from samcli.local.apigw.exceptions import (
@@ -30,19 +31,22 @@ from samcli.local.apigw.exceptions import (
 )
 from samcli.local.apigw.path_converter import PathConverter
 from samcli.local.apigw.route import Route
+from samcli.local.apigw.route_latency import RouteLatencyRecorder
+from samcli.local.apigw.route_table import CompiledRoute, RouteTable
 from samcli.local.apigw.service_error_responses import ServiceErrorResponses
 from samcli.local.docker.exceptions import DockerContainerCreationFailedException
-from samcli.local.events.api_event import (
-    ContextHTTP,
-    ContextIdentity,
-    RequestContext,
-    RequestContextV2,
-)
 from samcli.local.lambdafn.exceptions import FunctionNotFound
 from samcli.local.services.base_local_service import BaseLocalService, LambdaOutputParser
 
 LOG = logging.getLogger(__name__)
 
+# Number of worker threads serving the requests, 0 keeps the Flask development server with a thread per connection
+LOCAL_API_WORKERS = int(os.environ.get("SAM_CLI_LOCAL_API_WORKERS", "0"))
+# Endpoint that returns the latency histogram of each route as JSON. It is only served if
+# SAM_CLI_LOCAL_API_LATENCY_ENDPOINT is set, since it would take precedence over a user {proxy+} route matching it
+LATENCY_ENDPOINT = "/__sam_cli__/latency"
+LATENCY_ENDPOINT_ENABLED = os.environ.get("SAM_CLI_LOCAL_API_LATENCY_ENDPOINT", "") not in ("", "0", "false")
+
 
 class CatchAllPathConverter(BaseConverter):
     regex = ".+"
@@ -69,6 +73,8 @@ class LocalApigwService(BaseLocalService):
         host: Optional[str] = None,
         stderr: Optional[StreamWriter] = None,
         ssl_context: Optional[Tuple[str, str]] = None,
+        max_workers: Optional[int] = None,
+        latency_endpoint: Optional[bool] = None,
     ):
         """
         Creates an ApiGatewayService
@@ -92,13 +98,29 @@ class LocalApigwService(BaseLocalService):
             Defaults to None
         stderr : samcli.lib.utils.stream_writer.StreamWriter
             Optional stream writer where the stderr from Docker container should be written to
+        max_workers : int
+            Optional. Number of worker threads serving the requests
+            Defaults to SAM_CLI_LOCAL_API_WORKERS, or the Flask development server if it is not set
+        latency_endpoint : bool
+            Optional. Whether to record the latency of the routes and serve it on LATENCY_ENDPOINT
+            Defaults to whether SAM_CLI_LOCAL_API_LATENCY_ENDPOINT is set
         """
-        super().__init__(lambda_runner.is_debugging(), port=port, host=host, ssl_context=ssl_context)
+        super().__init__(
+            lambda_runner.is_debugging(),
+            port=port,
+            host=host,
+            ssl_context=ssl_context,
+            max_workers=max_workers if max_workers is not None else LOCAL_API_WORKERS,
+        )
         self.api = api
         self.lambda_runner = lambda_runner
         self.static_dir = static_dir
-        self._dict_of_routes: Dict[str, Route] = {}
+        self._route_table = RouteTable(api.stage_name)
         self.stderr = stderr
+        if latency_endpoint is None:
+            latency_endpoint = LATENCY_ENDPOINT_ENABLED
+        self._route_latency: Optional[RouteLatencyRecorder] = RouteLatencyRecorder() if latency_endpoint else None
+        self._authorizer_cache = AuthorizerResultCache()
 
         self._click_session_id = None
 
@@ -141,12 +163,12 @@ class LocalApigwService(BaseLocalService):
                 default_route = api_gateway_route
                 continue
             path = PathConverter.convert_path_to_flask(api_gateway_route.path)
-            for route_key in self._generate_route_keys(api_gateway_route.methods, path):
-                self._dict_of_routes[route_key] = api_gateway_route
+            for method in api_gateway_route.methods:
+                self._route_table.add(api_gateway_route, method, path)
             self._app.add_url_rule(
                 path,
                 endpoint=path,
-                view_func=self._request_handler,
+                view_func=self._timed_request_handler,
                 methods=api_gateway_route.methods,
                 provide_automatic_options=False,
             )
@@ -165,11 +187,19 @@ class LocalApigwService(BaseLocalService):
             self._add_catch_all_path(all_methods, "/", default_route)
             self._add_catch_all_path(Route.ANY_HTTP_METHODS, "/<path:any_path>", default_route)
 
+        if self._route_latency is not None and not any(
+            rule.rule == LATENCY_ENDPOINT for rule in self._app.url_map.iter_rules()
+        ):
+            self._app.add_url_rule(
+                LATENCY_ENDPOINT, endpoint=LATENCY_ENDPOINT, view_func=self._latency_handler, methods=["GET"]
+            )
+
+        LOG.debug("Compiled %s routes", len(self._route_table))
         self._construct_error_handling()
 
     def _add_catch_all_path(self, methods: List[str], path: str, route: Route):
         """
-        Add the catch all route to the _app and the dictionary of routes.
+        Add the catch all route to the _app and the route table.
 
         :param list(str) methods: List of HTTP Methods
         :param str path: Path off the base url
@@ -179,53 +209,24 @@ class LocalApigwService(BaseLocalService):
         self._app.add_url_rule(
             path,
             endpoint=path,
-            view_func=self._request_handler,
+            view_func=self._timed_request_handler,
             methods=methods,
             provide_automatic_options=False,
         )
-        for route_key in self._generate_route_keys(methods, path):
-            self._dict_of_routes[route_key] = Route(
-                function_name=route.function_name,
-                path=path,
-                methods=methods,
-                event_type=Route.HTTP,
-                payload_format_version=route.payload_format_version,
-                is_default_route=True,
-                stack_path=route.stack_path,
-                authorizer_name=route.authorizer_name,
-                authorizer_object=route.authorizer_object,
-                use_default_authorizer=route.use_default_authorizer,
-            )
-
-    def _generate_route_keys(self, methods, path):
-        """
-        Generates the key to the _dict_of_routes based on the list of methods
-        and path supplied
-
-        Parameters
-        ----------
-        methods : List[str]
-            List of HTTP Methods
-        path : str
-            Path off the base url
-
-        Yields
-        ------
-        route_key : str
-            the route key in the form of "Path:Method"
-        """
+        catch_all_route = Route(
+            function_name=route.function_name,
+            path=path,
+            methods=methods,
+            event_type=Route.HTTP,
+            payload_format_version=route.payload_format_version,
+            is_default_route=True,
+            stack_path=route.stack_path,
+            authorizer_name=route.authorizer_name,
+            authorizer_object=route.authorizer_object,
+            use_default_authorizer=route.use_default_authorizer,
+        )
         for method in methods:
-            yield self._route_key(method, path)
-
-    @staticmethod
-    def _v2_route_key(method, path, is_default_route):
-        if is_default_route:
-            return "$default"
-        return "{} {}".format(method, path)
-
-    @staticmethod
-    def _route_key(method, path):
-        return "{}:{}".format(path, method)
+            self._route_table.add(catch_all_route, method, path)
 
     def _construct_error_handling(self):
         """
@@ -254,13 +255,7 @@ class LocalApigwService(BaseLocalService):
         str
             A built method ARN with fake values
         """
-        context = RequestContext() if event_type == Route.API else RequestContextV2()
-        method, path = flask_request.method, flask_request.path
-
-        return (
-            f"arn:aws:execute-api:us-east-1:{context.account_id}:"  # type: ignore
-            f"{context.api_id}/{self.api.stage_name}/{method}{path}"
-        )
+        return self._get_compiled_route(flask_request).method_arn(flask_request)
 
     def _generate_lambda_token_authorizer_event(
         self, flask_request: Request, route: Route, lambda_authorizer: LambdaAuthorizer
@@ -337,7 +332,11 @@ class LocalApigwService(BaseLocalService):
             }
 
     def _generate_lambda_request_authorizer_event(
-        self, flask_request: Request, route: Route, lambda_authorizer: LambdaAuthorizer
+        self,
+        flask_request: Request,
+        route: Route,
+        lambda_authorizer: LambdaAuthorizer,
+        route_lambda_event: Optional[dict] = None,
     ) -> dict:
         """
         Creates a Lambda authorizer request event
@@ -350,6 +349,9 @@ class LocalApigwService(BaseLocalService):
             Route object representing the endpoint to be invoked later
         lambda_authorizer: LambdaAuthorizer
             The Lambda authorizer the route is using
+        route_lambda_event: Optional[dict]
+            The event already generated for the route, the authorizer event is based on it instead of
+            generating the same event again
 
         Returns
         -------
@@ -357,23 +359,29 @@ class LocalApigwService(BaseLocalService):
             A Lambda authorizer event
         """
         method_arn = self._create_method_arn(flask_request, route.event_type)
-        method, endpoint = self.get_request_methods_endpoints(flask_request)
 
-        # generate base lambda event and load it into a dict
-        lambda_event = self._generate_lambda_event(flask_request, route, method, endpoint)
+        # generate base lambda event and load it into a dict, only top level keys are updated here, and the route
+        # request context gets the authorizer output later, so copying these two levels keeps both events apart
+        if route_lambda_event is not None:
+            lambda_event = dict(route_lambda_event)
+            if "requestContext" in lambda_event:
+                lambda_event["requestContext"] = dict(lambda_event["requestContext"])
+        else:
+            method, endpoint = self.get_request_methods_endpoints(flask_request)
+            lambda_event = self._generate_lambda_event(flask_request, route, method, endpoint)
         lambda_event.update({"type": LambdaAuthorizer.REQUEST.upper()})
 
-        # build context to form identity values
-        context = (
-            self._build_v1_context(route)
-            if lambda_authorizer.payload_version == LambdaAuthorizer.PAYLOAD_V1
-            else self._build_v2_context(route)
-        )
-
         if route.event_type == Route.API:
             # v1 requests only add method ARN
             lambda_event.update({"methodArn": method_arn})
         else:
+            # build context to form identity values
+            context = (
+                self._build_v1_context(route)
+                if lambda_authorizer.payload_version == LambdaAuthorizer.PAYLOAD_V1
+                else self._build_v2_context(route)
+            )
+
             # kwargs to pass into identity value finder
             kwargs = {
                 "headers": flask_request.headers,
@@ -400,7 +408,11 @@ class LocalApigwService(BaseLocalService):
         return lambda_event
 
     def _generate_lambda_authorizer_event(
-        self, flask_request: Request, route: Route, lambda_authorizer: LambdaAuthorizer
+        self,
+        flask_request: Request,
+        route: Route,
+        lambda_authorizer: LambdaAuthorizer,
+        route_lambda_event: Optional[dict] = None,
     ) -> dict:
         """
         Generate a Lambda authorizer event
@@ -413,6 +425,8 @@ class LocalApigwService(BaseLocalService):
             Route object representing the endpoint to be invoked later
         lambda_authorizer: LambdaAuthorizer
             The Lambda authorizer the route is using
+        route_lambda_event: Optional[dict]
+            The event already generated for the route, request authorizer events are based on it
 
         Returns
         -------
@@ -429,6 +443,8 @@ class LocalApigwService(BaseLocalService):
             "route": route,
             "lambda_authorizer": lambda_authorizer,
         }
+        if lambda_authorizer.type == LambdaAuthorizer.REQUEST:
+            kwargs["route_lambda_event"] = route_lambda_event
 
         return authorizer_events[lambda_authorizer.type](**kwargs)
 
@@ -456,30 +472,28 @@ class LocalApigwService(BaseLocalService):
         # the Lambda Event 2.0 is only used for the HTTP API gateway with defined payload format version equal 2.0
         # or none, as the default value to be used is 2.0
         # https://docs.aws.amazon.com/apigatewayv2/latest/api-reference/apis-apiid-integrations.html#apis-apiid-integrations-prop-createintegrationinput-payloadformatversion
-        if route.event_type == Route.HTTP and route.payload_format_version in [None, "2.0"]:
-            apigw_endpoint = PathConverter.convert_path_to_api_gateway(endpoint)
-            route_key = self._v2_route_key(method, apigw_endpoint, route.is_default_route)
-
+        compiled_route = self._route_table.get(method, endpoint) or CompiledRoute(
+            route, method, endpoint, self.api.stage_name
+        )
+        if compiled_route.uses_v2_event:
             return construct_v2_event_http(
                 flask_request=flask_request,
                 port=self.port,
                 binary_types=self.api.binary_media_types,
                 stage_name=self.api.stage_name,
                 stage_variables=self.api.stage_variables,
-                route_key=route_key,
+                route_key=compiled_route.v2_route_key,
             )
 
-        # For Http Apis with payload version 1.0, API Gateway never sends the OperationName.
-        route_key = route.operation_name if route.event_type == Route.API else None
-
         return construct_v1_event(
             flask_request=flask_request,
             port=self.port,
             binary_types=self.api.binary_media_types,
             stage_name=self.api.stage_name,
             stage_variables=self.api.stage_variables,
-            operation_name=route_key,
+            operation_name=compiled_route.operation_name,
             api_type=route.event_type,
+            resource_path=compiled_route.apigw_path,
         )
 
     def _build_v1_context(self, route: Route) -> Dict[str, Any]:
@@ -496,28 +510,7 @@ class LocalApigwService(BaseLocalService):
         dict
             JSON object containing context variables
         """
-        identity = ContextIdentity(source_ip=request.remote_addr)
-
-        protocol = request.environ.get("SERVER_PROTOCOL", "HTTP/1.1")
-        host = request.host
-
-        operation_name = route.operation_name if route.event_type == Route.API else None
-
-        endpoint = PathConverter.convert_path_to_api_gateway(request.endpoint)
-        method = request.method
-
-        context = RequestContext(
-            resource_path=endpoint,
-            http_method=method,
-            stage=self.api.stage_name,
-            identity=identity,
-            path=endpoint,
-            protocol=protocol,
-            domain_name=host,
-            operation_name=operation_name,
-        )
-
-        return context.to_dict()
+        return self._get_compiled_route(request).build_v1_context(request)
 
     def _build_v2_context(self, route: Route) -> Dict[str, Any]:
         """
@@ -533,25 +526,7 @@ class LocalApigwService(BaseLocalService):
         dict
             JSON object containing context variables
         """
-        endpoint = PathConverter.convert_path_to_api_gateway(request.endpoint)
-        method = request.method
-
-        apigw_endpoint = PathConverter.convert_path_to_api_gateway(endpoint)
-        route_key = self._v2_route_key(method, apigw_endpoint, route.is_default_route)
-
-        request_time_epoch = int(time())
-        request_time = datetime.utcnow().strftime("%d/%b/%Y:%H:%M:%S +0000")
-
-        context_http = ContextHTTP(method=method, path=request.path, source_ip=request.remote_addr)
-        context = RequestContextV2(
-            http=context_http,
-            route_key=route_key,
-            stage=self.api.stage_name,
-            request_time_epoch=request_time_epoch,
-            request_time=request_time,
-        )
-
-        return context.to_dict()
+        return self._get_compiled_route(request).build_v2_context(request)
 
     def _valid_identity_sources(self, request: Request, route: Route) -> bool:
         """
@@ -569,28 +544,21 @@ class LocalApigwService(BaseLocalService):
         bool
             true if all the identity sources are present and valid
         """
-        lambda_auth = route.authorizer_object
+        compiled_route = self._get_compiled_route(request)
+        lambda_auth = compiled_route.lambda_authorizer
 
-        if not isinstance(lambda_auth, LambdaAuthorizer):
+        if not lambda_auth:
             return False
 
-        identity_sources = lambda_auth.identity_sources
-
-        context = (
-            self._build_v1_context(route)
-            if lambda_auth.payload_version == LambdaAuthorizer.PAYLOAD_V1
-            else self._build_v2_context(route)
-        )
-
         kwargs = {
             "headers": request.headers,
             "querystring": request.query_string.decode("utf-8"),
-            "context": context,
+            "context": compiled_route.build_authorizer_context(request),
             "stageVariables": self.api.stage_variables,
             "validation_expression": lambda_auth.validation_string,
         }
 
-        for validator in identity_sources:
+        for validator in lambda_auth.identity_sources:
             if not validator.is_valid(**kwargs):
                 return False
 
@@ -612,17 +580,49 @@ class LocalApigwService(BaseLocalService):
         Union[str, bytes]
             A string or bytes containing the output from the Lambda function
         """
-        with StringIO() as stdout:
+        # Collect the text and the binary output in the same UTF-8 buffer, the JSON parsers consume the bytes
+        # directly so there is no need to build an intermediate string of the whole output
+        stdout_bytes = BytesIO()
+        stdout = TextIOWrapper(stdout_bytes, encoding="utf-8", write_through=True)
+        try:
             event_str = json.dumps(event, sort_keys=True)
             stdout_writer = StreamWriter(stdout, auto_flush=True)
 
             self.lambda_runner.invoke(lambda_function_name, event_str, stdout=stdout_writer, stderr=self.stderr)
-            lambda_response, is_lambda_user_error_response = LambdaOutputParser.get_lambda_output(stdout)
-            if is_lambda_user_error_response:
-                raise LambdaResponseParseException
+            lambda_response = stdout_bytes.getvalue()
+        finally:
+            stdout.close()
+
+        if LambdaOutputParser.is_lambda_error_response(lambda_response):
+            raise LambdaResponseParseException
 
         return lambda_response
 
+    def _timed_request_handler(self, **kwargs):
+        """
+        Handles the request with _request_handler, and records its latency for the route
+        """
+        if self._route_latency is None:
+            return self._request_handler(**kwargs)
+
+        start = perf_counter()
+        try:
+            return self._request_handler(**kwargs)
+        finally:
+            self._route_latency.record(
+                request.method, PathConverter.convert_path_to_api_gateway(request.endpoint), perf_counter() - start
+            )
+
+    def _latency_handler(self):
+        """
+        Returns the latency histogram of each route invoked so far
+        """
+        return self.service_response(
+            json.dumps({"routes": self._route_latency.to_dict() if self._route_latency is not None else {}}),
+            Headers({"Content-Type": "application/json"}),
+            200,
+        )
+
     def _request_handler(self, **kwargs):
         """
         We handle all requests to the host:port. The general flow of handling a request is as follows
@@ -647,7 +647,8 @@ class LocalApigwService(BaseLocalService):
         Response object
         """
 
-        route: Route = self._get_current_route(request)
+        compiled_route = self._get_compiled_route(request)
+        route: Route = compiled_route.route
 
         request_origin = request.headers.get("Origin")
         cors_headers = Cors.cors_to_headers(self.api.cors, request_origin, route.event_type)
@@ -657,7 +658,7 @@ class LocalApigwService(BaseLocalService):
         # payloadFormatVersion can only support 2 values: "1.0" and "2.0"
         # so we want to do strict validation to make sure it has proper value if provided
         # https://docs.aws.amazon.com/apigateway/latest/developerguide/http-api-develop-integrations-lambda.html
-        if route.payload_format_version not in [None, "1.0", "2.0"]:
+        if not compiled_route.has_valid_payload_format_version:
             raise PayloadFormatVersionValidateException(
                 f'{route.payload_format_version} is not a valid value. PayloadFormatVersion must be "1.0" or "2.0"'
             )
@@ -668,7 +669,7 @@ class LocalApigwService(BaseLocalService):
             return self.service_response("", headers, 200)
 
         # check for LambdaAuthorizer since that is the only authorizer we currently support
-        if isinstance(lambda_authorizer, LambdaAuthorizer) and not self._valid_identity_sources(request, route):
+        if compiled_route.lambda_authorizer and not self._valid_identity_sources(request, route):
             return ServiceErrorResponses.missing_lambda_auth_identity_sources()
 
         try:
@@ -676,7 +677,9 @@ class LocalApigwService(BaseLocalService):
             auth_lambda_event = None
 
             if lambda_authorizer:
-                auth_lambda_event = self._generate_lambda_authorizer_event(request, route, lambda_authorizer)
+                auth_lambda_event = self._generate_lambda_authorizer_event(
+                    request, route, lambda_authorizer, route_lambda_event
+                )
         except UnicodeDecodeError as error:
             LOG.error("UnicodeDecodeError while processing HTTP request: %s", error)
             return ServiceErrorResponses.lambda_failure_response()
@@ -784,7 +787,14 @@ class LocalApigwService(BaseLocalService):
         route: Route
             The route that is being called
         """
-        lambda_auth_response = self._invoke_lambda_function(lambda_authorizer.lambda_name, auth_lambda_event)
+        cache_key = self._get_authorizer_cache_key(lambda_authorizer) if lambda_authorizer.result_ttl else None
+        lambda_auth_response = self._authorizer_cache.get(cache_key) if cache_key else None
+
+        if lambda_auth_response is None:
+            lambda_auth_response = self._invoke_lambda_function(lambda_authorizer.lambda_name, auth_lambda_event)
+            if cache_key and lambda_authorizer.result_ttl:
+                self._authorizer_cache.put(cache_key, lambda_auth_response, lambda_authorizer.result_ttl)
+
         method_arn = self._create_method_arn(request, route.event_type)
 
         if not lambda_authorizer.is_valid_response(lambda_auth_response, method_arn):
@@ -803,6 +813,36 @@ class LocalApigwService(BaseLocalService):
 
         route_lambda_event.update({"requestContext": original_context})
 
+    def _get_authorizer_cache_key(self, lambda_authorizer: LambdaAuthorizer) -> Optional[Tuple]:
+        """
+        Builds the key the Lambda authorizer response of the current request is cached with, from the values of
+        the authorizer identity sources
+
+        Parameters
+        ----------
+        lambda_authorizer: LambdaAuthorizer
+            The route's Lambda authorizer
+
+        Returns
+        -------
+        Optional[Tuple]
+            The cache key, None if the authorizer has no identity sources, as API Gateway does not cache those
+        """
+        if not lambda_authorizer.identity_sources:
+            return None
+
+        kwargs = {
+            "headers": request.headers,
+            "querystring": request.query_string.decode("utf-8"),
+            "context": self._get_compiled_route(request).build_authorizer_context(request),
+            "stageVariables": self.api.stage_variables,
+        }
+        identity_values = tuple(
+            str(identity_source.find_identity_value(**kwargs)) for identity_source in lambda_authorizer.identity_sources
+        )
+
+        return lambda_authorizer.authorizer_name, lambda_authorizer.lambda_name, identity_values
+
     def _get_current_route(self, flask_request):
         """
         Get the route (Route) based on the current request
@@ -810,23 +850,30 @@ class LocalApigwService(BaseLocalService):
         :param request flask_request: Flask Request
         :return: Route matching the endpoint and method of the request
         """
+        return self._get_compiled_route(flask_request).route
+
+    def _get_compiled_route(self, flask_request) -> CompiledRoute:
+        """
+        Get the precompiled route (CompiledRoute) based on the current request
+
+        :param request flask_request: Flask Request
+        :return: CompiledRoute matching the endpoint and method of the request
+        """
         method, endpoint = self.get_request_methods_endpoints(flask_request)
 
-        route_key = self._route_key(method, endpoint)
-        route = self._dict_of_routes.get(route_key, None)
+        compiled_route = self._route_table.get(method, endpoint)
 
-        if not route:
+        if not compiled_route:
             LOG.debug(
                 "Lambda function for the route not found. This should not happen because Flask is "
                 "already configured to serve all path/methods given to the service. "
-                "Path=%s Method=%s RouteKey=%s",
+                "Path=%s Method=%s",
                 endpoint,
                 method,
-                route_key,
             )
             raise KeyError("Lambda function for the route not found")
 
-        return route
+        return compiled_route
 
     @staticmethod
     def get_request_methods_endpoints(flask_request):
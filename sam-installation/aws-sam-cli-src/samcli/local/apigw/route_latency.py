@@ -0,0 +1,95 @@
+"""
+Latency histograms of the routes served by local start-api
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Tuple
+
+# Upper bounds of the histogram buckets in milliseconds, the last bucket holds everything slower
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """
+    Fixed buckets latency histogram of a single route. Not thread safe, RouteLatencyRecorder guards it.
+    """
+
+    def __init__(self) -> None:
+        self._bucket_counts: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._count = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def record(self, latency_ms: float) -> None:
+        self._bucket_counts[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self._count += 1
+        self._total_ms += latency_ms
+        self._max_ms = max(self._max_ms, latency_ms)
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Estimate a percentile as the upper bound of the bucket it falls in
+
+        Parameters
+        ----------
+        percentile: float
+            Percentile between 0 and 100
+
+        Returns
+        -------
+        float
+            Estimated latency in milliseconds, it is never higher than the slowest recorded latency
+        """
+        if not self._count:
+            return 0.0
+        rank = self._count * percentile / 100
+        cumulative = 0
+        for upper_bound, bucket_count in zip(LATENCY_BUCKETS_MS, self._bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return round(min(upper_bound, self._max_ms), 3)
+        return round(self._max_ms, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {str(upper_bound): count for upper_bound, count in zip(LATENCY_BUCKETS_MS, self._bucket_counts)}
+        buckets["+Inf"] = self._bucket_counts[-1]
+        return {
+            "count": self._count,
+            "averageMs": round(self._total_ms / self._count, 3) if self._count else 0.0,
+            "maxMs": round(self._max_ms, 3),
+            "p50Ms": self.percentile(50),
+            "p90Ms": self.percentile(90),
+            "p99Ms": self.percentile(99),
+            "buckets": buckets,
+        }
+
+
+class RouteLatencyRecorder:
+    """
+    Records the latency of every request per route (method and path)
+    """
+
+    def __init__(self) -> None:
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, path: str, latency_seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((method, path))
+            if not histogram:
+                histogram = self._histograms[(method, path)] = LatencyHistogram()
+            histogram.record(latency_seconds * 1000)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        dict
+            Histogram of each route keyed by "METHOD path"
+        """
+        with self._lock:
+            return {
+                f"{method} {path}": histogram.to_dict()
+                for (method, path), histogram in sorted(self._histograms.items())
+            }
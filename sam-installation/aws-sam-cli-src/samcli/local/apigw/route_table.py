@@ -0,0 +1,128 @@
+"""
+Route table of local start-api, precompiled when the service is created
+"""
+
+from datetime import datetime
+from time import time
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Request
+
+from samcli.local.apigw.authorizers.lambda_authorizer import LambdaAuthorizer
+from samcli.local.apigw.path_converter import PathConverter
+from samcli.local.apigw.route import Route
+from samcli.local.events.api_event import ContextHTTP, ContextIdentity, RequestContext, RequestContextV2
+
+
+class CompiledRoute:
+    """
+    Everything about a (method, path) pair of a Route that does not depend on the incoming request,
+    so that handling a request only fills in the request specific fields.
+    """
+
+    def __init__(self, route: Route, method: str, endpoint: str, stage_name: Optional[str]):
+        """
+        Parameters
+        ----------
+        route: Route
+            The route that serves the method and path
+        method: str
+            HTTP method
+        endpoint: str
+            The Flask path (endpoint) of the route
+        stage_name: Optional[str]
+            The API stage name
+        """
+        self.route = route
+        self.method = method
+        self.endpoint = endpoint
+        self.apigw_path = PathConverter.convert_path_to_api_gateway(endpoint)
+
+        # the Lambda Event 2.0 is only used for the HTTP API gateway with payload format version 2.0 or none
+        self.uses_v2_event = route.event_type == Route.HTTP and route.payload_format_version in [None, "2.0"]
+        self.v2_route_key = "$default" if route.is_default_route else f"{method} {self.apigw_path}"
+        # For Http Apis with payload version 1.0, API Gateway never sends the OperationName.
+        self.operation_name = route.operation_name if route.event_type == Route.API else None
+        self.has_valid_payload_format_version = route.payload_format_version in [None, "1.0", "2.0"]
+
+        self.lambda_authorizer = (
+            route.authorizer_object if isinstance(route.authorizer_object, LambdaAuthorizer) else None
+        )
+
+        context = RequestContext() if route.event_type == Route.API else RequestContextV2()
+        self.method_arn_prefix = (
+            f"arn:aws:execute-api:us-east-1:{context.account_id}:{context.api_id}/{stage_name}/{method}"
+        )
+
+        self._v1_context = RequestContext(
+            resource_path=self.apigw_path,
+            http_method=method,
+            stage=stage_name,
+            identity=ContextIdentity(),
+            path=self.apigw_path,
+            operation_name=self.operation_name,
+        ).to_dict()
+        self._v2_context = RequestContextV2(route_key=self.v2_route_key, stage=stage_name).to_dict()
+
+    def build_v1_context(self, flask_request: Request) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        dict
+            The 1.0 request context of the request
+        """
+        context = dict(self._v1_context)
+        identity = dict(context["identity"])
+        identity["sourceIp"] = flask_request.remote_addr
+        context["identity"] = identity
+        context["protocol"] = flask_request.environ.get("SERVER_PROTOCOL", "HTTP/1.1")
+        context["domainName"] = flask_request.host
+        return context
+
+    def build_v2_context(self, flask_request: Request) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        dict
+            The 2.0 request context of the request
+        """
+        context = dict(self._v2_context)
+        context["http"] = ContextHTTP(
+            method=self.method, path=flask_request.path, source_ip=flask_request.remote_addr
+        ).to_dict()
+        context["timeEpoch"] = int(time())
+        context["time"] = datetime.utcnow().strftime("%d/%b/%Y:%H:%M:%S +0000")
+        return context
+
+    def build_authorizer_context(self, flask_request: Request) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        dict
+            The request context the route's Lambda authorizer identity sources are resolved from
+        """
+        if self.lambda_authorizer and self.lambda_authorizer.payload_version == LambdaAuthorizer.PAYLOAD_V1:
+            return self.build_v1_context(flask_request)
+        return self.build_v2_context(flask_request)
+
+    def method_arn(self, flask_request: Request) -> str:
+        return f"{self.method_arn_prefix}{flask_request.path}"
+
+
+class RouteTable:
+    """
+    Maps the Flask endpoint and method of a request to its CompiledRoute
+    """
+
+    def __init__(self, stage_name: Optional[str]) -> None:
+        self._stage_name = stage_name
+        self._routes: Dict[Tuple[str, str], CompiledRoute] = {}
+
+    def add(self, route: Route, method: str, endpoint: str) -> None:
+        self._routes[(endpoint, method)] = CompiledRoute(route, method, endpoint, self._stage_name)
+
+    def get(self, method: str, endpoint: str) -> Optional[CompiledRoute]:
+        return self._routes.get((endpoint, method))
+
+    def __len__(self) -> int:
+        return len(self._routes)
@@ -25,7 +25,7 @@ from docker.errors import (
     NotFound as DockerNetworkNotFound,
 )
 
-from samcli.lib.constants import DOCKER_MIN_API_VERSION
+from samcli.lib.constants import DEFAULT_CONTAINER_HOST_INTERFACE, DOCKER_MIN_API_VERSION
 from samcli.lib.utils.retry import retry
 from samcli.lib.utils.stream_writer import StreamWriter
 from samcli.lib.utils.tar import extract_tarfile
@@ -36,11 +36,20 @@ from samcli.local.docker.exceptions import (
     PortAlreadyInUse,
 )
 from samcli.local.docker.utils import NoFreePortsError, find_free_port, to_posix_path
+from samcli.local.lambdafn.invoke_profiler import profile_span
 
 LOG = logging.getLogger(__name__)
 
 CONTAINER_CONNECTION_TIMEOUT = float(os.environ.get("SAM_CLI_CONTAINER_CONNECTION_TIMEOUT", 20))
-DEFAULT_CONTAINER_HOST_INTERFACE = "127.0.0.1"
+# Delays between the attempts to connect to the container socket, doubled after every failed attempt
+SOCKET_WAIT_INITIAL_DELAY = 0.001
+SOCKET_WAIT_MAX_DELAY = 0.05
+# Maximum number of seconds to wait for the REPORT line of an invocation in the container logs
+LOGS_FLUSH_TIMEOUT = float(os.environ.get("SAM_CLI_CONTAINER_LOGS_FLUSH_TIMEOUT", "1"))
+# The runtime interface emulator writes this line once an invocation is completed, it is the last log line of it
+REPORT_LINE_PATTERN = re.compile(
+    r"(?:^|\s)REPORT RequestId:\s.+ Duration:\s.+\sMemory Size:\s.+\sMax Memory Used:\s.+", re.MULTILINE
+)
 
 # Keep a lock instance to access the locks for individual containers (see dict below)
 CONCURRENT_CALL_MANAGER_LOCK = threading.Lock()
@@ -141,6 +150,8 @@ class Container:
         self._logs_thread = None
         self._extra_hosts = extra_hosts
         self._logs_thread_event = None
+        # True once the runtime interface emulator of the started container accepted a connection
+        self._socket_ready = False
 
         # Use the given Docker client or create new one
         self.docker_client = docker_client or docker.from_env(version=DOCKER_MIN_API_VERSION)
@@ -334,6 +345,7 @@ class Container:
             LOG.debug("Container was not created, cannot run stop.")
             return
 
+        self._socket_ready = False
         try:
             self.docker_client.containers.get(self.id).stop(timeout=timeout)
         except docker.errors.NotFound:
@@ -407,6 +419,7 @@ class Container:
         # Get the underlying container instance from Docker API
         real_container = self.docker_client.containers.get(self.id)
 
+        self._socket_ready = False
         try:
             # Start the container
             real_container.start()
@@ -462,16 +475,33 @@ class Container:
 
         # wait_for_http_response will attempt to establish a connection to the socket
         # but it'll fail if the socket is not listening yet, so we wait for the socket
-        self._wait_for_socket_connection()
+        with profile_span("container.socket_wait", function=full_path):
+            self._wait_for_socket_connection()
+
+        # the REPORT line of this invocation can only be written after the request is sent
+        self._logs_thread_event.clear()
 
         # start the timer for function timeout right before executing the function, as waiting for the socket
         # can take some time
         timer = start_timer() if start_timer else None
-        response, is_image = self.wait_for_http_response(full_path, event, stdout)
+        try:
+            with profile_span("function.invoke", function=full_path):
+                response, is_image = self.wait_for_http_response(full_path, event, stdout)
+        except BaseException:
+            # the runtime may have crashed or be stuck, check that it listens again before the next invocation
+            self._socket_ready = False
+            raise
         if timer:
+            if not timer.is_alive():
+                # the function timed out, the runtime may have been interrupted while the request was running
+                self._socket_ready = False
             timer.cancel()
 
-        self._logs_thread_event.wait(timeout=1)
+        # the response can be returned before all the logs of the invocation are streamed, wait until the REPORT
+        # line of the invocation is written or the log stream is closed
+        with profile_span("logs.flush", function=full_path):
+            if self._logs_thread.is_alive() and not self._logs_thread_event.wait(timeout=LOGS_FLUSH_TIMEOUT):
+                LOG.debug("Timed out waiting for the logs of the invocation of %s", full_path)
         if isinstance(response, str):
             stdout.write_str(response)
         elif isinstance(response, bytes) and is_image:
@@ -481,7 +511,6 @@ class Container:
         stdout.flush()
         stderr.write_str("\n")
         stderr.flush()
-        self._logs_thread_event.clear()
 
     def wait_for_logs(
         self,
@@ -496,27 +525,40 @@ class Container:
         if not self.is_created():
             raise RuntimeError("Container does not exist. Cannot get logs for this container")
 
-        real_container = self.docker_client.containers.get(self.id)
+        try:
+            real_container = self.docker_client.containers.get(self.id)
 
-        # Fetch both stdout and stderr streams from Docker as a single iterator.
-        logs_itr = real_container.attach(stream=True, logs=True, demux=True)
-        self._write_container_output(logs_itr, event=event, stdout=stdout, stderr=stderr)
+            # Fetch both stdout and stderr streams from Docker as a single iterator.
+            logs_itr = real_container.attach(stream=True, logs=True, demux=True)
+            self._write_container_output(logs_itr, event=event, stdout=stdout, stderr=stderr)
+        finally:
+            # no more logs will come once the stream is closed, do not keep anyone waiting for them
+            if event:
+                event.set()
 
     def _wait_for_socket_connection(self) -> None:
         """
-        Waits for a successful connection to the socket used to communicate with Docker.
+        Waits for a successful connection to the socket used to communicate with Docker. The socket is polled
+        with an exponential backoff starting at a millisecond, so the invocation is not delayed much longer than
+        it takes the runtime interface emulator to start listening. Once the socket accepted a connection, it is
+        not checked again until the container is restarted.
         """
+        if self._socket_ready:
+            return
 
-        start_time = time.time()
+        start_time = time.monotonic()
+        delay = SOCKET_WAIT_INITIAL_DELAY
         while not self._can_connect_to_socket():
-            time.sleep(0.1)
-            current_time = time.time()
+            time.sleep(delay)
+            delay = min(delay * 2, SOCKET_WAIT_MAX_DELAY)
+            current_time = time.monotonic()
             if current_time - start_time > CONTAINER_CONNECTION_TIMEOUT:
                 raise ContainerConnectionTimeoutException(
                     f"Timed out while attempting to establish a connection to the container. You can increase this "
                     f"timeout by setting the SAM_CLI_CONTAINER_CONNECTION_TIMEOUT environment variable. "
                     f"The current timeout is {CONTAINER_CONNECTION_TIMEOUT} (seconds)."
                 )
+        self._socket_ready = True
 
     def _can_connect_to_socket(self) -> bool:
         """
@@ -592,7 +634,6 @@ class Container:
         # the carriage return will be printed instead of the entire stack trace. Encode the string after cleaning
         # to be printed by the correct output stream
         output_str = output_data.decode("utf-8").replace("\r", os.linesep)
-        pattern = r"(.*\s)?REPORT RequestId:\s.+ Duration:\s.+\sMemory Size:\s.+\sMax Memory Used:\s.+"
         if isinstance(output_stream, StreamWriter):
             output_stream.write_str(output_str)
             output_stream.flush()
@@ -602,7 +643,7 @@ class Container:
 
         if isinstance(output_stream, io.TextIOWrapper):
             output_stream.buffer.write(output_str.encode("utf-8"))
-        if re.match(pattern, output_str) is not None and event:
+        if event and "REPORT RequestId:" in output_str and REPORT_LINE_PATTERN.search(output_str):
             event.set()
 
     # This method exists because otherwise when writing tests patching/mocking threading.Event breaks everything
@@ -8,12 +8,13 @@ import os
 import platform
 import re
 import sys
+import threading
+import time
 import uuid
+from collections import Counter
 from enum import Enum
 from pathlib import Path
-from typing import Optional
-
-import docker
+from typing import Dict, List, Optional, Tuple, Union
 
 from samcli.commands.local.cli_common.user_exceptions import (
     DockerDistributionAPIError,
@@ -22,11 +23,16 @@ from samcli.commands.local.cli_common.user_exceptions import (
 from samcli.commands.local.lib.exceptions import InvalidIntermediateImageError
 from samcli.lib.constants import DOCKER_MIN_API_VERSION
 from samcli.lib.utils.architecture import has_runtime_multi_arch_image
+from samcli.lib.utils.hash import dir_stat_checksum
+from samcli.lib.utils.lazy_import import lazy_import
 from samcli.lib.utils.packagetype import IMAGE, ZIP
 from samcli.lib.utils.stream_writer import StreamWriter
 from samcli.lib.utils.tar import create_tarball
 from samcli.local.docker.utils import get_docker_platform, get_rapid_name
 
+# loaded on first use, the runtime definitions of this module are used by commands that never talk to docker
+docker = lazy_import("docker")
+
 LOG = logging.getLogger(__name__)
 
 RAPID_IMAGE_TAG_PREFIX = "rapid"
@@ -117,6 +123,12 @@ class LambdaImage:
     _INVOKE_REPO_PREFIX = "public.ecr.aws/lambda"
     _SAM_INVOKE_REPO_PREFIX = "public.ecr.aws/sam/emulation"
     _SAM_CLI_REPO_NAME = "samcli/lambda"
+    _SAM_CLI_LAYER_REPO_NAME = "samcli/lambda-layer"
+    # label of the intermediate layer images, holding the layer version they were built for
+    _SAM_CLI_LAYER_LABEL = "com.amazonaws.samcli.layer"
+    # intermediate layer images the builds of this process are about to copy from, they are not removed meanwhile
+    _layer_images_in_use: "Counter[str]" = Counter()
+    _layer_images_lock = threading.Lock()
     _RAPID_SOURCE_PATH = Path(__file__).parent.joinpath("..", "rapid").resolve()
 
     def __init__(self, layer_downloader, skip_pull_image, force_image_build, docker_client=None, invoke_images=None):
@@ -138,6 +150,8 @@ class LambdaImage:
         self.force_image_build = force_image_build
         self.docker_client = docker_client or docker.from_env(version=DOCKER_MIN_API_VERSION)
         self.invoke_images = invoke_images
+        # (docker tag, seconds) of every image built by this instance
+        self.build_timings: List[Tuple[str, float]] = []
 
     def build(self, runtime, packagetype, image, layers, architecture, stream=None, function_name=None):
         """
@@ -296,6 +310,10 @@ class LambdaImage:
         """
         Builds the image
 
+        Every layer is first built into its own intermediate image, tagged with the digest of the layer content,
+        and the final image copies the layers from these intermediate images. An intermediate image is reused as long
+        as the content of its layer doesn't change, so only the changed layers are sent to Docker again.
+
         Parameters
         ----------
         base_image str
@@ -314,25 +332,242 @@ class LambdaImage:
         samcli.commands.local.cli_common.user_exceptions.ImageBuildException
             When docker fails to build the image
         """
-        dockerfile_content = self._generate_dockerfile(base_image, layers, architecture)
+        stream_writer = stream or StreamWriter(sys.stderr)
+        start_time = time.time()
+
+        layer_images: List[str] = []
+        try:
+            for layer in layers:
+                layer_images.append(self._build_layer_image(layer, architecture, stream_writer))
+            dockerfile_content = self._generate_dockerfile(base_image, layer_images, architecture)
+
+            # the layer images only exist locally, building with pull would try to pull them from Docker Hub as well.
+            # Only the base image is pulled
+            if not self.skip_pull_image:
+                self._pull_base_image(base_image, architecture, stream_writer)
+
+            # only the rapid binary is sent with the Dockerfile, layers are copied from their images
+            self._build_from_context(
+                dockerfile_content,
+                {self._RAPID_SOURCE_PATH: "/" + get_rapid_name(architecture)},
+                docker_tag,
+                architecture,
+                pull=False,
+                stream_writer=stream_writer,
+            )
+        finally:
+            self._release_layer_images(layer_images)
+
+        self._record_build_timing(docker_tag, time.time() - start_time)
+
+    def _pull_base_image(self, base_image: str, architecture: str, stream_writer: StreamWriter) -> None:
+        """
+        Pulls the latest version of the base image
+
+        Parameters
+        ----------
+        base_image str
+            Base Image (REPOSITORY:TAG or REPOSITORY@DIGEST) to pull
+        architecture str
+            Architecture, either x86_64 or arm64
+        stream_writer samcli.lib.utils.stream_writer.StreamWriter
+            Stream to write the pull output
+
+        Raises
+        ------
+        samcli.commands.local.cli_common.user_exceptions.ImageBuildException
+            When docker fails to pull the image
+        """
+        try:
+            for log in self.docker_client.api.pull(
+                base_image, stream=True, decode=True, platform=get_docker_platform(architecture)
+            ):
+                stream_writer.write_str(".")
+                stream_writer.flush()
+                if "error" in log:
+                    stream_writer.write_str(os.linesep)
+                    raise ImageBuildException("Error pulling base image {}: {}".format(base_image, log["error"]))
+        except docker.errors.APIError as ex:
+            stream_writer.write_str(os.linesep)
+            LOG.exception("Failed to pull base image %s", base_image)
+            raise ImageBuildException("Pulling base image {} failed.".format(base_image)) from ex
+
+    def _build_layer_image(self, layer, architecture, stream_writer) -> str:
+        """
+        Builds the intermediate image for a layer, unless an image for the same layer content already exists. The
+        image is in use until it is released with _release_layer_images
+
+        Parameters
+        ----------
+        layer samcli.commands.local.lib.provider.Layer
+            Layer to build the image for
+        architecture str
+            Architecture, either x86_64 or arm64
+        stream_writer samcli.lib.utils.stream_writer.StreamWriter
+            Stream to write the build output
+
+        Returns
+        -------
+        str
+            The intermediate image of the layer (REPOSITORY:TAG)
+        """
+        layer_image = f"{self._SAM_CLI_LAYER_REPO_NAME}:{architecture}-{self._get_layer_digest(layer)[0:25]}"
+        with LambdaImage._layer_images_lock:
+            LambdaImage._layer_images_in_use[layer_image] += 1
+
+        try:
+            self._get_or_build_layer_image(layer, layer_image, architecture, stream_writer)
+        except BaseException:
+            self._release_layer_images([layer_image])
+            raise
+        return layer_image
+
+    def _get_or_build_layer_image(self, layer, layer_image: str, architecture: str, stream_writer) -> None:
+        try:
+            self.docker_client.images.get(layer_image)
+            LOG.debug("Reusing image %s for layer %s", layer_image, layer.name)
+            return
+        except docker.errors.ImageNotFound:
+            LOG.debug("Building image %s for layer %s", layer_image, layer.name)
+
+        start_time = time.time()
+        layer_source = self._get_layer_source(layer)
+        self._build_from_context(
+            f"FROM scratch\nADD {layer.name} {LambdaImage._LAYERS_DIR}\n",
+            {layer.codeuri: "/" + layer.name},
+            layer_image,
+            architecture,
+            pull=False,
+            stream_writer=stream_writer,
+            labels={self._SAM_CLI_LAYER_LABEL: layer_source},
+        )
+        self._record_build_timing(layer_image, time.time() - start_time)
+        self._remove_layer_images(layer_source, architecture, keep=layer_image)
+
+    @staticmethod
+    def _release_layer_images(layer_images: List[str]) -> None:
+        with LambdaImage._layer_images_lock:
+            for layer_image in layer_images:
+                LambdaImage._layer_images_in_use[layer_image] -= 1
+                if LambdaImage._layer_images_in_use[layer_image] <= 0:
+                    del LambdaImage._layer_images_in_use[layer_image]
 
+    @staticmethod
+    def _get_layer_source(layer) -> str:
+        """
+        Identifies a layer version across its content changes: the layer version ARN for downloaded layers, the full
+        path of the layer for layers defined in the template. Functions using other versions of the same layer
+        don't share the images of their version
+        """
+        return layer.full_path if layer.is_defined_within_template else layer.arn
+
+    def _remove_layer_images(self, layer_source: str, architecture: str, keep: str) -> None:
+        """
+        Remove the intermediate images built for the previous content of a layer version, the final images don't
+        depend on them since they copy the layer files. The images a build of this process is about to copy from
+        are kept
+
+        Parameters
+        ----------
+        layer_source str
+            Layer the images were built for, see _get_layer_source
+        architecture str
+            Architecture of the images to remove, either x86_64 or arm64
+        keep str
+            Image (REPOSITORY:TAG) built for the current content of the layer
+        """
+        architecture_prefix = f"{self._SAM_CLI_LAYER_REPO_NAME}:{architecture}-"
+        try:
+            images = self.docker_client.images.list(
+                name=self._SAM_CLI_LAYER_REPO_NAME, filters={"label": f"{self._SAM_CLI_LAYER_LABEL}={layer_source}"}
+            )
+        except docker.errors.APIError as ex:
+            LOG.warning("Failed getting images from repo %s", self._SAM_CLI_LAYER_REPO_NAME, exc_info=ex)
+            return
+
+        for image in images:
+            if keep in image.tags or not any(tag.startswith(architecture_prefix) for tag in image.tags):
+                continue
+            # the lock is held while removing, so that no build starts using the image meanwhile
+            with LambdaImage._layer_images_lock:
+                if any(tag in LambdaImage._layer_images_in_use for tag in image.tags):
+                    LOG.debug("Keeping image %s of layer %s, it is used by another build", image.tags, layer_source)
+                    continue
+                LOG.debug("Removing image %s of the previous content of layer %s", image.tags, layer_source)
+                try:
+                    self.docker_client.images.remove(image.id)
+                except docker.errors.APIError as ex:
+                    LOG.warning("Failed to remove layer image with ID: %s", image.id, exc_info=ex)
+
+    def _get_layer_digest(self, layer) -> str:
+        """
+        Digest of the layer content. Downloaded layers use the digest from AWS Lambda, layers defined in the template
+        use a checksum of their files metadata so that their content doesn't have to be read.
+
+        Parameters
+        ----------
+        layer samcli.commands.local.lib.provider.Layer
+            Layer to get the digest of
+
+        Returns
+        -------
+        str
+            Digest of the layer content
+        """
+        layer_digest = self.layer_downloader.get_layer_digest(layer)
+        if layer_digest:
+            return hashlib.sha256(f"{layer.name}-{layer_digest}".encode("utf-8")).hexdigest()
+
+        return hashlib.sha256(
+            f"{layer.name}-{dir_stat_checksum(str(layer.codeuri), followlinks=True)}".encode("utf-8")
+        ).hexdigest()
+
+    def _build_from_context(
+        self,
+        dockerfile_content: str,
+        context_paths: Dict[Union[str, Path], str],
+        docker_tag: str,
+        architecture: str,
+        pull: bool,
+        stream_writer: StreamWriter,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Builds an image from a Dockerfile and the files it uses
+
+        Parameters
+        ----------
+        dockerfile_content str
+            Content of the Dockerfile
+        context_paths Dict[Union[str, Path], str]
+            Paths to add to the build context, mapped to their path within the context
+        docker_tag str
+            Docker tag (REPOSITORY:TAG) to use when building the image
+        architecture str
+            Architecture, either x86_64 or arm64
+        pull bool
+            True to pull the base image before building
+        stream_writer samcli.lib.utils.stream_writer.StreamWriter
+            Stream to write the build output
+        labels Optional[Dict[str, str]]
+            Labels to set on the image
+
+        Raises
+        ------
+        samcli.commands.local.cli_common.user_exceptions.ImageBuildException
+            When docker fails to build the image
+        """
         # Create dockerfile in the same directory of the layer cache
         dockerfile_name = "dockerfile_" + str(uuid.uuid4())
         full_dockerfile_path = Path(self.layer_downloader.layer_cache, dockerfile_name)
-        stream_writer = stream or StreamWriter(sys.stderr)
 
         try:
             with open(str(full_dockerfile_path), "w") as dockerfile:
                 dockerfile.write(dockerfile_content)
 
-            # add dockerfile and rapid source paths
-            tar_paths = {
-                str(full_dockerfile_path): "Dockerfile",
-                self._RAPID_SOURCE_PATH: "/" + get_rapid_name(architecture),
-            }
-
-            for layer in layers:
-                tar_paths[layer.codeuri] = "/" + layer.name
+            # add dockerfile and the context paths
+            tar_paths: Dict[Union[str, Path], str] = {str(full_dockerfile_path): "Dockerfile"}
+            tar_paths.update(context_paths)
 
             # Set permission for all the files in the tarball to 500(Read and Execute Only)
             # This is need for systems without unix like permission bits(Windows) while creating a unix image
@@ -344,14 +579,16 @@ class LambdaImage:
             # Set only on Windows, unix systems will preserve the host permission into the tarball
             tar_filter = set_item_permission if platform.system().lower() == "windows" else None
 
-            with create_tarball(tar_paths, tar_filter=tar_filter, dereference=True) as tarballfile:
+            # the context is streamed to Docker while it is being written, instead of being written to disk first
+            with create_tarball(tar_paths, tar_filter=tar_filter, dereference=True, stream=True) as tarballfile:
                 try:
                     resp_stream = self.docker_client.api.build(
                         fileobj=tarballfile,
                         custom_context=True,
                         rm=True,
                         tag=docker_tag,
-                        pull=not self.skip_pull_image,
+                        pull=pull,
+                        labels=labels,
                         decode=True,
                         platform=get_docker_platform(architecture),
                     )
@@ -371,22 +608,26 @@ class LambdaImage:
             if full_dockerfile_path.exists():
                 full_dockerfile_path.unlink()
 
+    def _record_build_timing(self, docker_tag: str, duration: float) -> None:
+        LOG.debug("Built image %s in %.2f seconds", docker_tag, duration)
+        self.build_timings.append((docker_tag, duration))
+
     @staticmethod
-    def _generate_dockerfile(base_image, layers, architecture):
+    def _generate_dockerfile(base_image, layer_images, architecture):
         """
         FROM public.ecr.aws/lambda/python:3.9-x86_64
 
         ADD aws-lambda-rie /var/rapid
 
-        ADD layer1 /opt
-        ADD layer2 /opt
+        COPY --from=samcli/lambda-layer:x86_64-<layer1 digest> /opt /opt
+        COPY --from=samcli/lambda-layer:x86_64-<layer2 digest> /opt /opt
 
         Parameters
         ----------
         base_image : str
             Base Image to use for the new image
-        layers : list
-            List of Layers to be use to mount in the image
+        layer_images : list
+            List of the intermediate images (REPOSITORY:TAG) of the layers to add to the image, in order
         architecture : str
             Architecture type either x86_64 or arm64 on AWS lambda
 
@@ -402,8 +643,10 @@ class LambdaImage:
             + f"ADD {rie_name} {rie_path}\n"
             + f"RUN mv {rie_path}{rie_name} {rie_path}aws-lambda-rie && chmod +x {rie_path}aws-lambda-rie\n"
         )
-        for layer in layers:
-            dockerfile_content = dockerfile_content + f"ADD {layer.name} {LambdaImage._LAYERS_DIR}\n"
+        for layer_image in layer_images:
+            dockerfile_content = (
+                dockerfile_content + f"COPY --from={layer_image} {LambdaImage._LAYERS_DIR} {LambdaImage._LAYERS_DIR}\n"
+            )
         return dockerfile_content
 
     def _remove_rapid_images(self, repo: str) -> None:
@@ -0,0 +1,218 @@
+"""
+Pool of warm containers for a single Lambda function
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Set, Tuple
+
+from samcli.local.docker.container import Container
+from samcli.local.lambdafn.exceptions import ContainerPoolClosed
+
+LOG = logging.getLogger(__name__)
+
+
+class ContainerPool:
+    """
+    Keeps the warm containers of one Lambda function. A container is leased by exactly one invocation at a time,
+    so concurrent invocations of the same function run on separate containers, up to max_size containers.
+    Once the pool is full, further invocations wait until a container is returned.
+    A drained pool is closed: it can't be leased from anymore, and the containers returned to it must be stopped.
+    """
+
+    def __init__(self, function_full_path: str, min_size: int = 1, max_size: int = 1):
+        """
+        Parameters
+        ----------
+        function_full_path : str
+            Full path of the function the pool is created for, only used for logging
+        min_size : int
+            Number of containers that are kept warm even when idle
+        max_size : int
+            Maximum number of containers that can be created for the function
+        """
+        self._function_full_path = function_full_path
+        self._max_size = max(1, max_size)
+        self._min_size = min(max(0, min_size), self._max_size)
+        # idle containers with the time they were returned to the pool, most recently used on the right
+        self._idle: Deque[Tuple[Container, float]] = deque()
+        self._leased: Set[Container] = set()
+        # leased containers that should be stopped instead of going back to the pool once they are returned
+        self._retired: Set[Container] = set()
+        self._creating = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def min_size(self) -> int:
+        return self._min_size
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def closed(self) -> bool:
+        with self._condition:
+            return self._closed
+
+    @property
+    def size(self) -> int:
+        with self._condition:
+            return len(self._idle) + len(self._leased) + self._creating
+
+    def lease(self, create_container: Callable[[], Container], prefer_new: bool = False) -> Container:
+        """
+        Lease a container from the pool. The most recently used idle container is preferred, so that the
+        rest of the idle containers can be reaped. A new container is created if there is no idle container
+        and the pool is not full yet, otherwise this waits until a container is returned to the pool.
+
+        Parameters
+        ----------
+        create_container : Callable[[], Container]
+            Function that creates a new container for the function
+        prefer_new : bool
+            Create a new container instead of leasing an idle one while the pool is not full, used to warm up
+            the pool
+
+        Returns
+        -------
+        Container
+            Container that is leased to the caller until it is released
+
+        Raises
+        ------
+        ContainerPoolClosed
+            When the pool is drained, before or while waiting for a container
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise ContainerPoolClosed(f"Warm containers of function '{self._function_full_path}' were drained")
+
+                if prefer_new and len(self._idle) + len(self._leased) + self._creating < self._max_size:
+                    self._creating += 1
+                    break
+
+                while self._idle:
+                    container, _ = self._idle.pop()
+                    if container.is_created():
+                        self._leased.add(container)
+                        LOG.debug("Leased warm container %s for function '%s'", container.id, self._function_full_path)
+                        return container
+                    LOG.debug(
+                        "Discarding warm container for function '%s' that no longer exists", self._function_full_path
+                    )
+
+                if len(self._leased) + self._creating < self._max_size:
+                    self._creating += 1
+                    break
+
+                LOG.debug("All warm containers for function '%s' are busy, waiting for one", self._function_full_path)
+                self._condition.wait()
+
+        container = None
+        try:
+            container = create_container()
+        finally:
+            with self._condition:
+                self._creating -= 1
+                if container:
+                    self._leased.add(container)
+                    # drained while the container was being created, it is stopped once the invocation is done
+                    if self._closed:
+                        self._retired.add(container)
+                self._condition.notify()
+
+        LOG.debug(
+            "Created warm container %s for function '%s', pool size is now %s",
+            container.id,
+            self._function_full_path,
+            self.size,
+        )
+        return container
+
+    def release(self, container: Container) -> bool:
+        """
+        Return a leased container to the pool
+
+        Parameters
+        ----------
+        container : Container
+            Container that was leased from this pool
+
+        Returns
+        -------
+        bool
+            False if the container was retired while it was leased and should be stopped by the caller
+        """
+        with self._condition:
+            self._leased.discard(container)
+            self._condition.notify()
+            if container in self._retired or self._closed:
+                self._retired.discard(container)
+                return False
+            self._idle.append((container, time.monotonic()))
+            return True
+
+    def drain(self) -> List[Container]:
+        """
+        Remove all the containers from the pool and close it, e.g. when the function code or configuration changed.
+        Leased containers are retired, and will not go back to the pool once they are released. Invocations waiting
+        for a container get a ContainerPoolClosed error, so that they lease from the pool that replaces this one.
+
+        Returns
+        -------
+        List[Container]
+            Idle containers that should be stopped by the caller
+        """
+        with self._condition:
+            self._closed = True
+            idle = [container for container, _ in self._idle]
+            self._idle.clear()
+            self._retired.update(self._leased)
+            self._condition.notify_all()
+            return idle
+
+    def reap(self, idle_timeout: float, now: Optional[float] = None) -> List[Container]:
+        """
+        Remove the containers which have been idle longer than idle_timeout, while keeping min_size containers
+
+        Parameters
+        ----------
+        idle_timeout : float
+            Number of seconds after which an idle container is reaped
+        now : Optional[float]
+            Current monotonic time, defaults to time.monotonic()
+
+        Returns
+        -------
+        List[Container]
+            Reaped containers that should be stopped by the caller
+        """
+        now = now if now is not None else time.monotonic()
+        reaped = []
+        with self._condition:
+            # least recently used containers are on the left
+            while self._idle and len(self._idle) + len(self._leased) > self._min_size:
+                container, last_used = self._idle[0]
+                if now - last_used < idle_timeout:
+                    break
+                self._idle.popleft()
+                reaped.append(container)
+
+        if reaped:
+            LOG.debug("Reaped %s idle warm container(s) for function '%s'", len(reaped), self._function_full_path)
+        return reaped
+
+    def all_containers(self) -> List[Container]:
+        """
+        Returns
+        -------
+        List[Container]
+            All the idle and leased containers of the pool
+        """
+        with self._condition:
+            return [container for container, _ in self._idle] + list(self._leased)
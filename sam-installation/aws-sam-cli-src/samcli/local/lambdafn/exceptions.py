@@ -13,3 +13,15 @@ class ResourceNotFound(Exception):
     """
     Raised when the requested resource is not found
     """
+
+
+class DownloadChecksumMismatch(Exception):
+    """
+    Raised when a downloaded file doesn't match its expected checksum
+    """
+
+
+class ContainerPoolClosed(Exception):
+    """
+    Raised when leasing a container from a pool that was drained, e.g. because the function changed
+    """
@@ -0,0 +1,217 @@
+"""
+Opt-in profiler of the local Lambda invocations, it records how long each phase of an invocation
+(creating the container, starting it, invoking the function, ...) takes
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, NamedTuple, Optional
+
+from samcli.lib.utils.file_lock import atomic_write_text
+
+LOG = logging.getLogger(__name__)
+
+# Path of the Chrome trace file the spans are written to, profiling is disabled when it is not set
+INVOKE_PROFILE_PATH = os.environ.get("SAM_CLI_INVOKE_PROFILE", "")
+
+
+class Span(NamedTuple):
+    name: str
+    # microseconds since the profiler was created
+    start_us: float
+    duration_us: float
+    thread_id: int
+    thread_name: str
+    args: Dict[str, Any]
+
+
+class InvokeProfiler:
+    """
+    Thread safe recorder of the invocation phase spans. The spans are exported in the Chrome trace format,
+    which can be opened with chrome://tracing or https://ui.perfetto.dev, and summarized per phase at shutdown.
+    """
+
+    def __init__(self, trace_path: Optional[str] = None):
+        """
+        Parameters
+        ----------
+        trace_path : Optional[str]
+            Path of the trace file written at shutdown, the profiler is disabled if it is not set
+        """
+        self._trace_path = trace_path
+        self._origin = time.perf_counter()
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._trace_path)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def span(self, name: str, **args: Any) -> ContextManager:
+        """
+        Context manager that records a span around its block, it does nothing if the profiler is disabled
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase
+        args
+            Extra details of the span, e.g. the function name
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._record_span(name, args)
+
+    @contextmanager
+    def _record_span(self, name: str, args: Dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as ex:
+            args["error"] = type(ex).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            thread = threading.current_thread()
+            span = Span(
+                name=name,
+                start_us=(start - self._origin) * 1_000_000,
+                duration_us=(end - start) * 1_000_000,
+                thread_id=thread.ident or 0,
+                thread_name=thread.name,
+                args=args,
+            )
+            with self._lock:
+                self._spans.append(span)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        dict
+            The spans as complete ("X") events of the Chrome trace event format
+        """
+        spans = self.spans
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        thread_names = {}
+        for span in spans:
+            thread_names[span.thread_id] = span.thread_name
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "invoke",
+                    "ph": "X",
+                    "ts": round(span.start_us, 3),
+                    "dur": round(span.duration_us, 3),
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": span.args,
+                }
+            )
+        for thread_id, thread_name in thread_names.items():
+            events.append(
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}}
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Returns
+        -------
+        List[dict]
+            Count and latency statistics in milliseconds of each phase, in the order the phases were first seen
+        """
+        durations: Dict[str, List[float]] = {}
+        for span in self.spans:
+            durations.setdefault(span.name, []).append(span.duration_us / 1000)
+
+        rows = []
+        for name, phase_durations in durations.items():
+            phase_durations.sort()
+            count = len(phase_durations)
+            total = sum(phase_durations)
+            rows.append(
+                {
+                    "phase": name,
+                    "count": count,
+                    "totalMs": round(total, 3),
+                    "averageMs": round(total / count, 3),
+                    "p50Ms": round(_percentile(phase_durations, 50), 3),
+                    "p95Ms": round(_percentile(phase_durations, 95), 3),
+                    "maxMs": round(phase_durations[-1], 3),
+                }
+            )
+        return rows
+
+    def format_summary(self) -> str:
+        """
+        Returns
+        -------
+        str
+            The summary as a text table
+        """
+        columns = ["phase", "count", "totalMs", "averageMs", "p50Ms", "p95Ms", "maxMs"]
+        headers = ["Phase", "Count", "Total (ms)", "Avg (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)"]
+        rows = [[str(row[column]) for column in columns] for row in self.summary()]
+        widths = [max(len(cell) for cell in column) for column in zip(headers, *rows)]
+
+        lines = []
+        for cells in [headers, *rows]:
+            first, *others = cells
+            lines.append(
+                "  ".join([first.ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(others, widths[1:])])
+            )
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def shutdown(self) -> None:
+        """
+        Write the trace file and log the summary of the recorded spans, only the first call has any effect
+        """
+        if not self.enabled or self._shutdown:
+            return
+        self._shutdown = True
+
+        if not self.spans:
+            LOG.debug("No Lambda invocation was profiled, skipping writing %s", self._trace_path)
+            return
+
+        try:
+            atomic_write_text(str(self._trace_path), json.dumps(self.to_chrome_trace()))
+        except OSError as ex:
+            LOG.warning("Failed to write the Lambda invocation profile to %s: %s", self._trace_path, ex)
+        else:
+            LOG.info("Lambda invocation profile is written to %s", self._trace_path)
+        LOG.info("Lambda invocation phases:\n%s", self.format_summary())
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """
+    Nearest rank percentile of an already sorted, non empty list
+    """
+    rank = max(1, -(-len(sorted_values) * percentile // 100))
+    return sorted_values[int(rank) - 1]
+
+
+PROFILER = InvokeProfiler(INVOKE_PROFILE_PATH)
+if PROFILER.enabled:
+    atexit.register(PROFILER.shutdown)
+
+
+def profile_span(name: str, **args: Any) -> ContextManager:
+    """
+    Record a span of the invocation phase around the block if SAM_CLI_INVOKE_PROFILE is set
+    """
+    return PROFILER.span(name, **args)
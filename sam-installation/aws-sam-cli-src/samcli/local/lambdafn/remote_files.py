@@ -2,22 +2,69 @@
 Helper methods to handle files in remote locations.
 """
 
+import base64
+import hashlib
+import json
 import logging
 import os
+import shutil
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from http import HTTPStatus
 from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from samcli.lib.utils.progressbar import progressbar
-from samcli.local.lambdafn.zip import unzip
+from samcli.local.lambdafn.exceptions import DownloadChecksumMismatch
+from samcli.local.lambdafn.zip import unzip, unzip_entry
 
 LOG = logging.getLogger(__name__)
 
+# Size in MB of the ranges of a file downloaded in parallel
+DOWNLOAD_SEGMENT_SIZE_MB = int(os.environ.get("SAM_CLI_DOWNLOAD_SEGMENT_SIZE_MB", "16"))
+# Number of ranges of a file downloaded at the same time
+DOWNLOAD_SEGMENT_WORKERS = int(os.environ.get("SAM_CLI_DOWNLOAD_SEGMENT_WORKERS", "4"))
+# Attempts to download a range without making progress, each attempt resumes where the previous one stopped
+DOWNLOAD_ATTEMPTS = 5
+# Connect and read timeouts of the download requests, a stalled connection is retried instead of hanging
+DOWNLOAD_TIMEOUT = (10, 60)
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Connections kept open to the same host, shared by all the files downloaded at the same time
+DOWNLOAD_POOL_SIZE = 16
+# Keeps the downloaded ranges of a partially downloaded file, so that the next download resumes from there
+DOWNLOAD_PROGRESS_SUFFIX = ".progress"
+# Seconds between two updates of the progress bar
+PROGRESS_UPDATE_INTERVAL = 0.2
 
-def unzip_from_uri(uri, layer_zip_path, unzip_output_dir, progressbar_label):
+
+def _create_session() -> requests.Session:
+    """
+    Creates the session shared by all the downloads, so that the connections are reused across files
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=DOWNLOAD_POOL_SIZE, pool_maxsize=DOWNLOAD_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = _create_session()
+
+
+def unzip_from_uri(uri, layer_zip_path, unzip_output_dir, progressbar_label, code_sha256=None):
     """
     Download the LayerVersion Zip to the Layer Pkg Cache
 
+    When the server supports ranges, the file is downloaded in parallel ranges, and each range resumes where it
+    stopped when the connection fails. If code_sha256 is given, a partially downloaded file is kept next to
+    layer_zip_path and the next download of the same file resumes it. The entries of the zip are unzipped as soon as
+    they are downloaded.
+
     Parameters
     ----------
     uri str
@@ -28,26 +75,325 @@ def unzip_from_uri(uri, layer_zip_path, unzip_output_dir, progressbar_label):
         Path to unzip the zip to
     progressbar_label str
         Label to use in the Progressbar
+    code_sha256 Optional[str]
+        Base64 encoded SHA-256 of the file, the CodeSha256 of a Lambda layer or function. The download is verified
+        against it
+
+    Raises
+    ------
+    DownloadChecksumMismatch
+        When the downloaded file doesn't match code_sha256
     """
+    download = _RangedDownload(uri, layer_zip_path, unzip_output_dir, progressbar_label, code_sha256)
     try:
-        get_request = requests.get(uri, stream=True, verify=os.environ.get("AWS_CA_BUNDLE", True))
+        download.run()
+    except DownloadChecksumMismatch:
+        # the unzipped content is not the expected one either
+        shutil.rmtree(unzip_output_dir, ignore_errors=True)
+        raise
+    finally:
+        # Remove the downloaded zip file, unless the next download can resume it
+        if not download.resumable:
+            for path in [Path(layer_zip_path), Path(layer_zip_path + DOWNLOAD_PROGRESS_SUFFIX)]:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError as ex:
+                    LOG.debug("Failed to remove %s", path, exc_info=ex)
+
+
+class _RangedDownload:
+    """
+    Downloads a file with parallel HTTP range requests, and unzips its entries as they are downloaded.
+
+    The file is split in segments of DOWNLOAD_SEGMENT_SIZE_MB. The last segment is downloaded first since the zip
+    central directory is at the end of the file, then each entry is unzipped once its bytes are downloaded.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        zip_path: str,
+        unzip_output_dir: str,
+        progressbar_label: str,
+        code_sha256: Optional[str],
+    ):
+        self._uri = uri
+        self._zip_path = zip_path
+        self._progress_path = Path(zip_path + DOWNLOAD_PROGRESS_SUFFIX)
+        self._unzip_output_dir = unzip_output_dir
+        self._progressbar_label = progressbar_label
+        self._code_sha256 = code_sha256
+        self._session = _SESSION
+        self._verify = os.environ.get("AWS_CA_BUNDLE", True)
+        self._segment_size = max(DOWNLOAD_SEGMENT_SIZE_MB, 1) * 1024 * 1024
+
+        self._size = 0
+        # start of each segment -> number of bytes of the segment already downloaded, updated by the workers
+        self._downloaded: Dict[int, int] = {}
+        self._downloaded_bytes = 0
+        self._lock = threading.Lock()
+        self._aborted = threading.Event()
+
+        # set when the download failed, but the partially downloaded file can be resumed by the next download
+        self.resumable = False
+
+        self._zip_ref: Optional[zipfile.ZipFile] = None
+        self._unreadable_zip = False
+        # (start, end, ZipInfo) of the entries which are not unzipped yet
+        self._pending_entries: List[Tuple[int, int, zipfile.ZipInfo]] = []
+        self._last_extracted_path: Optional[str] = None
 
-        with open(layer_zip_path, "wb") as local_layer_file:
-            file_length = int(get_request.headers["Content-length"])
+    def run(self) -> None:
+        """
+        Downloads and unzips the file
+        """
+        with self._get(headers={"Range": "bytes=0-0"}) as response:
+            response.raise_for_status()
+            content_range = response.headers.get("Content-Range", "")
+            if response.status_code != requests.codes.partial_content or "/" not in content_range:
+                LOG.debug("%s does not support ranges, downloading it with a single request", self._progressbar_label)
+                self._download_whole(response)
+                self._verify_checksum()
+                unzip(self._zip_path, self._unzip_output_dir, permission=0o700)
+                return
+            # consume the body so that the connection goes back to the pool
+            response.content  # pylint: disable=pointless-statement
+            self._size = int(content_range.rsplit("/", 1)[1])
 
-            with progressbar(file_length, progressbar_label) as p_bar:
+        self._prepare_file()
+        try:
+            try:
+                self._download_segments()
+            except BaseException:
+                self._save_progress()
+                self.resumable = self._code_sha256 is not None
+                raise
+            self._verify_checksum()
+            self._unzip_remaining_entries()
+        finally:
+            if self._zip_ref:
+                self._zip_ref.close()
+                self._zip_ref = None
+
+    def _get(self, headers: Dict[str, str]) -> requests.Response:
+        return self._session.get(self._uri, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT, verify=self._verify)
+
+    def _download_whole(self, response: requests.Response) -> None:
+        with open(self._zip_path, "wb") as local_layer_file:
+            file_length = int(response.headers["Content-length"])
+
+            with progressbar(file_length, self._progressbar_label) as p_bar:
                 # Set the chunk size to None. Since we are streaming the request, None will allow the data to be
                 # read as it arrives in whatever size the chunks are received.
-                for data in get_request.iter_content(chunk_size=None):
+                for data in response.iter_content(chunk_size=None):
                     local_layer_file.write(data)
                     p_bar.update(len(data))
 
-        # Forcefully set the permissions to 700 on files and directories. This is to ensure the owner
-        # of the files is the only one that can read, write, or execute the files.
-        unzip(layer_zip_path, unzip_output_dir, permission=0o700)
+    def _prepare_file(self) -> None:
+        """
+        Loads the progress of a previous download of the same file, or creates an empty file of the right size
+        """
+        segment_starts = range(0, self._size, self._segment_size)
+        self._downloaded = dict.fromkeys(segment_starts, 0)
+        try:
+            progress = json.loads(self._progress_path.read_text())
+            if (
+                self._code_sha256
+                and progress.get("code_sha256") == self._code_sha256
+                and progress.get("size") == self._size
+                and progress.get("segment_size") == self._segment_size
+                and os.path.getsize(self._zip_path) == self._size
+            ):
+                for start, downloaded in progress.get("downloaded", {}).items():
+                    if int(start) in self._downloaded:
+                        self._downloaded[int(start)] = int(downloaded)
+                self._downloaded_bytes = sum(self._downloaded.values())
+                LOG.debug("Resuming the download of %s at %d bytes", self._zip_path, self._downloaded_bytes)
+                return
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, AttributeError) as ex:
+            LOG.debug("Ignoring the invalid download progress %s", self._progress_path, exc_info=ex)
 
-    finally:
-        # Remove the downloaded zip file
-        path_to_layer = Path(layer_zip_path)
-        if path_to_layer.exists():
-            path_to_layer.unlink()
+        self._downloaded = dict.fromkeys(segment_starts, 0)
+        self._downloaded_bytes = 0
+        with open(self._zip_path, "wb") as zip_file:
+            zip_file.truncate(self._size)
+
+    def _save_progress(self) -> None:
+        if not self._code_sha256:
+            return
+        with self._lock:
+            progress = {
+                "code_sha256": self._code_sha256,
+                "size": self._size,
+                "segment_size": self._segment_size,
+                "downloaded": {str(start): downloaded for start, downloaded in self._downloaded.items()},
+            }
+        try:
+            self._progress_path.write_text(json.dumps(progress))
+        except OSError as ex:
+            LOG.debug("Failed to save the download progress %s", self._progress_path, exc_info=ex)
+
+    def _download_segments(self) -> None:
+        # the last segment holds the zip central directory, which tells where each entry is
+        starts = sorted(self._downloaded, key=lambda start: (start + self._segment_size < self._size, start))
+        starts = [start for start in starts if not self._is_segment_downloaded(start)]
+
+        with progressbar(self._size, self._progressbar_label) as p_bar:
+            p_bar.update(self._downloaded_bytes)
+            reported_bytes = self._downloaded_bytes
+            self._unzip_downloaded_entries()
+
+            if not starts:
+                return
+            executor = ThreadPoolExecutor(
+                max_workers=max(1, min(DOWNLOAD_SEGMENT_WORKERS, len(starts))), thread_name_prefix="SegmentDownload"
+            )
+            pending: Set[Future] = {executor.submit(self._download_segment, start) for start in starts}
+            try:
+                while pending:
+                    done, pending = wait(pending, timeout=PROGRESS_UPDATE_INTERVAL, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                    with self._lock:
+                        downloaded_bytes = self._downloaded_bytes
+                    p_bar.update(downloaded_bytes - reported_bytes)
+                    reported_bytes = downloaded_bytes
+                    if done:
+                        self._unzip_downloaded_entries()
+            except BaseException:
+                # stop the other segments without waiting for them, they are resumed by the next download
+                self._aborted.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
+
+    def _download_segment(self, start: int) -> None:
+        end = min(start + self._segment_size, self._size)
+        attempts = 0
+        while not self._is_segment_downloaded(start):
+            position = start + self._downloaded[start]
+            try:
+                with self._get(headers={"Range": f"bytes={position}-{end - 1}"}) as response:
+                    response.raise_for_status()
+                    if response.status_code != requests.codes.partial_content:
+                        raise requests.exceptions.HTTPError(
+                            f"Expected a partial content response, got {response.status_code}", response=response
+                        )
+                    with open(self._zip_path, "r+b", buffering=0) as zip_file:
+                        zip_file.seek(position)
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            if self._aborted.is_set():
+                                return
+                            data = chunk[: end - position]
+                            zip_file.write(data)
+                            position += len(data)
+                            # the downloaded bytes are only counted once they are written, so that they can be unzipped
+                            with self._lock:
+                                self._downloaded[start] += len(data)
+                                self._downloaded_bytes += len(data)
+                            # a connection which makes progress gets all its attempts back
+                            attempts = 0
+                            if position >= end:
+                                break
+            except requests.exceptions.RequestException as ex:
+                attempts += 1
+                if attempts >= DOWNLOAD_ATTEMPTS or self._aborted.is_set() or not self._is_retryable(ex):
+                    raise
+                delay = min(0.5 * 2**attempts, 10)
+                LOG.debug(
+                    "Failed to download bytes %d-%d, retrying in %s seconds", position, end - 1, delay, exc_info=ex
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    def _is_retryable(ex: requests.exceptions.RequestException) -> bool:
+        # client errors, like an expired url, fail the same way when retried
+        response = ex.response if isinstance(ex, requests.exceptions.HTTPError) else None
+        return response is None or response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+
+    def _is_segment_downloaded(self, start: int) -> bool:
+        with self._lock:
+            return start + self._downloaded[start] >= min(start + self._segment_size, self._size)
+
+    def _is_range_downloaded(self, range_start: int, range_end: int) -> bool:
+        first_segment = range_start - range_start % self._segment_size
+        with self._lock:
+            for start in range(first_segment, min(range_end, self._size), self._segment_size):
+                if start + self._downloaded[start] < min(range_end, start + self._segment_size, self._size):
+                    return False
+        return True
+
+    def _unzip_downloaded_entries(self) -> None:
+        """
+        Unzips the entries whose bytes are downloaded, once the central directory of the zip is downloaded
+        """
+        if not self._zip_ref and not self._open_zip():
+            return
+
+        remaining_entries = []
+        for entry_start, entry_end, file_info in self._pending_entries:
+            if self._is_range_downloaded(entry_start, entry_end):
+                self._last_extracted_path = unzip_entry(self._zip_ref, file_info, self._unzip_output_dir, 0o700)
+            else:
+                remaining_entries.append((entry_start, entry_end, file_info))
+        self._pending_entries = remaining_entries
+
+    def _open_zip(self) -> bool:
+        """
+        Reads the central directory of the zip, returns False if it isn't downloaded yet
+        """
+        if self._unreadable_zip:
+            return False
+        # the end of central directory record is at most 64 KB from the end of the file, it tells where the central
+        # directory starts. Until all of it is downloaded, the zip may not be readable or may be read wrong
+        if not self._is_range_downloaded(max(self._size - 64 * 1024 - 22, 0), self._size):
+            return False
+        try:
+            with zipfile.ZipFile(self._zip_path) as zip_ref:
+                central_directory_start = getattr(zip_ref, "start_dir", 0)
+        except Exception as ex:  # pylint: disable=broad-except
+            # the central directory may not be downloaded yet
+            LOG.debug("Can't read the central directory of %s yet", self._zip_path, exc_info=ex)
+            return False
+        if not self._is_range_downloaded(central_directory_start, self._size):
+            return False
+
+        try:
+            self._zip_ref = zipfile.ZipFile(self._zip_path)
+        except (zipfile.BadZipFile, OSError, ValueError) as ex:
+            # not a valid zip, unzipping it after the download reports the error
+            LOG.debug("Can't read the central directory of %s", self._zip_path, exc_info=ex)
+            self._unreadable_zip = True
+            return False
+
+        # the bytes of an entry go from its local header to the local header of the next entry
+        file_infos = sorted(self._zip_ref.infolist(), key=lambda file_info: file_info.header_offset)
+        entry_ends = [file_info.header_offset for file_info in file_infos[1:]] + [central_directory_start]
+        self._pending_entries = [
+            (file_info.header_offset, entry_end, file_info) for file_info, entry_end in zip(file_infos, entry_ends)
+        ]
+        return True
+
+    def _unzip_remaining_entries(self) -> None:
+        if not self._zip_ref and not self._open_zip():
+            # the zip couldn't be read while it was downloaded, let unzip report why
+            unzip(self._zip_path, self._unzip_output_dir, permission=0o700)
+            return
+        self._unzip_downloaded_entries()
+        if self._last_extracted_path and not os.path.islink(self._last_extracted_path):
+            os.chmod(self._unzip_output_dir, 0o700)
+
+    def _verify_checksum(self) -> None:
+        if not self._code_sha256:
+            return
+        sha256 = hashlib.sha256()
+        with open(self._zip_path, "rb") as zip_file:
+            for data in iter(lambda: zip_file.read(DOWNLOAD_CHUNK_SIZE), b""):
+                sha256.update(data)
+        code_sha256 = base64.b64encode(sha256.digest()).decode("utf-8")
+        if code_sha256 != self._code_sha256:
+            raise DownloadChecksumMismatch(
+                f"The SHA-256 of {self._progressbar_label} is {code_sha256}, expected {self._code_sha256}"
+            )
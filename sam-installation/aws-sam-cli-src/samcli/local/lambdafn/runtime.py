@@ -9,7 +9,7 @@ import shutil
 import signal
 import tempfile
 import threading
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from samcli.lib.telemetry.metric import capture_parameter
 from samcli.lib.utils.file_observer import LambdaFunctionObserver
@@ -18,6 +18,9 @@ from samcli.local.docker.container import Container, ContainerContext
 from samcli.local.docker.container_analyzer import ContainerAnalyzer
 from samcli.local.docker.exceptions import ContainerFailureError, DockerContainerCreationFailedException
 from samcli.local.docker.lambda_container import LambdaContainer
+from samcli.local.lambdafn.container_pool import ContainerPool
+from samcli.local.lambdafn.exceptions import ContainerPoolClosed
+from samcli.local.lambdafn.invoke_profiler import profile_span
 
 from ...lib.providers.provider import LayerVersion
 from ...lib.utils.stream_writer import StreamWriter
@@ -25,6 +28,13 @@ from .zip import unzip
 
 LOG = logging.getLogger(__name__)
 
+# Number of warm containers that are kept for each function, even when they are idle
+WARM_CONTAINERS_MIN = int(os.environ.get("SAM_CLI_WARM_CONTAINERS_MIN", "1"))
+# Maximum number of warm containers per function, concurrent invocations above it wait for a free container
+WARM_CONTAINERS_MAX = int(os.environ.get("SAM_CLI_WARM_CONTAINERS_MAX", "4"))
+# Number of seconds after which idle warm containers above the minimum are stopped
+WARM_CONTAINERS_IDLE_TIMEOUT = float(os.environ.get("SAM_CLI_WARM_CONTAINERS_IDLE_TIMEOUT", "300"))
+
 
 class LambdaRuntime:
     """
@@ -84,8 +94,9 @@ class LambdaRuntime:
         # Generate a dictionary of environment variable key:values
         env_vars = function_config.env_vars.resolve()
 
-        code_dir = self._get_code_dir(function_config.code_abs_path)
-        layers = [self._unarchived_layer(layer) for layer in function_config.layers]
+        with profile_span("code.unarchive", function=function_config.full_path):
+            code_dir = self._get_code_dir(function_config.code_abs_path)
+            layers = [self._unarchived_layer(layer) for layer in function_config.layers]
         if function_config.runtime_management_config and function_config.runtime_management_config.get(
             "RuntimeVersionArn"
         ):
@@ -97,28 +108,30 @@ class LambdaRuntime:
                 sam_accelerate_link,
             )
 
-        container = LambdaContainer(
-            function_config.runtime,
-            function_config.imageuri,
-            function_config.handler,
-            function_config.packagetype,
-            function_config.imageconfig,
-            code_dir,
-            layers,
-            self._image_builder,
-            function_config.architecture,
-            memory_mb=(None if self._no_mem_limit else function_config.memory),
-            env_vars=env_vars,
-            debug_options=debug_context,
-            container_host=container_host,
-            container_host_interface=container_host_interface,
-            extra_hosts=extra_hosts,
-            function_full_path=function_config.full_path,
-            mount_symlinks=self._mount_symlinks,
-        )
+        with profile_span("container.image", function=function_config.full_path):
+            container = LambdaContainer(
+                function_config.runtime,
+                function_config.imageuri,
+                function_config.handler,
+                function_config.packagetype,
+                function_config.imageconfig,
+                code_dir,
+                layers,
+                self._image_builder,
+                function_config.architecture,
+                memory_mb=(None if self._no_mem_limit else function_config.memory),
+                env_vars=env_vars,
+                debug_options=debug_context,
+                container_host=container_host,
+                container_host_interface=container_host_interface,
+                extra_hosts=extra_hosts,
+                function_full_path=function_config.full_path,
+                mount_symlinks=self._mount_symlinks,
+            )
         try:
             # create the container.
-            self._container_manager.create(container, ContainerContext.INVOKE)
+            with profile_span("container.create", function=function_config.full_path):
+                self._container_manager.create(container, ContainerContext.INVOKE)
             return container
 
         except DockerContainerCreationFailedException:
@@ -179,7 +192,8 @@ class LambdaRuntime:
 
         try:
             # start the container.
-            self._container_manager.run(container, ContainerContext.INVOKE)
+            with profile_span("container.start", function=function_config.full_path):
+                self._container_manager.run(container, ContainerContext.INVOKE)
             return container
 
         except KeyboardInterrupt:
@@ -223,37 +237,43 @@ class LambdaRuntime:
             Dict of hostname to IP resolutions
         :raises Keyboard
         """
-        container = None
-        try:
-            # Start the container. This call returns immediately after the container starts
-            container = self.create(
-                function_config, debug_context, container_host, container_host_interface, extra_hosts
-            )
-            container = self.run(container, function_config, debug_context)
-            # Setup appropriate interrupt - timeout or Ctrl+C - before function starts executing and
-            # get callback function to start timeout timer
-            start_timer = self._configure_interrupt(
-                function_config.full_path, function_config.timeout, container, bool(debug_context)
-            )
-
-            # NOTE: BLOCKING METHOD
-            # Block on waiting for result from the init process on the container, below method also
-            # starts another thread to stream logs. This method will terminate
-            # either successfully or be killed by one of the interrupt handlers above.
-            container.wait_for_result(
-                full_path=function_config.full_path, event=event, stdout=stdout, stderr=stderr, start_timer=start_timer
-            )
-
-        except KeyboardInterrupt:
-            # When user presses Ctrl+C, we receive a Keyboard Interrupt. This is especially very common when
-            # container is in debugging mode. We have special handling of Ctrl+C. So handle KeyboardInterrupt
-            # and swallow the exception. The ``finally`` block will also take care of cleaning it up.
-            LOG.debug("Ctrl+C was pressed. Aborting Lambda execution")
-
-        finally:
-            # We will be done with execution, if either the execution completed or an interrupt was fired
-            # Any case, cleanup the container.
-            self._on_invoke_done(container)
+        with profile_span("invoke", function=function_config.full_path):
+            container = None
+            try:
+                # Start the container. This call returns immediately after the container starts
+                container = self.create(
+                    function_config, debug_context, container_host, container_host_interface, extra_hosts
+                )
+                container = self.run(container, function_config, debug_context)
+                # Setup appropriate interrupt - timeout or Ctrl+C - before function starts executing and
+                # get callback function to start timeout timer
+                start_timer = self._configure_interrupt(
+                    function_config.full_path, function_config.timeout, container, bool(debug_context)
+                )
+
+                # NOTE: BLOCKING METHOD
+                # Block on waiting for result from the init process on the container, below method also
+                # starts another thread to stream logs. This method will terminate
+                # either successfully or be killed by one of the interrupt handlers above.
+                container.wait_for_result(
+                    full_path=function_config.full_path,
+                    event=event,
+                    stdout=stdout,
+                    stderr=stderr,
+                    start_timer=start_timer,
+                )
+
+            except KeyboardInterrupt:
+                # When user presses Ctrl+C, we receive a Keyboard Interrupt. This is especially very common when
+                # container is in debugging mode. We have special handling of Ctrl+C. So handle KeyboardInterrupt
+                # and swallow the exception. The ``finally`` block will also take care of cleaning it up.
+                LOG.debug("Ctrl+C was pressed. Aborting Lambda execution")
+
+            finally:
+                # We will be done with execution, if either the execution completed or an interrupt was fired
+                # Any case, cleanup the container.
+                with profile_span("container.cleanup", function=function_config.full_path):
+                    self._on_invoke_done(container)
 
     def _on_invoke_done(self, container):
         """
@@ -393,9 +413,22 @@ class WarmLambdaRuntime(LambdaRuntime):
     """
     This class extends the LambdaRuntime class to add the Warm containers feature. This class handles the
     warm containers life cycle.
+
+    Each function gets a pool of warm containers. Every invocation leases its own container from the pool, so
+    concurrent invocations of the same function don't share a container, and returns it once the invocation is done.
     """
 
-    def __init__(self, container_manager, image_builder, observer=None, mount_symlinks=False, no_mem_limit=False):
+    def __init__(
+        self,
+        container_manager,
+        image_builder,
+        observer=None,
+        mount_symlinks=False,
+        no_mem_limit=False,
+        min_containers=WARM_CONTAINERS_MIN,
+        max_containers=WARM_CONTAINERS_MAX,
+        idle_timeout=WARM_CONTAINERS_IDLE_TIMEOUT,
+    ):
         """
         Initialize the Local Lambda runtime
 
@@ -407,9 +440,24 @@ class WarmLambdaRuntime(LambdaRuntime):
             Instance of the LambdaImage class that can create am image
         warm_containers bool
             Determines if the warm containers is enabled or not.
+        min_containers int
+            Number of warm containers kept for each function, even when they are idle
+        max_containers int
+            Maximum number of warm containers for each function
+        idle_timeout float
+            Number of seconds after which idle containers above min_containers are stopped
         """
         self._function_configs = {}
-        self._containers = {}
+        self._container_pools: Dict[str, ContainerPool] = {}
+        # pool each leased container has to be returned to
+        self._leases: Dict[Container, ContainerPool] = {}
+        self._pools_lock = threading.Lock()
+
+        self._min_containers = min_containers
+        self._max_containers = max_containers
+        self._idle_timeout = idle_timeout
+        self._reaper_thread: Optional[threading.Thread] = None
+        self._reaper_stop_event = threading.Event()
 
         self._observer = observer if observer else LambdaFunctionObserver(self._on_code_change)
 
@@ -419,9 +467,9 @@ class WarmLambdaRuntime(LambdaRuntime):
         self, function_config, debug_context=None, container_host=None, container_host_interface=None, extra_hosts=None
     ):
         """
-        Create a new Container for the passed function, then store it in a dictionary using the function name,
-        so it can be retrieved later and used in the other functions. Make sure to use the debug_context only
-        if the function_config.name equals debug_context.debug-function or the warm_containers option is disabled
+        Lease a container for the passed function from its pool of warm containers. A new container is created
+        if none of the existing ones is free. Make sure to use the debug_context only if the function_config.name
+        equals debug_context.debug-function or the warm_containers option is disabled
 
         Parameters
         ----------
@@ -437,27 +485,13 @@ class WarmLambdaRuntime(LambdaRuntime):
         Returns
         -------
         Container
-            the created container
+            the leased container, it must be returned with _on_invoke_done
         """
+        debug_context = self._get_function_debug_context(function_config, debug_context)
+        return self._lease(function_config, debug_context, container_host, container_host_interface, extra_hosts)
 
-        # reuse the cached container if it is created, and if the function configuration is not changed
-        exist_function_config = self._function_configs.get(function_config.full_path, None)
-        container = self._containers.get(function_config.full_path, None)
-        if exist_function_config and _require_container_reloading(exist_function_config, function_config):
-            LOG.info(
-                "Lambda Function '%s' definition has been changed in the stack template, "
-                "terminate the created warm container.",
-                function_config.full_path,
-            )
-            self._function_configs.pop(exist_function_config.full_path, None)
-            if container:
-                self._container_manager.stop(container)
-                self._containers.pop(exist_function_config.full_path, None)
-            self._observer.unwatch(exist_function_config)
-        elif container and container.is_created():
-            LOG.info("Reuse the created warm container for Lambda function '%s'", function_config.full_path)
-            return container
-
+    @staticmethod
+    def _get_function_debug_context(function_config, debug_context):
         # debug_context should be used only if the function name is the one defined
         # in debug-function option
         if debug_context and debug_context.debug_function != function_config.name:
@@ -466,30 +500,141 @@ class WarmLambdaRuntime(LambdaRuntime):
                 function_config.name,
                 debug_context.debug_function,
             )
-            debug_context = None
+            return None
+        return debug_context
 
-        self._observer.watch(function_config)
-        self._observer.start()
+    def _lease(
+        self,
+        function_config,
+        debug_context,
+        container_host=None,
+        container_host_interface=None,
+        extra_hosts=None,
+        prefer_new=False,
+    ):
+        """
+        Lease a container for the passed function from its pool, see create and ContainerPool.lease
+        """
+        self._start_reaper()
 
-        container = super().create(
-            function_config, debug_context, container_host, container_host_interface, extra_hosts
-        )
-        self._function_configs[function_config.full_path] = function_config
-        self._containers[function_config.full_path] = container
+        def create_container():
+            return LambdaRuntime.create(
+                self, function_config, debug_context, container_host, container_host_interface, extra_hosts
+            )
 
+        with profile_span("container.lease", function=function_config.full_path):
+            while True:
+                pool = self._get_pool(function_config, debug_context)
+                try:
+                    container = pool.lease(create_container, prefer_new)
+                    break
+                except ContainerPoolClosed:
+                    # the function changed while waiting for a container, lease from the new pool instead
+                    LOG.debug("Warm containers of function '%s' were drained, retrying", function_config.full_path)
+
+        with self._pools_lock:
+            self._leases[container] = pool
         return container
 
+    def _get_pool(self, function_config, debug_context) -> ContainerPool:
+        """
+        Get the pool of warm containers of the passed function, the pool is replaced by a new one if the function
+        configuration changed
+
+        Parameters
+        ----------
+        function_config FunctionConfig
+            Configuration of the function
+        debug_context DebugContext
+            Debugging context of the function, if it is the function being debugged
+
+        Returns
+        -------
+        ContainerPool
+            Pool of the function
+        """
+        drained: List[Container] = []
+        # reuse the cached containers if they are created, and if the function configuration is not changed
+        with self._pools_lock:
+            exist_function_config = self._function_configs.get(function_config.full_path, None)
+            if exist_function_config and _require_container_reloading(exist_function_config, function_config):
+                LOG.info(
+                    "Lambda Function '%s' definition has been changed in the stack template, "
+                    "terminate the created warm containers.",
+                    function_config.full_path,
+                )
+                self._function_configs.pop(exist_function_config.full_path, None)
+                drained = self._drain_pool(exist_function_config.full_path)
+                self._observer.unwatch(exist_function_config)
+                exist_function_config = None
+
+            if not exist_function_config:
+                self._observer.watch(function_config)
+                self._observer.start()
+                self._function_configs[function_config.full_path] = function_config
+
+            pool = self._container_pools.get(function_config.full_path)
+            if not pool:
+                # a debugger can only be attached to one container through the debug port
+                max_containers = 1 if debug_context else self._max_containers
+                pool = ContainerPool(function_config.full_path, self._min_containers, max_containers)
+                self._container_pools[function_config.full_path] = pool
+
+        self._stop_containers(drained)
+        return pool
+
+    def prewarm(
+        self, function_config, debug_context=None, container_host=None, container_host_interface=None, extra_hosts=None
+    ):
+        """
+        Create and start the minimum number of warm containers for the passed function, at least one. Each container
+        is returned to the pool before the next one is created, so that warming up never waits for a container of
+        a pool that can't grow further, like the pool of the function being debugged
+
+        Parameters
+        ----------
+        function_config FunctionConfig
+            Configuration of the function to create the containers for.
+        debug_context DebugContext
+            Debugging context for the function (includes port, args, and path)
+        container_host string
+            Host of locally emulated Lambda container
+        container_host_interface string
+            Interface that Docker host binds ports to
+        extra_hosts Dict
+            Optional. Dict of hostname to IP resolutions
+        """
+        debug_context = self._get_function_debug_context(function_config, debug_context)
+        pool = self._get_pool(function_config, debug_context)
+        for _ in range(max(1, pool.min_size)):
+            container = self._lease(
+                function_config, debug_context, container_host, container_host_interface, extra_hosts, prefer_new=True
+            )
+            try:
+                self.run(container, function_config, debug_context)
+            finally:
+                self._on_invoke_done(container)
+
     def _on_invoke_done(self, container):
         """
-        Cleanup the created resources, just before the invoke function ends.
+        Return the leased container to its pool, just before the invoke function ends.
         In warm containers, the running containers will be closed just before the end of te command execution,
-        so no action is done here
+        unless they have been retired in the meantime because the function changed
 
         Parameters
         ----------
         container: Container
            The current running container
         """
+        if not container:
+            return
+
+        with self._pools_lock:
+            pool = self._leases.pop(container, None)
+
+        if not pool or not pool.release(container):
+            LOG.debug("Terminate retired warm container %s", container.id)
+            self._container_manager.stop(container)
 
     def _configure_interrupt(self, function_full_path, timeout, container, is_debugging):
         """
@@ -541,9 +686,15 @@ class WarmLambdaRuntime(LambdaRuntime):
         Clean the running containers, the decompressed code dirs, and stop the created observer
         """
         LOG.debug("Terminating all running warm containers")
-        for function_name, container in self._containers.items():
-            LOG.debug("Terminate running warm container for Lambda Function '%s'", function_name)
-            self._container_manager.stop(container)
+        self._reaper_stop_event.set()
+        with self._pools_lock:
+            pools = dict(self._container_pools)
+            self._container_pools.clear()
+        for function_name, pool in pools.items():
+            # the pool is closed first, so that the containers still leased are not returned to it
+            for container in pool.drain() + pool.all_containers():
+                LOG.debug("Terminate running warm container for Lambda Function '%s'", function_name)
+                self._container_manager.stop(container)
         self._clean_decompressed_paths()
         self._observer.stop()
 
@@ -561,17 +712,67 @@ class WarmLambdaRuntime(LambdaRuntime):
             function_full_path = function_config.full_path
             resource = "source code" if function_config.packagetype == ZIP else f"{function_config.imageuri} image"
             LOG.info(
-                "Lambda Function '%s' %s has been changed, terminate its warm container. "
-                "The new container will be created in lazy mode",
+                "Lambda Function '%s' %s has been changed, terminate its warm containers. "
+                "The new containers will be created in lazy mode",
                 function_full_path,
                 resource,
             )
             self._observer.unwatch(function_config)
-            self._function_configs.pop(function_full_path, None)
-            container = self._containers.get(function_full_path, None)
-            if container:
+            with self._pools_lock:
+                self._function_configs.pop(function_full_path, None)
+                drained = self._drain_pool(function_full_path)
+            self._stop_containers(drained)
+
+    def _drain_pool(self, function_full_path: str) -> List[Container]:
+        """
+        Remove the pool of a function, and retire its containers that are currently leased.
+        Must be called while holding self._pools_lock
+
+        Parameters
+        ----------
+        function_full_path: str
+            Full path of the function whose containers should be terminated
+
+        Returns
+        -------
+        List[Container]
+            Idle containers of the function, to be stopped with _stop_containers once the lock is released
+        """
+        pool = self._container_pools.pop(function_full_path, None)
+        return pool.drain() if pool else []
+
+    def _stop_containers(self, containers: List[Container]) -> None:
+        for container in containers:
+            LOG.debug("Terminate warm container %s", container.id)
+            self._container_manager.stop(container)
+
+    def _start_reaper(self) -> None:
+        """
+        Start the background thread that stops idle warm containers, if it is not running yet
+        """
+        if self._reaper_thread or self._idle_timeout <= 0:
+            return
+
+        with self._pools_lock:
+            if self._reaper_thread:
+                return
+            self._reaper_thread = threading.Thread(target=self._reap_idle_containers, daemon=True)
+            self._reaper_thread.start()
+
+    def _reap_idle_containers(self) -> None:
+        """
+        Periodically stop the warm containers that have been idle longer than the idle timeout
+        """
+        interval = max(1.0, self._idle_timeout / 2)
+        while not self._reaper_stop_event.wait(interval):
+            with self._pools_lock:
+                pools = list(self._container_pools.values())
+            reaped: List[Container] = []
+            for pool in pools:
+                reaped.extend(pool.reap(self._idle_timeout))
+            for container in reaped:
+                LOG.debug("Terminate idle warm container %s", container.id)
                 self._container_manager.stop(container)
-                self._containers.pop(function_full_path, None)
 
 
 def _unzip_file(filepath):
@@ -89,18 +89,43 @@ def unzip(zip_file_path, output_dir, permission=None):
     with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
         # For each item in the zip file, extract the file and set permissions if available
         for file_info in zip_ref.infolist():
-            extracted_path = _extract(file_info, output_dir, zip_ref)
-
-            # If the extracted_path is a symlink, do not set the permissions. If the target of the symlink does not
-            # exist, then os.chmod will fail with FileNotFoundError
-            if not os.path.islink(extracted_path):
-                _set_permissions(file_info, extracted_path)
-                _override_permissions(extracted_path, permission)
+            extracted_path = unzip_entry(zip_ref, file_info, output_dir, permission)
 
     if not os.path.islink(extracted_path):
         _override_permissions(output_dir, permission)
 
 
+def unzip_entry(zip_ref, file_info, output_dir, permission=None):
+    """
+    Unzip a single entry of the given zip file into the given directory while preserving its permissions.
+
+    Parameters
+    ----------
+    zip_ref : zipfile.ZipFile
+        The ZipFile we are working with.
+    file_info : zipfile.ZipInfo
+        The ZipInfo of the entry to unzip
+    output_dir : str
+        Path to the directory where the it should be unzipped to
+    permission : int
+        Permission to set in an octal int form
+
+    Returns
+    -------
+    string
+        Returns the target path the Zip Entry was extracted to.
+    """
+    extracted_path = _extract(file_info, output_dir, zip_ref)
+
+    # If the extracted_path is a symlink, do not set the permissions. If the target of the symlink does not
+    # exist, then os.chmod will fail with FileNotFoundError
+    if not os.path.islink(extracted_path):
+        _set_permissions(file_info, extracted_path)
+        _override_permissions(extracted_path, permission)
+
+    return extracted_path
+
+
 def _override_permissions(path, permission):
     """
     Forcefully override the permissions on the path
@@ -3,23 +3,59 @@ Downloads Layers locally
 """
 
 import logging
-import uuid
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Set
 
-import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 
-from samcli.commands.local.cli_common.user_exceptions import CredentialsRequired, ResourceNotFound
+from samcli.commands.local.cli_common.user_exceptions import (
+    CredentialsRequired,
+    LayerChecksumMismatch,
+    ResourceNotFound,
+)
 from samcli.lib.providers.provider import LayerVersion, Stack
+from samcli.lib.utils.boto_utils import BOTO_CLIENT_REGISTRY, get_boto_client_with_config
 from samcli.lib.utils.codeuri import resolve_code_path
-from samcli.local.lambdafn.remote_files import unzip_from_uri
+from samcli.lib.utils.file_lock import FileLock, atomic_write_text
+from samcli.local.lambdafn.exceptions import DownloadChecksumMismatch
+from samcli.local.lambdafn.remote_files import DOWNLOAD_PROGRESS_SUFFIX, unzip_from_uri
 
 LOG = logging.getLogger(__name__)
 
+# Maximum size of the layer cache in MB, least recently used layers are evicted above it. 0 means unbounded.
+LAYER_CACHE_MAX_SIZE_MB = int(os.environ.get("SAM_CLI_LAYER_CACHE_MAX_SIZE_MB", "0"))
+# Number of layers that are downloaded at the same time
+LAYER_DOWNLOAD_WORKERS = int(os.environ.get("SAM_CLI_LAYER_DOWNLOAD_WORKERS", "4"))
+
+LAYER_DIGEST_MARKER_SUFFIX = ".digest"
+LAYER_LOCK_SUFFIX = ".lock"
+LAYER_ZIP_SUFFIX = ".zip"
+# Files kept next to the directory of a layer, longest suffix first
+LAYER_FILE_SUFFIXES = (
+    LAYER_ZIP_SUFFIX + DOWNLOAD_PROGRESS_SUFFIX,
+    LAYER_ZIP_SUFFIX,
+    LAYER_DIGEST_MARKER_SUFFIX,
+    LAYER_LOCK_SUFFIX,
+)
+# Zip files left behind by older versions, which downloaded each layer to <layer>_<random hex>.zip
+LEGACY_LAYER_ZIP_PATTERN = re.compile(r"^(?P<layer_name>.+)_[0-9a-f]{32}\.zip$")
+
 
 class LayerDownloader:
-    def __init__(self, layer_cache, cwd, stacks: List[Stack], lambda_client=None):
+    def __init__(
+        self,
+        layer_cache,
+        cwd,
+        stacks: List[Stack],
+        lambda_client=None,
+        max_workers: int = LAYER_DOWNLOAD_WORKERS,
+        max_cache_size_mb: int = LAYER_CACHE_MAX_SIZE_MB,
+    ):
         """
 
         Parameters
@@ -32,15 +68,28 @@ class LayerDownloader:
             List of all stacks
         lambda_client boto3.client('lambda')
             Boto3 Client for AWS Lambda
+        max_workers int
+            Maximum number of layers to download in parallel
+        max_cache_size_mb int
+            Size cap of the layer cache in MB, least recently used layers are evicted once it is exceeded.
+            0 disables eviction
         """
         self._layer_cache = layer_cache
         self.cwd = cwd
         self._stacks = stacks
         self._lambda_client = lambda_client
+        self._max_workers = max(1, max_workers)
+        self._max_cache_size_mb = max_cache_size_mb
+        self._lambda_client_lock = threading.Lock()
+        # Names of the remote layers used since this downloader was created, e.g. for the whole life of
+        # `sam local start-api`. They are never evicted from the cache
+        self._layers_in_use: Set[str] = set()
+        self._layers_in_use_lock = threading.Lock()
 
     @property
     def lambda_client(self):
-        self._lambda_client = self._lambda_client or boto3.client("lambda")
+        with self._lambda_client_lock:
+            self._lambda_client = self._lambda_client or get_boto_client_with_config("lambda")
         return self._lambda_client
 
     @property
@@ -72,9 +121,19 @@ class LayerDownloader:
         List(Path)
             List of Paths to where the layer was cached
         """
-        layer_dirs = []
-        for layer in layers:
-            layer_dirs.append(self.download(layer, force))
+        remote_layers = [layer for layer in layers if not layer.is_defined_within_template]
+
+        if len(remote_layers) <= 1 or self._max_workers == 1:
+            layer_dirs = [self.download(layer, force) for layer in layers]
+        else:
+            workers = min(self._max_workers, len(remote_layers))
+            BOTO_CLIENT_REGISTRY.scale_max_pool_connections(workers)
+            # executor.map keeps the order of the layers, which is the order they get applied in the image
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                layer_dirs = list(executor.map(lambda layer: self.download(layer, force), layers))
+
+        if remote_layers:
+            self._evict_layers()
 
         return layer_dirs
 
@@ -100,25 +159,64 @@ class LayerDownloader:
             return layer
 
         layer_path = Path(self.layer_cache).resolve().joinpath(layer.name)
-        is_layer_downloaded = self._is_layer_cached(layer_path)
         layer.codeuri = str(layer_path)
+        with self._layers_in_use_lock:
+            self._layers_in_use.add(layer.name)
+
+        # The lock is shared with other SAM CLI processes using the same cache, so only one of them downloads
+        # the layer while the others wait and then pick up the cached copy
+        with FileLock(self._get_lock_path(layer_path)):
+            if self._is_layer_cached(layer_path) and not force:
+                LOG.info("%s is already cached. Skipping download", layer.arn)
+                self._touch_layer(layer_path)
+                return layer
+
+            # Remove whatever is left from an interrupted download before unzipping over it
+            self._remove_layer(layer_path)
+
+            layer_content = self._fetch_layer_content(layer)
+            # The zip path doesn't change between downloads of the layer, so an interrupted download is resumed.
+            # It is only used while holding the lock of the layer
+            layer_zip_path = f"{layer.codeuri}{LAYER_ZIP_SUFFIX}"
+            try:
+                unzip_from_uri(
+                    layer_content.get("Location"),
+                    layer_zip_path,
+                    unzip_output_dir=layer.codeuri,
+                    progressbar_label="Downloading {}".format(layer.layer_arn),
+                    code_sha256=layer_content.get("CodeSha256"),
+                )
+            except DownloadChecksumMismatch as ex:
+                raise LayerChecksumMismatch(f"{layer.arn} could not be downloaded: {ex}") from ex
+
+            # The digest marker is written last, its presence is what makes the layer count as cached
+            atomic_write_text(self._get_digest_marker_path(layer_path), layer_content.get("CodeSha256") or "")
 
-        if is_layer_downloaded and not force:
-            LOG.info("%s is already cached. Skipping download", layer.arn)
-            return layer
+        return layer
 
-        layer_zip_path = f"{layer.codeuri}_{uuid.uuid4().hex}.zip"
-        layer_zip_uri = self._fetch_layer_uri(layer)
-        unzip_from_uri(
-            layer_zip_uri,
-            layer_zip_path,
-            unzip_output_dir=layer.codeuri,
-            progressbar_label="Downloading {}".format(layer.layer_arn),
-        )
+    def get_layer_digest(self, layer: LayerVersion) -> Optional[str]:
+        """
+        Digest of a downloaded layer, which is the CodeSha256 reported by AWS Lambda for the layer version
 
-        return layer
+        Parameters
+        ----------
+        layer samcli.commands.local.lib.provider.LayerVersion
+            Layer that has been downloaded to the cache
+
+        Returns
+        -------
+        Optional[str]
+            Digest of the layer, None if the layer is defined in the template or not cached
+        """
+        if layer.is_defined_within_template or not layer.codeuri:
+            return None
 
-    def _fetch_layer_uri(self, layer):
+        try:
+            return self._get_digest_marker_path(Path(layer.codeuri)).read_text() or None
+        except OSError:
+            return None
+
+    def _fetch_layer_content(self, layer) -> Dict:
         """
         Fetch the Layer Uri based on the LayerVersion Arn
 
@@ -129,8 +227,8 @@ class LayerDownloader:
 
         Returns
         -------
-        str
-            The Uri to download the LayerVersion Content from
+        Dict
+            The Content of the LayerVersion, which contains the Location to download it from and its CodeSha256
 
         Raises
         ------
@@ -159,7 +257,116 @@ class LayerDownloader:
             # If it was not 'AccessDeniedException' or 'ResourceNotFoundException' re-raise
             raise e
 
-        return layer_version_response.get("Content").get("Location")
+        return layer_version_response.get("Content")
+
+    def _evict_layers(self) -> None:
+        """
+        Remove the files left behind by earlier downloads, then evict least recently used layers from the cache
+        until it fits in the configured size cap. Everything in the cache counts towards the cap, including
+        partially downloaded layers. Layers used by this downloader or locked by another process are skipped.
+        """
+        cache_dir = Path(self.layer_cache).resolve()
+        with self._layers_in_use_lock:
+            in_use = set(self._layers_in_use)
+        all_cache_entries = self._get_cache_entries(cache_dir)
+        cache_entries = {
+            layer_name: paths for layer_name, paths in all_cache_entries.items() if layer_name not in in_use
+        }
+
+        for layer_name, paths in list(cache_entries.items()):
+            layer_path = cache_dir / layer_name
+            if self._is_layer_cached(layer_path):
+                # the zip of a cached layer is only left behind when removing it failed
+                leftovers = [path for path in paths if self._is_download_leftover(path)]
+                if leftovers and self._remove_unlocked(layer_path, leftovers):
+                    cache_entries[layer_name] = [path for path in paths if path not in leftovers]
+            elif all(path.name.endswith(LAYER_LOCK_SUFFIX) for path in paths):
+                # nothing left to guard
+                if self._remove_unlocked(layer_path, paths):
+                    del cache_entries[layer_name]
+
+        if not self._max_cache_size_mb:
+            return
+
+        max_cache_size = self._max_cache_size_mb * 1024 * 1024
+        entry_sizes = {layer_name: self._get_size(paths) for layer_name, paths in cache_entries.items()}
+        cache_size = sum(entry_sizes.values()) + sum(
+            self._get_size(paths) for layer_name, paths in all_cache_entries.items() if layer_name in in_use
+        )
+
+        # the digest marker is touched every time a layer is used, so its mtime tells when it was last used
+        for layer_name in sorted(cache_entries, key=lambda name: self._get_last_used(cache_dir / name)):
+            if cache_size <= max_cache_size:
+                break
+            LOG.debug("Evicting layer %s from the layer cache", layer_name)
+            if self._remove_unlocked(cache_dir / layer_name, cache_entries[layer_name], remove_lock=True):
+                cache_size -= entry_sizes[layer_name]
+
+    @staticmethod
+    def _remove_unlocked(layer_path: Path, paths: List[Path], remove_lock: bool = False) -> bool:
+        """
+        Remove the given files of a layer, unless another process holds the lock of the layer right now
+
+        Returns
+        -------
+        bool
+            True if the files were removed
+        """
+        lock = FileLock(LayerDownloader._get_lock_path(layer_path))
+        if not lock.acquire(blocking=False):
+            return False
+        try:
+            # the digest marker goes first, so that a layer which is partially removed never counts as cached
+            for path in sorted(paths, key=lambda path: not path.name.endswith(LAYER_DIGEST_MARKER_SUFFIX)):
+                if path.is_dir() and not path.is_symlink():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink(missing_ok=True)
+        except OSError as ex:
+            LOG.debug("Failed to remove %s from the layer cache", layer_path.name, exc_info=ex)
+            return False
+        finally:
+            lock.release(remove=remove_lock)
+        return True
+
+    @staticmethod
+    def _get_cache_entries(cache_dir: Path) -> Dict[str, List[Path]]:
+        """
+        Group the files in the layer cache by the layer they belong to
+
+        Parameters
+        ----------
+        cache_dir Path
+            Layer cache directory
+
+        Returns
+        -------
+        Dict[str, List[Path]]
+            Files of each layer: its directory, digest marker, lock file and downloaded zip
+        """
+        cache_entries: Dict[str, List[Path]] = {}
+        for path in cache_dir.iterdir():
+            layer_name = LayerDownloader._get_cache_entry_name(path)
+            if layer_name:
+                cache_entries.setdefault(layer_name, []).append(path)
+        return cache_entries
+
+    @staticmethod
+    def _get_cache_entry_name(path: Path) -> Optional[str]:
+        if path.is_dir():
+            return path.name
+        legacy_zip = LEGACY_LAYER_ZIP_PATTERN.match(path.name)
+        if legacy_zip:
+            return legacy_zip.group("layer_name")
+        for suffix in LAYER_FILE_SUFFIXES:
+            if path.name.endswith(suffix):
+                return path.name[: -len(suffix)]
+        # e.g. the temporary file of a digest marker being written
+        return None
+
+    @staticmethod
+    def _is_download_leftover(path: Path) -> bool:
+        return path.is_file() and path.name.endswith((LAYER_ZIP_SUFFIX, DOWNLOAD_PROGRESS_SUFFIX))
 
     @staticmethod
     def _is_layer_cached(layer_path: Path) -> bool:
@@ -174,10 +381,54 @@ class LayerDownloader:
         Returns
         -------
         bool
-            True if the layer_path already exists otherwise False
+            True if the layer_path and its digest marker exist otherwise False
 
         """
-        return layer_path.exists()
+        return layer_path.exists() and LayerDownloader._get_digest_marker_path(layer_path).exists()
+
+    @staticmethod
+    def _touch_layer(layer_path: Path) -> None:
+        """Mark the layer as recently used"""
+        LayerDownloader._get_digest_marker_path(layer_path).touch()
+
+    @staticmethod
+    def _remove_layer(layer_path: Path) -> None:
+        """Remove a layer and its digest marker from the cache"""
+        LayerDownloader._get_digest_marker_path(layer_path).unlink(missing_ok=True)
+        if layer_path.exists():
+            shutil.rmtree(layer_path)
+
+    @staticmethod
+    def _get_last_used(layer_path: Path) -> float:
+        try:
+            return LayerDownloader._get_digest_marker_path(layer_path).stat().st_mtime
+        except FileNotFoundError:
+            # not downloaded completely, or evicted by another process in the meantime. Evicted first
+            return 0
+
+    @staticmethod
+    def _get_size(paths: List[Path]) -> int:
+        size = 0
+        for path in paths:
+            try:
+                if path.is_dir() and not path.is_symlink():
+                    size += sum(
+                        file.stat().st_size for file in path.rglob("*") if file.is_file() and not file.is_symlink()
+                    )
+                else:
+                    size += path.stat().st_size
+            except OSError:
+                # removed by another process in the meantime
+                continue
+        return size
+
+    @staticmethod
+    def _get_digest_marker_path(layer_path: Path) -> Path:
+        return layer_path.with_name(layer_path.name + LAYER_DIGEST_MARKER_SUFFIX)
+
+    @staticmethod
+    def _get_lock_path(layer_path: Path) -> Path:
+        return layer_path.with_name(layer_path.name + LAYER_LOCK_SUFFIX)
 
     @staticmethod
     def _create_cache(layer_cache):
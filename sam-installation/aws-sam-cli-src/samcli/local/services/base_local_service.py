@@ -4,17 +4,75 @@ import io
 import json
 import logging
 import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple, Union
 
 from flask import Response
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
 
 from samcli.local.docker.exceptions import ProcessSigTermException
 
 LOG = logging.getLogger(__name__)
 
 
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    WSGI server that handles the requests on a fixed size pool of worker threads, instead of starting a new
+    thread for each connection like the threaded development server. Once all the workers are busy, new
+    connections wait in the listen backlog until a worker is free.
+
+    The connection is closed after each response, so that an idle keep-alive connection does not hold a worker
+    while other clients wait in the backlog.
+    """
+
+    multithread = True
+
+    def __init__(self, host, port, app, max_workers, ssl_context=None):
+        """
+        Parameters
+        ----------
+        host str
+            host to start the server on
+        port int
+            port for the server to listen on
+        app
+            WSGI application to serve
+        max_workers int
+            Number of worker threads that handle the requests
+        ssl_context tuple(str, str)
+            Optional. path to ssl certificate and key files to start the server in https
+        """
+        super().__init__(host, port, app, handler=_PooledRequestHandler, ssl_context=ssl_context)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sam-local-service")
+        self._free_workers = threading.BoundedSemaphore(max_workers)
+
+    def process_request(self, request, client_address):
+        # do not accept more connections than the available workers, the rest waits in the listen backlog
+        self._free_workers.acquire()
+        self._executor.submit(self._process_request_in_worker, request, client_address)
+
+    def _process_request_in_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._free_workers.release()
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=False)
+
+
+class _PooledRequestHandler(WSGIRequestHandler):
+    # HTTP/1.0 closes the connection once the response is sent, which releases the worker of the connection
+    protocol_version = "HTTP/1.0"
+
+
 class BaseLocalService:
-    def __init__(self, is_debugging, port, host, ssl_context):
+    def __init__(self, is_debugging, port, host, ssl_context, max_workers=None):
         """
         Creates a BaseLocalService class
 
@@ -28,11 +86,15 @@ class BaseLocalService:
             Optional. host to start the service on Defaults to '127.0.0.1
         ssl_context tuple(str, str)
             Optional. path to ssl certificate and key files to start service in https
+        max_workers int
+            Optional. Serve the requests on a pool of this many worker threads instead of the
+            Flask development server
         """
         self.is_debugging = is_debugging
         self.port = port
         self.host = host
         self.ssl_context = ssl_context
+        self.max_workers = max_workers
         self._app = None
 
     def create(self):
@@ -76,6 +138,15 @@ class BaseLocalService:
         LOG.debug("Setting SIGTERM interrupt handler")
         signal.signal(signal.SIGTERM, interrupt_handler)
 
+        if multi_threaded and self.max_workers:
+            LOG.debug("Serving the requests on a pool of %s workers", self.max_workers)
+            server = PooledWSGIServer(
+                self.host, self.port, self._app, max_workers=self.max_workers, ssl_context=self.ssl_context
+            )
+            server.log_startup()
+            server.serve_forever()
+            return
+
         self._app.run(threaded=multi_threaded, host=self.host, port=self.port, ssl_context=self.ssl_context)
 
     @staticmethod
@@ -88,6 +159,8 @@ class BaseLocalService:
         :param int status_code: status_code for response
         :return: Flask Response
         """
+        # The body is not streamed to the client: the output of the function has to be parsed completely before the
+        # status code and headers are known, so sending it in chunks would only re-slice a buffer already in memory
         response = Response(body)
         response.headers = headers
         response.status_code = status_code
@@ -150,6 +223,11 @@ class LambdaOutputParser:
         lambda_response_error_dict_len = 2
         lambda_response_error_with_stacktrace_dict_len = 3
 
+        # Only error responses contain the errorType key, skip parsing the other (possibly large) responses
+        error_type_key = b'"errorType"' if isinstance(lambda_response, (bytes, bytearray)) else '"errorType"'
+        if error_type_key not in lambda_response:
+            return False
+
         try:
             lambda_response_dict = json.loads(lambda_response)
 
@@ -15,19 +15,35 @@ YAML helper, sourced from the AWS CLI
 
 https://github.com/aws/aws-cli/blob/develop/awscli/customizations/cloudformation/yamlhelper.py
 """
+
 # pylint: disable=too-many-ancestors
 
+import hashlib
 import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
 from typing import Dict, Optional, cast
 
 import yaml
-from botocore.compat import OrderedDict
-from samtranslator.utils.py27hash_fix import Py27Dict, Py27UniStr
 from yaml.nodes import ScalarNode, SequenceNode
 
+from samcli.lib.utils.file_lock import atomic_write_text
+
+LOG = logging.getLogger(__name__)
+
 TAG_STR = "tag:yaml.org,2002:str"
 TIMESTAMP_TAG = "tag:yaml.org,2002:timestamp"
 
+# YAML files at least this long (in characters) are cached on disk once parsed, 0 disables the cache
+PARSE_CACHE_MIN_SIZE = int(os.environ.get("SAM_CLI_YAML_PARSE_CACHE_MIN_SIZE", str(256 * 1024)))
+# The parsed documents are cached as JSON in this directory of the SAM CLI configuration directory, one per file
+PARSE_CACHE_DIR_NAME = "parsed-yaml"
+PARSE_CACHE_MAX_ENTRIES = 16
+# Cached documents are invalidated if the format of the cache or the YAML library changes
+PARSE_CACHE_VERSION = f"2-{yaml.__version__}"
+
 
 def string_representer(dumper, value):
     """
@@ -98,6 +114,9 @@ def yaml_dump(dict_to_dump):
     :param dict_to_dump:
     :return:
     """
+    # samtranslator is only needed to dump the templates it transformed, it is slow to import
+    from samtranslator.utils.py27hash_fix import Py27Dict, Py27UniStr
+
     CfnDumper.add_representer(OrderedDict, _dict_representer)
     CfnDumper.add_representer(str, string_representer)
     CfnDumper.add_representer(Py27Dict, _dict_representer)
@@ -111,20 +130,128 @@ def _dict_constructor(loader, node):
     return OrderedDict(loader.construct_pairs(node))
 
 
-def yaml_parse(yamlstr) -> Dict:
-    """Parse a yaml string"""
+class CfnSafeLoader(yaml.SafeLoader):
+    """
+    Pure Python SafeLoader which parses CloudFormation intrinsics, keeps the order of the mappings
+    and loads timestamps as strings
+    """
+
+
+CfnCSafeLoader: Optional[type] = None
+if getattr(yaml, "__with_libyaml__", False):
+
+    class _CfnCSafeLoader(yaml.CSafeLoader):  # type: ignore[name-defined,misc]
+        """
+        Same as CfnSafeLoader, but backed by the libyaml C parser
+        """
+
+    CfnCSafeLoader = _CfnCSafeLoader
+
+for _loader in filter(None, [CfnSafeLoader, CfnCSafeLoader]):
+    _loader.add_constructor(TIMESTAMP_TAG, yaml.constructor.SafeConstructor.yaml_constructors[TAG_STR])
+    _loader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _dict_constructor)
+    _loader.add_multi_constructor("!", intrinsics_multi_constructor)
+
+
+def _yaml_load(yamlstr):
+    """
+    Parse a YAML document with the libyaml parser if it is available, otherwise with the pure Python one
+    """
+    if CfnCSafeLoader:
+        try:
+            return yaml.load(yamlstr, Loader=CfnCSafeLoader)
+        except yaml.YAMLError as ex:
+            # the parsers do not accept exactly the same documents, let the pure Python parser decide
+            LOG.debug("Failed to parse the YAML document with libyaml, retrying without it: %s", ex)
+    return yaml.load(yamlstr, Loader=CfnSafeLoader)
+
+
+def _get_parse_cache_dir() -> Path:
+    # imported here, every command imports this module but few of them parse large templates
+    from samcli.cli.global_config import GlobalConfig
+
+    return GlobalConfig().config_dir / PARSE_CACHE_DIR_NAME
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _yaml_load_cached(yamlstr, source_path: Optional[str] = None):
+    """
+    Parse a YAML document, large documents read from a file are cached on disk keyed by the location of the file,
+    so the same document is not parsed again by the next commands
+    """
+    if not source_path or not PARSE_CACHE_MIN_SIZE or len(yamlstr) < PARSE_CACHE_MIN_SIZE:
+        return _yaml_load(yamlstr)
+
+    location = os.path.abspath(source_path)
+    digest = _sha256(f"{PARSE_CACHE_VERSION}\n{yamlstr}")
+    cache_dir = _get_parse_cache_dir()
+    cache_path = cache_dir / f"{_sha256(location)}.json"
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"), object_pairs_hook=OrderedDict)
+        if cached["location"] == location and cached["digest"] == digest:
+            LOG.debug("Using the parsed YAML document of %s cached in %s", location, cache_path)
+            return cached["document"]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as ex:
+        LOG.debug("Failed to read the parsed YAML document cached in %s", cache_path, exc_info=ex)
+
+    parsed = _yaml_load(yamlstr)
+    if not _is_json_document(parsed):
+        LOG.debug("Not caching the parsed YAML document of %s, it can not be stored as JSON", location)
+        return parsed
+    try:
+        _write_parse_cache(cache_dir, cache_path, {"location": location, "digest": digest, "document": parsed})
+    except (OSError, ValueError) as ex:
+        LOG.debug("Failed to cache the parsed YAML document in %s", cache_path, exc_info=ex)
+    return parsed
+
+
+def _is_json_document(value) -> bool:
+    """
+    Whether the value is loaded back the same from JSON, i.e. it only has string keys, lists and JSON scalars
+    """
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_json_document(item) for key, item in value.items())
+    if isinstance(value, list):
+        return all(_is_json_document(item) for item in value)
+    return value is None or isinstance(value, (str, int, float))
+
+
+def _write_parse_cache(cache_dir: Path, cache_path: Path, content: Dict) -> None:
+    """
+    Atomically write the parsed document to the cache and evict the least recently written documents
+    """
+    serialized = json.dumps(content, allow_nan=False)
+    # templates may contain secrets in their defaults, the directory is only readable by the user
+    cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # the cache can always be parsed again, it is not synced to disk
+    atomic_write_text(cache_path, serialized, fsync=False)
+
+    cached_files = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(".json")]
+    if len(cached_files) > PARSE_CACHE_MAX_ENTRIES:
+        cached_files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in cached_files[: len(cached_files) - PARSE_CACHE_MAX_ENTRIES]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def yaml_parse(yamlstr, source_path: Optional[str] = None) -> Dict:
+    """
+    Parse a yaml string. source_path is the file the string was read from, if any, large files are cached by location
+    """
     try:
         # PyYAML doesn't support json as well as it should, so if the input
         # is actually just json it is better to parse it with the standard
         # json parser.
         return cast(Dict, json.loads(yamlstr, object_pairs_hook=OrderedDict))
     except ValueError:
-        yaml.constructor.SafeConstructor.yaml_constructors[TIMESTAMP_TAG] = (
-            yaml.constructor.SafeConstructor.yaml_constructors[TAG_STR]
-        )
-        yaml.SafeLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _dict_constructor)
-        yaml.SafeLoader.add_multi_constructor("!", intrinsics_multi_constructor)
-        return cast(Dict, yaml.safe_load(yamlstr))
+        return cast(Dict, _yaml_load_cached(yamlstr, source_path))
 
 
 def parse_yaml_file(file_path, extra_context: Optional[Dict] = None) -> Dict:
@@ -148,7 +275,7 @@ def parse_yaml_file(file_path, extra_context: Optional[Dict] = None) -> Dict:
         content = fp.read()
         if isinstance(extra_context, dict):
             content = content % extra_context
-        return yaml_parse(content)
+        return yaml_parse(content, file_path)
 
 
 class CfnDumper(yaml.SafeDumper):
@@ -0,0 +1,79 @@
+import builtins
+import importlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.cli import import_profiler
+from samcli.cli.import_profiler import ImportProfiler
+
+PACKAGE_NAME = "samcli_import_profiler_probe"
+
+
+class TestImportProfiler(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        package_dir = os.path.join(self.temp_dir, PACKAGE_NAME)
+        os.mkdir(package_dir)
+        with open(os.path.join(package_dir, "__init__.py"), "w") as init_file:
+            init_file.write(f"import {PACKAGE_NAME}.child\n")
+        with open(os.path.join(package_dir, "child.py"), "w") as child_file:
+            child_file.write("VALUE = 42\n")
+        sys.path.insert(0, self.temp_dir)
+        importlib.invalidate_caches()
+
+        atexit_patch = patch.object(import_profiler, "atexit")
+        self.atexit_mock = atexit_patch.start()
+        self.addCleanup(atexit_patch.stop)
+
+        self.profiler = ImportProfiler()
+
+    def tearDown(self):
+        self.profiler.uninstall()
+        sys.path.remove(self.temp_dir)
+        for name in [PACKAGE_NAME, f"{PACKAGE_NAME}.child"]:
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_must_restore_the_import_functions(self):
+        original_import = builtins.__import__
+        original_import_module = importlib.import_module
+
+        self.profiler.install()
+        self.profiler.install()
+        self.profiler.uninstall()
+
+        self.assertIs(importlib.import_module, original_import_module)
+        self.assertIs(builtins.__import__, original_import)
+        self.atexit_mock.register.assert_called_once_with(self.profiler.report)
+
+    def test_must_measure_the_first_import_of_each_module(self):
+        self.profiler.install()
+        importlib.import_module(PACKAGE_NAME)
+        importlib.import_module(PACKAGE_NAME)
+        self.profiler.uninstall()
+
+        package_cumulative, package_self, package_importer = self.profiler._timings[PACKAGE_NAME]
+        child_cumulative, child_self, child_importer = self.profiler._timings[f"{PACKAGE_NAME}.child"]
+        self.assertEqual(package_importer, __name__)
+        self.assertEqual(child_importer, PACKAGE_NAME)
+        self.assertGreaterEqual(package_cumulative, child_cumulative)
+        self.assertAlmostEqual(package_self, package_cumulative - child_cumulative, places=3)
+        self.assertEqual(child_self, child_cumulative)
+
+    def test_must_report_the_slowest_imports(self):
+        self.profiler.install()
+        importlib.import_module(PACKAGE_NAME)
+        self.profiler.uninstall()
+        report = io.StringIO()
+
+        self.profiler.report(top=1, file=report)
+
+        lines = report.getvalue().strip().splitlines()
+        self.assertTrue(lines[0].startswith("Imported 2 modules"))
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].endswith(f"{PACKAGE_NAME} ({__name__})"))
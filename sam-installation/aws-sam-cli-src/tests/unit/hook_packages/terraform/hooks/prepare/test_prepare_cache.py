@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.hook_packages.terraform.hooks.prepare.hook import prepare
+from samcli.hook_packages.terraform.hooks.prepare.prepare_cache import compute_inputs_digest, get_plan_time_sources
+
+
+def _archive_file(address, **values):
+    return {"address": address, "mode": "data", "type": "archive_file", "values": values}
+
+
+class TestComputeInputsDigest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_root_dir = self.temp_dir.name
+        self.application_dir = os.path.join(self.project_root_dir, "app")
+        self.output_dir = os.path.join(self.application_dir, ".aws-sam-iacs", "iacs_metadata")
+        self._write(os.path.join(self.application_dir, "main.tf"), 'module "function" { source = "../modules/fn" }')
+        self._write(os.path.join(self.project_root_dir, "modules", "fn", "main.tf"), 'resource "aws_lambda" "f" {}')
+        self._write(
+            os.path.join(self.application_dir, ".terraform", "modules", "modules.json"),
+            json.dumps({"Modules": [{"Key": "", "Dir": "."}, {"Key": "function", "Dir": "../modules/fn"}]}),
+        )
+        environ_patcher = patch.dict(os.environ, {}, clear=True)
+        environ_patcher.start()
+        self.addCleanup(environ_patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def _write(path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(content)
+
+    def _digest(self):
+        return compute_inputs_digest(self.application_dir, self.project_root_dir, self.output_dir)
+
+    def test_must_be_stable(self):
+        self.assertEqual(self._digest(), self._digest())
+
+    def test_must_change_with_the_root_module(self):
+        digest = self._digest()
+        self._write(os.path.join(self.application_dir, "variables.tf"), 'variable "stage" {}')
+
+        self.assertNotEqual(self._digest(), digest)
+
+    def test_must_change_with_the_modules_of_the_manifest(self):
+        digest = self._digest()
+        self._write(os.path.join(self.project_root_dir, "modules", "fn", "main.tf"), 'resource "aws_lambda" "g" {}')
+
+        self.assertNotEqual(self._digest(), digest)
+
+    def test_must_ignore_files_outside_of_the_modules(self):
+        digest = self._digest()
+        self._write(os.path.join(self.project_root_dir, "modules", "unused", "main.tf"), 'resource "aws_s3" "b" {}')
+        self._write(os.path.join(self.project_root_dir, "node_modules", "lib", "main.tf"), "")
+        self._write(os.path.join(self.application_dir, "src", "handler.py"), "def handler(event, context): pass")
+
+        self.assertEqual(self._digest(), digest)
+
+    def test_must_change_with_the_aws_environment_variables(self):
+        digest = self._digest()
+
+        for name in ["AWS_REGION", "AWS_DEFAULT_REGION", "AWS_PROFILE", "TF_VAR_stage"]:
+            with patch.dict(os.environ, {name: "value"}):
+                self.assertNotEqual(self._digest(), digest, name)
+
+    def test_must_ignore_other_environment_variables(self):
+        digest = self._digest()
+
+        with patch.dict(os.environ, {"HOME": "/home/user"}):
+            self.assertEqual(self._digest(), digest)
+
+    def test_must_only_use_the_plan_file_when_provided(self):
+        plan_file = os.path.join(self.project_root_dir, "plan.json")
+        self._write(plan_file, "{}")
+        digest = compute_inputs_digest(self.application_dir, self.project_root_dir, self.output_dir, plan_file)
+
+        self._write(os.path.join(self.application_dir, "variables.tf"), 'variable "stage" {}')
+
+        self.assertEqual(
+            compute_inputs_digest(self.application_dir, self.project_root_dir, self.output_dir, plan_file), digest
+        )
+
+    def test_must_change_with_the_plan_time_sources(self):
+        source_dir = os.path.join(self.application_dir, "src")
+        self._write(os.path.join(source_dir, "handler.py"), "def handler(event, context): pass")
+        digest = compute_inputs_digest(self.application_dir, self.project_root_dir, self.output_dir, None, [source_dir])
+
+        self._write(os.path.join(source_dir, "handler.py"), "def handler(event, context): return 1")
+
+        self.assertNotEqual(
+            compute_inputs_digest(self.application_dir, self.project_root_dir, self.output_dir, None, [source_dir]),
+            digest,
+        )
+
+
+class TestGetPlanTimeSources(TestCase):
+    def test_must_return_the_sources_of_the_archive_files_of_all_modules(self):
+        tf_json = {
+            "prior_state": {
+                "values": {
+                    "root_module": {
+                        "resources": [
+                            _archive_file("data.archive_file.zip", source_dir="src"),
+                            {"address": "aws_lambda_function.f", "mode": "managed", "type": "aws_lambda_function"},
+                        ],
+                        "child_modules": [
+                            {"resources": [_archive_file("module.fn.data.archive_file.zip", source_file="/abs/fn.py")]}
+                        ],
+                    }
+                }
+            },
+            "planned_values": {
+                "root_module": {"resources": [_archive_file("data.archive_file.zip", source_dir="src")]}
+            },
+        }
+
+        self.assertEqual(
+            get_plan_time_sources(tf_json, os.path.join(os.sep, "app")),
+            sorted([os.path.join(os.sep, "app", "src"), os.path.normpath("/abs/fn.py")]),
+        )
+
+    def test_must_ignore_plans_without_archive_files(self):
+        self.assertEqual(get_plan_time_sources({"planned_values": {"root_module": {}}}, "/app"), [])
+
+
+@patch("samcli.hook_packages.terraform.hooks.prepare.hook.translate_to_cfn", return_value={"Resources": {}})
+@patch("samcli.hook_packages.terraform.hooks.prepare.hook._generate_plan_file")
+class TestPrepareCacheWithPlanTimeSources(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.application_dir = self.temp_dir.name
+        self.handler_path = os.path.join(self.application_dir, "src", "handler.py")
+        os.makedirs(os.path.dirname(self.handler_path))
+        self._write_handler("def handler(event, context): pass")
+        with open(os.path.join(self.application_dir, "main.tf"), "w") as main_file:
+            main_file.write('data "archive_file" "zip" { source_dir = "src" }')
+        self.params = {"IACProjectPath": self.application_dir, "OutputDirPath": "out"}
+        environ_patcher = patch.dict(os.environ, {}, clear=True)
+        environ_patcher.start()
+        self.addCleanup(environ_patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_handler(self, content):
+        with open(self.handler_path, "w") as handler_file:
+            handler_file.write(content)
+
+    def test_must_plan_again_when_an_archive_file_source_changed(self, generate_plan_mock, translate_mock):
+        plan = {
+            "planned_values": {"root_module": {"resources": [_archive_file("data.archive_file.zip", source_dir="src")]}}
+        }
+        generate_plan_mock.return_value = plan
+
+        prepare(self.params)
+        prepare(self.params)
+        self.assertEqual(generate_plan_mock.call_count, 1)
+
+        self._write_handler("def handler(event, context): return 1")
+        prepare(self.params)
+
+        self.assertEqual(generate_plan_mock.call_count, 2)
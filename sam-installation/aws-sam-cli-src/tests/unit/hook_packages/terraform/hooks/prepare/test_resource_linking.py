@@ -0,0 +1,117 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from samcli.hook_packages.terraform.hooks.prepare import resource_linking
+from samcli.hook_packages.terraform.hooks.prepare.resource_linking import (
+    ResourceLinker,
+    ResourcePairExceptedDestination,
+    _resolve_module_output,
+    _resolve_module_variable,
+    linking_index,
+)
+from samcli.hook_packages.terraform.hooks.prepare.types import ConstantValue, References, TFModule
+
+
+class TestLinkingIndex_destination_map(TestCase):
+    def setUp(self):
+        self.destination_resource_tf = {
+            "LayerOne": {"type": "aws_lambda_layer_version", "values": {"arn": "arn:layer:one"}},
+            "LayerTwo": {"type": "aws_lambda_layer_version", "values": {"arn": "arn:layer:two"}},
+        }
+        self.expected_destinations = [
+            ResourcePairExceptedDestination(
+                terraform_resource_type_prefix="aws_lambda_layer_version.", terraform_attribute_name="arn"
+            )
+        ]
+        self.expected_map = {
+            "arn:layer:one": ("LayerOne", "aws_lambda_layer_version"),
+            "arn:layer:two": ("LayerTwo", "aws_lambda_layer_version"),
+        }
+
+    def _linker(self, expected_destinations=None):
+        resource_pair = Mock(
+            destination_resource_tf=self.destination_resource_tf,
+            expected_destinations=expected_destinations or self.expected_destinations,
+        )
+        return ResourceLinker(resource_pair)
+
+    @patch.object(
+        resource_linking, "_build_destination_linking_map", wraps=resource_linking._build_destination_linking_map
+    )
+    def test_must_build_the_destination_map_once_per_rule(self, build_mock):
+        with linking_index():
+            first = self._linker()._get_destination_linking_map()
+            second = self._linker()._get_destination_linking_map()
+
+        self.assertEqual(first, self.expected_map)
+        self.assertIs(first, second)
+        build_mock.assert_called_once()
+
+    @patch.object(
+        resource_linking, "_build_destination_linking_map", wraps=resource_linking._build_destination_linking_map
+    )
+    def test_must_build_a_destination_map_per_expected_destinations(self, build_mock):
+        other_destinations = [
+            ResourcePairExceptedDestination(
+                terraform_resource_type_prefix="aws_lambda_layer_version.", terraform_attribute_name="id"
+            )
+        ]
+
+        with linking_index():
+            self._linker()._get_destination_linking_map()
+            self.assertEqual(self._linker(other_destinations)._get_destination_linking_map(), {})
+
+        self.assertEqual(build_mock.call_count, 2)
+
+    @patch.object(
+        resource_linking, "_build_destination_linking_map", wraps=resource_linking._build_destination_linking_map
+    )
+    def test_must_build_the_destination_map_per_linker_outside_the_index(self, build_mock):
+        linker = self._linker()
+
+        self.assertEqual(linker._get_destination_linking_map(), self.expected_map)
+        self.assertEqual(linker._get_destination_linking_map(), self.expected_map)
+        self.assertEqual(self._linker()._get_destination_linking_map(), self.expected_map)
+
+        self.assertEqual(build_mock.call_count, 2)
+
+
+class TestLinkingIndex_module_values(TestCase):
+    def setUp(self):
+        self.module = TFModule(
+            full_address="module.layers",
+            parent_module=None,
+            variables={"layer_arn": ConstantValue("arn:layer:one")},
+            resources={},
+            child_modules={},
+            outputs={"arn": References(["var.layer_arn"])},
+        )
+
+    @patch.object(resource_linking, "_do_resolve_module_variable", wraps=resource_linking._do_resolve_module_variable)
+    @patch.object(resource_linking, "_do_resolve_module_output", wraps=resource_linking._do_resolve_module_output)
+    def test_must_memoize_the_module_values(self, resolve_output_mock, resolve_variable_mock):
+        with linking_index():
+            first = _resolve_module_output(self.module, "arn")
+            first.append(ConstantValue("added by the caller"))
+            second = _resolve_module_output(self.module, "arn")
+            variable = _resolve_module_variable(self.module, "layer_arn")
+
+        self.assertEqual(second, [ConstantValue("arn:layer:one")])
+        self.assertEqual(variable, [ConstantValue("arn:layer:one")])
+        resolve_output_mock.assert_called_once()
+        resolve_variable_mock.assert_called_once()
+
+    @patch.object(resource_linking, "_do_resolve_module_variable", wraps=resource_linking._do_resolve_module_variable)
+    @patch.object(resource_linking, "_do_resolve_module_output", wraps=resource_linking._do_resolve_module_output)
+    def test_must_resolve_the_module_values_each_time_outside_the_index(
+        self, resolve_output_mock, resolve_variable_mock
+    ):
+        with linking_index():
+            _resolve_module_output(self.module, "arn")
+        self.module.variables["layer_arn"] = ConstantValue("arn:layer:two")
+
+        self.assertEqual(_resolve_module_output(self.module, "arn"), [ConstantValue("arn:layer:two")])
+        self.assertEqual(_resolve_module_output(self.module, "arn"), [ConstantValue("arn:layer:two")])
+
+        self.assertEqual(resolve_output_mock.call_count, 3)
+        self.assertEqual(resolve_variable_mock.call_count, 3)
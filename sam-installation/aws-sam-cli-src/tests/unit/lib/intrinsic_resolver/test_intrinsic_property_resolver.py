@@ -0,0 +1,84 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from samcli.lib.intrinsic_resolver.intrinsic_property_resolver import IntrinsicResolver
+
+
+class TestIntrinsicResolver_memoization(TestCase):
+    def setUp(self):
+        self.symbol_resolver = Mock()
+        self.symbol_resolver.get_translation.return_value = None
+        self.symbol_resolver.resolve_symbols.side_effect = lambda logical_id, attribute, ignore_errors=False: {
+            ("Stage", "Ref"): "prod",
+            ("Subnets", "Ref"): ["subnet-1", "subnet-2"],
+        }[(logical_id, attribute)]
+
+    def test_must_resolve_each_symbol_once(self):
+        template = {
+            "Resources": {
+                "First": {"Type": "AWS::Serverless::Function", "Properties": {"Stage": {"Ref": "Stage"}}},
+                "Second": {"Type": "AWS::Serverless::Function", "Properties": {"Stage": {"Ref": "Stage"}}},
+            }
+        }
+
+        resolved = IntrinsicResolver(template, self.symbol_resolver).resolve_template()
+
+        self.assertEqual(resolved["Resources"]["First"]["Properties"]["Stage"], "prod")
+        self.assertEqual(resolved["Resources"]["Second"]["Properties"]["Stage"], "prod")
+        self.symbol_resolver.resolve_symbols.assert_called_once_with("Stage", "Ref")
+
+    def test_must_not_share_mutable_symbol_values(self):
+        template = {
+            "Resources": {
+                "First": {"Type": "AWS::Serverless::Function", "Properties": {"Subnets": {"Ref": "Subnets"}}},
+                "Second": {"Type": "AWS::Serverless::Function", "Properties": {"Subnets": {"Ref": "Subnets"}}},
+            }
+        }
+
+        resolved = IntrinsicResolver(template, self.symbol_resolver).resolve_template()
+
+        first = resolved["Resources"]["First"]["Properties"]["Subnets"]
+        second = resolved["Resources"]["Second"]["Properties"]["Subnets"]
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    def test_must_evaluate_each_condition_once(self):
+        template = {
+            "Conditions": {"IsProd": {"Fn::Equals": [{"Ref": "Stage"}, "prod"]}},
+            "Resources": {
+                "First": {
+                    "Type": "AWS::Serverless::Function",
+                    "Properties": {"Memory": {"Fn::If": ["IsProd", 1024, 128]}},
+                },
+                "Second": {
+                    "Type": "AWS::Serverless::Function",
+                    "Properties": {
+                        "Debug": {"Fn::If": ["IsProd", False, True]},
+                        "Prod": {"Fn::Not": [{"Condition": "IsProd"}]},
+                    },
+                },
+            },
+        }
+        resolver = IntrinsicResolver(template, self.symbol_resolver)
+        resolver.handle_fn_equals = Mock(wraps=resolver.handle_fn_equals)
+        resolver.conditional_key_function_map = resolver.default_conditional_key_map()
+
+        resolved = resolver.resolve_template()
+
+        self.assertEqual(resolved["Resources"]["First"]["Properties"]["Memory"], 1024)
+        self.assertEqual(resolved["Resources"]["Second"]["Properties"], {"Debug": False, "Prod": False})
+        resolver.handle_fn_equals.assert_called_once()
+
+    def test_must_resolve_a_new_template_again(self):
+        template = {
+            "Resources": {"First": {"Type": "AWS::Serverless::Function", "Properties": {"Stage": {"Ref": "Stage"}}}}
+        }
+        resolver = IntrinsicResolver(template, self.symbol_resolver)
+        resolver.resolve_template()
+        self.symbol_resolver.resolve_symbols.side_effect = lambda logical_id, attribute, ignore_errors=False: "dev"
+
+        resolver.init_template(template)
+        resolved = resolver.resolve_template()
+
+        self.assertEqual(resolved["Resources"]["First"]["Properties"]["Stage"], "dev")
+        self.assertEqual(self.symbol_resolver.resolve_symbols.call_count, 2)
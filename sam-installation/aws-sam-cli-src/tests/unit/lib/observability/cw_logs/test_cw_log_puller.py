@@ -0,0 +1,41 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from botocore.exceptions import ClientError
+
+from samcli.lib.observability.cw_logs.cw_log_puller import CWLogPuller
+
+
+class TestCWLogPuller_poll(TestCase):
+    def setUp(self):
+        self.logs_client = Mock()
+        self.logs_client.exceptions.ResourceNotFoundException = type("ResourceNotFoundException", (Exception,), {})
+        self.consumer = Mock()
+        self.puller = CWLogPuller(self.logs_client, self.consumer, "log-group", poll_interval=1, max_poll_interval=8)
+
+    def test_must_back_off_up_to_the_max_poll_interval_and_decay(self):
+        self.logs_client.filter_log_events.side_effect = ClientError(
+            {"Error": {"Code": "ThrottlingException"}}, "FilterLogEvents"
+        )
+        intervals = []
+        for _ in range(5):
+            self.assertFalse(self.puller.poll())
+            intervals.append(self.puller.poll_interval)
+
+        self.logs_client.filter_log_events.side_effect = None
+        self.logs_client.filter_log_events.return_value = {"events": []}
+        for _ in range(3):
+            self.puller.poll()
+            intervals.append(self.puller.poll_interval)
+
+        self.assertEqual(intervals, [2, 4, 8, 8, 8, 4, 2, 1])
+
+    def test_must_not_consume_the_same_event_twice(self):
+        event = {"eventId": "1", "timestamp": 1000, "ingestionTime": 1000, "message": "hello"}
+        self.logs_client.filter_log_events.return_value = {"events": [event]}
+
+        self.assertTrue(self.puller.poll())
+        self.assertFalse(self.puller.poll())
+
+        self.consumer.consume.assert_called_once()
+        self.assertEqual(self.logs_client.filter_log_events.call_args.kwargs["startTime"], 1000)
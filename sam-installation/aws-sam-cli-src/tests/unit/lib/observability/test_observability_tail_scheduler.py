@@ -0,0 +1,165 @@
+import threading
+from typing import List, Optional
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from samcli.lib.observability.observability_info_puller import (
+    ApiRateBudget,
+    ObservabilityCombinedPuller,
+    ObservabilityEvent,
+    ObservabilityPollingPuller,
+)
+from samcli.lib.observability.observability_tail_scheduler import ObservabilityTailScheduler
+
+
+class _ScriptedPuller(ObservabilityPollingPuller):
+    """
+    Consumes the events of the next script entry at each poll, and stops once the script is done
+    """
+
+    def __init__(self, consumer, polls: List[List[int]], api_name: str = "", max_retries: int = 1):
+        self.consumer = consumer
+        self.api_name = api_name
+        self._polls = list(polls)
+        self._max_retries = max_retries
+        self.poll_threads = set()
+        self.get_rate_budget = None
+
+    @property
+    def poll_interval(self) -> float:
+        return 0
+
+    @property
+    def max_retries(self) -> int:
+        return self._max_retries
+
+    def poll(self, filter_pattern: Optional[str] = None) -> bool:
+        self.poll_threads.add(threading.current_thread().name)
+        if not self._polls:
+            return False
+        poll = self._polls.pop(0)
+        if isinstance(poll, Exception):
+            raise poll
+        for timestamp in poll:
+            self.consumer.consume(ObservabilityEvent(str(timestamp), timestamp))
+        return bool(poll)
+
+    def use_rate_budgets(self, get_rate_budget):
+        self.get_rate_budget = get_rate_budget
+
+    def load_time_period(self, start_time=None, end_time=None, filter_pattern=None):
+        pass
+
+    def load_events(self, event_ids):
+        pass
+
+
+class _ListConsumer:
+    def __init__(self):
+        self.events = []
+
+    def consume(self, event):
+        self.events.append(event.event)
+
+
+class TestObservabilityTailScheduler(TestCase):
+    def test_must_flatten_the_combined_pullers(self):
+        pullers = [_ScriptedPuller(Mock(), []) for _ in range(3)]
+
+        scheduler = ObservabilityTailScheduler(
+            [pullers[0], ObservabilityCombinedPuller([pullers[1], ObservabilityCombinedPuller([pullers[2]])])]
+        )
+
+        self.assertEqual(list(scheduler.pullers), pullers)
+
+    def test_must_consume_the_events_of_all_pullers_in_timestamp_order(self):
+        consumer = _ListConsumer()
+        first_puller = _ScriptedPuller(consumer, [[10, 40], [50]])
+        second_puller = _ScriptedPuller(consumer, [[20, 30], [60]])
+
+        ObservabilityTailScheduler([first_puller, second_puller], event_ordering_delay=0.2).tail()
+
+        self.assertEqual(consumer.events, ["10", "20", "30", "40", "50", "60"])
+        # the polls ran on the worker threads, and the consumers are restored once tailing stopped
+        self.assertTrue(all(name.startswith("ObservabilityTail") for name in first_puller.poll_threads))
+        self.assertIs(first_puller.consumer, consumer)
+        self.assertIs(second_puller.consumer, consumer)
+
+    def test_must_consume_the_oldest_events_beyond_the_buffer_size(self):
+        consumer = _ListConsumer()
+        puller = _ScriptedPuller(consumer, [[30, 10, 20]])
+
+        ObservabilityTailScheduler([puller], event_ordering_delay=10, max_buffered_events=1).tail()
+
+        self.assertEqual(consumer.events, ["10", "20", "30"])
+
+    def test_must_stop_all_pullers_when_one_fails(self):
+        failing_puller = _ScriptedPuller(_ListConsumer(), [[10], ValueError("failed")])
+        endless_puller = _ScriptedPuller(_ListConsumer(), [[index] for index in range(100000)], max_retries=1000)
+        scheduler = ObservabilityTailScheduler([failing_puller, endless_puller], event_ordering_delay=0)
+
+        with self.assertRaises(ValueError):
+            scheduler.tail()
+
+        self.assertTrue(endless_puller.cancelled)
+        self.assertTrue(endless_puller._polls)
+
+    def test_must_share_the_rate_budget_of_an_api(self):
+        pullers = [
+            _ScriptedPuller(Mock(), [], api_name="logs:FilterLogEvents"),
+            _ScriptedPuller(Mock(), [], api_name="logs:FilterLogEvents"),
+            _ScriptedPuller(Mock(), [], api_name="xray:GetTraceSummaries"),
+            _ScriptedPuller(Mock(), []),
+            _ScriptedPuller(Mock(), []),
+        ]
+        scheduler = ObservabilityTailScheduler(pullers, api_rate_limits={"logs:FilterLogEvents": 20})
+
+        budgets = [scheduler._get_rate_budget(puller) for puller in pullers]
+
+        self.assertIs(budgets[0], budgets[1])
+        self.assertEqual(len({id(budget) for budget in budgets}), 4)
+        self.assertEqual(budgets[0]._request_interval, 1 / 20)
+        self.assertEqual(budgets[2]._request_interval, 1 / 5)
+        self.assertIs(scheduler._get_api_rate_budget("xray:GetTraceSummaries", 1), budgets[2])
+
+    def test_must_pass_the_shared_budgets_to_the_pullers(self):
+        puller = _ScriptedPuller(Mock(), [], api_name="xray:GetTraceSummaries")
+        scheduler = ObservabilityTailScheduler([puller], event_ordering_delay=0)
+
+        scheduler.tail()
+
+        self.assertEqual(puller.get_rate_budget, scheduler._get_api_rate_budget)
+
+
+class TestApiRateBudget(TestCase):
+    @patch("samcli.lib.observability.observability_info_puller.time.monotonic", Mock(return_value=100.0))
+    def test_must_give_a_slot_of_its_own_to_each_request_of_concurrent_threads(self):
+        budget = ApiRateBudget(10)
+        delays = []
+        barrier = threading.Barrier(8)
+
+        def reserve():
+            barrier.wait()
+            for _ in range(5):
+                delays.append(budget._reserve())
+
+        threads = [threading.Thread(target=reserve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for index, delay in enumerate(sorted(delays)):
+            self.assertAlmostEqual(delay, index * 0.1)
+        self.assertEqual(len(delays), 40)
+
+    @patch("samcli.lib.observability.observability_info_puller.time.sleep")
+    def test_must_only_wait_when_the_api_was_called_lately(self, sleep_mock):
+        budget = ApiRateBudget(2)
+
+        budget.wait()
+        sleep_mock.assert_not_called()
+        budget.wait()
+
+        sleep_mock.assert_called_once()
+        self.assertAlmostEqual(sleep_mock.call_args.args[0], 0.5, delta=0.1)
@@ -0,0 +1,157 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from botocore.exceptions import ClientError
+
+from samcli.lib.observability.xray_traces.xray_event_puller import BATCH_GET_TRACES_API_NAME, XRayTracePuller
+
+
+def _throttling_error():
+    return ClientError({"Error": {"Code": "ThrottlingException"}}, "GetTraceSummaries")
+
+
+class _FakeXRayClient:
+    """
+    Returns the given pages of 'get_trace_summaries', and the requested traces from 'batch_get_traces'
+    """
+
+    def __init__(self, summary_pages, batch_pages_per_request=1):
+        self.summary_pages = summary_pages
+        self.batch_pages_per_request = batch_pages_per_request
+        self.batch_error = None
+        self.batch_requests = []
+
+    def get_paginator(self, operation_name):
+        paginator = Mock()
+        if operation_name == "get_trace_summaries":
+            paginator.paginate.side_effect = lambda **kwargs: iter(self.summary_pages)
+        else:
+            paginator.paginate.side_effect = self._batch_get_traces
+        return paginator
+
+    def _batch_get_traces(self, TraceIds):
+        self.batch_requests.append(TraceIds)
+        if self.batch_error:
+            raise self.batch_error
+        # the traces aren't returned in the order of the requested ids
+        pages = [{"Traces": [], "NextToken": "token"} for _ in range(self.batch_pages_per_request - 1)]
+        pages.append({"Traces": [{"Id": trace_id} for trace_id in reversed(TraceIds)]})
+        return iter(pages)
+
+
+def _summaries(*trace_ids, next_token=None):
+    page = {"TraceSummaries": [{"Id": trace_id, "Revision": 1} for trace_id in trace_ids]}
+    if next_token:
+        page["NextToken"] = next_token
+    return page
+
+
+class TestAbstractXRayPuller_poll(TestCase):
+    def setUp(self):
+        self.puller = XRayTracePuller(Mock(), Mock(), poll_interval=1, trace_cache=Mock())
+
+    def test_must_back_off_up_to_the_max_poll_interval_when_throttled(self):
+        with patch.object(self.puller, "load_time_period", side_effect=_throttling_error()):
+            intervals = []
+            for _ in range(7):
+                self.puller.poll()
+                intervals.append(self.puller.poll_interval)
+
+        self.assertEqual(intervals, [2, 4, 8, 16, 30, 30, 30])
+
+    def test_must_decay_back_to_the_initial_poll_interval(self):
+        with patch.object(self.puller, "load_time_period", side_effect=_throttling_error()):
+            for _ in range(3):
+                self.puller.poll()
+
+        with patch.object(self.puller, "load_time_period"):
+            intervals = []
+            for _ in range(4):
+                self.puller.poll()
+                intervals.append(self.puller.poll_interval)
+
+        self.assertEqual(intervals, [4, 2, 1, 1])
+
+    def test_must_raise_other_errors(self):
+        error = ClientError({"Error": {"Code": "AccessDeniedException"}}, "GetTraceSummaries")
+        with patch.object(self.puller, "load_time_period", side_effect=error):
+            with self.assertRaises(ClientError):
+                self.puller.poll()
+
+
+class TestXRayTracePuller_load_events(TestCase):
+    def setUp(self):
+        self.trace_cache = Mock()
+        self.trace_cache.get.return_value = None
+        self.consumer = Mock()
+        self.consumed_ids = []
+        self.consumer.consume.side_effect = lambda event: self.consumed_ids.append(event.id)
+
+    def _puller(self, xray_client, **kwargs):
+        puller = XRayTracePuller(xray_client, self.consumer, trace_cache=self.trace_cache, **kwargs)
+        puller._batch_rate_budget = Mock()
+        return puller
+
+    def test_must_consume_the_cached_and_fetched_traces_in_summary_order(self):
+        self.trace_cache.get.side_effect = lambda trace_id, revision: {"Id": trace_id} if trace_id in "bf" else None
+        xray_client = _FakeXRayClient([])
+        puller = self._puller(xray_client, max_concurrent_requests=2)
+
+        puller.load_events({trace_id: 1 for trace_id in "abcdefgh"})
+
+        self.assertEqual(self.consumed_ids, list("abcdefgh"))
+        self.assertEqual(xray_client.batch_requests, [list("acdeg"), ["h"]])
+        self.trace_cache.evict.assert_called_once()
+
+    def test_must_take_the_rate_budget_for_each_batch_request(self):
+        xray_client = _FakeXRayClient([], batch_pages_per_request=2)
+        puller = self._puller(xray_client)
+
+        puller.load_events({trace_id: 1 for trace_id in "abcdefg"})
+
+        # 2 batches of 2 pages each
+        self.assertEqual(puller._batch_rate_budget.wait.call_count, 4)
+
+    def test_must_take_the_rate_budget_for_the_following_summary_pages_only(self):
+        xray_client = _FakeXRayClient([_summaries("a", next_token="token"), _summaries("b", next_token="token"), {}])
+        puller = self._puller(xray_client)
+        puller._summaries_rate_budget = Mock()
+
+        puller.load_time_period()
+
+        self.assertEqual(puller._summaries_rate_budget.wait.call_count, 2)
+        self.assertEqual(self.consumed_ids, ["a", "b"])
+
+    def test_must_use_the_budgets_of_the_scheduler(self):
+        budgets = {}
+        puller = XRayTracePuller(Mock(), self.consumer, trace_cache=self.trace_cache)
+
+        puller.use_rate_budgets(lambda api_name, api_rate_limit: budgets.setdefault(api_name, Mock()))
+
+        self.assertIs(puller._batch_rate_budget, budgets[BATCH_GET_TRACES_API_NAME])
+        self.assertIs(puller._summaries_rate_budget, budgets[XRayTracePuller.api_name])
+
+    def test_must_load_the_traces_again_when_fetching_them_failed(self):
+        xray_client = _FakeXRayClient([_summaries("a", "b")])
+        xray_client.batch_error = _throttling_error()
+        puller = self._puller(xray_client)
+
+        puller.poll()
+        self.assertEqual(self.consumed_ids, [])
+
+        xray_client.batch_error = None
+        puller.poll()
+        puller.poll()
+
+        self.assertEqual(self.consumed_ids, ["a", "b"])
+        self.assertEqual(xray_client.batch_requests, [["a", "b"], ["a", "b"]])
+
+    def test_must_only_remember_the_consumed_traces(self):
+        xray_client = _FakeXRayClient([_summaries("a", "b")])
+        puller = self._puller(xray_client)
+        self.consumer.consume.side_effect = [None, ValueError("failed")]
+
+        with self.assertRaises(ValueError):
+            puller.load_time_period()
+
+        self.assertEqual(dict(puller._previous_trace_ids), {"a": 1})
@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+from samcli.lib.providers.provider import Stack, StackIndex
+
+
+def _stack(parent_stack_path, name):
+    return Stack(parent_stack_path, name, "template.yaml", {}, {"Resources": {}})
+
+
+class TestStackIndex(TestCase):
+    def setUp(self):
+        self.root_stack = _stack("", "")
+        self.child_stack = _stack("", "Child")
+        self.grand_child_stack = _stack("Child", "GrandChild")
+        self.other_child_stack = _stack("", "Other")
+        self.stacks = [self.root_stack, self.child_stack, self.grand_child_stack, self.other_child_stack]
+        self.index = StackIndex(self.stacks)
+
+    def test_must_find_the_same_stacks_as_the_stack_helpers(self):
+        for stack in self.stacks:
+            self.assertIs(
+                self.index.get_stack_by_full_path(stack.stack_path),
+                Stack.get_stack_by_full_path(stack.stack_path, self.stacks),
+            )
+            self.assertIs(self.index.get_parent_stack(stack), Stack.get_parent_stack(stack, self.stacks))
+            self.assertEqual(self.index.get_child_stacks(stack), Stack.get_child_stacks(stack, self.stacks))
+
+    def test_must_index_the_stacks_by_path_and_parent(self):
+        self.assertIs(self.index.get_stack_by_full_path("Child/GrandChild"), self.grand_child_stack)
+        self.assertIsNone(self.index.get_stack_by_full_path("Missing"))
+        self.assertIs(self.index.get_parent_stack(self.grand_child_stack), self.child_stack)
+        self.assertIsNone(self.index.get_parent_stack(self.root_stack))
+        self.assertEqual(self.index.get_child_stacks(self.root_stack), [self.child_stack, self.other_child_stack])
+        self.assertEqual(self.index.get_child_stacks(self.grand_child_stack), [])
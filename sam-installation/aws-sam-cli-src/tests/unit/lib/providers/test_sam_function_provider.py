@@ -0,0 +1,111 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.lib.providers.provider import Stack
+from samcli.lib.providers.sam_function_provider import RefreshableSamFunctionProvider, SamFunctionProvider
+
+
+def _function(function_name):
+    return {
+        "Type": "AWS::Serverless::Function",
+        "Properties": {
+            "FunctionName": function_name,
+            "CodeUri": "src",
+            "Handler": "app.handler",
+            "Runtime": "python3.12",
+        },
+    }
+
+
+def _stack(parent_stack_path, name, resources):
+    return Stack(parent_stack_path, name, "template.yaml", {}, {"Resources": resources})
+
+
+class TestSamFunctionProvider_lookups(TestCase):
+    def setUp(self):
+        self.root_stack = _stack("", "", {"RootFunction": _function("root-function")})
+        self.child_stack = _stack("", "ChildStack", {"ChildFunction": _function("child-function")})
+        self.provider = SamFunctionProvider([self.root_stack, self.child_stack], ignore_code_extraction_warnings=True)
+
+    def test_must_get_the_resources_by_stack_path(self):
+        self.assertIn("RootFunction", self.provider.get_resources_by_stack_path(""))
+        self.assertIn("ChildFunction", self.provider.get_resources_by_stack_path("ChildStack"))
+
+        with self.assertRaises(RuntimeError):
+            self.provider.get_resources_by_stack_path("MissingStack")
+
+    def test_must_index_the_stacks_again_on_update(self):
+        other_child_stack = _stack("", "OtherStack", {"OtherFunction": _function("other-function")})
+
+        self.provider.update([self.root_stack, other_child_stack], ignore_code_extraction_warnings=True)
+
+        self.assertIn("OtherFunction", self.provider.get_resources_by_stack_path("OtherStack"))
+        with self.assertRaises(RuntimeError):
+            self.provider.get_resources_by_stack_path("ChildStack")
+
+    def test_must_get_the_functions_by_logical_id_and_function_name(self):
+        self.assertEqual(self.provider.get("ChildFunction").functionname, "child-function")
+        self.assertEqual(self.provider.get("child-function").function_id, "ChildFunction")
+        self.assertEqual(self.provider.get("ChildStack/ChildFunction").functionname, "child-function")
+        self.assertIsNone(self.provider.get("MissingFunction"))
+
+    def test_must_index_the_functions_again_on_update(self):
+        other_child_stack = _stack("", "OtherStack", {"OtherFunction": _function("other-function")})
+
+        self.provider.update([self.root_stack, other_child_stack], ignore_code_extraction_warnings=True)
+
+        self.assertEqual(self.provider.get("other-function").function_id, "OtherFunction")
+        self.assertIsNone(self.provider.get("child-function"))
+
+
+class TestSamFunctionProvider_nested_layers(TestCase):
+    def test_must_locate_the_layers_of_the_child_and_parent_stacks(self):
+        function = _function("root-function")
+        function["Properties"]["Layers"] = [{"Fn::GetAtt": ["LayerStack", "Outputs.LayerArn"]}]
+        function["Metadata"] = {"SamResourceId": "RootFunction"}
+        root_stack = _stack("", "", {"RootFunction": function})
+        layer_stack = Stack(
+            "",
+            "LayerStack",
+            "template.yaml",
+            {},
+            {
+                "Resources": {
+                    "Layer": {"Type": "AWS::Serverless::LayerVersion", "Properties": {"ContentUri": "layer"}}
+                },
+                "Outputs": {"LayerArn": {"Value": {"Ref": "Layer"}}},
+            },
+        )
+
+        provider = SamFunctionProvider(
+            [root_stack, layer_stack], ignore_code_extraction_warnings=True, locate_layer_nested=True
+        )
+
+        layers = provider.get("RootFunction").layers
+        self.assertEqual([layer.stack_path for layer in layers], ["LayerStack"])
+        self.assertEqual([layer.name for layer in layers], ["Layer"])
+
+
+class TestRefreshableSamFunctionProvider_lookups(TestCase):
+    def setUp(self):
+        observer_patcher = patch("samcli.lib.providers.sam_function_provider.FileObserver")
+        observer_patcher.start()
+        self.addCleanup(observer_patcher.stop)
+        self.root_stack = _stack("", "", {"RootFunction": _function("root-function")})
+        self.child_stack = _stack("", "ChildStack", {"ChildFunction": _function("child-function")})
+        self.provider = RefreshableSamFunctionProvider(
+            [self.root_stack, self.child_stack], ignore_code_extraction_warnings=True
+        )
+
+    @patch("samcli.lib.providers.sam_function_provider.SamLocalStackProvider.get_stacks")
+    def test_must_index_the_stacks_again_when_the_templates_changed(self, get_stacks_mock):
+        other_child_stack = _stack("", "OtherStack", {"OtherFunction": _function("other-function")})
+        get_stacks_mock.return_value = ([self.root_stack, other_child_stack], [])
+        self.assertIn("ChildFunction", self.provider.get_resources_by_stack_path("ChildStack"))
+
+        self.provider.is_changed = True
+
+        self.assertIn("OtherFunction", self.provider.get_resources_by_stack_path("OtherStack"))
+        with self.assertRaises(RuntimeError):
+            self.provider.get_resources_by_stack_path("ChildStack")
+        self.assertEqual(self.provider.get("other-function").function_id, "OtherFunction")
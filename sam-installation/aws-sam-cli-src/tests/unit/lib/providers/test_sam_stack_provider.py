@@ -0,0 +1,33 @@
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.lib.providers.sam_stack_provider import _map_concurrently
+
+
+class TestMapConcurrently(TestCase):
+    def test_must_keep_the_order_of_the_items(self):
+        self.assertEqual(_map_concurrently(lambda item: item * 2, [1, 2, 3, 4]), [2, 4, 6, 8])
+
+    @patch("samcli.lib.providers.sam_stack_provider.NESTED_STACK_MAX_WORKERS", 1)
+    def test_must_run_on_the_calling_thread_with_a_single_worker(self):
+        threads = _map_concurrently(lambda _: threading.current_thread(), [1, 2])
+
+        self.assertEqual(threads, [threading.current_thread()] * 2)
+
+    def test_must_only_run_the_top_level_concurrently(self):
+        nested_threads = []
+
+        def load_children(item):
+            worker = threading.current_thread()
+            nested_threads.extend(
+                (worker, thread) for thread in _map_concurrently(lambda _: threading.current_thread(), [1, 2])
+            )
+            return worker
+
+        workers = _map_concurrently(load_children, [1, 2, 3])
+
+        self.assertNotIn(threading.current_thread(), workers)
+        self.assertEqual(len(nested_threads), 6)
+        for worker, thread in nested_threads:
+            self.assertIs(thread, worker)
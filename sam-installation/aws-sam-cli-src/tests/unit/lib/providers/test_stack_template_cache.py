@@ -0,0 +1,97 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+from samcli.lib.providers.stack_template_cache import StackTemplateCache
+
+
+class TestStackTemplateCache_get_template_data(TestCase):
+    def setUp(self):
+        self.cache = StackTemplateCache()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.template_file = os.path.join(self.temp_dir.name, "template.yaml")
+        self._write_template("Resources: {}", mtime_ns=1_000_000_000)
+        self.parse = Mock(side_effect=lambda path: {"Resources": {}, "Parsed": self.parse.call_count})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_template(self, content, mtime_ns):
+        with open(self.template_file, "w") as template:
+            template.write(content)
+        os.utime(self.template_file, ns=(mtime_ns, mtime_ns))
+
+    def test_must_parse_an_unchanged_template_once(self):
+        first = self.cache.get_template_data(self.template_file, self.parse)
+        second = self.cache.get_template_data(self.template_file, self.parse)
+
+        self.parse.assert_called_once_with(self.template_file)
+        self.assertEqual(first, second)
+
+    def test_must_return_copies(self):
+        self.cache.get_template_data(self.template_file, self.parse)["Resources"]["Function"] = {}
+
+        self.assertEqual(self.cache.get_template_data(self.template_file, self.parse)["Resources"], {})
+
+    def test_must_parse_again_when_the_modification_time_changes(self):
+        self.cache.get_template_data(self.template_file, self.parse)
+        self._write_template("Resources: {}", mtime_ns=2_000_000_000)
+
+        template_dict = self.cache.get_template_data(self.template_file, self.parse)
+
+        self.assertEqual(self.parse.call_count, 2)
+        self.assertEqual(template_dict["Parsed"], 2)
+
+    def test_must_parse_again_when_the_size_changes(self):
+        self.cache.get_template_data(self.template_file, self.parse)
+        self._write_template("Resources: {}\n", mtime_ns=1_000_000_000)
+
+        self.cache.get_template_data(self.template_file, self.parse)
+
+        self.assertEqual(self.parse.call_count, 2)
+
+    def test_must_not_cache_missing_files(self):
+        missing_file = os.path.join(self.temp_dir.name, "missing.yaml")
+
+        self.cache.get_template_data(missing_file, self.parse)
+        self.cache.get_template_data(missing_file, self.parse)
+
+        self.assertEqual(self.parse.call_count, 2)
+
+
+class TestStackTemplateCache_get_resolved_template(TestCase):
+    def setUp(self):
+        self.cache = StackTemplateCache()
+        self.template_dict = {"Parameters": {"Stage": {"Type": "String"}}, "Resources": {}}
+        self.resolve = Mock(side_effect=lambda: {"Resolved": self.resolve.call_count})
+
+    def test_must_resolve_the_same_template_and_parameters_once(self):
+        self.cache.get_resolved_template(self.template_dict, {"Stage": "dev"}, self.resolve)
+        resolved = self.cache.get_resolved_template(dict(self.template_dict), {"Stage": "dev"}, self.resolve)
+
+        self.resolve.assert_called_once_with()
+        self.assertEqual(resolved, {"Resolved": 1})
+
+    def test_must_resolve_again_when_the_parameters_change(self):
+        self.cache.get_resolved_template(self.template_dict, {"Stage": "dev"}, self.resolve)
+        resolved = self.cache.get_resolved_template(self.template_dict, {"Stage": "prod"}, self.resolve)
+
+        self.assertEqual(resolved, {"Resolved": 2})
+
+    def test_must_resolve_again_when_the_template_changes(self):
+        self.cache.get_resolved_template(self.template_dict, None, self.resolve)
+        self.template_dict["Resources"]["Function"] = {"Type": "AWS::Serverless::Function"}
+
+        resolved = self.cache.get_resolved_template(self.template_dict, None, self.resolve)
+
+        self.assertEqual(resolved, {"Resolved": 2})
+
+    def test_must_evict_the_least_recently_used_templates(self):
+        cache = StackTemplateCache(max_size=1)
+
+        cache.get_resolved_template(self.template_dict, {"Stage": "dev"}, self.resolve)
+        cache.get_resolved_template(self.template_dict, {"Stage": "prod"}, self.resolve)
+        cache.get_resolved_template(self.template_dict, {"Stage": "dev"}, self.resolve)
+
+        self.assertEqual(self.resolve.call_count, 3)
@@ -0,0 +1,29 @@
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+from samcli.lib.sync.continuous_sync_flow_executor import ContinuousSyncFlowExecutor
+
+
+class TestContinuousSyncFlowExecutor_get_wakeup_timeout(TestCase):
+    def setUp(self):
+        self.executor = ContinuousSyncFlowExecutor()
+
+    def test_must_wait_for_the_earliest_delayed_task(self):
+        self.executor.add_delayed_sync_flow(Mock(), wait_time=10)
+        self.executor.add_delayed_sync_flow(Mock(), wait_time=5)
+
+        self.assertAlmostEqual(self.executor._get_wakeup_timeout(), 5, delta=1)
+
+    def test_must_not_wake_up_for_expired_tasks_of_running_sync_flows(self):
+        sync_flow = Mock()
+        self.executor._running_futures[sync_flow] = Mock()
+        self.executor.add_delayed_sync_flow(sync_flow, wait_time=0)
+        time.sleep(0.01)
+
+        self.assertIsNone(self.executor._get_wakeup_timeout())
+
+    def test_must_wake_up_right_away_for_expired_tasks(self):
+        self.executor.add_delayed_sync_flow(Mock(), wait_time=0)
+
+        self.assertEqual(self.executor._get_wakeup_timeout(), 0)
@@ -0,0 +1,75 @@
+import threading
+from unittest import TestCase
+from unittest.mock import Mock
+
+from samcli.lib.sync.sync_flow_executor import SyncFlowExecutor
+
+
+def _sync_flow(execute=None):
+    sync_flow = Mock()
+    sync_flow.execute.side_effect = execute or (lambda: [])
+    return sync_flow
+
+
+class TestSyncFlowExecutor_execute(TestCase):
+    def setUp(self):
+        self.executor = SyncFlowExecutor(max_workers=2)
+
+    def _execute(self):
+        thread = threading.Thread(target=self.executor.execute, daemon=True)
+        thread.start()
+        return thread
+
+    def test_must_execute_dependent_sync_flows(self):
+        dependent = _sync_flow()
+        self.executor.add_sync_flow(_sync_flow(lambda: [dependent]))
+
+        thread = self._execute()
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        dependent.execute.assert_called_once()
+
+    def test_must_execute_sync_flow_queued_while_it_is_running(self):
+        first_run_started = threading.Event()
+        first_run_release = threading.Event()
+
+        def execute():
+            if not first_run_started.is_set():
+                first_run_started.set()
+                first_run_release.wait(5)
+            return []
+
+        sync_flow = _sync_flow(execute)
+        self.executor.add_sync_flow(sync_flow)
+        thread = self._execute()
+        self.assertTrue(first_run_started.wait(5))
+
+        # deferred until the running one is done, which is the only event that wakes up the executor again
+        self.executor.add_sync_flow(sync_flow)
+        first_run_release.set()
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(sync_flow.execute.call_count, 2)
+
+    def test_must_not_run_the_same_sync_flow_concurrently(self):
+        running = []
+        overlaps = []
+
+        def execute():
+            overlaps.append(bool(running))
+            running.append(True)
+            threading.Event().wait(0.05)
+            running.pop()
+            return []
+
+        sync_flow = _sync_flow(execute)
+        for _ in range(3):
+            self.executor.add_sync_flow(sync_flow, dedup=False)
+
+        thread = self._execute()
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(overlaps, [False, False, False])
@@ -0,0 +1,190 @@
+import json
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import requests
+
+from samcli.lib.telemetry.sender import TELEMETRY_BATCH_SIZE, TelemetrySender
+
+
+@patch("requests.post")
+class TestTelemetrySender(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pending_metrics_dir = Path(self.temp_dir.name, "telemetry")
+        self.sender = TelemetrySender("https://telemetry", self.pending_metrics_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _pending_metrics(self):
+        if not self.pending_metrics_dir.exists():
+            return []
+        metrics = []
+        for pending_file in sorted(self.pending_metrics_dir.iterdir()):
+            metrics.extend(json.loads(pending_file.read_text())["metrics"])
+        return metrics
+
+    @staticmethod
+    def _sent_metrics(post_mock):
+        return [metric for call in post_mock.call_args_list for metric in call.kwargs["json"]["metrics"]]
+
+    def test_must_send_the_metrics_in_batches(self, post_mock):
+        post_mock.return_value = Mock(status_code=200)
+        metrics = [{"index": index} for index in range(TELEMETRY_BATCH_SIZE + 1)]
+
+        for metric in metrics:
+            self.sender.send(metric)
+        self.sender.flush(timeout=5)
+
+        self.assertEqual(self._sent_metrics(post_mock), metrics)
+        self.assertGreaterEqual(post_mock.call_count, 2)
+        self.assertEqual(self._pending_metrics(), [])
+
+    def test_must_send_each_metric_once_when_sent_from_many_threads(self, post_mock):
+        post_mock.return_value = Mock(status_code=200)
+
+        def send_metrics(thread_index):
+            for index in range(50):
+                self.sender.send({"thread": thread_index, "index": index})
+
+        threads = [threading.Thread(target=send_metrics, args=(thread_index,)) for thread_index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.sender.flush(timeout=5)
+
+        sent = self._sent_metrics(post_mock) + self._pending_metrics()
+        self.assertEqual(len(sent), 8 * 50)
+        self.assertEqual(
+            {(metric["thread"], metric["index"]) for metric in sent}, {(t, i) for t in range(8) for i in range(50)}
+        )
+
+    def test_must_save_the_metrics_when_the_backend_is_unreachable(self, post_mock):
+        post_mock.side_effect = requests.exceptions.ConnectionError("offline")
+
+        self.sender.send({"index": 0})
+        self.sender.flush(timeout=5)
+        self.sender.send({"index": 1})
+
+        self.assertEqual(self._pending_metrics(), [{"index": 0}, {"index": 1}])
+
+    def test_must_save_the_metrics_on_server_errors(self, post_mock):
+        post_mock.return_value = Mock(status_code=503)
+
+        self.sender.send({"index": 0})
+        self.sender.flush(timeout=5)
+
+        self.assertEqual(self._pending_metrics(), [{"index": 0}])
+
+    def test_must_not_send_again_the_metrics_rejected_by_the_backend(self, post_mock):
+        post_mock.return_value = Mock(status_code=400)
+
+        self.sender.send({"index": 0})
+        self.sender.flush(timeout=5)
+
+        self.assertEqual(self._pending_metrics(), [])
+
+    def test_must_not_send_again_the_metrics_when_the_response_timed_out(self, post_mock):
+        post_mock.side_effect = requests.exceptions.ReadTimeout("no response")
+
+        self.sender.send({"index": 0})
+        self.sender.flush(timeout=5)
+
+        post_mock.assert_called_once()
+        self.assertEqual(self._pending_metrics(), [])
+
+    def test_must_send_the_metrics_saved_by_a_previous_command(self, post_mock):
+        post_mock.side_effect = requests.exceptions.ConnectionError("offline")
+        self.sender.send({"index": 0})
+        self.sender.flush(timeout=5)
+        post_mock.side_effect = None
+        post_mock.return_value = Mock(status_code=200)
+
+        next_sender = TelemetrySender("https://telemetry", self.pending_metrics_dir)
+        next_sender.send({"index": 1})
+        next_sender.flush(timeout=5)
+
+        self.assertEqual(self._sent_metrics(post_mock)[-2:], [{"index": 0}, {"index": 1}])
+        self.assertEqual(self._pending_metrics(), [])
+
+    def test_must_ignore_the_metrics_saved_for_another_url(self, post_mock):
+        post_mock.side_effect = requests.exceptions.ConnectionError("offline")
+        self.sender.send({"index": 0})
+        self.sender.flush(timeout=5)
+        post_mock.side_effect = None
+        post_mock.return_value = Mock(status_code=200)
+
+        other_sender = TelemetrySender("https://other-telemetry", self.pending_metrics_dir)
+        other_sender.send({"index": 1})
+        other_sender.flush(timeout=5)
+
+        self.assertEqual(self._sent_metrics(post_mock)[-1:], [{"index": 1}])
+
+    def _slow_post(self, post_mock, result):
+        started = threading.Event()
+        release = threading.Event()
+
+        def post(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        post_mock.side_effect = post
+        return started, release
+
+    def test_must_save_the_batch_being_sent_when_flush_times_out(self, post_mock):
+        started, release = self._slow_post(post_mock, Mock(status_code=200))
+
+        self.sender.send({"index": 0})
+        started.wait(5)
+        self.sender.flush(timeout=0.1)
+
+        self.assertEqual(self._pending_metrics(), [{"index": 0}])
+
+        # the request completed after all, the saved batch is not sent again
+        release.set()
+        self.sender._thread.join(5)
+        self.assertEqual(self._pending_metrics(), [])
+
+    def test_must_save_the_batch_being_sent_once_when_the_request_fails_after_flush(self, post_mock):
+        started, release = self._slow_post(post_mock, requests.exceptions.ConnectionError("offline"))
+
+        self.sender.send({"index": 0})
+        started.wait(5)
+        self.sender.flush(timeout=0.1)
+        release.set()
+        self.sender._thread.join(5)
+
+        self.assertEqual(self._pending_metrics(), [{"index": 0}])
+
+    def test_must_queue_the_pending_metrics_before_removing_their_files(self, post_mock):
+        post_mock.side_effect = requests.exceptions.ConnectionError("offline")
+        self.sender.send({"index": 0})
+        self.sender.flush(timeout=5)
+        self.sender.send({"index": 1})
+
+        next_sender = TelemetrySender("https://telemetry", self.pending_metrics_dir)
+        next_sender._queue = [{"index": 2}]
+        next_sender._load_pending_metrics()
+
+        self.assertEqual(next_sender._queue, [{"index": 0}, {"index": 1}, {"index": 2}])
+        self.assertEqual(list(self.pending_metrics_dir.iterdir()), [])
+
+    def test_must_leave_the_pending_metrics_when_flushed_while_loading_them(self, post_mock):
+        post_mock.side_effect = requests.exceptions.ConnectionError("offline")
+        self.sender.send({"index": 0})
+        self.sender.flush(timeout=5)
+
+        next_sender = TelemetrySender("https://telemetry", self.pending_metrics_dir)
+        next_sender._closed = next_sender._flushed = True
+        next_sender._load_pending_metrics()
+
+        self.assertEqual(next_sender._queue, [])
+        self.assertEqual(self._pending_metrics(), [{"index": 0}])
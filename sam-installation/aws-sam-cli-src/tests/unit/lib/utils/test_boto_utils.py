@@ -0,0 +1,75 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from samcli.lib.utils import boto_utils
+from samcli.lib.utils.boto_utils import DEFAULT_MAX_POOL_CONNECTIONS, BotoClientRegistry
+
+
+class TestBotoClientRegistry(TestCase):
+    def setUp(self):
+        config_patch = patch.object(boto_utils, "get_boto_config_with_user_agent", side_effect=lambda **kwargs: kwargs)
+        self.config_mock = config_patch.start()
+        self.addCleanup(config_patch.stop)
+
+        self.registry = BotoClientRegistry()
+        self.session = self._session()
+
+    @staticmethod
+    def _session():
+        session = Mock()
+        session.client.side_effect = lambda service_name, config: Mock(service_name=service_name, config=config)
+        return session
+
+    def test_must_reuse_the_client_of_the_same_service_session_and_config(self):
+        first = self.registry.get_client("lambda", session=self.session, read_timeout=5)
+        second = self.registry.get_client("lambda", session=self.session, read_timeout=5)
+
+        self.assertIs(first, second)
+        self.session.client.assert_called_once()
+
+    def test_must_create_a_client_per_config(self):
+        first = self.registry.get_client("lambda", session=self.session)
+        second = self.registry.get_client("lambda", session=self.session, read_timeout=5)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.config["read_timeout"], 5)
+
+    def test_must_create_a_client_per_session_and_service(self):
+        first = self.registry.get_client("lambda", session=self.session)
+        other_session = self.registry.get_client("lambda", session=self._session())
+        other_service = self.registry.get_client("s3", session=self.session)
+
+        self.assertIsNot(first, other_session)
+        self.assertIsNot(first, other_service)
+
+    def test_must_never_shrink_the_connection_pools(self):
+        self.assertEqual(self.registry.max_pool_connections, DEFAULT_MAX_POOL_CONNECTIONS)
+
+        self.registry.scale_max_pool_connections(50)
+        self.registry.scale_max_pool_connections(20)
+
+        self.assertEqual(self.registry.max_pool_connections, 50)
+        client = self.registry.get_client("lambda", session=self.session)
+        self.assertEqual(client.config["max_pool_connections"], 50)
+
+    @patch.object(boto_utils, "BOTO_MAX_POOL_CONNECTIONS", 8)
+    def test_must_keep_the_configured_connection_pools(self):
+        registry = BotoClientRegistry()
+
+        registry.scale_max_pool_connections(50)
+
+        self.assertEqual(registry.max_pool_connections, 8)
+
+    def test_must_count_the_created_clients(self):
+        self.registry.get_client("lambda", session=self.session)
+        self.registry.get_client("lambda", session=self.session)
+        self.registry.get_client("lambda", session=self.session, read_timeout=5)
+        self.registry.get_client("s3", session=self.session)
+
+        stats = self.registry.get_stats()
+
+        self.assertEqual({name: stat.count for name, stat in stats.items()}, {"lambda": 2, "s3": 1})
+        self.assertGreaterEqual(stats["lambda"].total_seconds, 0)
+
+        self.registry.clear()
+        self.assertEqual(self.registry.get_stats(), {})
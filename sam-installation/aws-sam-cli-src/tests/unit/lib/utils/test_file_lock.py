@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.lib.utils import file_lock
+from samcli.lib.utils.file_lock import atomic_write_text
+
+
+class TestAtomicWriteText(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir, "content.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch.object(file_lock.os, "fsync", wraps=os.fsync)
+    def test_must_replace_the_file(self, fsync_mock):
+        self.path.write_text("old")
+
+        atomic_write_text(self.path, "new")
+
+        self.assertEqual(self.path.read_text(), "new")
+        self.assertEqual(os.listdir(self.temp_dir), ["content.json"])
+        fsync_mock.assert_called_once()
+
+    @patch.object(file_lock.os, "fsync")
+    def test_must_not_sync_when_disabled(self, fsync_mock):
+        atomic_write_text(self.path, "new", fsync=False)
+
+        self.assertEqual(self.path.read_text(), "new")
+        fsync_mock.assert_not_called()
+
+    @patch.object(file_lock.os, "replace", side_effect=OSError("replace failed"))
+    def test_must_remove_the_temporary_file_on_failure(self, replace_mock):
+        with self.assertRaises(OSError):
+            atomic_write_text(self.path, "new")
+
+        self.assertEqual(os.listdir(self.temp_dir), [])
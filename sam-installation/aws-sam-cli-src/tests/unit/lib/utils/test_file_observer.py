@@ -0,0 +1,67 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.lib.utils import file_observer
+from samcli.lib.utils.file_observer import _PathDigest, _PathTrie
+
+
+class TestPathTrie(TestCase):
+    def setUp(self):
+        self.trie = _PathTrie()
+        self.trie.add(os.path.join(os.sep, "project", "function"), "function")
+        self.trie.add(os.path.join(os.sep, "project", "function", "layer"), "layer")
+
+    def test_must_find_the_observed_parents_of_a_path(self):
+        found = self.trie.find_ancestors(os.path.join(os.sep, "project", "function", "layer", "file.py"))
+
+        self.assertEqual([groups for _, groups in found], [{"function"}, {"layer"}])
+
+    def test_must_find_the_observed_children_of_a_path(self):
+        found = self.trie.find_descendants(os.path.join(os.sep, "project"))
+
+        self.assertEqual(sorted(group for _, groups in found for group in groups), ["function", "layer"])
+
+    def test_must_forget_removed_paths(self):
+        self.trie.remove(os.path.join(os.sep, "project", "function", "layer"), "layer")
+
+        found = self.trie.find_ancestors(os.path.join(os.sep, "project", "function", "layer", "file.py"))
+
+        self.assertEqual([groups for _, groups in found], [{"function"}])
+
+
+class TestPathDigest(TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        (self.root / "nested").mkdir()
+        (self.root / "nested" / "file.py").write_text("content")
+        (self.root / "other.py").write_text("other")
+        self.digest = _PathDigest(str(self.root))
+
+    def test_must_only_hash_the_changed_files(self):
+        changed_file = self.root / "nested" / "file.py"
+        changed_file.write_text("new content")
+
+        with patch.object(file_observer, "file_checksum", wraps=file_observer.file_checksum) as checksum_mock:
+            self.assertTrue(self.digest.update({str(changed_file)}))
+
+        checksum_mock.assert_called_once_with(str(changed_file))
+
+    def test_must_ignore_events_without_content_change(self):
+        os.utime(self.root / "other.py", None)
+
+        self.assertFalse(self.digest.update({str(self.root / "other.py")}))
+
+    def test_must_detect_removed_directories(self):
+        (self.root / "nested" / "file.py").unlink()
+        (self.root / "nested").rmdir()
+
+        self.assertTrue(self.digest.update({str(self.root / "nested")}))
+        self.assertFalse(self.digest.update({str(self.root)}))
+
+    def test_must_detect_added_files(self):
+        (self.root / "added.py").write_text("added")
+
+        self.assertTrue(self.digest.update({str(self.root)}))
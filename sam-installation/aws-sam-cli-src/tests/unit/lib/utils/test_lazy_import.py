@@ -0,0 +1,57 @@
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.lib.utils import lazy_import as lazy_import_module
+from samcli.lib.utils.lazy_import import lazy_import
+
+PACKAGE_NAME = "samcli_lazy_import_probe"
+
+
+class TestLazyImport(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        package_dir = os.path.join(self.temp_dir, PACKAGE_NAME)
+        os.mkdir(package_dir)
+        with open(os.path.join(package_dir, "__init__.py"), "w") as init_file:
+            init_file.write("EXECUTED = []\n")
+        with open(os.path.join(package_dir, "heavy.py"), "w") as heavy_file:
+            heavy_file.write(f"from {PACKAGE_NAME} import EXECUTED\nEXECUTED.append(__name__)\nVALUE = 42\n")
+        sys.path.insert(0, self.temp_dir)
+        importlib.invalidate_caches()
+
+    def tearDown(self):
+        sys.path.remove(self.temp_dir)
+        for name in [PACKAGE_NAME, f"{PACKAGE_NAME}.heavy"]:
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_must_execute_the_module_on_first_attribute_access(self):
+        heavy = lazy_import(f"{PACKAGE_NAME}.heavy")
+        package = sys.modules[PACKAGE_NAME]
+
+        self.assertEqual(package.EXECUTED, [])
+        self.assertIs(package.heavy, heavy)
+        self.assertIs(sys.modules[f"{PACKAGE_NAME}.heavy"], heavy)
+
+        self.assertEqual(heavy.VALUE, 42)
+        self.assertEqual(package.EXECUTED, [f"{PACKAGE_NAME}.heavy"])
+
+    def test_must_return_an_imported_module(self):
+        heavy = importlib.import_module(f"{PACKAGE_NAME}.heavy")
+
+        self.assertIs(lazy_import(f"{PACKAGE_NAME}.heavy"), heavy)
+
+    @patch.object(lazy_import_module, "EAGER_IMPORTS", True)
+    def test_must_execute_the_module_right_away_with_eager_imports(self):
+        lazy_import(f"{PACKAGE_NAME}.heavy")
+
+        self.assertEqual(sys.modules[PACKAGE_NAME].EXECUTED, [f"{PACKAGE_NAME}.heavy"])
+
+    def test_must_raise_for_a_missing_module(self):
+        with self.assertRaises(ModuleNotFoundError):
+            lazy_import(f"{PACKAGE_NAME}.missing")
@@ -0,0 +1,67 @@
+import io
+import os
+import tarfile
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.lib.utils import tar
+from samcli.lib.utils.tar import _validate_destinations_exists, create_tarball
+
+
+class TestValidateDestinationsExists(TestCase):
+    def setUp(self):
+        self.tree = Path(tempfile.mkdtemp())
+        self.outside = Path(tempfile.mkdtemp())
+        (self.tree / "nested").mkdir()
+        (self.outside / "target.txt").write_text("content")
+        os.symlink(self.outside / "target.txt", self.tree / "nested" / "link.txt")
+        tar._VALIDATED_DESTINATIONS.clear()
+
+    def test_must_scan_a_tree_once(self):
+        with patch.object(tar, "_scan_symlink_destinations", wraps=tar._scan_symlink_destinations) as scan_mock:
+            self.assertTrue(_validate_destinations_exists([self.tree]))
+            self.assertTrue(_validate_destinations_exists([self.tree]))
+
+        scan_mock.assert_called_once()
+
+    def test_must_notice_removed_symlink_destination_outside_of_the_tree(self):
+        self.assertTrue(_validate_destinations_exists([self.tree]))
+
+        (self.outside / "target.txt").unlink()
+
+        self.assertFalse(_validate_destinations_exists([self.tree]))
+
+    def test_must_scan_again_when_a_directory_changes(self):
+        self.assertTrue(_validate_destinations_exists([self.tree]))
+
+        os.symlink(self.outside / "missing.txt", self.tree / "nested" / "broken.txt")
+
+        self.assertFalse(_validate_destinations_exists([self.tree]))
+
+
+class TestCreateTarball(TestCase):
+    def setUp(self):
+        self.tree = Path(tempfile.mkdtemp())
+        (self.tree / "file.txt").write_text("content")
+
+    def _read_members(self, tarball):
+        with tarfile.open(fileobj=io.BytesIO(tarball.read()), mode="r") as archive:
+            return {
+                member.name: archive.extractfile(member).read() for member in archive.getmembers() if member.isfile()
+            }
+
+    def test_must_create_the_same_tarball_when_streaming(self):
+        with create_tarball({self.tree: "context"}) as tarball:
+            expected = self._read_members(tarball)
+        with create_tarball({self.tree: "context"}, stream=True) as tarball:
+            streamed = self._read_members(tarball)
+
+        self.assertEqual(streamed, expected)
+        self.assertEqual(streamed, {"context/file.txt": b"content"})
+
+    def test_must_raise_errors_of_the_streamed_tarball(self):
+        with self.assertRaises(FileNotFoundError):
+            with create_tarball({self.tree / "missing": "missing"}, stream=True) as tarball:
+                tarball.read()
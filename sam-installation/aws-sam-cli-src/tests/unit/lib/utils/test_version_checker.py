@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from samcli.lib.utils.version_checker import (
+    VersionCheck,
+    _inform_newer_version,
+    _start_version_check,
+    check_newer_version,
+    fetch_latest_version,
+)
+
+
+def _timestamp(days_ago):
+    return (datetime.utcnow() - timedelta(days=days_ago)).timestamp()
+
+
+@patch("samcli.lib.utils.version_checker.requests")
+class TestFetchLatestVersion(TestCase):
+    def test_must_fetch_without_a_cached_version(self, requests_mock):
+        requests_mock.get.return_value = Mock(status_code=200, headers={"ETag": '"v2"'})
+        requests_mock.get.return_value.json.return_value = {"info": {"version": "2.0.0"}}
+
+        latest = fetch_latest_version()
+
+        self.assertEqual(requests_mock.get.call_args.kwargs["headers"], {})
+        self.assertEqual(latest["version"], "2.0.0")
+        self.assertEqual(latest["etag"], '"v2"')
+
+    def test_must_revalidate_the_cached_version(self, requests_mock):
+        requests_mock.codes.not_modified = 304
+        requests_mock.get.return_value = Mock(status_code=304, headers={"ETag": '"v1"'})
+
+        latest = fetch_latest_version({"version": "1.0.0", "etag": '"v1"'})
+
+        self.assertEqual(requests_mock.get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(latest["version"], "1.0.0")
+        requests_mock.get.return_value.json.assert_not_called()
+
+    def test_must_fail_on_errors(self, requests_mock):
+        requests_mock.get.return_value = Mock(status_code=503, headers={})
+        requests_mock.get.return_value.raise_for_status.side_effect = RuntimeError("unavailable")
+
+        with self.assertRaises(RuntimeError):
+            fetch_latest_version({"version": "1.0.0"})
+
+
+@patch("samcli.lib.utils.version_checker.GlobalConfig")
+class TestStartVersionCheck(TestCase):
+    def test_must_not_check_before_a_week(self, global_config_mock):
+        global_config_mock.return_value.last_version_check = _timestamp(1)
+
+        self.assertIsNone(_start_version_check())
+
+    def test_must_not_fetch_again_a_version_fetched_since_the_last_check(self, global_config_mock):
+        global_config_mock.return_value.last_version_check = _timestamp(8)
+        global_config_mock.return_value.latest_version = {"version": "2.0.0", "fetchedAt": _timestamp(0)}
+
+        self.assertIsNone(_start_version_check())
+
+    @patch.object(VersionCheck, "start")
+    def test_must_fetch_when_the_check_is_overdue(self, start_mock, global_config_mock):
+        cached_version = {"version": "2.0.0", "etag": '"v2"', "fetchedAt": _timestamp(9)}
+        global_config_mock.return_value.last_version_check = _timestamp(8)
+        global_config_mock.return_value.latest_version = cached_version
+
+        _start_version_check()
+
+        start_mock.assert_called_once_with()
+
+
+@patch("samcli.lib.utils.version_checker.update_last_check_time")
+@patch("samcli.lib.utils.version_checker.compare_versions")
+@patch("samcli.lib.utils.version_checker.GlobalConfig")
+class TestInformNewerVersion(TestCase):
+    def setUp(self):
+        self.version_check = VersionCheck()
+
+    def test_must_save_and_compare_a_finished_check(self, global_config_mock, compare_mock, update_mock):
+        global_config_mock.return_value.last_version_check = None
+        self.version_check._fetched_version = {"version": "2.0.0"}
+        self.version_check._done.set()
+
+        _inform_newer_version(self.version_check)
+
+        self.assertEqual(global_config_mock.return_value.latest_version, {"version": "2.0.0"})
+        compare_mock.assert_called_once_with("2.0.0")
+        update_mock.assert_called_once_with()
+
+    @patch("samcli.lib.utils.version_checker.atexit")
+    def test_must_not_wait_for_an_unfinished_check(self, atexit_mock, global_config_mock, compare_mock, update_mock):
+        global_config_mock.return_value.last_version_check = None
+
+        _inform_newer_version(self.version_check)
+
+        atexit_mock.register.assert_called_once_with(self.version_check.save)
+        compare_mock.assert_not_called()
+        update_mock.assert_not_called()
+
+    def test_must_compare_the_version_fetched_by_a_previous_command(
+        self, global_config_mock, compare_mock, update_mock
+    ):
+        global_config_mock.return_value.last_version_check = _timestamp(8)
+        global_config_mock.return_value.latest_version = {"version": "2.0.0", "fetchedAt": _timestamp(0)}
+
+        _inform_newer_version(None)
+
+        compare_mock.assert_called_once_with("2.0.0")
+        update_mock.assert_called_once_with()
+
+
+class TestVersionCheck(TestCase):
+    @patch("samcli.lib.utils.version_checker.fetch_latest_version")
+    def test_must_fetch_in_the_background(self, fetch_mock):
+        fetch_mock.return_value = {"version": "2.0.0"}
+
+        version_check = VersionCheck({"version": "1.0.0"}).start()
+        version_check._done.wait(5)
+
+        self.assertTrue(version_check.done)
+        self.assertEqual(version_check.latest_version, "2.0.0")
+        fetch_mock.assert_called_once_with({"version": "1.0.0"})
+
+    @patch("samcli.lib.utils.version_checker.fetch_latest_version")
+    def test_must_finish_when_the_fetch_fails(self, fetch_mock):
+        fetch_mock.side_effect = RuntimeError("offline")
+
+        version_check = VersionCheck().start()
+        version_check._done.wait(5)
+
+        self.assertTrue(version_check.done)
+        self.assertIsNone(version_check.latest_version)
+
+    @patch("samcli.lib.utils.version_checker.GlobalConfig")
+    def test_must_not_save_a_version_which_was_not_fetched(self, global_config_mock):
+        VersionCheck().save()
+
+        global_config_mock.assert_not_called()
+
+
+class TestCheckNewerVersion(TestCase):
+    @patch("samcli.lib.utils.version_checker._inform_newer_version")
+    @patch("samcli.lib.utils.version_checker._start_version_check")
+    def test_must_run_the_command_between_the_start_and_the_end_of_the_check(self, start_mock, inform_mock):
+        calls = []
+        start_mock.side_effect = lambda: calls.append("start") or "check"
+        inform_mock.side_effect = lambda version_check: calls.append(("inform", version_check))
+
+        result = check_newer_version(lambda: calls.append("command") or "result")()
+
+        self.assertEqual(result, "result")
+        self.assertEqual(calls, ["start", "command", ("inform", "check")])
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from samcli.local.apigw.authorizers.authorizer_cache import AuthorizerResultCache, parse_result_ttl
+
+
+class TestParseResultTtl(TestCase):
+    def test_must_parse_the_ttl(self):
+        self.assertEqual(parse_result_ttl(300, "auth"), 300)
+        self.assertEqual(parse_result_ttl("300", "auth"), 300)
+        self.assertEqual(parse_result_ttl(0, "auth"), 0)
+        self.assertEqual(parse_result_ttl(3600, "auth"), 3600)
+
+    def test_must_ignore_a_missing_or_invalid_ttl(self):
+        self.assertIsNone(parse_result_ttl(None, "auth"))
+        self.assertIsNone(parse_result_ttl("five minutes", "auth"))
+        self.assertIsNone(parse_result_ttl({"Ref": "Ttl"}, "auth"))
+        self.assertIsNone(parse_result_ttl(-1, "auth"))
+        self.assertIsNone(parse_result_ttl(3601, "auth"))
+
+
+class TestAuthorizerResultCache(TestCase):
+    def setUp(self):
+        self.cache = AuthorizerResultCache(max_size=2)
+
+    def test_must_return_the_cached_response_until_it_expires(self):
+        self.cache.put("token", '{"principalId": "user"}', ttl=300, now=1000)
+
+        self.assertEqual(self.cache.get("token", now=1299), '{"principalId": "user"}')
+        self.assertIsNone(self.cache.get("token", now=1300))
+        self.assertIsNone(self.cache.get("token", now=1000))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_must_not_cache_with_a_zero_ttl(self):
+        self.cache.put("token", "response", ttl=0, now=1000)
+
+        self.assertIsNone(self.cache.get("token", now=1000))
+
+    def test_must_not_cache_with_a_zero_size(self):
+        cache = AuthorizerResultCache(max_size=0)
+        cache.put("token", "response", ttl=300, now=1000)
+
+        self.assertIsNone(cache.get("token", now=1000))
+
+    def test_must_evict_the_least_recently_used_response(self):
+        self.cache.put("first", "first response", ttl=300, now=1000)
+        self.cache.put("second", "second response", ttl=300, now=1000)
+        self.cache.get("first", now=1000)
+
+        self.cache.put("third", "third response", ttl=300, now=1000)
+
+        self.assertEqual(self.cache.get("first", now=1000), "first response")
+        self.assertIsNone(self.cache.get("second", now=1000))
+        self.assertEqual(self.cache.get("third", now=1000), "third response")
+
+    def test_must_clear_the_cached_responses(self):
+        self.cache.put("token", "response", ttl=300, now=1000)
+
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get("token", now=1000))
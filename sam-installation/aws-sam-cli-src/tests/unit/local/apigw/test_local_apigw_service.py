@@ -0,0 +1,35 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from samcli.lib.providers.provider import Api
+from samcli.local.apigw.local_apigw_service import LATENCY_ENDPOINT, LocalApigwService
+from samcli.local.apigw.route import Route
+
+
+class TestLocalApigwService_latency_endpoint(TestCase):
+    def setUp(self):
+        self.api = Api(routes=[Route(function_name="ProxyFunction", path="/{proxy+}", methods=["GET"])])
+        self.lambda_runner = Mock()
+        self.lambda_runner.is_debugging.return_value = False
+
+    def test_must_not_serve_latency_endpoint_by_default(self):
+        service = LocalApigwService(self.api, self.lambda_runner, latency_endpoint=False)
+        service._request_handler = Mock(return_value="proxied")
+
+        service.create()
+
+        endpoint, _ = service._app.url_map.bind("localhost").match(LATENCY_ENDPOINT)
+        self.assertEqual(endpoint, "/<path:proxy>")
+        self.assertIsNone(service._route_latency)
+
+    def test_must_serve_latency_endpoint_when_enabled(self):
+        service = LocalApigwService(self.api, self.lambda_runner, latency_endpoint=True)
+        service._request_handler = Mock(return_value="proxied")
+
+        service.create()
+        client = service._app.test_client()
+        client.get("/hello")
+        response = client.get(LATENCY_ENDPOINT)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("GET /{proxy+}", response.get_data(as_text=True))
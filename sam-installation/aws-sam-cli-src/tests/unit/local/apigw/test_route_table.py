@@ -0,0 +1,126 @@
+from unittest import TestCase
+
+from flask import Flask, request
+
+from samcli.local.apigw.authorizers.lambda_authorizer import LambdaAuthorizer
+from samcli.local.apigw.route import Route
+from samcli.local.apigw.route_table import CompiledRoute, RouteTable
+from samcli.local.events.api_event import ContextIdentity, RequestContext
+
+
+class TestCompiledRoute(TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.api_route = Route(function_name="Function", path="/users/{id}", methods=["GET"], operation_name="GetUser")
+        self.http_route = Route(
+            function_name="Function", path="/users/{id}", methods=["GET"], event_type=Route.HTTP, operation_name="Get"
+        )
+
+    def _request_context(self, remote_addr="10.0.0.1"):
+        return self.app.test_request_context(
+            "/users/1", method="GET", base_url="http://localhost:3000", environ_base={"REMOTE_ADDR": remote_addr}
+        )
+
+    def test_must_build_the_same_v1_context_as_a_request_context(self):
+        compiled_route = CompiledRoute(self.api_route, "GET", "/users/<id>", "prod")
+
+        with self._request_context():
+            context = compiled_route.build_v1_context(request)
+
+        expected = RequestContext(
+            resource_path="/users/{id}",
+            http_method="GET",
+            stage="prod",
+            identity=ContextIdentity(source_ip="10.0.0.1"),
+            path="/users/{id}",
+            protocol="HTTP/1.1",
+            domain_name="localhost:3000",
+            operation_name="GetUser",
+        ).to_dict()
+        self.assertEqual(context, expected)
+
+    def test_must_not_share_the_request_fields_between_requests(self):
+        compiled_route = CompiledRoute(self.api_route, "GET", "/users/<id>", "prod")
+
+        with self._request_context("10.0.0.1"):
+            first = compiled_route.build_v1_context(request)
+        with self._request_context("10.0.0.2"):
+            second = compiled_route.build_v1_context(request)
+
+        self.assertEqual(first["identity"]["sourceIp"], "10.0.0.1")
+        self.assertEqual(second["identity"]["sourceIp"], "10.0.0.2")
+
+    def test_must_build_the_v2_context(self):
+        compiled_route = CompiledRoute(self.http_route, "GET", "/users/<id>", "prod")
+
+        with self._request_context():
+            context = compiled_route.build_v2_context(request)
+
+        self.assertEqual(context["routeKey"], "GET /users/{id}")
+        self.assertEqual(context["stage"], "prod")
+        self.assertEqual(context["http"]["method"], "GET")
+        self.assertEqual(context["http"]["path"], "/users/1")
+        self.assertEqual(context["http"]["sourceIp"], "10.0.0.1")
+        self.assertIsInstance(context["timeEpoch"], int)
+
+    def test_must_use_the_default_route_key(self):
+        route = Route(function_name="Function", path="$default", methods=["GET"], event_type=Route.HTTP)
+        route.is_default_route = True
+
+        compiled_route = CompiledRoute(route, "GET", "/<path:any_path>", None)
+
+        self.assertEqual(compiled_route.v2_route_key, "$default")
+
+    def test_must_precompute_the_event_format(self):
+        http_v1_route = Route(
+            function_name="Function", path="/", methods=["GET"], event_type=Route.HTTP, payload_format_version="1.0"
+        )
+        invalid_route = Route(function_name="Function", path="/", methods=["GET"], payload_format_version="3.0")
+
+        api = CompiledRoute(self.api_route, "GET", "/users/<id>", "prod")
+        http = CompiledRoute(self.http_route, "GET", "/users/<id>", "prod")
+        http_v1 = CompiledRoute(http_v1_route, "GET", "/", "prod")
+        invalid = CompiledRoute(invalid_route, "GET", "/", "prod")
+
+        self.assertFalse(api.uses_v2_event)
+        self.assertTrue(http.uses_v2_event)
+        self.assertFalse(http_v1.uses_v2_event)
+        self.assertEqual(api.operation_name, "GetUser")
+        self.assertIsNone(http.operation_name)
+        self.assertTrue(api.has_valid_payload_format_version)
+        self.assertFalse(invalid.has_valid_payload_format_version)
+
+    def test_must_build_the_method_arn(self):
+        compiled_route = CompiledRoute(self.api_route, "GET", "/users/<id>", "prod")
+
+        with self._request_context():
+            method_arn = compiled_route.method_arn(request)
+
+        self.assertEqual(method_arn, "arn:aws:execute-api:us-east-1:123456789012:1234567890/prod/GET/users/1")
+
+    def test_must_build_the_authorizer_context_of_the_payload_version(self):
+        for payload_version, context_key in [(LambdaAuthorizer.PAYLOAD_V1, "resourcePath"), ("2.0", "routeKey")]:
+            authorizer = LambdaAuthorizer("auth", LambdaAuthorizer.TOKEN, "AuthFunction", [], payload_version)
+            route = Route(function_name="Function", path="/users/{id}", methods=["GET"], authorizer_object=authorizer)
+            compiled_route = CompiledRoute(route, "GET", "/users/<id>", "prod")
+
+            with self._request_context():
+                context = compiled_route.build_authorizer_context(request)
+
+            self.assertIs(compiled_route.lambda_authorizer, authorizer)
+            self.assertIn(context_key, context)
+
+
+class TestRouteTable(TestCase):
+    def test_must_map_the_endpoint_and_method_to_the_compiled_route(self):
+        route = Route(function_name="Function", path="/users/{id}", methods=["GET", "POST"])
+        route_table = RouteTable("prod")
+
+        route_table.add(route, "GET", "/users/<id>")
+        route_table.add(route, "POST", "/users/<id>")
+
+        compiled_route = route_table.get("POST", "/users/<id>")
+        self.assertIs(compiled_route.route, route)
+        self.assertEqual(compiled_route.method, "POST")
+        self.assertIsNone(route_table.get("DELETE", "/users/<id>"))
+        self.assertEqual(len(route_table), 2)
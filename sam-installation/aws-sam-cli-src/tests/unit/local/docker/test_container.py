@@ -0,0 +1,56 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from samcli.local.docker.container import Container, ContainerResponseException
+
+
+class TestContainer_wait_for_result(TestCase):
+    def setUp(self):
+        self.container = Container("image", "cmd", "/var/task", "/host", docker_client=Mock())
+        self.container._logs_thread = Mock()
+        self.container._logs_thread.is_alive.return_value = True
+        self.container._logs_thread_event = Mock()
+        self.container._can_connect_to_socket = Mock(return_value=True)
+        self.stdout = Mock()
+        self.stderr = Mock()
+
+    @patch.object(Container, "wait_for_http_response")
+    def test_must_check_the_socket_once_while_invocations_succeed(self, wait_for_http_response_mock):
+        wait_for_http_response_mock.return_value = ("{}", False)
+
+        self.container.wait_for_result("function", "{}", self.stdout, self.stderr)
+        self.container.wait_for_result("function", "{}", self.stdout, self.stderr)
+
+        self.container._can_connect_to_socket.assert_called_once_with()
+
+    @patch.object(Container, "wait_for_http_response")
+    def test_must_check_the_socket_again_after_a_failed_invocation(self, wait_for_http_response_mock):
+        wait_for_http_response_mock.side_effect = [ContainerResponseException("unreachable"), ("{}", False)]
+
+        with self.assertRaises(ContainerResponseException):
+            self.container.wait_for_result("function", "{}", self.stdout, self.stderr)
+        self.assertFalse(self.container._socket_ready)
+
+        self.container.wait_for_result("function", "{}", self.stdout, self.stderr)
+        self.assertEqual(self.container._can_connect_to_socket.call_count, 2)
+
+    @patch.object(Container, "wait_for_http_response")
+    def test_must_check_the_socket_again_after_a_timed_out_invocation(self, wait_for_http_response_mock):
+        wait_for_http_response_mock.return_value = ("{}", False)
+        timer = Mock()
+        timer.is_alive.return_value = False
+
+        self.container.wait_for_result("function", "{}", self.stdout, self.stderr, start_timer=lambda: timer)
+
+        self.assertFalse(self.container._socket_ready)
+        timer.cancel.assert_called_once_with()
+
+    @patch.object(Container, "wait_for_http_response")
+    def test_must_keep_the_socket_ready_when_the_invocation_finished_in_time(self, wait_for_http_response_mock):
+        wait_for_http_response_mock.return_value = ("{}", False)
+        timer = Mock()
+        timer.is_alive.return_value = True
+
+        self.container.wait_for_result("function", "{}", self.stdout, self.stderr, start_timer=lambda: timer)
+
+        self.assertTrue(self.container._socket_ready)
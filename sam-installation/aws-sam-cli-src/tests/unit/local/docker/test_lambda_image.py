@@ -0,0 +1,127 @@
+from unittest import TestCase
+from unittest.mock import ANY, Mock, patch
+
+import docker
+
+from samcli.commands.local.cli_common.user_exceptions import ImageBuildException
+from samcli.local.docker.lambda_image import LambdaImage
+
+
+class TestLambdaImage_build_image(TestCase):
+    def setUp(self):
+        self.docker_client = Mock()
+        self.lambda_image = LambdaImage(Mock(), False, False, docker_client=self.docker_client)
+        self.docker_client.api.pull.return_value = iter([{"status": "Downloading"}])
+
+    @patch.object(LambdaImage, "_build_from_context")
+    @patch.object(LambdaImage, "_build_layer_image")
+    def test_must_pull_the_base_image_only(self, build_layer_image_mock, build_from_context_mock):
+        build_layer_image_mock.return_value = "samcli/lambda-layer:x86_64-digest"
+
+        self.lambda_image._build_image("base:latest", "samcli/lambda-python:tag", [Mock()], "x86_64")
+
+        self.docker_client.api.pull.assert_called_once_with("base:latest", stream=True, decode=True, platform=ANY)
+        build_from_context_mock.assert_called_once_with(
+            ANY, ANY, "samcli/lambda-python:tag", "x86_64", pull=False, stream_writer=ANY
+        )
+        self.assertIn("COPY --from=samcli/lambda-layer:x86_64-digest", build_from_context_mock.call_args[0][0])
+
+    @patch.object(LambdaImage, "_build_from_context")
+    def test_must_not_pull_when_skipping_pull(self, build_from_context_mock):
+        self.lambda_image.skip_pull_image = True
+
+        self.lambda_image._build_image("base:latest", "samcli/lambda-python:tag", [], "x86_64")
+
+        self.docker_client.api.pull.assert_not_called()
+        self.assertFalse(build_from_context_mock.call_args.kwargs["pull"])
+
+    @patch.object(LambdaImage, "_build_from_context")
+    def test_must_fail_when_pulling_fails(self, build_from_context_mock):
+        self.docker_client.api.pull.side_effect = docker.errors.APIError("unreachable")
+
+        with self.assertRaises(ImageBuildException):
+            self.lambda_image._build_image("base:latest", "samcli/lambda-python:tag", [], "x86_64")
+
+        build_from_context_mock.assert_not_called()
+
+
+class TestLambdaImage_layer_images(TestCase):
+    def setUp(self):
+        self.docker_client = Mock()
+        self.docker_client.images.get.side_effect = docker.errors.ImageNotFound("not found")
+        self.layer_downloader = Mock()
+        self.layer_downloader.get_layer_digest.return_value = "sha"
+        self.lambda_image = LambdaImage(self.layer_downloader, False, False, docker_client=self.docker_client)
+        self.layer = Mock(
+            is_defined_within_template=False,
+            arn="arn:aws:lambda:us-east-1:123:layer:Layer:2",
+            layer_arn="arn:aws:lambda:us-east-1:123:layer:Layer",
+        )
+        self.layer.name = "Layer-2-abc"
+
+    @patch.object(LambdaImage, "_build_from_context")
+    def test_must_remove_images_of_previous_layer_versions(self, build_from_context_mock):
+        layer_image = f"samcli/lambda-layer:x86_64-{self.lambda_image._get_layer_digest(self.layer)[0:25]}"
+        current = Mock(id="current", tags=[layer_image])
+        previous = Mock(id="previous", tags=["samcli/lambda-layer:x86_64-previous"])
+        other_architecture = Mock(id="arm", tags=["samcli/lambda-layer:arm64-previous"])
+        self.docker_client.images.list.return_value = [current, previous, other_architecture]
+
+        self.assertEqual(self.lambda_image._build_layer_image(self.layer, "x86_64", Mock()), layer_image)
+
+        build_from_context_mock.assert_called_once_with(
+            ANY,
+            ANY,
+            layer_image,
+            "x86_64",
+            pull=False,
+            stream_writer=ANY,
+            labels={"com.amazonaws.samcli.layer": "arn:aws:lambda:us-east-1:123:layer:Layer:2"},
+        )
+        # the images of the other versions of the layer are not listed
+        self.docker_client.images.list.assert_called_once_with(
+            name="samcli/lambda-layer",
+            filters={"label": "com.amazonaws.samcli.layer=arn:aws:lambda:us-east-1:123:layer:Layer:2"},
+        )
+        self.docker_client.images.remove.assert_called_once_with("previous")
+        self.lambda_image._release_layer_images([layer_image])
+
+    @patch.object(LambdaImage, "_build_from_context")
+    def test_must_keep_the_images_used_by_other_builds(self, build_from_context_mock):
+        used = Mock(id="used", tags=["samcli/lambda-layer:x86_64-used"])
+        self.docker_client.images.list.return_value = [used]
+        LambdaImage._layer_images_in_use["samcli/lambda-layer:x86_64-used"] += 1
+        self.addCleanup(LambdaImage._release_layer_images, ["samcli/lambda-layer:x86_64-used"])
+
+        layer_image = self.lambda_image._build_layer_image(self.layer, "x86_64", Mock())
+        self.lambda_image._release_layer_images([layer_image])
+
+        self.docker_client.images.remove.assert_not_called()
+
+    @patch.object(LambdaImage, "_build_from_context")
+    def test_must_release_the_layer_images_once_the_function_image_is_built(self, build_from_context_mock):
+        self.lambda_image.skip_pull_image = True
+        self.docker_client.images.list.return_value = []
+
+        self.lambda_image._build_image("base:latest", "samcli/lambda-python:tag", [self.layer], "x86_64")
+
+        self.assertEqual(LambdaImage._layer_images_in_use, {})
+
+    @patch.object(LambdaImage, "_build_from_context")
+    def test_must_release_the_layer_images_when_the_build_fails(self, build_from_context_mock):
+        build_from_context_mock.side_effect = ImageBuildException("failed")
+
+        with self.assertRaises(ImageBuildException):
+            self.lambda_image._build_layer_image(self.layer, "x86_64", Mock())
+
+        self.assertEqual(LambdaImage._layer_images_in_use, {})
+
+    @patch.object(LambdaImage, "_build_from_context")
+    def test_must_reuse_existing_layer_image(self, build_from_context_mock):
+        self.docker_client.images.get.side_effect = None
+
+        layer_image = self.lambda_image._build_layer_image(self.layer, "x86_64", Mock())
+        self.lambda_image._release_layer_images([layer_image])
+
+        build_from_context_mock.assert_not_called()
+        self.docker_client.images.remove.assert_not_called()
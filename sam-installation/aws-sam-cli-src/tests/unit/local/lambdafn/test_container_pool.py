@@ -0,0 +1,91 @@
+import threading
+from unittest import TestCase
+from unittest.mock import Mock
+
+from samcli.local.lambdafn.container_pool import ContainerPool
+from samcli.local.lambdafn.exceptions import ContainerPoolClosed
+
+
+class TestContainerPool(TestCase):
+    def setUp(self):
+        self.pool = ContainerPool("function", min_size=1, max_size=2)
+
+    def test_must_reuse_released_containers(self):
+        container = self.pool.lease(Mock)
+
+        self.assertTrue(self.pool.release(container))
+
+        self.assertIs(self.pool.lease(Mock), container)
+        self.assertEqual(self.pool.size, 1)
+
+    def test_must_create_containers_up_to_max_size(self):
+        first = self.pool.lease(Mock)
+        second = self.pool.lease(Mock)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.pool.size, 2)
+
+    def test_must_prefer_new_containers_until_the_pool_is_full(self):
+        first = self.pool.lease(Mock, prefer_new=True)
+        self.pool.release(first)
+        second = self.pool.lease(Mock, prefer_new=True)
+        self.pool.release(second)
+
+        self.assertIsNot(first, second)
+        self.assertIs(self.pool.lease(Mock, prefer_new=True), second)
+        self.assertEqual(self.pool.size, 2)
+
+    def test_must_reap_idle_containers_above_min_size(self):
+        first = self.pool.lease(Mock)
+        second = self.pool.lease(Mock)
+        self.pool.release(first)
+        self.pool.release(second)
+
+        reaped = self.pool.reap(idle_timeout=10, now=float("inf"))
+
+        self.assertEqual(reaped, [first])
+        self.assertEqual(self.pool.size, 1)
+
+    def test_must_retire_leased_containers_when_drained(self):
+        idle = self.pool.lease(Mock)
+        leased = self.pool.lease(Mock)
+        self.pool.release(idle)
+
+        self.assertEqual(self.pool.drain(), [idle])
+
+        self.assertTrue(self.pool.closed)
+        self.assertFalse(self.pool.release(leased))
+
+    def test_must_not_lease_from_a_drained_pool(self):
+        self.pool.drain()
+
+        with self.assertRaises(ContainerPoolClosed):
+            self.pool.lease(Mock)
+
+    def test_must_retire_container_created_while_draining(self):
+        def create_container():
+            self.pool.drain()
+            return Mock()
+
+        container = self.pool.lease(create_container)
+
+        self.assertFalse(self.pool.release(container))
+
+    def test_must_wake_up_waiting_leases_when_drained(self):
+        pool = ContainerPool("function", min_size=1, max_size=1)
+        pool.lease(Mock)
+        errors = []
+
+        def lease():
+            try:
+                pool.lease(Mock)
+            except ContainerPoolClosed as ex:
+                errors.append(ex)
+
+        waiting = threading.Thread(target=lease)
+        waiting.start()
+        pool.drain()
+        waiting.join(timeout=5)
+
+        self.assertFalse(waiting.is_alive())
+        self.assertEqual(len(errors), 1)
@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from samcli.local.lambdafn.invoke_profiler import InvokeProfiler, Span, _percentile
+
+
+class TestInvokeProfiler(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.trace_path = os.path.join(self.temp_dir, "trace.json")
+        self.profiler = InvokeProfiler(self.trace_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _add_spans(self, name, durations_ms):
+        for index, duration_ms in enumerate(durations_ms):
+            self.profiler._spans.append(
+                Span(
+                    name,
+                    start_us=index * 1000.0,
+                    duration_us=duration_ms * 1000.0,
+                    thread_id=7,
+                    thread_name="main",
+                    args={},
+                )
+            )
+
+    def test_must_not_record_when_disabled(self):
+        profiler = InvokeProfiler(None)
+
+        with profiler.span("invoke"):
+            pass
+        profiler.shutdown()
+
+        self.assertFalse(profiler.enabled)
+        self.assertEqual(profiler.spans, [])
+
+    def test_must_record_the_span_and_its_error(self):
+        with self.profiler.span("create", function="HelloWorld"):
+            pass
+        with self.assertRaises(ValueError):
+            with self.profiler.span("invoke"):
+                raise ValueError()
+
+        create, invoke = self.profiler.spans
+        self.assertEqual(create.name, "create")
+        self.assertEqual(create.args, {"function": "HelloWorld"})
+        self.assertGreaterEqual(create.duration_us, 0)
+        self.assertEqual(invoke.args, {"error": "ValueError"})
+
+    def test_must_summarize_each_phase_in_the_order_it_was_seen(self):
+        self._add_spans("start", list(range(1, 21)))
+        self._add_spans("create", [5])
+
+        start, create = self.profiler.summary()
+
+        self.assertEqual(
+            start,
+            {
+                "phase": "start",
+                "count": 20,
+                "totalMs": 210,
+                "averageMs": 10.5,
+                "p50Ms": 10,
+                "p95Ms": 19,
+                "maxMs": 20,
+            },
+        )
+        self.assertEqual((create["phase"], create["count"], create["p50Ms"], create["p95Ms"]), ("create", 1, 5, 5))
+
+    def test_must_format_the_summary_as_a_table(self):
+        self._add_spans("invoke", [1.5, 2.5])
+
+        header, separator, row = self.profiler.format_summary().splitlines()
+
+        self.assertTrue(header.startswith("Phase"))
+        self.assertEqual(set(separator.replace(" ", "")), {"-"})
+        self.assertEqual(row.split(), ["invoke", "2", "4.0", "2.0", "1.5", "2.5", "2.5"])
+
+    def test_must_export_a_chrome_trace(self):
+        self._add_spans("invoke", [2])
+
+        trace = self.profiler.to_chrome_trace()
+
+        span_event, thread_event = trace["traceEvents"]
+        self.assertEqual(span_event["ph"], "X")
+        self.assertEqual((span_event["name"], span_event["ts"], span_event["dur"]), ("invoke", 0, 2000))
+        self.assertEqual(span_event["tid"], 7)
+        self.assertEqual(thread_event["ph"], "M")
+        self.assertEqual(thread_event["args"], {"name": "main"})
+
+    def test_must_write_the_trace_once_at_shutdown(self):
+        self._add_spans("invoke", [2])
+
+        self.profiler.shutdown()
+        with open(self.trace_path) as trace_file:
+            self.assertEqual(json.load(trace_file), self.profiler.to_chrome_trace())
+
+        os.remove(self.trace_path)
+        self.profiler.shutdown()
+        self.assertFalse(os.path.exists(self.trace_path))
+
+    def test_must_not_write_a_trace_without_spans(self):
+        self.profiler.shutdown()
+
+        self.assertFalse(os.path.exists(self.trace_path))
+
+
+class TestPercentile(TestCase):
+    def test_must_return_the_nearest_rank(self):
+        self.assertEqual(_percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(_percentile([1, 2, 3, 4], 51), 3)
+        self.assertEqual(_percentile([1, 2, 3, 4], 95), 4)
+        self.assertEqual(_percentile([1, 2, 3, 4], 0), 1)
+        self.assertEqual(_percentile([7], 99), 7)
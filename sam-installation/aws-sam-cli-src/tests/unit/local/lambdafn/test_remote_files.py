@@ -0,0 +1,241 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from samcli.local.lambdafn import remote_files
+from samcli.local.lambdafn.exceptions import DownloadChecksumMismatch
+from samcli.local.lambdafn.remote_files import DOWNLOAD_PROGRESS_SUFFIX, _RangedDownload, unzip_from_uri
+
+SEGMENT_SIZE = 16 * 1024
+
+
+def _response(status_code, body, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.raw = io.BytesIO(body)
+    response.url = "https://layer.zip"
+    return response
+
+
+class _FakeSession:
+    """
+    Serves the given bytes, with the HTTP range requests made by _RangedDownload
+    """
+
+    def __init__(self, data, supports_ranges=True):
+        self.data = data
+        self.supports_ranges = supports_ranges
+        self.requested_ranges = []
+        # (start, end) of a range -> status codes returned for it before it succeeds
+        self.failures = {}
+        # called with (start, end) before a range is served
+        self.before_range = None
+        self._lock = threading.Lock()
+
+    def get(self, uri, headers, stream, timeout, verify):
+        start, end = (int(position) for position in headers["Range"].split("=")[1].split("-"))
+        with self._lock:
+            self.requested_ranges.append((start, end))
+            failures = self.failures.get((start, end))
+            status_code = failures.pop(0) if failures else None
+        if status_code:
+            return _response(status_code, b"")
+        if not self.supports_ranges:
+            return _response(200, self.data, {"Content-length": str(len(self.data))})
+        if self.before_range:
+            self.before_range(start, end)
+        return _response(206, self.data[start : end + 1], {"Content-Range": f"bytes {start}-{end}/{len(self.data)}"})
+
+
+def _make_zip():
+    # stored entries of random bytes, so that the entries span several segments
+    zip_bytes = io.BytesIO()
+    with zipfile.ZipFile(zip_bytes, "w", compression=zipfile.ZIP_STORED) as zip_file:
+        zip_file.writestr("first.bin", os.urandom(20 * 1024))
+        zip_file.writestr("second.bin", os.urandom(200 * 1024))
+    return zip_bytes.getvalue()
+
+
+def _code_sha256(data):
+    return base64.b64encode(hashlib.sha256(data).digest()).decode("utf-8")
+
+
+class TestRangedDownload(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.zip_path = os.path.join(self.temp_dir, "layer.zip")
+        self.unzip_output_dir = os.path.join(self.temp_dir, "layer")
+        self.data = _make_zip()
+        self.session = _FakeSession(self.data)
+
+        time_patch = patch.object(remote_files, "time")
+        self.sleep_mock = time_patch.start().sleep
+        self.addCleanup(time_patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _download(self, code_sha256=None):
+        download = _RangedDownload("https://layer.zip", self.zip_path, self.unzip_output_dir, "layer", code_sha256)
+        download._session = self.session
+        download._segment_size = SEGMENT_SIZE
+        return download
+
+    def _assert_unzipped(self):
+        with zipfile.ZipFile(io.BytesIO(self.data)) as zip_file:
+            for name in ["first.bin", "second.bin"]:
+                with open(os.path.join(self.unzip_output_dir, name), "rb") as unzipped_file:
+                    self.assertEqual(unzipped_file.read(), zip_file.read(name))
+
+    def test_must_download_in_segments(self):
+        self._download(_code_sha256(self.data)).run()
+
+        self._assert_unzipped()
+        segment_starts = sorted(start for start, _ in self.session.requested_ranges[1:])
+        self.assertEqual(segment_starts, list(range(0, len(self.data), SEGMENT_SIZE)))
+
+    def test_must_download_with_a_single_request_when_ranges_are_not_supported(self):
+        self.session.supports_ranges = False
+
+        self._download().run()
+
+        self._assert_unzipped()
+        self.assertEqual(len(self.session.requested_ranges), 1)
+
+    def test_must_resume_from_the_saved_progress(self):
+        code_sha256 = _code_sha256(self.data)
+        partial_start = 2 * SEGMENT_SIZE
+        downloaded = {start: SEGMENT_SIZE for start in range(0, len(self.data), SEGMENT_SIZE)}
+        downloaded[partial_start] = 1000
+        downloaded[5 * SEGMENT_SIZE] = 0
+        last_start = max(downloaded)
+        downloaded[last_start] = len(self.data) - last_start
+
+        # only the downloaded bytes are in the file, the others are still zeros
+        partial_data = bytearray(len(self.data))
+        for start, size in downloaded.items():
+            partial_data[start : start + size] = self.data[start : start + size]
+        with open(self.zip_path, "wb") as zip_file:
+            zip_file.write(partial_data)
+        with open(self.zip_path + DOWNLOAD_PROGRESS_SUFFIX, "w") as progress_file:
+            progress = {
+                "code_sha256": code_sha256,
+                "size": len(self.data),
+                "segment_size": SEGMENT_SIZE,
+                "downloaded": {str(start): size for start, size in downloaded.items()},
+            }
+            progress_file.write(json.dumps(progress))
+
+        self._download(code_sha256).run()
+
+        self._assert_unzipped()
+        self.assertEqual(
+            sorted(self.session.requested_ranges[1:]),
+            [(partial_start + 1000, 3 * SEGMENT_SIZE - 1), (5 * SEGMENT_SIZE, 6 * SEGMENT_SIZE - 1)],
+        )
+
+    def test_must_ignore_the_saved_progress_of_another_file(self):
+        with open(self.zip_path, "wb") as zip_file:
+            zip_file.write(bytes(len(self.data)))
+        with open(self.zip_path + DOWNLOAD_PROGRESS_SUFFIX, "w") as progress_file:
+            progress = {
+                "code_sha256": "other",
+                "size": len(self.data),
+                "segment_size": SEGMENT_SIZE,
+                "downloaded": {"0": SEGMENT_SIZE},
+            }
+            progress_file.write(json.dumps(progress))
+
+        self._download(_code_sha256(self.data)).run()
+
+        self._assert_unzipped()
+        self.assertIn((0, SEGMENT_SIZE - 1), self.session.requested_ranges)
+
+    def test_must_retry_a_segment_after_a_server_error(self):
+        failed_range = (SEGMENT_SIZE, 2 * SEGMENT_SIZE - 1)
+        self.session.failures[failed_range] = [503]
+
+        self._download().run()
+
+        self._assert_unzipped()
+        self.assertEqual(self.session.requested_ranges.count(failed_range), 2)
+        self.sleep_mock.assert_called_once()
+
+    def test_must_not_retry_a_segment_after_a_client_error(self):
+        failed_range = (SEGMENT_SIZE, 2 * SEGMENT_SIZE - 1)
+        self.session.failures[failed_range] = [403]
+        download = self._download(_code_sha256(self.data))
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            download.run()
+
+        self.assertEqual(self.session.requested_ranges.count(failed_range), 1)
+        self.sleep_mock.assert_not_called()
+        # the next download resumes the segments downloaded so far
+        self.assertTrue(download.resumable)
+        self.assertTrue(os.path.exists(self.zip_path + DOWNLOAD_PROGRESS_SUFFIX))
+
+    def test_must_unzip_the_downloaded_entries_before_the_last_segment(self):
+        first_entry_path = os.path.join(self.unzip_output_dir, "first.bin")
+        blocked_start = 8 * SEGMENT_SIZE
+        first_entry_unzipped = []
+
+        def before_range(start, end):
+            if start != blocked_start:
+                return
+            # hold a segment of the second entry until the first entry is unzipped
+            deadline = time.monotonic() + 5
+            while not os.path.exists(first_entry_path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            first_entry_unzipped.append(os.path.exists(first_entry_path))
+
+        self.session.before_range = before_range
+
+        with patch.object(remote_files, "DOWNLOAD_SEGMENT_WORKERS", 2):
+            self._download().run()
+
+        self.assertEqual(first_entry_unzipped, [True])
+        self._assert_unzipped()
+
+
+class TestUnzipFromUri(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.zip_path = os.path.join(self.temp_dir, "layer.zip")
+        self.unzip_output_dir = os.path.join(self.temp_dir, "layer")
+        self.data = _make_zip()
+        self.session = _FakeSession(self.data)
+
+        session_patch = patch.object(remote_files, "_SESSION", self.session)
+        session_patch.start()
+        self.addCleanup(session_patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_must_unzip_and_remove_the_downloaded_file(self):
+        unzip_from_uri("https://layer.zip", self.zip_path, self.unzip_output_dir, "layer", _code_sha256(self.data))
+
+        self.assertTrue(os.path.exists(os.path.join(self.unzip_output_dir, "second.bin")))
+        self.assertFalse(os.path.exists(self.zip_path))
+        self.assertFalse(os.path.exists(self.zip_path + DOWNLOAD_PROGRESS_SUFFIX))
+
+    def test_must_remove_the_unzipped_content_when_the_checksum_does_not_match(self):
+        with self.assertRaises(DownloadChecksumMismatch):
+            unzip_from_uri("https://layer.zip", self.zip_path, self.unzip_output_dir, "layer", _code_sha256(b"other"))
+
+        self.assertFalse(os.path.exists(self.unzip_output_dir))
+        self.assertFalse(os.path.exists(self.zip_path))
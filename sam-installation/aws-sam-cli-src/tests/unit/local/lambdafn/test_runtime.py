@@ -0,0 +1,115 @@
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from samcli.local.lambdafn.runtime import LambdaRuntime, WarmLambdaRuntime
+
+
+class TestWarmLambdaRuntime_container_pools(TestCase):
+    def setUp(self):
+        self.container_manager = Mock()
+        self.runtime = WarmLambdaRuntime(
+            self.container_manager, Mock(), observer=Mock(), min_containers=1, max_containers=1, idle_timeout=0
+        )
+        self.function_config = Mock(full_path="function", layers=[])
+        self.function_config.name = "function"
+
+        create_patch = patch.object(LambdaRuntime, "create", side_effect=lambda *args, **kwargs: Mock())
+        self.create_mock = create_patch.start()
+        self.addCleanup(create_patch.stop)
+
+    def test_must_stop_drained_containers_outside_of_the_pools_lock(self):
+        container = self.runtime.create(self.function_config)
+        self.runtime._on_invoke_done(container)
+        self.container_manager.stop.side_effect = lambda _: self.assertFalse(self.runtime._pools_lock.locked())
+
+        self.runtime._on_code_change([self.function_config])
+
+        self.container_manager.stop.assert_called_once_with(container)
+
+    def test_must_stop_container_created_while_its_pool_is_drained(self):
+        created = Mock()
+
+        def create_container(*args, **kwargs):
+            self.runtime._on_code_change([self.function_config])
+            return created
+
+        self.create_mock.side_effect = create_container
+
+        container = self.runtime.create(self.function_config)
+        self.runtime._on_invoke_done(container)
+
+        self.assertIs(container, created)
+        self.container_manager.stop.assert_called_once_with(created)
+
+    def test_must_stop_leased_container_returned_after_shutdown(self):
+        container = self.runtime.create(self.function_config)
+        self.runtime.clean_running_containers_and_related_resources()
+        self.container_manager.stop.reset_mock()
+
+        self.runtime._on_invoke_done(container)
+
+        self.container_manager.stop.assert_called_once_with(container)
+
+    def test_waiting_invocation_must_lease_from_the_new_pool(self):
+        leased = self.runtime.create(self.function_config)
+        waiting_result = []
+        waiting = threading.Thread(target=lambda: waiting_result.append(self.runtime.create(self.function_config)))
+        waiting.start()
+        time.sleep(0.1)
+
+        self.runtime._on_code_change([self.function_config])
+        waiting.join(timeout=5)
+
+        self.assertEqual(len(waiting_result), 1)
+        self.assertIsNot(waiting_result[0], leased)
+        self.runtime._on_invoke_done(leased)
+        self.container_manager.stop.assert_called_once_with(leased)
+        self.runtime._on_invoke_done(waiting_result[0])
+        self.container_manager.stop.assert_called_once_with(leased)
+
+
+class TestWarmLambdaRuntime_prewarm(TestCase):
+    def setUp(self):
+        self.container_manager = Mock()
+        self.function_config = Mock(full_path="function", layers=[])
+        self.function_config.name = "function"
+
+        create_patch = patch.object(LambdaRuntime, "create", side_effect=lambda *args, **kwargs: Mock())
+        self.create_mock = create_patch.start()
+        self.addCleanup(create_patch.stop)
+
+    def _prewarm(self, runtime, debug_context=None):
+        self.addCleanup(runtime._reaper_stop_event.set)
+        # prewarm used to wait forever for a container, it is run on a thread to fail instead
+        thread = threading.Thread(target=runtime.prewarm, args=(self.function_config, debug_context), daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        return runtime._container_pools["function"]
+
+    def test_must_create_min_containers(self):
+        runtime = WarmLambdaRuntime(self.container_manager, Mock(), observer=Mock(), min_containers=3, max_containers=5)
+
+        pool = self._prewarm(runtime)
+
+        self.assertEqual(self.create_mock.call_count, 3)
+        self.assertEqual(len(set(pool.all_containers())), 3)
+        self.assertEqual(runtime._leases, {})
+
+    def test_must_create_max_containers_when_min_is_greater(self):
+        runtime = WarmLambdaRuntime(self.container_manager, Mock(), observer=Mock(), min_containers=3, max_containers=2)
+
+        pool = self._prewarm(runtime)
+
+        self.assertEqual(self.create_mock.call_count, 2)
+        self.assertEqual(pool.size, 2)
+
+    def test_must_create_one_container_for_the_debugged_function(self):
+        runtime = WarmLambdaRuntime(self.container_manager, Mock(), observer=Mock(), min_containers=2, max_containers=4)
+
+        pool = self._prewarm(runtime, Mock(debug_function="function"))
+
+        self.assertEqual(self.create_mock.call_count, 1)
+        self.assertEqual(pool.max_size, 1)
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from samcli.lib.utils.file_lock import FileLock
+from samcli.local.layers.layer_downloader import LayerDownloader
+
+
+class TestLayerDownloader_evict_layers(TestCase):
+    def setUp(self):
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.download_layer = LayerDownloader(str(self.cache_dir), ".", [], Mock(), max_cache_size_mb=1)
+
+    def _cache_layer(self, name, size, last_used):
+        layer_dir = self.cache_dir / name
+        layer_dir.mkdir()
+        (layer_dir / "content").write_bytes(b"0" * size)
+        marker = self.cache_dir / f"{name}.digest"
+        marker.write_text("sha")
+        (self.cache_dir / f"{name}.lock").touch()
+        os.utime(marker, (last_used, last_used))
+
+    def _used_layer(self, name):
+        layer = Mock(is_defined_within_template=False, codeuri=None, arn=name, layer_arn=name)
+        layer.name = name
+        return layer
+
+    def test_must_evict_least_recently_used_layers_with_their_lock_files(self):
+        now = time.time()
+        self._cache_layer("old", 600 * 1024, now - 100)
+        self._cache_layer("new", 600 * 1024, now)
+
+        self.download_layer._evict_layers()
+
+        self.assertEqual(sorted(path.name for path in self.cache_dir.iterdir()), ["new", "new.digest", "new.lock"])
+
+    def test_must_not_evict_layers_used_earlier_by_the_process(self):
+        now = time.time()
+        self._cache_layer("old", 600 * 1024, now - 100)
+        self._cache_layer("new", 600 * 1024, now)
+        # used by a previous request of the same start-api process
+        self.download_layer.download(self._used_layer("old"))
+        os.utime(self.cache_dir / "old.digest", (now - 100, now - 100))
+
+        self.download_layer._evict_layers()
+
+        self.assertTrue((self.cache_dir / "old").exists())
+        self.assertFalse((self.cache_dir / "new").exists())
+
+    def test_must_count_partial_downloads_towards_the_cap(self):
+        self._cache_layer("cached", 600 * 1024, time.time())
+        (self.cache_dir / "partial.zip").write_bytes(b"0" * 600 * 1024)
+        (self.cache_dir / "partial.zip.progress").write_text("{}")
+
+        self.download_layer._evict_layers()
+
+        self.assertEqual(
+            sorted(path.name for path in self.cache_dir.iterdir()), ["cached", "cached.digest", "cached.lock"]
+        )
+
+    def test_must_remove_stale_download_files_of_cached_layers(self):
+        self.download_layer._max_cache_size_mb = 0
+        self._cache_layer("cached", 10, time.time())
+        (self.cache_dir / "cached.zip").write_bytes(b"0")
+        (self.cache_dir / "cached.zip.progress").write_text("{}")
+        (self.cache_dir / "cached_0123456789abcdef0123456789abcdef.zip").write_bytes(b"0")
+        (self.cache_dir / "orphan.lock").touch()
+
+        self.download_layer._evict_layers()
+
+        self.assertEqual(
+            sorted(path.name for path in self.cache_dir.iterdir()), ["cached", "cached.digest", "cached.lock"]
+        )
+
+    def test_must_not_evict_layers_locked_by_another_process(self):
+        now = time.time()
+        self._cache_layer("old", 600 * 1024, now - 100)
+        self._cache_layer("new", 600 * 1024, now)
+
+        with patch.object(FileLock, "acquire", return_value=False):
+            self.download_layer._evict_layers()
+
+        self.assertTrue((self.cache_dir / "old").exists())
+        self.assertTrue((self.cache_dir / "new").exists())
+
+
+class TestFileLock(TestCase):
+    def test_must_lock_the_new_file_when_the_lock_file_was_removed(self):
+        lock_path = Path(tempfile.mkdtemp(), "layer.lock")
+        lock = FileLock(lock_path)
+        lock.acquire()
+        lock.release(remove=True)
+        self.assertFalse(lock_path.exists())
+
+        other_lock = FileLock(lock_path)
+        self.assertTrue(other_lock.acquire(blocking=False))
+        self.assertTrue(lock_path.exists())
+        self.assertFalse(FileLock(lock_path).acquire(blocking=False))
+        other_lock.release()
+
+    def test_must_not_share_the_lock_with_a_process_which_waited_on_the_removed_file(self):
+        lock_path = Path(tempfile.mkdtemp(), "layer.lock")
+        lock = FileLock(lock_path)
+        lock.acquire()
+        waiting_lock = FileLock(lock_path)
+        waiter = threading.Thread(target=waiting_lock.acquire)
+        waiter.start()
+        time.sleep(0.1)
+
+        lock.release(remove=True)
+        waiter.join(timeout=5)
+
+        self.assertTrue(waiting_lock.is_locked)
+        self.assertFalse(FileLock(lock_path).acquire(blocking=False))
+        waiting_lock.release()
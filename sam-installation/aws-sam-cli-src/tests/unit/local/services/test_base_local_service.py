@@ -0,0 +1,50 @@
+import socket
+import threading
+from unittest import TestCase
+
+from samcli.local.services.base_local_service import PooledWSGIServer
+
+
+def _hello_app(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain"), ("Content-Length", "5")])
+    return [b"hello"]
+
+
+class TestPooledWSGIServer(TestCase):
+    def setUp(self):
+        self.server = PooledWSGIServer("127.0.0.1", 0, _hello_app, max_workers=1)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join(timeout=5)
+
+    def _connect(self):
+        client = socket.create_connection(self.server.server_address[:2], timeout=5)
+        self.addCleanup(client.close)
+        return client
+
+    @staticmethod
+    def _read_until_closed(client):
+        data = b""
+        while True:
+            chunk = client.recv(4096)
+            if not chunk:
+                return data
+            data += chunk
+
+    def test_must_release_the_worker_of_a_keep_alive_connection(self):
+        keep_alive_client = self._connect()
+        keep_alive_client.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\nConnection: keep-alive\r\n\r\n")
+
+        # the server closes the connection after the response instead of waiting for the next request on it
+        response = self._read_until_closed(keep_alive_client)
+        self.assertIn(b"200 OK", response)
+        self.assertTrue(response.endswith(b"hello"))
+
+        # the only worker is free again for another client
+        other_client = self._connect()
+        other_client.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        self.assertTrue(self._read_until_closed(other_client).endswith(b"hello"))
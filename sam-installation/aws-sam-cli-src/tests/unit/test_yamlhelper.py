@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+import yaml
+
+from samcli import yamlhelper
+from samcli.yamlhelper import CfnSafeLoader, yaml_parse
+
+TEMPLATE = """
+Resources:
+  Function:
+    Type: AWS::Serverless::Function
+    Properties:
+      CodeUri: !Sub "${AWS::StackName}/src"
+      Role: !GetAtt Role.Arn
+      Created: 2024-01-01
+"""
+
+
+class TestYamlParse(TestCase):
+    def test_must_parse_intrinsics_in_order(self):
+        template = yaml_parse(TEMPLATE)
+
+        properties = template["Resources"]["Function"]["Properties"]
+        self.assertIsInstance(template, OrderedDict)
+        self.assertEqual(list(properties), ["CodeUri", "Role", "Created"])
+        self.assertEqual(properties["CodeUri"], {"Fn::Sub": "${AWS::StackName}/src"})
+        self.assertEqual(properties["Role"], {"Fn::GetAtt": ["Role", "Arn"]})
+        self.assertEqual(properties["Created"], "2024-01-01")
+
+    @patch("samcli.yamlhelper.CfnCSafeLoader", None)
+    def test_must_parse_without_libyaml(self):
+        self.assertEqual(yaml_parse(TEMPLATE), yaml.load(TEMPLATE, Loader=CfnSafeLoader))
+
+    @patch("samcli.yamlhelper.yaml.load")
+    def test_must_fall_back_to_the_pure_python_loader(self, load_mock):
+        if not yamlhelper.CfnCSafeLoader:
+            self.skipTest("PyYAML is not built with libyaml")
+        load_mock.side_effect = [yaml.YAMLError("rejected by libyaml"), {"Resources": {}}]
+
+        self.assertEqual(yamlhelper._yaml_load(TEMPLATE), {"Resources": {}})
+
+        self.assertIs(load_mock.call_args_list[0].kwargs["Loader"], yamlhelper.CfnCSafeLoader)
+        self.assertIs(load_mock.call_args_list[1].kwargs["Loader"], CfnSafeLoader)
+
+
+@patch("samcli.yamlhelper.PARSE_CACHE_MIN_SIZE", 1)
+class TestYamlParse_cache(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name, "config", "parsed-yaml")
+        self.template_file = os.path.join(self.temp_dir.name, "template.yaml")
+        cache_dir_patcher = patch("samcli.yamlhelper._get_parse_cache_dir", return_value=self.cache_dir)
+        cache_dir_patcher.start()
+        self.addCleanup(cache_dir_patcher.stop)
+        load_patcher = patch("samcli.yamlhelper._yaml_load", wraps=yamlhelper._yaml_load)
+        self.load_mock = load_patcher.start()
+        self.addCleanup(load_patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_must_parse_a_cached_file_once(self):
+        first = yaml_parse(TEMPLATE, self.template_file)
+        second = yaml_parse(TEMPLATE, self.template_file)
+
+        self.load_mock.assert_called_once_with(TEMPLATE)
+        self.assertEqual(first, second)
+        self.assertIsInstance(second["Resources"], OrderedDict)
+
+    def test_must_store_the_cache_as_json_only_readable_by_the_user(self):
+        yaml_parse(TEMPLATE, self.template_file)
+
+        (cache_file,) = self.cache_dir.iterdir()
+        self.assertEqual(json.loads(cache_file.read_text())["location"], os.path.abspath(self.template_file))
+        if os.name == "posix":
+            self.assertEqual(self.cache_dir.stat().st_mode & 0o777, 0o700)
+
+    def test_must_parse_again_when_the_content_changes(self):
+        yaml_parse(TEMPLATE, self.template_file)
+        changed = yaml_parse(TEMPLATE.replace("src", "lib"), self.template_file)
+
+        self.assertEqual(self.load_mock.call_count, 2)
+        self.assertEqual(
+            changed["Resources"]["Function"]["Properties"]["CodeUri"], {"Fn::Sub": "${AWS::StackName}/lib"}
+        )
+        self.assertEqual(len(list(self.cache_dir.iterdir())), 1)
+
+    def test_must_cache_each_location_separately(self):
+        yaml_parse(TEMPLATE, self.template_file)
+        yaml_parse(TEMPLATE, os.path.join(self.temp_dir.name, "other", "template.yaml"))
+
+        self.assertEqual(self.load_mock.call_count, 2)
+        self.assertEqual(len(list(self.cache_dir.iterdir())), 2)
+
+    def test_must_not_cache_strings_without_a_file(self):
+        yaml_parse(TEMPLATE)
+
+        self.assertFalse(self.cache_dir.exists())
+
+    def test_must_not_cache_documents_which_are_not_json(self):
+        document = "Mappings:\n  1: one\n"
+
+        self.assertEqual(yaml_parse(document, self.template_file), {"Mappings": {1: "one"}})
+
+        self.assertFalse(self.cache_dir.exists())
+
+    def test_must_ignore_corrupted_cache_files(self):
+        yaml_parse(TEMPLATE, self.template_file)
+        (cache_file,) = self.cache_dir.iterdir()
+        cache_file.write_text("not json")
+
+        template = yaml_parse(TEMPLATE, self.template_file)
+
+        self.assertEqual(self.load_mock.call_count, 2)
+        self.assertEqual(template["Resources"]["Function"]["Type"], "AWS::Serverless::Function")
+
+    @patch("samcli.yamlhelper.PARSE_CACHE_MAX_ENTRIES", 2)
+    def test_must_evict_the_oldest_files(self):
+        for index in range(3):
+            yaml_parse(TEMPLATE, os.path.join(self.temp_dir.name, f"template{index}.yaml"))
+
+        self.assertEqual(len(list(self.cache_dir.iterdir())), 2)